@@ -0,0 +1 @@
+"""Performance benchmarks for the motorcycle alert system."""
@@ -0,0 +1,90 @@
+"""Compare vectorised daily summaries with a per-sample Python loop.
+
+Usage::
+
+    python -m benchmarks.bench_analytics --vehicles 5 --days 365
+
+Both compute the daily distance, driving time and top speed of synthetic
+1-minute samples; the loop uses the scalar haversine of the domain layer.
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from motorcycle_alert.domain.values import distance_m
+from motorcycle_alert.infrastructure.analytics import daily_summaries
+
+START = 1_700_006_400.0
+
+
+def make_columns(samples: int, seed: int) -> dict:
+    """Build one vehicle's columns with alternating parked and driving hours."""
+    rng = np.random.default_rng(seed)
+    time_ = START + np.arange(samples) * 60.0
+    ignition = ((np.arange(samples) // 60) % 3 == 1).astype(np.uint8)
+    speed = (ignition * rng.uniform(0, 90, samples)).astype(np.float32)
+    lat = -3.1 + np.cumsum(ignition * rng.normal(0, 1e-4, samples))
+    lng = -60.0 + np.cumsum(ignition * rng.normal(0, 1e-4, samples))
+    return {"time": time_, "lat": lat, "lng": lng, "speed": speed, "ignition": ignition}
+
+
+def loop_summaries(columns: dict) -> dict:
+    """Aggregate the same totals one sample at a time."""
+    rows = list(zip(*(columns[c].tolist() for c in ("time", "lat", "lng", "speed"))))
+    ignition = columns["ignition"].tolist()
+    distance = defaultdict(float)
+    driving = defaultdict(float)
+    top = defaultdict(float)
+    for i in range(1, len(rows)):
+        day = int(rows[i][0] // 86_400)
+        distance[day] += distance_m(
+            rows[i - 1][1], rows[i - 1][2], rows[i][1], rows[i][2]
+        )
+        if ignition[i - 1]:
+            driving[day] += rows[i][0] - rows[i - 1][0]
+        top[day] = max(top[day], rows[i][3])
+    return distance
+
+
+def main() -> None:
+    """Run the benchmark and print the timings, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    samples = args.days * 24 * 60
+    fleet = [make_columns(samples, seed) for seed in range(args.vehicles)]
+    timings = {}
+
+    started = time.perf_counter()
+    vectorised = [daily_summaries(columns, str(i)) for i, columns in enumerate(fleet)]
+    timings["numpy"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    looped = [loop_summaries(columns) for columns in fleet]
+    timings["loop"] = time.perf_counter() - started
+
+    for days, totals in zip(vectorised, looped):
+        assert np.allclose([d.distance_m for d in days], list(totals.values()))
+
+    results = {
+        "vehicles": args.vehicles,
+        "samples": samples * args.vehicles,
+        "seconds": timings,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['samples']} samples over {args.days} days")
+    for name, seconds in timings.items():
+        print(f"{name:<6} {seconds * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""Run the monitor end to end against a fake tracker API and Telegram sink.
+
+The real ``MotorcycleMonitoringUseCase`` polls a local stand-in for
+``/objects/items`` (see :mod:`benchmarks.fakes`) and delivers its alerts
+through the queued Telegram service to a local ``sendMessage`` sink. Both
+fakes have configurable latency, error rate and payload size. The run
+reports polls per second, poll and poll-to-alert latency percentiles, CPU
+time and peak RSS. CPU time of the fakes' thread is reported apart from the
+monitor's.
+
+Usage::
+
+    python -m benchmarks.bench_e2e --vehicles 200 --interval 1 --duration 30
+    python -m benchmarks.bench_e2e --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.fakes import FakeServers, FakeTelegram, FakeTracker, chat_id
+from motorcycle_alert.application.use_cases import (
+    MotorcycleMonitoringUseCase,
+    PollListener,
+)
+from motorcycle_alert.domain.services import MotorcycleAlertService
+from motorcycle_alert.infrastructure.api_client import ApiMotorcycleDataRepository
+from motorcycle_alert.infrastructure.conditional import ConditionalCache
+from motorcycle_alert.infrastructure.config import Config, VehicleConfig
+from motorcycle_alert.infrastructure.http_client import create_http_fetcher
+from motorcycle_alert.infrastructure.notifications import (
+    QueuedTelegramNotificationService,
+)
+from motorcycle_alert.infrastructure.storage import (
+    CachedStatusStorage,
+    FileStatusStorage,
+    vehicle_status_path,
+)
+
+# Results compared by ``--compare``, and whether higher values are better.
+COMPARED = {
+    "polls_per_second": True,
+    "poll_ms.p50": False,
+    "poll_ms.p99": False,
+    "alert_ms.p50": False,
+    "alert_ms.p99": False,
+    "cpu.monitor_ms_per_poll": False,
+    "max_rss_mb": False,
+}
+
+
+class RecordingListener(PollListener):
+    """Keeps the latency of every poll and counts failed ones."""
+
+    def __init__(self):
+        self.seconds: List[float] = []
+        self.errors = 0
+
+    def poll_finished(self, object_id, seconds, error) -> None:
+        self.seconds.append(seconds)
+        if error is not None:
+            self.errors += 1
+
+
+def percentiles(values: List[float], scale: float = 1e3) -> Dict[str, float]:
+    """Return the p50, p99 and max of ``values``, multiplied by ``scale``."""
+    if not values:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0, "samples": 0}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * scale
+
+    return {
+        "p50": at(0.5),
+        "p99": at(0.99),
+        "max": ordered[-1] * scale,
+        "samples": len(ordered),
+    }
+
+
+def revision() -> str:
+    """Return the git revision of the tree, or ``unknown``."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_config(
+    args: argparse.Namespace, servers: FakeServers, workdir: str
+) -> Config:
+    """Build a configuration pointing at the fake servers."""
+    os.environ.setdefault("API_COOKIE", "benchmark")
+    os.environ.setdefault("API_CSRF_TOKEN", "benchmark")
+    return Config(
+        telegram_api_key="benchmark",
+        telegram_user_id="0",
+        api_base_url=servers.tracker_url,
+        object_id=servers.tracker.object_ids[0],
+        check_interval=args.interval,
+        status_file_path=os.path.join(workdir, "status.txt"),
+        http_client=args.http_client,
+        http_pool_size=args.concurrency,
+        vehicles=tuple(
+            VehicleConfig(object_id, chat_id(object_id))
+            for object_id in servers.tracker.object_ids
+        ),
+        max_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        status_fsync=args.fsync,
+        telegram_api_url=servers.telegram_url,
+        telegram_workers=args.telegram_workers,
+        telegram_chat_rate=1000.0,
+        telegram_global_rate=1000.0,
+        conditional_fetch=not args.no_conditional,
+        probe_fetch=args.probe,
+    )
+
+
+async def monitor(config: Config, duration: float) -> Dict[str, object]:
+    """Monitor the fake fleet for ``duration`` seconds."""
+    fetcher = create_http_fetcher(config)
+    notifier = QueuedTelegramNotificationService(config)
+    await notifier.start()
+    conditional = ConditionalCache() if config.conditional_fetch else None
+    storages = []
+    services = []
+    for vehicle in config.fleet:
+        storage = CachedStatusStorage(
+            FileStatusStorage(
+                vehicle_status_path(config.status_file_path, vehicle.object_id),
+                fsync=config.status_fsync,
+            )
+        )
+        storages.append(storage)
+        services.append(
+            MotorcycleAlertService(
+                ApiMotorcycleDataRepository(
+                    config,
+                    fetcher=fetcher,
+                    object_id=vehicle.object_id,
+                    conditional_cache=conditional,
+                ),
+                storage,
+                notifier,
+                object_id=vehicle.object_id,
+                recipient=vehicle.recipient,
+            )
+        )
+    listener = RecordingListener()
+    use_case = MotorcycleMonitoringUseCase(
+        alert_services=services,
+        check_interval=config.check_interval,
+        max_concurrency=config.max_concurrency,
+        fleet_repository=(
+            ApiMotorcycleDataRepository(
+                config, fetcher=fetcher, conditional_cache=conditional
+            )
+            if config.batched
+            else None
+        ),
+        poll_listener=listener,
+    )
+
+    task = asyncio.create_task(use_case.start_monitoring())
+    await asyncio.sleep(duration)
+    use_case.stop_monitoring()
+    await task
+    await notifier.close()
+    for storage in storages:
+        storage.close()
+    await fetcher.close()
+    return {
+        "polls": len(listener.seconds),
+        "poll_errors": listener.errors,
+        "poll_ms": percentiles(listener.seconds),
+        "telegram": dict(notifier.stats),
+        "conditional": dict(conditional.stats) if conditional else {},
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    """Start the fakes, monitor the fleet and collect the results."""
+    tracker = FakeTracker(
+        args.vehicles,
+        tail_points=args.tail_points,
+        sensors=args.sensors,
+        change_rate=args.change_rate,
+        latency=args.tracker_latency,
+        error_rate=args.tracker_errors,
+        seed=args.seed,
+    )
+    telegram = FakeTelegram(
+        args.telegram_latency, args.telegram_errors, tracker.alerted, args.seed
+    )
+    servers = FakeServers(tracker, telegram)
+    servers.start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            config = build_config(args, servers, workdir)
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            fakes_cpu = servers.cpu_seconds()
+            started = time.perf_counter()
+            result = asyncio.run(monitor(config, args.duration))
+            elapsed = time.perf_counter() - started
+            used = resource.getrusage(resource.RUSAGE_SELF)
+            fakes_cpu = servers.cpu_seconds() - fakes_cpu
+    finally:
+        servers.stop()
+
+    process_cpu = (used.ru_utime - usage.ru_utime) + (used.ru_stime - usage.ru_stime)
+    monitor_cpu = process_cpu - fakes_cpu
+    polls = result["polls"] or 1
+    result.update(
+        {
+            "seconds": elapsed,
+            "polls_per_second": result["polls"] / elapsed,
+            "alert_ms": percentiles(tracker.latencies),
+            "cpu": {
+                "process_s": process_cpu,
+                "fakes_s": fakes_cpu,
+                "monitor_s": monitor_cpu,
+                "monitor_ms_per_poll": monitor_cpu / polls * 1e3,
+            },
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+            "max_rss_mb": used.ru_maxrss
+            / (1024 * 1024 if platform.system() == "Darwin" else 1024),
+            "tracker": dict(tracker.stats),
+            "sink": dict(telegram.stats),
+        }
+    )
+    return {
+        "revision": revision(),
+        "python": platform.python_version(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "parameters": {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("json", "output", "compare", "log_level")
+        },
+        "results": result,
+    }
+
+
+def lookup(results: Dict[str, object], path: str) -> Optional[float]:
+    """Return a nested result such as ``poll_ms.p99``, or None when missing."""
+    value: object = results
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return float(value)
+
+
+def compare(baseline: Dict[str, object], current: Dict[str, object]) -> None:
+    """Print each compared result against a baseline run."""
+    print(f"\nAgainst {baseline.get('revision', 'baseline')}:")
+    print(f"{'metric':<26}{'baseline':>12}{'current':>12}{'change':>10}")
+    for path, higher_is_better in COMPARED.items():
+        before = lookup(baseline["results"], path)
+        after = lookup(current["results"], path)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before if before else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        flag = " !" if worse and abs(change) > 0.1 else ""
+        print(f"{path:<26}{before:>12.2f}{after:>12.2f}{change:>+10.1%}{flag}")
+    if baseline.get("parameters") != current.get("parameters"):
+        print("Parameters differ from the baseline run.")
+
+
+def summarize(report: Dict[str, object]) -> None:
+    """Print the main results."""
+    r = report["results"]
+    print(
+        f"{r['polls']} polls in {r['seconds']:.1f}s: {r['polls_per_second']:.1f} polls/s, "
+        f"{r['poll_errors']} failed"
+    )
+    print(
+        f"poll latency     p50 {r['poll_ms']['p50']:8.1f} ms   "
+        f"p99 {r['poll_ms']['p99']:8.1f} ms"
+    )
+    print(
+        f"poll-to-alert    p50 {r['alert_ms']['p50']:8.1f} ms   "
+        f"p99 {r['alert_ms']['p99']:8.1f} ms   ({r['alert_ms']['samples']} changes)"
+    )
+    cpu = r["cpu"]
+    print(
+        f"CPU monitor {cpu['monitor_s']:.2f}s ({cpu['monitor_ms_per_poll']:.2f} ms/poll), "
+        f"fakes {cpu['fakes_s']:.2f}s; peak RSS {r['max_rss_mb']:.1f} MB"
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print a summary, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds")
+    parser.add_argument("--interval", type=float, default=1, help="Poll seconds")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=0)
+    parser.add_argument("--http-client", default="aiohttp")
+    parser.add_argument("--probe", action="store_true", help="PROBE_FETCH=true")
+    parser.add_argument(
+        "--no-conditional", action="store_true", help="CONDITIONAL_FETCH=false"
+    )
+    parser.add_argument("--fsync", action="store_true", help="STATUS_FSYNC=true")
+    parser.add_argument("--tail-points", type=int, default=100)
+    parser.add_argument("--sensors", type=int, default=30)
+    parser.add_argument(
+        "--change-rate", type=float, default=0.05, help="Polls flipping ignition"
+    )
+    parser.add_argument("--tracker-latency", type=float, default=0.02)
+    parser.add_argument("--tracker-errors", type=float, default=0.0)
+    parser.add_argument("--telegram-latency", type=float, default=0.05)
+    parser.add_argument("--telegram-errors", type=float, default=0.0)
+    parser.add_argument("--telegram-workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="CRITICAL", help="Monitor log level")
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    parser.add_argument("--output", help="Save the JSON results to this file")
+    parser.add_argument("--compare", help="Compare with results saved by --output")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        summarize(report)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(json.load(file), report)
+
+
+if __name__ == "__main__":
+    main()
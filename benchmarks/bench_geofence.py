@@ -0,0 +1,106 @@
+"""Compare geofence lookups through the grid index with a linear scan.
+
+Usage::
+
+    python -m benchmarks.bench_geofence --zones 500 --lookups 100000
+
+Zones are random circles and polygons scattered over a metropolitan area;
+lookups follow a vehicle wandering through it.
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+
+from motorcycle_alert.domain.geofence import CircleZone, PolygonZone, ZoneIndex
+
+CENTER = (-3.1, -60.0)
+SPREAD = 0.3  # degrees, about 33 km
+
+
+def make_zones(count: int, rng: random.Random) -> list:
+    """Build a mix of circles and hexagons."""
+    zones = []
+    for i in range(count):
+        lat = CENTER[0] + rng.uniform(-SPREAD, SPREAD)
+        lng = CENTER[1] + rng.uniform(-SPREAD, SPREAD)
+        if i % 2:
+            zones.append(CircleZone(f"c{i}", lat, lng, rng.uniform(100, 1500)))
+        else:
+            size = rng.uniform(0.002, 0.015)
+            zones.append(
+                PolygonZone(
+                    f"p{i}",
+                    tuple(
+                        (
+                            lat + size * math.sin(k * math.pi / 3),
+                            lng + size * math.cos(k * math.pi / 3),
+                        )
+                        for k in range(6)
+                    ),
+                )
+            )
+    return zones
+
+
+def make_route(count: int, rng: random.Random) -> list:
+    """Build the positions of a vehicle wandering through the area."""
+    lat, lng = CENTER
+    route = []
+    for _ in range(count):
+        lat = min(
+            max(lat + rng.gauss(0, 0.002), CENTER[0] - SPREAD), CENTER[0] + SPREAD
+        )
+        lng = min(
+            max(lng + rng.gauss(0, 0.002), CENTER[1] - SPREAD), CENTER[1] + SPREAD
+        )
+        route.append((lat, lng))
+    return route
+
+
+def main() -> None:
+    """Run the benchmark and print the timings, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--zones", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    zones = make_zones(args.zones, rng)
+    route = make_route(args.lookups, rng)
+    index = ZoneIndex(zones)
+
+    timings = {}
+    started = time.perf_counter()
+    linear = [frozenset(z for z in zones if z.contains(*p)) for p in route[:5000]]
+    timings["linear"] = (time.perf_counter() - started) / len(linear)
+
+    started = time.perf_counter()
+    indexed = [index.zones_at(*p) for p in route]
+    timings["index"] = (time.perf_counter() - started) / len(indexed)
+
+    tracker = index.tracker()
+    started = time.perf_counter()
+    events = sum(len(tracker.update(*p)) for p in route)
+    timings["tracker"] = (time.perf_counter() - started) / len(route)
+
+    assert indexed[: len(linear)] == linear, "index disagrees with linear scan"
+    results = {
+        "zones": args.zones,
+        "cell_size": index.cell_size,
+        "events": events,
+        "us_per_lookup": {name: seconds * 1e6 for name, seconds in timings.items()},
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.zones} zones, cell {index.cell_size:.4f} deg, {events} events")
+    for name, seconds in timings.items():
+        print(f"{name:<8} {seconds * 1e6:>10.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
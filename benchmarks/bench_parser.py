@@ -0,0 +1,103 @@
+"""Compare full JSON decoding with the streaming parser on large payloads.
+
+Usage::
+
+    python -m benchmarks.bench_parser                      # synthetic payload
+    python -m benchmarks.bench_parser recorded1.json ...   # recorded responses
+
+Recorded payloads are raw ``/objects/items?full=true`` response bodies saved to
+disk, e.g. with ``curl ... > recorded.json``.
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.payloads import make_payload
+from motorcycle_alert.infrastructure.api_client import ApiMotorcycleDataRepository
+from motorcycle_alert.infrastructure.config import Config
+from motorcycle_alert.infrastructure.streaming_parser import parse_items
+
+
+def build_repository() -> ApiMotorcycleDataRepository:
+    """Build a repository used only for its response parsing."""
+    os.environ.setdefault("API_COOKIE", "benchmark")
+    os.environ.setdefault("API_CSRF_TOKEN", "benchmark")
+    config = Config(
+        telegram_api_key="benchmark",
+        telegram_user_id="0",
+        api_base_url="http://localhost",
+        object_id="1",
+        check_interval=60,
+        status_file_path="status.txt",
+    )
+    return ApiMotorcycleDataRepository(config)
+
+
+def measure(parse: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Return the best wall time and the peak traced memory of ``parse``."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run(name: str, body: bytes, repeat: int) -> List[Dict[str, object]]:
+    """Benchmark both parsing paths on one response body."""
+    repository = build_repository()
+
+    def full_json():
+        return repository._parse_fleet_response(json.loads(body))
+
+    def streaming():
+        return repository._parse_fleet_response(parse_items(io.BytesIO(body)))
+
+    assert full_json() == streaming(), "parsers disagree"
+    return [
+        {"payload": name, "bytes": len(body), "parser": parser, **measure(fn, repeat)}
+        for parser, fn in (("json", full_json), ("stream", streaming))
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print a table, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("payloads", nargs="*", help="Recorded response bodies")
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--tail-points", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    bodies = {path: open(path, "rb").read() for path in args.payloads}
+    if not bodies:
+        bodies["synthetic"] = make_payload(args.vehicles, args.tail_points)
+
+    results = [
+        row for name, body in bodies.items() for row in run(name, body, args.repeat)
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'payload':<24} {'parser':<7} {'size MB':>8} {'time ms':>9} {'peak MB':>8}")
+    for row in results:
+        print(
+            f"{row['payload'][-24:]:<24} {row['parser']:<7} {row['bytes'] / 1e6:>8.2f} "
+            f"{row['seconds'] * 1e3:>9.1f} {row['peak_bytes'] / 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare bytes and parse time per poll of full fetches and ``full=false`` probes.
+
+A probe only escalates to a full fetch when it shows a possible change or a
+periodic refresh is due, so the expected cost of a poll is the probe plus
+the full fetch weighted by how often it is needed.
+
+Usage::
+
+    python -m benchmarks.bench_probe --vehicles 50 --interval 60 --refresh 600
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from benchmarks.bench_parser import build_repository
+from benchmarks.payloads import make_payload, make_probe_payload
+
+
+def best_time(parse: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time of ``parse`` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print a summary, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--tail-points", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=60, help="Poll seconds")
+    parser.add_argument("--refresh", type=float, default=600, help="Full refresh")
+    parser.add_argument(
+        "--change-rate", type=float, default=0.02, help="Polls showing a change"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    repository = build_repository()
+    full_body = make_payload(args.vehicles, args.tail_points)
+    probe_body = make_probe_payload(args.vehicles)
+    full_seconds = best_time(
+        lambda: repository._parse_fleet_response(json.loads(full_body)), args.repeat
+    )
+    probe_seconds = best_time(
+        lambda: repository._parse_fleet_response(json.loads(probe_body)), args.repeat
+    )
+
+    escalated = min(1.0, args.interval / args.refresh + args.change_rate)
+    probe_bytes = len(probe_body) + escalated * len(full_body)
+    probe_time = probe_seconds + escalated * full_seconds
+    result = {
+        "vehicles": args.vehicles,
+        "escalated": escalated,
+        "full": {"bytes": len(full_body), "parse_ms": full_seconds * 1e3},
+        "probe": {"bytes": len(probe_body), "parse_ms": probe_seconds * 1e3},
+        "per_poll": {
+            "full_bytes": len(full_body),
+            "probed_bytes": probe_bytes,
+            "full_parse_ms": full_seconds * 1e3,
+            "probed_parse_ms": probe_time * 1e3,
+            "bytes_factor": len(full_body) / probe_bytes,
+            "parse_factor": full_seconds / probe_time,
+        },
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    per_poll = result["per_poll"]
+    print(
+        f"{args.vehicles} vehicles, {escalated:.0%} of polls escalated to a full fetch"
+    )
+    print(f"{'mode':<8}{'KB/poll':>10}{'parse ms/poll':>15}")
+    print(
+        f"{'full':<8}{per_poll['full_bytes'] / 1e3:>10.1f}{per_poll['full_parse_ms']:>15.2f}"
+    )
+    print(
+        f"{'probe':<8}{per_poll['probed_bytes'] / 1e3:>10.1f}"
+        f"{per_poll['probed_parse_ms']:>15.2f}"
+    )
+    print(
+        f"{per_poll['bytes_factor']:.1f}x fewer bytes, "
+        f"{per_poll['parse_factor']:.1f}x less parse time"
+    )
+
+
+if __name__ == "__main__":
+    main()
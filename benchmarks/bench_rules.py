@@ -0,0 +1,79 @@
+"""Measure the cost of evaluating alert rules per polled status.
+
+Usage::
+
+    python -m benchmarks.bench_rules --polls 100000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.rules import AlertRule, RuleSet
+
+RULES = [
+    AlertRule("Ignition while blocked", "ignition_on and blocked"),
+    AlertRule("Speeding", "speed > 80", cooldown=600),
+    AlertRule("Towed", "not ignition_on and moved_since_parked > 200"),
+    AlertRule("Power lost", "prev.voltage > 0 and voltage == 0"),
+]
+
+
+def make_polls(count: int) -> list:
+    """Build synthetic statuses of one vehicle."""
+    rng = random.Random(42)
+    return [
+        MotorcycleStatus(
+            icon_color="green",
+            alimentation=rng.choice(("12.4V", "12.1V", "0V")),
+            blocked=rng.random() < 0.05,
+            ignition=rng.choice(("Ligado", "Desligado")),
+            speed=float(rng.randint(0, 110)),
+            stop_duration=303.0,
+            lat=-3.1 + rng.random() * 1e-3,
+            lng=-60.0 - rng.random() * 1e-3,
+        )
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print the timings, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    polls = make_polls(args.polls)
+    started = time.perf_counter()
+    rule_set = RuleSet(RULES)
+    compile_seconds = time.perf_counter() - started
+
+    evaluator = rule_set.evaluator()
+    fired = 0
+    started = time.perf_counter()
+    for status in polls:
+        fired += len(evaluator.evaluate(status))
+    seconds = time.perf_counter() - started
+
+    result = {
+        "rules": len(rule_set),
+        "polls": args.polls,
+        "fired": fired,
+        "compile_ms": compile_seconds * 1e3,
+        "us_per_poll": seconds / args.polls * 1e6,
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"compiled {result['rules']} rules in {result['compile_ms']:.2f} ms")
+    print(
+        f"{result['polls']} polls, {result['fired']} firings: "
+        f"{result['us_per_poll']:.2f} us per poll"
+    )
+
+
+if __name__ == "__main__":
+    main()
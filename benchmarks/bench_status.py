@@ -0,0 +1,144 @@
+"""Compare memory and construction cost of status representations.
+
+Three ways of holding the latest status of every vehicle of a fleet:
+
+* ``dict-dataclass``: the previous representation, a non-slotted dataclass
+  validated in ``__post_init__`` on every construction;
+* ``slots``: today's slotted :class:`MotorcycleStatus`, built unchecked;
+* ``table``: a :class:`FleetTable` of interned columns, one row per vehicle.
+
+Usage::
+
+    python -m benchmarks.bench_status --vehicles 100000
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from motorcycle_alert.domain.fleet import FleetTable
+from motorcycle_alert.domain.models import MotorcycleStatus
+
+
+@dataclass(frozen=True)
+class LegacyStatus:
+    """The status dataclass as it was before it was slotted."""
+
+    icon_color: str
+    alimentation: str
+    blocked: bool
+    ignition: str
+    time: Optional[float] = None
+    stop_duration: Optional[float] = None
+    speed: Optional[float] = None
+    additional_sensors: Optional[Dict[str, Any]] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    object_id: Optional[str] = None
+
+    def __post_init__(self):
+        """Validate like the old model did."""
+        if not self.icon_color:
+            raise ValueError("Icon color cannot be empty")
+        if not isinstance(self.blocked, bool):
+            raise ValueError("Blocked status must be a boolean")
+
+
+def iter_fields(count: int) -> Iterator[Dict[str, Any]]:
+    """Yield the fields of one synthetic status per vehicle, as parsed from JSON."""
+    rng = random.Random(42)
+    return (
+        {
+            "icon_color": rng.choice(("green", "red", "yellow")),
+            "alimentation": f"{rng.uniform(11.5, 13.0):.1f}V",
+            "blocked": rng.random() < 0.05,
+            "ignition": rng.choice(("Ligado", "Desligado")),
+            "time": 1_700_000_000.0 + i,
+            "stop_duration": float(rng.randint(0, 7200)),
+            "speed": float(rng.randint(0, 110)),
+            "additional_sensors": {"gsm": "Excelente", "gps": f"{rng.randint(4, 12)}"},
+            "lat": -3.1 + rng.random(),
+            "lng": -60.0 - rng.random(),
+            "object_id": str(100_000 + i),
+        }
+        for i in range(count)
+    )
+
+
+def _build_objects(cls: Callable[..., Any]) -> Callable[[Iterable[dict]], Any]:
+    """Return a builder keeping one object per vehicle in a dict."""
+
+    def build(rows: Iterable[dict]) -> Any:
+        return {row["object_id"]: cls(**row) for row in rows}
+
+    return build
+
+
+def _build_table(rows: Iterable[dict]) -> FleetTable:
+    """Build a table, materialising each status only while it is stored."""
+    table = FleetTable()
+    for row in rows:
+        table.update(row["object_id"], MotorcycleStatus(**row))
+    return table
+
+
+def measure(build: Callable[[Iterable[dict]], Any], count: int) -> Dict[str, float]:
+    """Return the retained bytes and construction time per status of a builder.
+
+    Memory is measured on freshly generated values, so each representation
+    pays for the strings and sensor dicts it keeps; time is measured on
+    pre-generated values, so it only covers construction.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build(iter_fields(count))
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del held
+    rows = list(iter_fields(count))
+    gc.collect()
+
+    started = time.perf_counter()
+    held = build(rows)
+    seconds = time.perf_counter() - started
+    del held
+    return {
+        "bytes_per_status": retained / count,
+        "us_per_status": seconds / count * 1e6,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print a table, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    builders = {
+        "dict-dataclass": _build_objects(LegacyStatus),
+        "slots": _build_objects(MotorcycleStatus),
+        "table": _build_table,
+    }
+    results = {name: measure(build, args.vehicles) for name, build in builders.items()}
+
+    if args.json:
+        print(json.dumps({"vehicles": args.vehicles, "results": results}, indent=2))
+        return
+    print(f"{args.vehicles} vehicles")
+    print(f"{'representation':<16}{'bytes/status':>14}{'us/status':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<16}{result['bytes_per_status']:>14.0f}"
+            f"{result['us_per_status']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Compare scanning the columnar telemetry log with parsing JSON lines.
+
+Usage::
+
+    python -m benchmarks.bench_telemetry --vehicles 5 --days 365
+
+Both formats hold the same synthetic 1-minute samples. The scan computes the
+top speed and the number of samples with ignition on for every vehicle.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.infrastructure.telemetry import TelemetryLog, TelemetryReader
+
+START = 1_700_000_000.0
+
+
+def write_fleet(directory: str, vehicles: int, samples: int) -> str:
+    """Write the same samples as a telemetry log and as JSON lines."""
+    clock = [START]
+    log = TelemetryLog(
+        os.path.join(directory, "telemetry"), flush_samples=4096, clock=lambda: clock[0]
+    )
+    jsonl_path = os.path.join(directory, "telemetry.jsonl")
+    rng = random.Random(42)
+    with open(jsonl_path, "w", encoding="utf-8") as jsonl:
+        for vehicle in range(vehicles):
+            object_id = str(1000 + vehicle)
+            for i in range(samples):
+                clock[0] = START + i * 60
+                speed = rng.choice((0, 0, 0, 35, 60))
+                status = MotorcycleStatus(
+                    icon_color="green" if speed else "yellow",
+                    alimentation="12V",
+                    blocked=False,
+                    ignition="Ligado" if speed else "Desligado",
+                    speed=float(speed),
+                    lat=-3.1 + i * 1e-6,
+                    lng=-60.0 - i * 1e-6,
+                )
+                log.append(object_id, status)
+                jsonl.write(
+                    json.dumps(
+                        {
+                            "object_id": object_id,
+                            "time": clock[0],
+                            "lat": status.lat,
+                            "lng": status.lng,
+                            "speed": speed,
+                            "ignition": status.ignition,
+                            "blocked": status.blocked,
+                        }
+                    )
+                    + "\n"
+                )
+    log.close()
+    return jsonl_path
+
+
+def scan_telemetry(directory: str) -> Dict[str, tuple]:
+    """Aggregate every vehicle from the memory-mapped columns."""
+    reader = TelemetryReader(os.path.join(directory, "telemetry"))
+    results = {}
+    for object_id in reader.vehicles():
+        columns = reader.read(object_id, columns=["speed", "ignition"])
+        results[object_id] = (
+            float(columns["speed"].max()),
+            int(columns["ignition"].sum()),
+        )
+    return results
+
+
+def scan_jsonl(path: str) -> Dict[str, tuple]:
+    """Aggregate every vehicle by decoding each JSON line."""
+    top: Dict[str, float] = {}
+    moving: Dict[str, int] = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            sample = json.loads(line)
+            object_id = sample["object_id"]
+            top[object_id] = max(top.get(object_id, -math.inf), sample["speed"])
+            moving[object_id] = moving.get(object_id, 0) + (
+                sample["ignition"] == "Ligado"
+            )
+    return {object_id: (float(top[object_id]), moving[object_id]) for object_id in top}
+
+
+def main() -> None:
+    """Run the benchmark and print the timings, or JSON with ``--json``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    args = parser.parse_args()
+
+    samples = args.days * 24 * 60
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = write_fleet(directory, args.vehicles, samples)
+        timings = {}
+        for name, scan, target in (
+            ("telemetry", scan_telemetry, directory),
+            ("jsonl", scan_jsonl, jsonl_path),
+        ):
+            started = time.perf_counter()
+            timings[name] = (scan(target), time.perf_counter() - started)
+
+    assert timings["telemetry"][0] == timings["jsonl"][0], "scans disagree"
+    results = [
+        {
+            "format": name,
+            "vehicles": args.vehicles,
+            "samples": samples * args.vehicles,
+            "seconds": seconds,
+        }
+        for name, (_, seconds) in timings.items()
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'format':<10} {'samples':>10} {'time ms':>10}")
+    for row in results:
+        print(f"{row['format']:<10} {row['samples']:>10} {row['seconds'] * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
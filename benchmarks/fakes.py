@@ -0,0 +1,217 @@
+"""In-process stand-ins for the tracker API and the Telegram Bot API.
+
+Both servers run on their own event loop in a background thread, so the
+monitor under test keeps its loop to itself. Each answer can be delayed
+and a share of them can fail with ``500``. Vehicles flip their ignition at
+random, and the time a flip is first served is matched against the
+Telegram message that reports it, which gives the poll-to-alert latency.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from benchmarks.payloads import PROBE_KEYS, make_item
+
+IGNITION_SENSOR = 1
+IGNITION_VALUES = ("Desligado", "Ligado")
+
+
+def chat_id(object_id: str) -> str:
+    """Return the Telegram chat the alerts of a vehicle are routed to."""
+    return f"chat-{object_id}"
+
+
+class FakeTracker:
+    """Serves ``/objects/items`` for a synthetic fleet.
+
+    Each served vehicle flips its ignition with probability ``change_rate``,
+    so the monitor has changes to alert on. ``stats`` counts ``requests``,
+    ``errors``, served ``items``, ``changes`` and response ``bytes``.
+    """
+
+    def __init__(
+        self,
+        vehicles: int,
+        tail_points: int = 100,
+        sensors: int = 30,
+        change_rate: float = 0.05,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """Initialize the fleet with vehicle IDs ``1..vehicles``, all parked."""
+        self.tail_points = tail_points
+        self.sensors = sensors
+        self.change_rate = change_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._ignition: Dict[str, int] = {str(i): 0 for i in range(1, vehicles + 1)}
+        # Serialized items per (vehicle, ignition, full) and the times
+        # changes were first served, waiting for their alert.
+        self._items: Dict[Tuple[str, int, bool], bytes] = {}
+        self._unalerted: Dict[str, List[float]] = {}
+        self.latencies: List[float] = []
+        self.stats: Counter = Counter()
+
+    @property
+    def object_ids(self) -> List[str]:
+        """Return the IDs of the fleet."""
+        return list(self._ignition)
+
+    def _item(self, object_id: str, full: bool) -> bytes:
+        """Return the serialized item of a vehicle in its current state."""
+        key = (object_id, self._ignition[object_id], full)
+        body = self._items.get(key)
+        if body is None:
+            item = make_item(
+                int(object_id), self.tail_points if full else 0, self.sensors
+            )
+            item["sensors"][IGNITION_SENSOR]["value"] = IGNITION_VALUES[key[1]]
+            if not full:
+                item = {name: item[name] for name in PROBE_KEYS}
+            body = self._items[key] = json.dumps(item).encode()
+        return body
+
+    def alerted(self, chat: str, received_at: float) -> None:
+        """Match a delivered alert with the changes it reports."""
+        object_id = chat.removeprefix("chat-")
+        for served_at in self._unalerted.pop(object_id, ()):
+            self.latencies.append(received_at - served_at)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer an items request, flipping some ignitions first."""
+        self.stats["requests"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.Response(status=500, text="fake tracker error")
+
+        ids = request.query.get("id")
+        object_ids = ids.split(",") if ids else self.object_ids
+        full = request.query.get("full", "true") != "false"
+        now = time.perf_counter()
+        items = []
+        for object_id in object_ids:
+            if object_id not in self._ignition:
+                continue
+            if self._rng.random() < self.change_rate:
+                self._ignition[object_id] ^= 1
+                self._unalerted.setdefault(object_id, []).append(now)
+                self.stats["changes"] += 1
+            items.append(self._item(object_id, full))
+        body = b'{"data": [' + b", ".join(items) + b"]}"
+        self.stats["items"] += len(items)
+        self.stats["bytes"] += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+
+class FakeTelegram:
+    """Accepts ``sendMessage`` calls of the Bot API.
+
+    ``stats`` counts ``requests``, ``errors`` and delivered ``messages``.
+    ``on_message`` is called with the chat and arrival time of each one.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        on_message: Optional[Callable[[str, float], None]] = None,
+        seed: int = 0,
+    ):
+        """Initialize the sink."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.on_message = on_message
+        self._rng = random.Random(seed)
+        self.stats: Counter = Counter()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer a ``sendMessage`` call."""
+        self.stats["requests"] += 1
+        payload = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response(
+                {"ok": False, "error_code": 500, "description": "fake error"},
+                status=500,
+            )
+        self.stats["messages"] += 1
+        if self.on_message is not None:
+            self.on_message(str(payload["chat_id"]), time.perf_counter())
+        return web.json_response(
+            {"ok": True, "result": {"message_id": self.stats["messages"]}}
+        )
+
+
+class FakeServers:
+    """Runs a :class:`FakeTracker` and a :class:`FakeTelegram` in a thread."""
+
+    def __init__(self, tracker: FakeTracker, telegram: FakeTelegram):
+        """Initialize the servers; they listen once :meth:`start` returns."""
+        self.tracker = tracker
+        self.telegram = telegram
+        self.tracker_url = ""
+        self.telegram_url = ""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fake-servers", daemon=True
+        )
+        self._runners: List[web.AppRunner] = []
+
+    async def _serve(self, method: str, path: str, handler) -> str:
+        """Serve one handler on a free local port and return its base URL."""
+        app = web.Application()
+        app.router.add_route(method, path, handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        self._runners.append(runner)
+        return f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    async def _start(self) -> None:
+        self.tracker_url = await self._serve(
+            "GET", "/objects/items", self.tracker.handle
+        )
+        self.telegram_url = await self._serve(
+            "POST", "/bot{token}/sendMessage", self.telegram.handle
+        )
+
+    async def _stop(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+
+    def _call(self, coroutine):
+        """Run a coroutine on the servers' loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def start(self) -> None:
+        """Start the thread and both servers."""
+        self._thread.start()
+        self._call(self._start())
+
+    def cpu_seconds(self) -> float:
+        """Return the CPU time used so far by the servers' thread."""
+
+        async def thread_time() -> float:
+            return time.thread_time()
+
+        return self._call(thread_time())
+
+    def stop(self) -> None:
+        """Stop both servers and the thread."""
+        self._call(self._stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
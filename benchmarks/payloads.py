@@ -0,0 +1,89 @@
+"""Synthetic ``/objects/items?full=true`` payloads for benchmarks."""
+
+import json
+import random
+from typing import Any, Dict
+
+
+def make_item(
+    object_id: int, tail_points: int = 500, sensors: int = 30
+) -> Dict[str, Any]:
+    """Build one large ``full=true`` item shaped like the tracker's response."""
+    rng = random.Random(object_id)
+    lat, lng = -3.1 + rng.random() / 10, -60.0 + rng.random() / 10
+    return {
+        "id": object_id,
+        "name": f"Motorcycle {object_id}",
+        "icon_color": rng.choice(["green", "yellow", "red", "black"]),
+        "time": "17-10-2026 12:00:00",
+        "stop_duration": "1h 5min 3s",
+        "speed": rng.randint(0, 90),
+        "lat": lat,
+        "lng": lng,
+        "course": rng.randint(0, 359),
+        "altitude": rng.randint(0, 120),
+        "sensors": [
+            {"name": "Alimentacao", "value": "Ligado", "type": "acc", "id": 1},
+            {"name": "Ignicao", "value": "Desligado", "type": "ignition", "id": 2},
+            {"name": "Bloqueio", "value": "Desligado", "type": "engine", "id": 3},
+        ]
+        + [
+            {
+                "name": f"Sensor {i}",
+                "value": str(rng.random()),
+                "type": "numerical",
+                "id": 10 + i,
+                "show_in_popup": True,
+                "unit_of_measurement": "V",
+            }
+            for i in range(sensors)
+        ],
+        "tail": [
+            {
+                "lat": lat + i / 1e5,
+                "lng": lng + i / 1e5,
+                "time": "17-10-2026 11:59:00",
+                "speed": rng.randint(0, 90),
+                "other": {"sat": 12, "hdop": 0.9, "power": 12.4},
+            }
+            for i in range(tail_points)
+        ],
+        "device_data": {
+            "imei": str(rng.randint(10**14, 10**15)),
+            "protocol": "gt06",
+            "settings": {f"opt_{i}": rng.random() for i in range(50)},
+        },
+    }
+
+
+def make_payload(vehicles: int = 50, tail_points: int = 500) -> bytes:
+    """Build a whole ``/objects/items`` response body for ``vehicles`` items."""
+    data = [make_item(i, tail_points) for i in range(1, vehicles + 1)]
+    return json.dumps({"data": data}).encode()
+
+
+# Keys of an item kept in the synthetic ``full=false`` payload.
+PROBE_KEYS = (
+    "id",
+    "name",
+    "icon_color",
+    "time",
+    "stop_duration",
+    "speed",
+    "lat",
+    "lng",
+    "sensors",
+)
+
+
+def make_probe_payload(vehicles: int = 50) -> bytes:
+    """Build a ``full=false`` response body: the items without tail or device data.
+
+    The exact ``full=false`` shape depends on the tracker; this assumes it keeps
+    the top-level fields and the sensor list, which is what probes read.
+    """
+    data = []
+    for i in range(1, vehicles + 1):
+        item = make_item(i, tail_points=0)
+        data.append({key: item[key] for key in PROBE_KEYS})
+    return json.dumps({"data": data}).encode()
@@ -0,0 +1,126 @@
+"""Polling policies deciding how long to wait before the next status check."""
+
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.values import is_on
+
+DECISION_FIXED = "fixed"
+DECISION_MOVING = "moving"
+DECISION_IDLE = "idle"
+DECISION_PARKED = "parked"
+DECISION_BACKOFF = "backoff"
+
+
+class PollingPolicy(ABC):
+    """Decides the delay before the next poll of a vehicle.
+
+    ``decisions`` counts how often each kind of decision was taken, so
+    schedule behaviour can be inspected and exported as metrics.
+    ``status_fields`` names the status fields the policy reads, so callers
+    keeping statuses in columns only read those; None means every field.
+    """
+
+    status_fields: Optional[Tuple[str, ...]] = None
+
+    def __init__(self):
+        """Initialize the decision counters."""
+        self.decisions: Counter = Counter()
+
+    @abstractmethod
+    def next_interval(
+        self, status: Optional[MotorcycleStatus], consecutive_errors: int
+    ) -> float:
+        """Return the seconds to wait before polling again.
+
+        Args:
+            status: Last successfully fetched status, or None if unknown.
+            consecutive_errors: Failed polls in a row since the last success.
+        """
+        pass
+
+
+class FixedPollingPolicy(PollingPolicy):
+    """Polls at a constant interval, whatever the vehicle is doing."""
+
+    status_fields: Optional[Tuple[str, ...]] = ()
+
+    def __init__(self, interval: float):
+        """Initialize the policy with the constant interval in seconds."""
+        super().__init__()
+        self._interval = interval
+
+    def next_interval(
+        self, status: Optional[MotorcycleStatus], consecutive_errors: int
+    ) -> float:
+        """Return the constant interval."""
+        self.decisions[DECISION_FIXED] += 1
+        return self._interval
+
+
+@dataclass(frozen=True)
+class AdaptiveIntervals:
+    """Intervals, in seconds, used by :class:`AdaptivePollingPolicy`."""
+
+    moving: float = 15.0
+    idle: float = 60.0
+    parked: float = 600.0
+    parked_after: float = 1800.0
+    max_backoff: float = 900.0
+    jitter: float = 0.1
+
+
+class AdaptivePollingPolicy(PollingPolicy):
+    """Polls fast while riding, slowly when parked and backs off on errors.
+
+    - Ignition on or non-zero speed: ``moving`` interval.
+    - Stopped for at least ``parked_after`` seconds: ``parked`` interval.
+    - Otherwise, or when the status is unknown: ``idle`` interval.
+    - After failures: ``idle * 2 ** (errors - 1)``, capped at ``max_backoff``.
+
+    Every delay is spread by ``±jitter`` (a fraction) so vehicles sharing a
+    state do not poll in lockstep.
+    """
+
+    status_fields: Optional[Tuple[str, ...]] = ("ignition", "speed", "stop_duration")
+
+    def __init__(
+        self,
+        intervals: AdaptiveIntervals,
+        rng: Callable[[], float] = random.random,
+    ):
+        """Initialize the policy.
+
+        Args:
+            intervals: Interval settings.
+            rng: Source of uniform numbers in [0, 1), replaceable in tests.
+        """
+        super().__init__()
+        self._intervals = intervals
+        self._rng = rng
+
+    def next_interval(
+        self, status: Optional[MotorcycleStatus], consecutive_errors: int
+    ) -> float:
+        """Return the state-dependent interval, with jitter."""
+        intervals = self._intervals
+        if consecutive_errors > 0:
+            decision = DECISION_BACKOFF
+            exponent = min(consecutive_errors - 1, 32)
+            interval = min(intervals.max_backoff, intervals.idle * 2**exponent)
+        elif status is None:
+            decision, interval = DECISION_IDLE, intervals.idle
+        elif is_on(status.ignition) or (status.speed or 0) > 0:
+            decision, interval = DECISION_MOVING, intervals.moving
+        elif (status.stop_duration or 0) >= intervals.parked_after:
+            decision, interval = DECISION_PARKED, intervals.parked
+        else:
+            decision, interval = DECISION_IDLE, intervals.idle
+
+        self.decisions[decision] += 1
+        spread = intervals.jitter * (2 * self._rng() - 1)
+        return max(0.0, interval * (1 + spread))
@@ -0,0 +1,181 @@
+"""Deadline-based scheduler for many independent polling jobs."""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+import zlib
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A job polls once and returns the seconds until its next run.
+Job = Callable[[], Awaitable[float]]
+
+
+class PollScheduler:
+    """Fires jobs on fixed deadlines kept in a min-heap.
+
+    A job's next deadline is derived from its previous *deadline*, not from
+    the time it finished, so request latency does not accumulate as drift.
+    When a run overruns one or more periods, the missed deadlines are
+    skipped instead of fired in a burst. Adding, rescheduling and firing a
+    job costs O(log n); a wake-up only touches jobs that are due.
+
+    ``stats`` counts ``fired`` runs, ``missed`` deadlines and ``failed`` jobs.
+    """
+
+    def __init__(
+        self,
+        retry_delay: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty scheduler.
+
+        Args:
+            retry_delay: Seconds before re-running a job that raised.
+            clock: Monotonic time source, replaceable in tests.
+        """
+        self._retry_delay = retry_delay
+        self._clock = clock
+        self._heap: List[Tuple[float, int, int, Hashable]] = []
+        self._jobs: Dict[Hashable, Job] = {}
+        self._generation: Dict[Hashable, int] = {}
+        # Queued deadline of each job; absent while the job is running.
+        self._deadlines: Dict[Hashable, float] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._counter = 0
+        self._generations = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._running = False
+        self.stats: Counter = Counter()
+
+    def __len__(self) -> int:
+        """Return the number of scheduled jobs."""
+        return len(self._jobs)
+
+    @staticmethod
+    def spread_offset(key: Hashable, interval: float) -> float:
+        """Return a stable start offset in ``[0, interval)`` derived from ``key``.
+
+        Jobs added together get different phases, avoiding bursts of
+        simultaneous requests against the tracker API.
+        """
+        fraction = zlib.crc32(str(key).encode()) / 2**32
+        return fraction * interval
+
+    def add(self, key: Hashable, job: Job, first_delay: float = 0.0) -> None:
+        """Schedule ``job`` under ``key``, replacing any job with the same key.
+
+        Args:
+            key: Unique job identifier, e.g. a vehicle.
+            job: Coroutine function polling once and returning the next interval.
+            first_delay: Seconds until the first run.
+        """
+        self._jobs[key] = job
+        self._generation[key] = self._next_generation()
+        self._push(self._clock() + first_delay, key)
+
+    def remove(self, key: Hashable) -> None:
+        """Unschedule ``key``; a run already in flight is not interrupted."""
+        self._jobs.pop(key, None)
+        self._generation.pop(key, None)
+        self._deadlines.pop(key, None)
+
+    def reschedule(self, key: Hashable, delay: float) -> None:
+        """Bring the next run of ``key`` forward to at most ``delay`` from now.
+
+        A job whose run is in flight is left alone: its next deadline is
+        chosen when the run finishes, so a job never runs twice at once.
+        """
+        deadline = self._deadlines.get(key)
+        target = self._clock() + delay
+        if deadline is None or deadline <= target:
+            return
+        self._generation[key] = self._next_generation()
+        self._push(target, key)
+
+    def _next_generation(self) -> int:
+        """Return a generation no job has used, so stale entries never match.
+
+        Generations are drawn from one counter for every key: a job removed
+        and added again must not revive the heap entries of its former self.
+        """
+        self._generations += 1
+        return self._generations
+
+    def _push(self, deadline: float, key: Hashable) -> None:
+        """Insert a deadline tagged with the job's current generation."""
+        self._counter += 1
+        self._deadlines[key] = deadline
+        heapq.heappush(
+            self._heap, (deadline, self._generation[key], self._counter, key)
+        )
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """Fire due jobs until :meth:`stop` is called, then await in-flight runs."""
+        self._running = True
+        self._wake = asyncio.Event()
+        try:
+            while self._running:
+                self._fire_due()
+                await self._sleep_until_next()
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Stop firing jobs."""
+        self._running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    def _fire_due(self) -> None:
+        """Start every job whose deadline has passed."""
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, generation, _, key = heapq.heappop(self._heap)
+            if self._generation.get(key) != generation:
+                continue  # removed or replaced since it was queued
+            del self._deadlines[key]
+            task = asyncio.create_task(self._run_job(key, generation, deadline))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _sleep_until_next(self) -> None:
+        """Sleep until the earliest deadline or until woken by add/stop."""
+        timeout = None
+        if self._heap:
+            timeout = max(0.0, self._heap[0][0] - self._clock())
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run_job(self, key: Hashable, generation: int, deadline: float) -> None:
+        """Run one job and queue its next deadline."""
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        self.stats["fired"] += 1
+        try:
+            interval = await job()
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Scheduled job {key!r} failed: {e}")
+            deadline, interval = self._clock(), self._retry_delay
+        if self._generation.get(key) != generation or not self._running:
+            return
+
+        next_deadline = deadline + interval
+        now = self._clock()
+        if next_deadline <= now and interval > 0:
+            missed = math.floor((now - next_deadline) / interval) + 1
+            self.stats["missed"] += missed
+            next_deadline += missed * interval
+        self._push(next_deadline, key)
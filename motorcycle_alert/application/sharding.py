@@ -0,0 +1,84 @@
+"""Consistent-hash assignment of vehicles to worker shards."""
+
+import hashlib
+from bisect import bisect, insort
+from typing import Dict, Iterable, List, Tuple
+
+
+def _hash(key: str) -> int:
+    """Return a hash of ``key`` that is stable across processes and runs."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Maps keys such as object IDs to nodes such as worker names.
+
+    Each node owns ``replicas`` points on a ring of hashes, and a key belongs
+    to the node of the first point at or after its own hash. Removing a node
+    only moves the keys it owned; adding one only takes keys from the others,
+    about ``1 / len(nodes)`` of them.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        """Initialize the ring.
+
+        Args:
+            nodes: Initial nodes.
+            replicas: Points per node; more points spread keys more evenly.
+
+        Raises:
+            ValueError: If ``replicas`` is not positive.
+        """
+        if replicas < 1:
+            raise ValueError("A hash ring needs at least 1 replica per node")
+        self._replicas = replicas
+        self._points: List[Tuple[int, str]] = []
+        self._nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Return the nodes in the order they were added."""
+        return list(self._nodes)
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        """Return whether ``node`` is on the ring."""
+        return node in self._nodes
+
+    def add(self, node: str) -> None:
+        """Place ``node`` on the ring; adding a present node does nothing."""
+        if node in self._nodes:
+            return
+        self._nodes.append(node)
+        for replica in range(self._replicas):
+            insort(self._points, (_hash(f"{node}#{replica}"), node))
+
+    def remove(self, node: str) -> None:
+        """Take ``node`` off the ring; its keys move to the next nodes."""
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        self._points = [point for point in self._points if point[1] != node]
+
+    def node_for(self, key: str) -> str:
+        """Return the node owning ``key``.
+
+        Raises:
+            LookupError: If the ring has no nodes.
+        """
+        if not self._points:
+            raise LookupError("The hash ring has no nodes")
+        index = bisect(self._points, (_hash(key), ""))
+        return self._points[index % len(self._points)][1]
+
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Group ``keys`` by owning node; every node is listed, maybe empty."""
+        shards: Dict[str, List[str]] = {node: [] for node in self._nodes}
+        for key in keys:
+            shards[self.node_for(key)].append(key)
+        return shards
@@ -1,9 +1,18 @@
 """Application use cases for motorcycle alert system."""
 
 import asyncio
+import functools
 import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
 
+from motorcycle_alert.application.polling import FixedPollingPolicy, PollingPolicy
+from motorcycle_alert.application.scheduler import PollScheduler
+from motorcycle_alert.domain.fleet import FleetTable
+from motorcycle_alert.domain.models import MotorcycleStatus
 from motorcycle_alert.domain.services import (
+    FleetDataRepository,
     MotorcycleAlertService,
     MotorcycleDataRepository,
     NotificationService,
@@ -13,38 +22,352 @@ from motorcycle_alert.domain.services import (
 logger = logging.getLogger(__name__)
 
 
+class PollListener(ABC):
+    """Observer of the outcome of every vehicle poll, e.g. to export metrics."""
+
+    @abstractmethod
+    def poll_finished(
+        self, object_id: Optional[str], seconds: float, error: Optional[BaseException]
+    ) -> None:
+        """Handle a finished poll.
+
+        Args:
+            object_id: Vehicle polled.
+            seconds: Time the poll took.
+            error: Why the poll failed, None when it succeeded.
+        """
+        pass
+
+
 class MotorcycleMonitoringUseCase:
-    """Use case for monitoring motorcycle status."""
+    """Use case for monitoring the status of one or many motorcycles."""
 
     def __init__(
         self,
-        data_repository: MotorcycleDataRepository,
-        status_storage: StatusStorage,
-        notification_service: NotificationService,
-        check_interval: int = 60,
+        data_repository: Optional[MotorcycleDataRepository] = None,
+        status_storage: Optional[StatusStorage] = None,
+        notification_service: Optional[NotificationService] = None,
+        check_interval: float = 60,
+        alert_services: Optional[Sequence[MotorcycleAlertService]] = None,
+        max_concurrency: int = 10,
+        fleet_repository: Optional[FleetDataRepository] = None,
+        fetch_all_objects: bool = False,
+        polling_policy: Optional[PollingPolicy] = None,
+        poll_listener: Optional[PollListener] = None,
     ):
-        """Initialize the monitoring use case."""
-        self._alert_service = MotorcycleAlertService(
-            data_repository, status_storage, notification_service
-        )
+        """Initialize the monitoring use case.
+
+        Either pass ``data_repository``, ``status_storage`` and
+        ``notification_service`` to watch a single vehicle, or pass one
+        ``alert_services`` entry per vehicle to watch a fleet.
+
+        Args:
+            data_repository: Source of status for a single vehicle.
+            status_storage: Last-status storage for a single vehicle.
+            notification_service: Alert channel for a single vehicle.
+            check_interval: Seconds between polls when no polling policy is set.
+            alert_services: Per-vehicle alert services, each holding its own
+                repository, last-status storage and alert routing.
+            max_concurrency: Maximum number of vehicles polled at once.
+            fleet_repository: When given, each cycle fetches every vehicle
+                through batched requests instead of one request per vehicle.
+            fetch_all_objects: Ask the fleet repository for the whole account
+                listing rather than the monitored IDs.
+            polling_policy: Chooses the delay before each vehicle's next poll;
+                defaults to a fixed ``check_interval``. First polls are
+                staggered over ``check_interval`` in any case.
+            poll_listener: Told the latency and outcome of every poll.
+
+        Raises:
+            ValueError: If neither a fleet nor a single vehicle is configured.
+        """
+        if alert_services is None:
+            if not (data_repository and status_storage and notification_service):
+                raise ValueError(
+                    "Provide alert_services or a repository, storage and notifier"
+                )
+            alert_services = [
+                MotorcycleAlertService(
+                    data_repository, status_storage, notification_service
+                )
+            ]
+        self._alert_services: List[MotorcycleAlertService] = list(alert_services)
+        self._max_concurrency = max_concurrency
+        self._fleet_repository = fleet_repository
+        self._fetch_all_objects = fetch_all_objects
         self._check_interval = check_interval
+        self._polling_policy = polling_policy or FixedPollingPolicy(check_interval)
+        self._poll_listener = poll_listener
+        # Latest polled status per vehicle, in a compact column table.
+        self._last_statuses: FleetTable[MotorcycleAlertService] = FleetTable()
+        self._errors: Dict[MotorcycleAlertService, int] = {}
+        self._fleet_errors = 0
+        self._scheduler: Optional[PollScheduler] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
         self._running = False
 
     async def start_monitoring(self) -> None:
-        """Start continuous monitoring of motorcycle status."""
-        logger.info("Starting motorcycle monitoring...")
+        """Start continuous monitoring of motorcycle status.
+
+        Every vehicle (or the whole fleet, in batched mode) is a job of a
+        deadline scheduler. First polls are staggered over ``check_interval``
+        and each following deadline is chosen by the polling policy.
+        """
+        logger.info(
+            f"Starting motorcycle monitoring for {len(self._alert_services)} vehicle(s)..."
+        )
         self._running = True
+        self._scheduler = PollScheduler(retry_delay=self._check_interval)
+
+        if self._fleet_repository is not None:
+            self._scheduler.add("fleet", self._poll_fleet_batched)
+        else:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            count = len(self._alert_services)
+            for index, service in enumerate(self._alert_services):
+                self._schedule(service, self._check_interval * index / count)
+
+        await self._scheduler.run()
+
+    def _schedule(self, service: MotorcycleAlertService, first_delay: float) -> None:
+        """Add a vehicle's polling job to the scheduler."""
+        self._scheduler.add(
+            service,
+            functools.partial(self._poll_vehicle, service, self._semaphore),
+            first_delay=first_delay,
+        )
+
+    def reconfigure(
+        self,
+        alert_services: Optional[Sequence[MotorcycleAlertService]] = None,
+        check_interval: Optional[float] = None,
+        polling_policy: Optional[PollingPolicy] = None,
+    ) -> None:
+        """Swap settings into the running monitor without interrupting polls.
+
+        Everything is swapped in one step on the event loop, so a poll sees
+        either the old or the new settings. Polls in flight finish, and each
+        vehicle's next delay comes from the new policy; queued polls due
+        later than it allows are brought forward. Vehicles no longer listed
+        are not polled again; new ones are polled within ``check_interval``,
+        at a stable offset.
+
+        Args:
+            alert_services: The vehicles to monitor from now on; services
+                already monitored keep their state.
+            check_interval: New base interval.
+            polling_policy: New polling policy.
+        """
+        if check_interval is not None:
+            self._check_interval = check_interval
+        if alert_services is not None:
+            self._replace_alert_services(alert_services)
+        if polling_policy is not None:
+            self._polling_policy = polling_policy
+            if self._scheduler is not None:
+                self._bring_deadlines_forward()
+
+    def _bring_deadlines_forward(self) -> None:
+        """Move queued polls due later than the polling policy now allows.
+
+        Moved polls are spread over the new interval rather than bunched.
+        """
+        if self._fleet_repository is not None:
+            if self._alert_services:
+                self._scheduler.reschedule(
+                    "fleet", min(map(self._next_interval, self._alert_services))
+                )
+            return
+        for service in self._alert_services:
+            self._scheduler.reschedule(
+                service,
+                PollScheduler.spread_offset(
+                    service.object_id, self._next_interval(service)
+                ),
+            )
+
+    def _replace_alert_services(
+        self, alert_services: Sequence[MotorcycleAlertService]
+    ) -> None:
+        """Monitor ``alert_services``; services kept from before keep their state."""
+        previous = set(self._alert_services)
+        # Replaced, not mutated: a batched cycle in flight keeps its list.
+        self._alert_services = list(alert_services)
+        current = set(self._alert_services)
+        per_vehicle = self._scheduler is not None and self._fleet_repository is None
+        for service in previous - current:
+            self._last_statuses.discard(service)
+            self._errors.pop(service, None)
+            if per_vehicle:
+                self._scheduler.remove(service)
+        if per_vehicle:
+            for service in self._alert_services:
+                if service not in previous:
+                    self._schedule(
+                        service,
+                        PollScheduler.spread_offset(
+                            service.object_id, self._check_interval
+                        ),
+                    )
+        logger.info(
+            f"Monitoring {len(self._alert_services)} vehicle(s): "
+            f"{len(current - previous)} added, {len(previous - current)} removed"
+        )
 
-        while self._running:
+    @property
+    def scheduler(self) -> Optional[PollScheduler]:
+        """Return the scheduler of the running monitor, exposing its ``stats``."""
+        return self._scheduler
+
+    @property
+    def polling_policy(self) -> PollingPolicy:
+        """Return the current polling policy, exposing its ``decisions``."""
+        return self._polling_policy
+
+    @property
+    def last_statuses(self) -> FleetTable[MotorcycleAlertService]:
+        """Return the latest polled status of every vehicle, keyed by its service."""
+        return self._last_statuses
+
+    async def check_all(self) -> None:
+        """Poll every vehicle once, at most ``max_concurrency`` at a time."""
+        if self._fleet_repository is not None:
+            await self._check_fleet_batched()
+            return
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        await asyncio.gather(
+            *(
+                self._check_vehicle(service, semaphore)
+                for service in self._alert_services
+            )
+        )
+
+    async def _poll_vehicle(
+        self, service: MotorcycleAlertService, semaphore: asyncio.Semaphore
+    ) -> float:
+        """Scheduler job: poll one vehicle and return its next interval."""
+        await self._check_vehicle(service, semaphore)
+        return self._next_interval(service)
+
+    async def _poll_fleet_batched(self) -> float:
+        """Scheduler job: poll the fleet and return the shortest next interval."""
+        if await self._check_fleet_batched():
+            return min(self._next_interval(service) for service in self._alert_services)
+        return self._polling_policy.next_interval(None, self._fleet_errors)
+
+    def _next_interval(self, service: MotorcycleAlertService) -> float:
+        """Ask the polling policy for a vehicle's next delay."""
+        policy = self._polling_policy
+        interval = policy.next_interval(
+            self._last_statuses.get(service, policy.status_fields),
+            self._errors.get(service, 0),
+        )
+        logger.debug(
+            "Next poll of vehicle %s in %.1fs",
+            service.object_id,
+            interval,
+            extra={"object_id": service.object_id},
+        )
+        return interval
+
+    async def _check_vehicle(
+        self, service: MotorcycleAlertService, semaphore: asyncio.Semaphore
+    ) -> None:
+        """Poll one vehicle, logging instead of propagating its errors."""
+        async with semaphore:
+            started = time.perf_counter()
             try:
-                await self._alert_service.check_and_alert()
-                logger.debug("Status check completed successfully")
+                status = await service.check_and_alert()
             except Exception as e:
-                logger.error(f"Error during status check: {e}")
+                self._record_failure(service, e, time.perf_counter() - started)
+                logger.error(
+                    f"Error during status check of vehicle {service.object_id}: {e}"
+                )
+                return
+        self._record_success(service, status, time.perf_counter() - started)
+        logger.debug(
+            "Status check completed for vehicle %s",
+            service.object_id,
+            extra={"object_id": service.object_id},
+        )
+
+    async def _check_fleet_batched(self) -> bool:
+        """Fetch the fleet in batched requests and evaluate every vehicle.
+
+        Returns:
+            Whether the batched fetch itself succeeded.
+        """
+        object_ids = None
+        if not self._fetch_all_objects:
+            object_ids = [service.object_id for service in self._alert_services]
 
-            await asyncio.sleep(self._check_interval)
+        started = time.perf_counter()
+        try:
+            statuses = await self._fleet_repository.get_fleet_status(object_ids)
+        except Exception as e:
+            self._fleet_errors += 1
+            logger.error(f"Error during batched fleet status check: {e}")
+            elapsed = time.perf_counter() - started
+            for service in self._alert_services:
+                self._notify_listener(service, elapsed, e)
+            return False
+        self._fleet_errors = 0
+
+        for service in self._alert_services:
+            status = statuses.get(service.object_id)
+            if status is None:
+                logger.warning(
+                    f"Vehicle {service.object_id} missing from fleet response"
+                )
+                continue
+            started = time.perf_counter()
+            try:
+                await service.check_and_alert(status)
+            except Exception as e:
+                self._record_failure(service, e, time.perf_counter() - started)
+                logger.error(
+                    f"Error during status check of vehicle {service.object_id}: {e}"
+                )
+                continue
+            self._record_success(service, status, time.perf_counter() - started)
+        return True
+
+    def _record_success(
+        self,
+        service: MotorcycleAlertService,
+        status: MotorcycleStatus,
+        seconds: float = 0.0,
+    ) -> None:
+        """Remember a vehicle's latest status and reset its error streak."""
+        self._last_statuses.update(service, status)
+        self._errors[service] = 0
+        self._notify_listener(service, seconds, None)
+
+    def _record_failure(
+        self, service: MotorcycleAlertService, error: Exception, seconds: float
+    ) -> None:
+        """Extend a vehicle's error streak."""
+        self._errors[service] = self._errors.get(service, 0) + 1
+        self._notify_listener(service, seconds, error)
+
+    def _notify_listener(
+        self,
+        service: MotorcycleAlertService,
+        seconds: float,
+        error: Optional[BaseException],
+    ) -> None:
+        """Pass a poll outcome to the listener, never failing the poll."""
+        if self._poll_listener is None:
+            return
+        try:
+            self._poll_listener.poll_finished(service.object_id, seconds, error)
+        except Exception as e:
+            logger.error(f"Poll listener failed: {e}")
 
     def stop_monitoring(self) -> None:
         """Stop the monitoring process."""
         logger.info("Stopping motorcycle monitoring...")
         self._running = False
+        if self._scheduler is not None:
+            self._scheduler.stop()
@@ -0,0 +1,175 @@
+"""Debouncing and coalescing of status changes before they are alerted."""
+
+import dataclasses
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from motorcycle_alert.domain.models import (
+    COMPARED_FIELDS,
+    FieldChange,
+    MotorcycleStatus,
+)
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """How long a new field value must persist before it is reported.
+
+    A value is confirmed once it has been seen on ``polls`` consecutive polls
+    or has persisted for ``seconds``, whichever comes first; a zero threshold
+    is not used. With both at zero a change is confirmed immediately.
+    """
+
+    polls: int = 1
+    seconds: float = 0.0
+
+    def __post_init__(self):
+        """Validate the thresholds."""
+        if self.polls < 0 or self.seconds < 0:
+            raise ValueError("Debounce thresholds cannot be negative")
+
+    def is_confirmed(self, polls: int, elapsed: float) -> bool:
+        """Return whether a value seen ``polls`` times over ``elapsed`` seconds holds."""
+        if not self.polls and not self.seconds:
+            return True
+        return bool(
+            (self.polls and polls >= self.polls)
+            or (self.seconds and elapsed >= self.seconds)
+        )
+
+
+@dataclass
+class _Candidate:
+    """A new field value waiting to be confirmed."""
+
+    value: Any
+    since: float
+    polls: int = 0
+
+
+@dataclass(frozen=True)
+class StatusDigest:
+    """A confirmed status change ready to be alerted."""
+
+    status: MotorcycleStatus
+    changes: Tuple[FieldChange, ...] = ()
+
+
+class StatusDebouncer:
+    """Turns raw polled statuses into confirmed, coalesced changes.
+
+    Each compared field is debounced on its own: a new value is only
+    confirmed after it persisted as long as its :class:`FieldRule` requires,
+    so a flapping ``icon_color`` never reaches the user. Rules are looked up
+    by ``"field:value"`` first, then ``"field"``, which gives hysteresis:
+    e.g. ignition may report ``on`` after one poll but ``off`` after three.
+
+    Confirmed changes are held for ``window`` seconds after the first one and
+    alerted together as one digest; a field returning to its reported value
+    meanwhile cancels its change. The debouncer is driven by polls, so the
+    window effectively ends on the first poll after it elapsed.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Mapping[str, FieldRule]] = None,
+        default_rule: FieldRule = FieldRule(),
+        window: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the debouncer.
+
+        Args:
+            rules: Rules keyed by ``"field"`` or ``"field:value"``, where the
+                value is the new value in its string form (e.g. ``"True"``).
+            default_rule: Rule for fields without a specific rule.
+            window: Seconds confirmed changes are held to be coalesced.
+            clock: Monotonic time source, replaceable in tests.
+        """
+        self._rules = dict(rules or {})
+        self._default_rule = default_rule
+        self._window = window
+        self._clock = clock
+        self._candidates: Dict[str, _Candidate] = {}
+        self._confirmed: Dict[str, Any] = {}
+        self._window_start: Optional[float] = None
+
+    def rule_for(self, field: str, value: Any) -> FieldRule:
+        """Return the rule confirming a change of ``field`` to ``value``."""
+        rule = self._rules.get(f"{field}:{value}")
+        if rule is None:
+            rule = self._rules.get(field, self._default_rule)
+        return rule
+
+    @property
+    def pending(self) -> Dict[str, Any]:
+        """Return the fields whose new value awaits confirmation or delivery."""
+        pending = {field: c.value for field, c in self._candidates.items()}
+        pending.update(self._confirmed)
+        return pending
+
+    def update(
+        self, reported: Optional[MotorcycleStatus], current: MotorcycleStatus
+    ) -> Optional[StatusDigest]:
+        """Feed a polled status and return a digest when an alert is due.
+
+        Args:
+            reported: Last status the user was alerted about, None if none.
+            current: Freshly polled status.
+
+        Returns:
+            The status to report, combining confirmed field values with the
+            reported ones, and its changes; None while nothing is due.
+        """
+        if reported is None:
+            self._reset()
+            return StatusDigest(status=current)
+
+        now = self._clock()
+        for field in COMPARED_FIELDS:
+            value = getattr(current, field)
+            if value == getattr(reported, field):
+                # Back to the reported value: nothing left to alert for it.
+                self._candidates.pop(field, None)
+                self._confirmed.pop(field, None)
+                continue
+            if field in self._confirmed and value == self._confirmed[field]:
+                self._candidates.pop(field, None)
+                continue
+            candidate = self._candidates.get(field)
+            if candidate is None or candidate.value != value:
+                candidate = self._candidates[field] = _Candidate(value, since=now)
+            candidate.polls += 1
+            if self.rule_for(field, value).is_confirmed(
+                candidate.polls, now - candidate.since
+            ):
+                del self._candidates[field]
+                self._confirmed[field] = value
+
+        if not self._confirmed:
+            self._window_start = None
+            return None
+        if self._window_start is None:
+            self._window_start = now
+        if now - self._window_start < self._window:
+            return None
+
+        values = {
+            field: self._confirmed.get(field, getattr(reported, field))
+            for field in COMPARED_FIELDS
+        }
+        changes = tuple(
+            FieldChange(field, getattr(reported, field), self._confirmed[field])
+            for field in COMPARED_FIELDS
+            if field in self._confirmed
+        )
+        self._confirmed.clear()
+        self._window_start = None
+        return StatusDigest(dataclasses.replace(current, **values), changes)
+
+    def _reset(self) -> None:
+        """Forget every pending change."""
+        self._candidates.clear()
+        self._confirmed.clear()
+        self._window_start = None
@@ -0,0 +1,315 @@
+"""Compact struct-of-arrays storage for the statuses of large fleets.
+
+A :class:`MotorcycleStatus` costs a few hundred bytes plus a sensors dict.
+Here every field is a column: numbers live in typed ``array`` buffers,
+categorical text (colours, ignition values, object IDs) is interned to
+small integer IDs, and free-form values (alimentation, sensor readings)
+sit in one list per field or sensor name, so a row costs a few dozen
+bytes and continuously varying readings never grow a table. Statuses are
+only materialised when a caller asks for one.
+"""
+
+import math
+import struct
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+
+K = TypeVar("K", bound=Hashable)
+
+_NO_SYMBOL = 0
+# Bytes of one list slot, i.e. of an object pointer.
+_POINTER_SIZE = struct.calcsize("P")
+# Marks a row that does not report a sensor.
+_MISSING = object()
+
+
+class SymbolTable:
+    """Interns categorical strings to small integer IDs.
+
+    ID 0 stands for None, so optional values need no separate mask. Only
+    text drawn from a small set (colours, ignition values, object IDs and
+    sensor names) is interned; symbols are never freed.
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[Optional[str]] = [None]
+
+    def __len__(self) -> int:
+        """Return the number of interned strings."""
+        return len(self._symbols) - 1
+
+    def intern(self, symbol: Optional[str]) -> int:
+        """Return the ID of a string, assigning the next one if new."""
+        if symbol is None:
+            return _NO_SYMBOL
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return symbol_id
+
+    def lookup(self, symbol_id: int) -> Optional[str]:
+        """Return the string of an ID."""
+        return self._symbols[symbol_id]
+
+
+def _optional(value: Optional[float]) -> float:
+    """Store None as NaN."""
+    return math.nan if value is None else value
+
+
+def _restore(value: float) -> Optional[float]:
+    """Read NaN back as None."""
+    return None if value != value else value
+
+
+class StatusColumns:
+    """Growable struct-of-arrays holding statuses by row number."""
+
+    # Numeric columns: name -> array typecode.
+    NUMBERS = {"time": "d", "stop_duration": "d", "speed": "d", "lat": "d", "lng": "d"}
+    # Interned text columns, stored as unsigned 32-bit symbol IDs.
+    SYMBOLS = ("icon_color", "ignition", "object_id")
+    # Free-form columns, stored as lists of the values themselves.
+    OBJECTS = ("alimentation",)
+
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        """Initialize empty columns.
+
+        Args:
+            symbols: Symbol table to share with other tables; a new one
+                is created when omitted.
+        """
+        self.symbols = symbols or SymbolTable()
+        self._numbers = {name: array(code) for name, code in self.NUMBERS.items()}
+        self._symbol_ids = {name: array("I") for name in self.SYMBOLS}
+        self._objects: Dict[str, List[Any]] = {name: [] for name in self.OBJECTS}
+        # Sensor name ID -> value per row, _MISSING where not reported.
+        self._sensors: Dict[int, List[Any]] = {}
+        self._blocked = array("B")
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self._blocked)
+
+    def column(self, name: str) -> array:
+        """Return a numeric or symbol ID column, e.g. for vectorised scans."""
+        if name == "blocked":
+            return self._blocked
+        return self._numbers.get(name) or self._symbol_ids[name]
+
+    def nbytes(self) -> int:
+        """Return the bytes held by the columns, excluding the values they point to."""
+        buffers = [*self._numbers.values(), *self._symbol_ids.values(), self._blocked]
+        slots = sum(map(len, [*self._objects.values(), *self._sensors.values()]))
+        return (
+            sum(len(values) * values.itemsize for values in buffers)
+            + slots * _POINTER_SIZE
+        )
+
+    def append(self, status: MotorcycleStatus) -> int:
+        """Add a row and return its number."""
+        for name in self.NUMBERS:
+            self._numbers[name].append(_optional(getattr(status, name)))
+        for name in self.SYMBOLS:
+            self._symbol_ids[name].append(self.symbols.intern(getattr(status, name)))
+        for name in self.OBJECTS:
+            self._objects[name].append(getattr(status, name))
+        for values in self._sensors.values():
+            values.append(_MISSING)
+        self._blocked.append(status.blocked)
+        row = len(self._blocked) - 1
+        self._write_sensors(row, status.additional_sensors)
+        return row
+
+    def write(self, row: int, status: MotorcycleStatus) -> None:
+        """Overwrite a row in place."""
+        for name in self.NUMBERS:
+            self._numbers[name][row] = _optional(getattr(status, name))
+        for name in self.SYMBOLS:
+            self._symbol_ids[name][row] = self.symbols.intern(getattr(status, name))
+        for name in self.OBJECTS:
+            self._objects[name][row] = getattr(status, name)
+        for values in self._sensors.values():
+            values[row] = _MISSING
+        self._write_sensors(row, status.additional_sensors)
+        self._blocked[row] = status.blocked
+
+    def clear(self, row: int) -> None:
+        """Drop the free-form values of a row, so they can be freed."""
+        for values in self._objects.values():
+            values[row] = None
+        for values in self._sensors.values():
+            values[row] = _MISSING
+
+    def _write_sensors(self, row: int, sensors: Optional[Dict[str, Any]]) -> None:
+        """Store the sensor values of a row whose sensors are all _MISSING."""
+        for name, value in (sensors or {}).items():
+            name_id = self.symbols.intern(name)
+            values = self._sensors.get(name_id)
+            if values is None:
+                values = self._sensors[name_id] = [_MISSING] * len(self)
+            values[row] = value
+
+    def read(
+        self, row: int, fields: Optional[Iterable[str]] = None
+    ) -> MotorcycleStatus:
+        """Materialise the status of a row.
+
+        Args:
+            row: Row number.
+            fields: Fields to read; the others are left empty. Every field
+                is read when omitted.
+        """
+        if fields is not None:
+            values: Dict[str, Any] = dict(
+                icon_color=None, alimentation=None, blocked=False, ignition=None
+            )
+            values.update((name, self._value(row, name)) for name in fields)
+            return MotorcycleStatus(**values)
+        lookup = self.symbols.lookup
+        ids = self._symbol_ids
+        numbers = self._numbers
+        return MotorcycleStatus(
+            icon_color=lookup(ids["icon_color"][row]),
+            alimentation=self._objects["alimentation"][row],
+            blocked=bool(self._blocked[row]),
+            ignition=lookup(ids["ignition"][row]),
+            time=_restore(numbers["time"][row]),
+            stop_duration=_restore(numbers["stop_duration"][row]),
+            speed=_restore(numbers["speed"][row]),
+            additional_sensors=self._read_sensors(row),
+            lat=_restore(numbers["lat"][row]),
+            lng=_restore(numbers["lng"][row]),
+            object_id=lookup(ids["object_id"][row]),
+        )
+
+    def _value(self, row: int, name: str) -> Any:
+        """Return one field of a row."""
+        if name in self._numbers:
+            return _restore(self._numbers[name][row])
+        if name in self._symbol_ids:
+            return self.symbols.lookup(self._symbol_ids[name][row])
+        if name in self._objects:
+            return self._objects[name][row]
+        if name == "blocked":
+            return bool(self._blocked[row])
+        if name == "additional_sensors":
+            return self._read_sensors(row)
+        raise KeyError(name)
+
+    def _read_sensors(self, row: int) -> Optional[Dict[str, Any]]:
+        """Return a new dict of the sensors of a row, None when there are none."""
+        lookup = self.symbols.lookup
+        sensors = {
+            lookup(name_id): values[row]
+            for name_id, values in self._sensors.items()
+            if values[row] is not _MISSING
+        }
+        return sensors or None
+
+
+class FleetTable(Generic[K]):
+    """Latest status of each vehicle, one struct-of-arrays row per key."""
+
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        """Initialize an empty table."""
+        self._columns = StatusColumns(symbols)
+        self._rows: Dict[K, int] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        """Return the number of vehicles."""
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether a vehicle has a status."""
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[K]:
+        """Iterate over the vehicle keys."""
+        return iter(self._rows)
+
+    @property
+    def columns(self) -> StatusColumns:
+        """Return the underlying columns, row order following insertion."""
+        return self._columns
+
+    def update(self, key: K, status: MotorcycleStatus) -> None:
+        """Store the latest status of a vehicle."""
+        row = self._rows.get(key)
+        if row is not None:
+            self._columns.write(row, status)
+        elif self._free:
+            row = self._rows[key] = self._free.pop()
+            self._columns.write(row, status)
+        else:
+            self._rows[key] = self._columns.append(status)
+
+    def discard(self, key: K) -> None:
+        """Forget a vehicle; its row is reused by the next new vehicle."""
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._columns.clear(row)
+            self._free.append(row)
+
+    def get(
+        self, key: K, fields: Optional[Iterable[str]] = None
+    ) -> Optional[MotorcycleStatus]:
+        """Return the latest status of a vehicle, None if unknown.
+
+        Args:
+            key: Vehicle key.
+            fields: Fields to read; the others are left empty. Every field
+                is read when omitted.
+        """
+        row = self._rows.get(key)
+        return None if row is None else self._columns.read(row, fields)
+
+
+class StatusWindow:
+    """Ring buffer of the last ``capacity`` statuses of a vehicle."""
+
+    def __init__(self, capacity: int, symbols: Optional[SymbolTable] = None):
+        """Initialize an empty window.
+
+        Raises:
+            ValueError: If ``capacity`` is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("Window capacity must be at least 1")
+        self._capacity = capacity
+        self._columns = StatusColumns(symbols)
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Return the number of statuses held."""
+        return len(self._columns)
+
+    def append(self, status: MotorcycleStatus) -> None:
+        """Add a status, evicting the oldest once full."""
+        if len(self._columns) < self._capacity:
+            self._columns.append(status)
+        else:
+            self._columns.write(self._next, status)
+        self._next = (self._next + 1) % self._capacity
+
+    def statuses(self) -> List[MotorcycleStatus]:
+        """Return the statuses held, oldest first."""
+        count = len(self._columns)
+        start = self._next if count == self._capacity else 0
+        return [self._columns.read((start + i) % count) for i in range(count)]
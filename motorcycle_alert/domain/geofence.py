@@ -0,0 +1,220 @@
+"""Geofence zones, a grid spatial index and incremental enter/exit detection."""
+
+import math
+import statistics
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from motorcycle_alert.domain.values import distance_m
+
+# Metres per degree of latitude, used to size circle bounding boxes.
+_METRES_PER_DEGREE = 111_320.0
+
+# Bounding box as (min_lat, min_lng, max_lat, max_lng).
+BoundingBox = Tuple[float, float, float, float]
+
+
+class Zone(ABC):
+    """A named area alerts are raised for when a vehicle enters or leaves it.
+
+    Zones compare by identity, keeping set membership cheap for large polygons.
+    """
+
+    name: str
+    recipient: Optional[str]
+
+    @abstractmethod
+    def bounding_box(self) -> BoundingBox:
+        """Return the smallest box containing the zone."""
+        pass
+
+    @abstractmethod
+    def contains(self, lat: float, lng: float) -> bool:
+        """Return whether a position lies inside the zone."""
+        pass
+
+
+@dataclass(frozen=True, eq=False)
+class CircleZone(Zone):
+    """Zone within ``radius`` metres of a centre."""
+
+    name: str
+    lat: float
+    lng: float
+    radius: float
+    recipient: Optional[str] = None
+
+    def __post_init__(self):
+        """Validate the circle."""
+        if self.radius <= 0:
+            raise ValueError(f"Radius of zone '{self.name}' must be positive")
+
+    def bounding_box(self) -> BoundingBox:
+        """Return the smallest box containing the circle."""
+        d_lat = self.radius / _METRES_PER_DEGREE
+        d_lng = d_lat / max(math.cos(math.radians(self.lat)), 1e-6)
+        return (self.lat - d_lat, self.lng - d_lng, self.lat + d_lat, self.lng + d_lng)
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """Return whether a position lies within the radius."""
+        return distance_m(self.lat, self.lng, lat, lng) <= self.radius
+
+
+@dataclass(frozen=True, eq=False)
+class PolygonZone(Zone):
+    """Zone bounded by a polygon of ``(lat, lng)`` vertices."""
+
+    name: str
+    points: Tuple[Tuple[float, float], ...]
+    recipient: Optional[str] = None
+    _box: BoundingBox = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Validate the polygon and precompute its bounding box."""
+        if len(self.points) < 3:
+            raise ValueError(f"Polygon zone '{self.name}' needs at least 3 points")
+        lats = [point[0] for point in self.points]
+        lngs = [point[1] for point in self.points]
+        object.__setattr__(self, "_box", (min(lats), min(lngs), max(lats), max(lngs)))
+
+    def bounding_box(self) -> BoundingBox:
+        """Return the smallest box containing the polygon."""
+        return self._box
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """Return whether a position lies inside, by ray casting."""
+        min_lat, min_lng, max_lat, max_lng = self._box
+        if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+            return False
+        inside = False
+        points = self.points
+        j = len(points) - 1
+        for i in range(len(points)):
+            lat_i, lng_i = points[i]
+            lat_j, lng_j = points[j]
+            if (lat_i > lat) != (lat_j > lat) and lng < (lng_j - lng_i) * (
+                lat - lat_i
+            ) / (lat_j - lat_i) + lng_i:
+                inside = not inside
+            j = i
+        return inside
+
+
+@dataclass(frozen=True)
+class GeofenceEvent:
+    """A vehicle entering or leaving a zone."""
+
+    zone: Zone
+    entered: bool
+
+    def describe(self) -> str:
+        """Describe the event, e.g. ``Entered Home``."""
+        return f"{'Entered' if self.entered else 'Left'} {self.zone.name}"
+
+
+class ZoneIndex:
+    """Uniform grid over zone bounding boxes.
+
+    Each grid cell lists the zones whose bounding box overlaps it, so a
+    position is only tested against the few zones of its cell instead of
+    every zone of the account.
+    """
+
+    def __init__(self, zones: Sequence[Zone], cell_size: Optional[float] = None):
+        """Build the index.
+
+        Args:
+            zones: Zones to index; names must be unique.
+            cell_size: Cell side in degrees; defaults to the median zone
+                extent, clamped between 0.001 and 1 degree.
+
+        Raises:
+            ValueError: If two zones share a name.
+        """
+        names = [zone.name for zone in zones]
+        if len(set(names)) != len(names):
+            raise ValueError("Geofence zone names must be unique")
+        self.zones = tuple(zones)
+        boxes = [zone.bounding_box() for zone in self.zones]
+        if cell_size is None:
+            extents = [max(b[2] - b[0], b[3] - b[1]) for b in boxes] or [0.01]
+            cell_size = min(max(statistics.median(extents), 0.001), 1.0)
+        self.cell_size = cell_size
+        cells: Dict[Tuple[int, int], List[Zone]] = {}
+        for zone, (min_lat, min_lng, max_lat, max_lng) in zip(self.zones, boxes):
+            low_lat, low_lng = self.cell(min_lat, min_lng)
+            high_lat, high_lng = self.cell(max_lat, max_lng)
+            for i in range(low_lat, high_lat + 1):
+                for j in range(low_lng, high_lng + 1):
+                    cells.setdefault((i, j), []).append(zone)
+        self._cells: Dict[Tuple[int, int], Tuple[Zone, ...]] = {
+            key: tuple(zones) for key, zones in cells.items()
+        }
+
+    def __len__(self) -> int:
+        """Return the number of zones."""
+        return len(self.zones)
+
+    def cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        """Return the grid cell of a position."""
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def candidates(self, lat: float, lng: float) -> Tuple[Zone, ...]:
+        """Return the zones whose bounding box may contain a position."""
+        return self._cells.get(self.cell(lat, lng), ())
+
+    def zones_at(self, lat: float, lng: float) -> FrozenSet[Zone]:
+        """Return the zones containing a position."""
+        return frozenset(
+            zone for zone in self.candidates(lat, lng) if zone.contains(lat, lng)
+        )
+
+    def tracker(self) -> "GeofenceTracker":
+        """Return a tracker following one vehicle across the zones."""
+        return GeofenceTracker(self)
+
+
+class GeofenceTracker:
+    """Detects zone entries and exits along the positions of one vehicle.
+
+    Each update only tests the zones of the new position's grid cell plus the
+    zones the vehicle was inside; a position equal to the previous one costs
+    nothing. The first known position sets the initial zones without events.
+    """
+
+    def __init__(self, index: ZoneIndex):
+        """Initialize the tracker."""
+        self._index = index
+        self._position: Optional[Tuple[float, float]] = None
+        # Ordered like a set, so exits are reported in order of entry.
+        self._inside: Dict[Zone, None] = {}
+
+    @property
+    def inside(self) -> FrozenSet[Zone]:
+        """Return the zones the vehicle is currently inside."""
+        return frozenset(self._inside)
+
+    def update(self, lat: Optional[float], lng: Optional[float]) -> List[GeofenceEvent]:
+        """Move the vehicle and return the zones it entered or left.
+
+        Unknown positions are ignored.
+        """
+        if lat is None or lng is None:
+            return []
+        position = (lat, lng)
+        if position == self._position:
+            return []
+        first = self._position is None
+        self._position = position
+
+        events = []
+        for zone in tuple(self._inside):
+            if not zone.contains(lat, lng):
+                del self._inside[zone]
+                events.append(GeofenceEvent(zone, entered=False))
+        for zone in self._index.candidates(lat, lng):
+            if zone not in self._inside and zone.contains(lat, lng):
+                self._inside[zone] = None
+                events.append(GeofenceEvent(zone, entered=True))
+        return [] if first else events
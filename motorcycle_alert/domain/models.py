@@ -1,34 +1,69 @@
 """Domain models for motorcycle alert system."""
 
+import hashlib
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+from motorcycle_alert.domain.values import (
+    format_duration,
+    format_speed,
+    format_timestamp,
+)
 
-@dataclass(frozen=True)
+# Fields whose change makes two statuses differ and triggers an alert.
+COMPARED_FIELDS = ("icon_color", "alimentation", "blocked", "ignition")
+
+_FIELD_LABELS = {
+    "icon_color": "Icon Color",
+    "alimentation": "Alimentation",
+    "blocked": "Blocked",
+    "ignition": "Ignition",
+}
+
+
+@dataclass(frozen=True, slots=True)
 class MotorcycleStatus:
-    """Domain model representing motorcycle status."""
+    """Domain model representing motorcycle status.
+
+    ``time`` is in epoch seconds, ``stop_duration`` in seconds and ``speed``
+    in km/h, parsed once when the API response is read; display text is
+    only built by :meth:`AlertMessage.format_message`.
+
+    Statuses are slotted and built without checks, as most are copies of
+    already valid ones; data entering from outside goes through
+    :meth:`create`.
+    """
 
     icon_color: str
     alimentation: str
     blocked: bool
     ignition: str
-    time: Optional[str] = None
-    stop_duration: Optional[str] = None
-    speed: Optional[str] = None
-    additional_sensors: Optional[Dict[str, str]] = None
+    time: Optional[float] = None
+    stop_duration: Optional[float] = None
+    speed: Optional[float] = None
+    additional_sensors: Optional[Dict[str, Any]] = None
     lat: Optional[float] = None
     lng: Optional[float] = None
+    object_id: Optional[str] = None
+
+    @classmethod
+    def create(cls, **fields: Any) -> "MotorcycleStatus":
+        """Build a status from untrusted data, validating it.
 
-    def __post_init__(self):
-        """Validate motorcycle status data."""
-        if not self.icon_color:
+        Raises:
+            ValueError: If the icon color is empty or blocked is not a boolean.
+        """
+        if not fields.get("icon_color"):
             raise ValueError("Icon color cannot be empty")
 
-        if not isinstance(self.blocked, bool):
+        if not isinstance(fields.get("blocked"), bool):
             raise ValueError("Blocked status must be a boolean")
+        return cls(**fields)
 
     def __eq__(self, other):
         """Check equality of two MotorcycleStatus instances."""
+        if other is self:
+            return True  # e.g. the same parsed status reused for an unchanged poll
         if not isinstance(other, MotorcycleStatus):
             return NotImplemented
         return (
@@ -39,27 +74,106 @@ class MotorcycleStatus:
         )
 
 
+@dataclass(frozen=True)
+class FieldChange:
+    """A compared field that changed between two reported statuses."""
+
+    field: str
+    previous: Any
+    current: Any
+
+    def describe(self) -> str:
+        """Describe the change, e.g. ``Ignition: Desligado → Ligado``."""
+
+        def show(value: Any) -> str:
+            if isinstance(value, bool):
+                return "Yes" if value else "No"
+            return str(value)
+
+        label = _FIELD_LABELS.get(self.field, self.field)
+        return f"{label}: {show(self.previous)} → {show(self.current)}"
+
+
 @dataclass(frozen=True)
 class AlertMessage:
     """Domain model for alert messages."""
 
     status: MotorcycleStatus
     timestamp: str
+    recipient: Optional[str] = None
+    dedup_key: Optional[str] = None
+    changes: Tuple[FieldChange, ...] = ()
+    rule: Optional[str] = None
+    geofence: Optional[str] = None
 
     def format_message(self) -> str:
         """Format the alert message for sending."""
+        rule_info = f"🚨 Rule triggered: {self.rule}\n" if self.rule else ""
+        if self.geofence:
+            rule_info += f"📍 Geofence: {self.geofence}\n"
+
+        changes_info = ""
+        if self.changes:
+            changes_info = "\n🔁 Changes:" + "".join(
+                f"\n- {change.describe()}" for change in self.changes
+            )
+
         sensors_info = ""
         if self.status.additional_sensors:
             sensors_info = f"\n- Additional Sensors: {self.status.additional_sensors}"
 
-        return f"""🏍️ Motorcycle Status Update:
+        vehicle_info = ""
+        if self.status.object_id:
+            vehicle_info = f"\n- Vehicle: {self.status.object_id}"
+
+        return f"""{rule_info}🏍️ Motorcycle Status Update:{vehicle_info}
 - Icon Color: {self.status.icon_color}
-- Time: {self.status.time or 'N/A'}
-- Stop Duration: {self.status.stop_duration or 'N/A'}
-- Speed: {self.status.speed or 'N/A'}
+- Time: {format_timestamp(self.status.time)}
+- Stop Duration: {format_duration(self.status.stop_duration)}
+- Speed: {format_speed(self.status.speed)}
 - Alimentation: {self.status.alimentation}
 - Blocked: {'Yes' if self.status.blocked else 'No'}
 - Ignition: {self.status.ignition}{sensors_info}
-- Map Location: https://www.google.com/maps?q={self.status.lat},{self.status.lng}
+- Map Location: https://www.google.com/maps?q={self.status.lat},{self.status.lng}{changes_info}
 
 📅 Alert Time: {self.timestamp}"""
+
+
+def transition_key(
+    previous: Optional[MotorcycleStatus],
+    current: MotorcycleStatus,
+    recipient: Optional[str] = None,
+) -> str:
+    """Return a stable key identifying a status change and its recipient.
+
+    The key depends on the compared fields and on the time of the previous
+    status, so the same change detected twice (e.g. again after a restart)
+    yields the same key, while a later flap back to it yields a new one.
+    """
+
+    def fields(status: Optional[MotorcycleStatus]) -> str:
+        if status is None:
+            return "-"
+        return "|".join(str(getattr(status, field)) for field in COMPARED_FIELDS)
+
+    since = previous.time if previous is not None else None
+    raw = (
+        f"{recipient}|{current.object_id}|{since}|"
+        f"{fields(previous)}>{fields(current)}"
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def event_key(
+    event: str, current: MotorcycleStatus, timestamp: str, recipient: Optional[str]
+) -> str:
+    """Return a stable key identifying one occurrence of an alert event.
+
+    Args:
+        event: Kind and name of the event, e.g. ``rule:Speeding``.
+        current: Status the event was detected on.
+        timestamp: Time the event was detected.
+        recipient: Chat the alert is routed to.
+    """
+    raw = f"event|{event}|{recipient}|{current.object_id}|{timestamp}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
@@ -0,0 +1,289 @@
+"""Declarative alert rules compiled into fast predicates."""
+
+import ast
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from motorcycle_alert.domain.models import COMPARED_FIELDS, MotorcycleStatus
+from motorcycle_alert.domain.values import distance_m, is_on, parse_number
+
+logger = logging.getLogger(__name__)
+
+# Variables a condition can read; ``prev.<name>`` reads the previous poll.
+RULE_VARIABLES = frozenset(
+    {
+        "object_id",
+        "icon_color",
+        "alimentation",
+        "voltage",
+        "blocked",
+        "ignition",
+        "ignition_on",
+        "speed",
+        "stop_duration",
+        "lat",
+        "lng",
+        "moved",
+        "moved_since_parked",
+        "changed",
+    }
+)
+
+_PREVIOUS = "prev"
+
+# Syntax allowed in conditions: comparisons, boolean logic and arithmetic over
+# variables and literals. Calls, subscripts and other attributes are rejected,
+# so a condition can never reach anything but the status variables.
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Mod,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Constant,
+    ast.Tuple,
+    ast.List,
+    ast.Name,
+    ast.Attribute,
+    ast.Load,
+)
+
+Predicate = Callable[[Dict[str, Any], Dict[str, Any]], Any]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """A named alert condition, e.g. ``speed > 80``.
+
+    A rule fires when its condition becomes true (it was false on the previous
+    poll) and it did not fire within ``cooldown`` seconds.
+    """
+
+    name: str
+    condition: str
+    cooldown: float = 0.0
+    recipient: Optional[str] = None
+
+    def __post_init__(self):
+        """Validate the rule."""
+        if not self.name:
+            raise ValueError("Alert rule name cannot be empty")
+        if self.cooldown < 0:
+            raise ValueError(f"Cooldown of rule '{self.name}' cannot be negative")
+
+
+class _Rewriter(ast.NodeTransformer):
+    """Turns variable reads into lookups in the current or previous context."""
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        return ast.copy_location(_lookup("c", node.id), node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        return ast.copy_location(_lookup("p", node.attr), node)
+
+
+def _lookup(context: str, variable: str) -> ast.Subscript:
+    """Build ``context["variable"]``."""
+    return ast.Subscript(
+        value=ast.Name(id=context, ctx=ast.Load()),
+        slice=ast.Constant(value=variable),
+        ctx=ast.Load(),
+    )
+
+
+def compile_condition(condition: str) -> Predicate:
+    """Compile a condition into a predicate over current and previous contexts.
+
+    Args:
+        condition: Python-like boolean expression over ``RULE_VARIABLES``,
+            e.g. ``ignition_on and blocked`` or ``prev.voltage > 0 == voltage``.
+
+    Returns:
+        A function taking the current and previous contexts.
+
+    Raises:
+        ValueError: If the condition is not valid or uses forbidden syntax.
+    """
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid condition '{condition}': {e.msg}") from e
+    previous_reads = {
+        id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Attribute)
+    }
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(
+                f"Unsupported syntax {type(node).__name__} in condition '{condition}'"
+            )
+        if (
+            isinstance(node, ast.Name)
+            and node.id not in RULE_VARIABLES
+            and id(node) not in previous_reads
+        ):
+            raise ValueError(f"Unknown variable '{node.id}' in condition '{condition}'")
+        if isinstance(node, ast.Attribute) and not (
+            isinstance(node.value, ast.Name)
+            and node.value.id == _PREVIOUS
+            and node.attr in RULE_VARIABLES
+        ):
+            raise ValueError(f"Unknown attribute in condition '{condition}'")
+    body = _Rewriter().visit(tree).body
+    function = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(arg="c"), ast.arg(arg="p")],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body=body,
+        )
+    )
+    code = compile(ast.fix_missing_locations(function), f"<rule {condition}>", "eval")
+    return eval(code, {"__builtins__": {}})
+
+
+def _number(value: Any) -> float:
+    """Return a parsed number, NaN when unknown so comparisons are false."""
+    return math.nan if value is None else value
+
+
+class RuleSet:
+    """Alert rules compiled once and shared by every vehicle."""
+
+    def __init__(self, rules: Sequence[AlertRule]):
+        """Compile the rules.
+
+        Raises:
+            ValueError: If a condition is invalid or two rules share a name.
+        """
+        names = [rule.name for rule in rules]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate alert rule names: {', '.join(duplicates)}")
+        self.rules = tuple(rules)
+        self._predicates = tuple(compile_condition(rule.condition) for rule in rules)
+
+    def __len__(self) -> int:
+        """Return the number of rules."""
+        return len(self.rules)
+
+    def evaluator(self, clock: Callable[[], float] = time.monotonic) -> "RuleEvaluator":
+        """Return an evaluator keeping the rule state of one vehicle."""
+        return RuleEvaluator(self, clock)
+
+
+class RuleEvaluator:
+    """Evaluates a :class:`RuleSet` against the successive polls of one vehicle."""
+
+    def __init__(self, rule_set: RuleSet, clock: Callable[[], float] = time.monotonic):
+        """Initialize the evaluator.
+
+        Args:
+            rule_set: Compiled rules.
+            clock: Monotonic time source for cooldowns, replaceable in tests.
+        """
+        self._rules = rule_set.rules
+        self._predicates = rule_set._predicates
+        self._clock = clock
+        self._active = [False] * len(self._rules)
+        self._fired_at: List[Optional[float]] = [None] * len(self._rules)
+        self._previous: Optional[Dict[str, Any]] = None
+        self._parked_at: Optional[MotorcycleStatus] = None
+
+    def context(
+        self, status: MotorcycleStatus, reported: Optional[MotorcycleStatus] = None
+    ) -> Dict[str, Any]:
+        """Build the variables of a polled status.
+
+        Args:
+            status: Freshly polled status.
+            reported: Last reported status, deciding ``changed``.
+        """
+        ignition_on = is_on(status.ignition)
+        if ignition_on:
+            self._parked_at = None
+        elif self._parked_at is None:
+            self._parked_at = status
+        previous = self._previous
+        parked = self._parked_at
+        return {
+            "object_id": status.object_id,
+            "icon_color": status.icon_color,
+            "alimentation": status.alimentation,
+            "voltage": _number(parse_number(status.alimentation)),
+            "blocked": status.blocked,
+            "ignition": status.ignition,
+            "ignition_on": ignition_on,
+            "speed": _number(status.speed),
+            "stop_duration": _number(status.stop_duration),
+            "lat": _number(status.lat),
+            "lng": _number(status.lng),
+            "moved": (
+                distance_m(previous["lat"], previous["lng"], status.lat, status.lng)
+                if previous is not None
+                else 0.0
+            ),
+            "moved_since_parked": (
+                distance_m(parked.lat, parked.lng, status.lat, status.lng)
+                if parked is not None
+                else 0.0
+            ),
+            "changed": reported is not None
+            and any(
+                getattr(status, field) != getattr(reported, field)
+                for field in COMPARED_FIELDS
+            ),
+        }
+
+    def evaluate(
+        self, status: MotorcycleStatus, reported: Optional[MotorcycleStatus] = None
+    ) -> List[AlertRule]:
+        """Return the rules firing for a polled status.
+
+        A failing condition (e.g. comparing a missing text value) counts as
+        false and is logged; it never stops the other rules.
+        """
+        current = self.context(status, reported)
+        previous = self._previous if self._previous is not None else current
+        self._previous = current
+        now = self._clock()
+        fired = []
+        for index, predicate in enumerate(self._predicates):
+            try:
+                active = bool(predicate(current, previous))
+            except Exception as e:
+                logger.warning(f"Alert rule '{self._rules[index].name}' failed: {e}")
+                active = False
+            was_active, self._active[index] = self._active[index], active
+            if not active or was_active:
+                continue
+            fired_at = self._fired_at[index]
+            if fired_at is not None and now - fired_at < self._rules[index].cooldown:
+                continue
+            self._fired_at[index] = now
+            fired.append(self._rules[index])
+        return fired
@@ -1,9 +1,21 @@
 """Domain services for motorcycle alert system."""
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Optional, Sequence
 
-from motorcycle_alert.domain.models import AlertMessage, MotorcycleStatus
+from motorcycle_alert.domain.debounce import StatusDebouncer, StatusDigest
+from motorcycle_alert.domain.geofence import GeofenceTracker
+from motorcycle_alert.domain.models import (
+    AlertMessage,
+    MotorcycleStatus,
+    event_key,
+    transition_key,
+)
+from motorcycle_alert.domain.rules import RuleEvaluator
+
+logger = logging.getLogger(__name__)
 
 
 class MotorcycleDataRepository(ABC):
@@ -14,6 +26,25 @@ class MotorcycleDataRepository(ABC):
         """Get current motorcycle status from external source."""
         pass
 
+    async def close(self) -> None:
+        """Release resources held by the repository."""
+        return None
+
+
+class FleetDataRepository(ABC):
+    """Abstract repository fetching many vehicles in one round trip."""
+
+    @abstractmethod
+    async def get_fleet_status(
+        self, object_ids: Optional[Sequence[str]] = None
+    ) -> Dict[str, MotorcycleStatus]:
+        """Get current statuses keyed by object ID, for all vehicles when None."""
+        pass
+
+    async def close(self) -> None:
+        """Release resources held by the repository."""
+        return None
+
 
 class StatusStorage(ABC):
     """Abstract storage for motorcycle status."""
@@ -28,6 +59,31 @@ class StatusStorage(ABC):
         """Save the current status."""
         pass
 
+    def record_status(self, status: MotorcycleStatus) -> None:
+        """Record a polled status that does not change the reported one.
+
+        Storages keeping only the last status ignore it; history stores
+        record every observation.
+        """
+        return None
+
+    def close(self) -> None:
+        """Persist pending writes and release resources."""
+        return None
+
+
+class StatusObserver(ABC):
+    """Receives every polled status, changed or not."""
+
+    @abstractmethod
+    def observe(self, status: MotorcycleStatus) -> None:
+        """Handle a freshly polled status."""
+        pass
+
+    def close(self) -> None:
+        """Flush buffered data and release resources."""
+        return None
+
 
 class NotificationService(ABC):
     """Abstract notification service."""
@@ -37,6 +93,14 @@ class NotificationService(ABC):
         """Send alert notification."""
         pass
 
+    async def commit(self) -> None:
+        """Wait until the alerts sent so far would survive a crash.
+
+        Called before the status change an alert reports is saved. Services
+        without durable storage have nothing to wait for.
+        """
+        return None
+
 
 class MotorcycleAlertService:
     """Domain service for handling motorcycle alerts."""
@@ -46,25 +110,127 @@ class MotorcycleAlertService:
         data_repository: MotorcycleDataRepository,
         status_storage: StatusStorage,
         notification_service: NotificationService,
+        object_id: Optional[str] = None,
+        recipient: Optional[str] = None,
+        observers: Sequence[StatusObserver] = (),
+        debouncer: Optional[StatusDebouncer] = None,
+        rules: Optional[RuleEvaluator] = None,
+        geofence: Optional[GeofenceTracker] = None,
     ):
-        """Initialize the alert service with dependencies."""
+        """Initialize the alert service with dependencies.
+
+        Args:
+            data_repository: Source of the vehicle's current status.
+            status_storage: Storage holding this vehicle's last status.
+            notification_service: Channel used to deliver alerts.
+            object_id: Identifier of the monitored vehicle, used for logging.
+            recipient: Chat the alerts are routed to; the notification
+                service default is used when omitted.
+            observers: Consumers notified of every polled status.
+            debouncer: Confirms and coalesces changes before they are
+                alerted; every change is alerted at once when omitted.
+            rules: Alert rules evaluated on every poll, in addition to the
+                status change alerts.
+            geofence: Tracker alerting when the vehicle enters or leaves a zone.
+        """
         self._data_repository = data_repository
         self._status_storage = status_storage
         self._notification_service = notification_service
-
-    async def check_and_alert(self) -> None:
-        """Check for status changes and send alerts if needed."""
-        current_status = await self._data_repository.get_current_status()
+        self.object_id = object_id
+        self._recipient = recipient
+        self._observers = tuple(observers)
+        self._debouncer = debouncer
+        self._rules = rules
+        self._geofence = geofence
+
+    def set_recipient(self, recipient: Optional[str]) -> None:
+        """Route the alerts of the next polls to ``recipient``."""
+        self._recipient = recipient
+
+    async def check_and_alert(
+        self, current_status: Optional[MotorcycleStatus] = None
+    ) -> MotorcycleStatus:
+        """Check status changes, alert rules and geofences, and send alerts.
+
+        Args:
+            current_status: Status already fetched by a batched fleet request;
+                the data repository is queried when omitted.
+
+        Returns:
+            The current status, whether or not it changed.
+        """
+        if current_status is None:
+            current_status = await self._data_repository.get_current_status()
         last_status = self._status_storage.load_last_status()
-
-        if last_status != current_status:
-            self._status_storage.save_status(current_status)
-
-            from datetime import datetime
-
+        for observer in self._observers:
+            try:
+                observer.observe(current_status)
+            except Exception as e:
+                # Recording must never prevent the alert itself.
+                logger.error(f"Status observer {type(observer).__name__} failed: {e}")
+
+        fired = (
+            self._rules.evaluate(current_status, last_status)
+            if self._rules is not None
+            else []
+        )
+        zone_events = (
+            self._geofence.update(current_status.lat, current_status.lng)
+            if self._geofence is not None
+            else []
+        )
+
+        if self._debouncer is not None:
+            digest = self._debouncer.update(last_status, current_status)
+        elif last_status == current_status:
+            digest = None
+        else:
+            digest = StatusDigest(status=current_status)
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if digest is None:
+            self._status_storage.record_status(current_status)
+        else:
             alert_message = AlertMessage(
-                status=current_status,
-                timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                status=digest.status,
+                timestamp=timestamp,
+                recipient=self._recipient,
+                dedup_key=transition_key(last_status, digest.status, self._recipient),
+                changes=digest.changes,
             )
 
+            # Hand the alert over before recording the change: if the process
+            # dies in between, the change is detected again rather than lost.
             self._notification_service.send_alert(alert_message)
+            await self._notification_service.commit()
+            self._status_storage.save_status(digest.status)
+
+        for rule in fired:
+            recipient = rule.recipient or self._recipient
+            self._notification_service.send_alert(
+                AlertMessage(
+                    status=current_status,
+                    timestamp=timestamp,
+                    recipient=recipient,
+                    dedup_key=event_key(
+                        f"rule:{rule.name}", current_status, timestamp, recipient
+                    ),
+                    rule=rule.name,
+                )
+            )
+        for event in zone_events:
+            recipient = event.zone.recipient or self._recipient
+            description = event.describe()
+            self._notification_service.send_alert(
+                AlertMessage(
+                    status=current_status,
+                    timestamp=timestamp,
+                    recipient=recipient,
+                    dedup_key=event_key(
+                        f"geofence:{description}", current_status, timestamp, recipient
+                    ),
+                    geofence=description,
+                )
+            )
+
+        return current_status
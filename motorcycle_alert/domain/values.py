@@ -0,0 +1,173 @@
+"""Interpretation of raw status values reported by the tracker."""
+
+import functools
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+_NUMBER = re.compile(r"[-+]?\d+(?:[.,]\d+)?")
+_DURATION_PART = re.compile(r"(\d+(?:[.,]\d+)?)\s*(dias?|d|h|min|m|s)\b", re.IGNORECASE)
+_CLOCK = re.compile(r"^(?:(\d+):)?(\d{1,2}):(\d{2})$")
+_TIMESTAMP = re.compile(
+    r"^(\d{4}|\d{1,2})[-/.](\d{1,2})[-/.](\d{4}|\d{1,2})[ T]"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?"
+)
+_DURATION_UNITS = {
+    "d": 86400,
+    "dia": 86400,
+    "dias": 86400,
+    "h": 3600,
+    "min": 60,
+    "m": 60,
+    "s": 1,
+}
+_OFF_VALUES = frozenset({"", "0", "off", "false", "desligado", "não", "nao"})
+
+
+def is_on(value: Any) -> bool:
+    """Return whether an on/off style value (e.g. ``Ligado``) reads as on."""
+    if value is None:
+        return False
+    return str(value).strip().lower() not in _OFF_VALUES
+
+
+# Raw values repeat from poll to poll ("0 km/h", "5 min", ...), so parsed text
+# is memoised; the caches are bounded and only ever hold strings.
+_CACHE_SIZE = 4096
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Parse the first number of a value such as ``45``, ``"45 km/h"`` or ``"12,4 V"``."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_number_text(str(value))
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _parse_number_text(text: str) -> Optional[float]:
+    """Parse the first number of a text."""
+    match = _NUMBER.search(text)
+    return float(match.group().replace(",", ".")) if match else None
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Parse a duration such as ``"1h 5min 3s"``, ``"2d 3h"`` or ``"01:05:03"``.
+
+    Returns:
+        The duration in seconds, or None when the value is not recognised.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_duration_text(str(value).strip())
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _parse_duration_text(text: str) -> Optional[float]:
+    """Parse a stripped duration text into seconds."""
+    clock = _CLOCK.match(text)
+    if clock:
+        hours, minutes, seconds = clock.groups()
+        return float(int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds))
+    parts = _DURATION_PART.findall(text)
+    if not parts:
+        return None
+    return sum(
+        float(amount.replace(",", ".")) * _DURATION_UNITS[unit.lower()]
+        for amount, unit in parts
+    )
+
+
+def parse_timestamp(value: Any, utc_offset: Optional[float] = None) -> Optional[float]:
+    """Parse a tracker time such as ``"17-10-2026 12:00:00"`` into epoch seconds.
+
+    Day-first (``DD-MM-YYYY``) and ISO-like (``YYYY-MM-DD``) dates are
+    accepted, with ``-``, ``/`` or ``.`` separators and optional seconds.
+    Numbers are taken as epoch seconds already.
+
+    Args:
+        value: Raw time value.
+        utc_offset: Seconds the tracker's clock is ahead of UTC; the host
+            local time zone is assumed when None.
+
+    Returns:
+        Epoch seconds, or None when the value is not recognised.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return _parse_timestamp_text(str(value).strip(), utc_offset)
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _parse_timestamp_text(text: str, utc_offset: Optional[float]) -> Optional[float]:
+    """Parse a stripped tracker time text into epoch seconds."""
+    match = _TIMESTAMP.match(text)
+    if not match:
+        return None
+    first, month, last, hour, minute, second = match.groups()
+    year, day = (first, last) if len(first) == 4 else (last, first)
+    try:
+        moment = datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second or 0)
+        )
+    except ValueError:
+        return None
+    if utc_offset is None:
+        return moment.timestamp()
+    return moment.replace(tzinfo=timezone(timedelta(seconds=utc_offset))).timestamp()
+
+
+def format_timestamp(value: Any) -> str:
+    """Format epoch seconds as host local time, e.g. ``2024-01-01 12:00:00``."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return "N/A" if value in (None, "") else str(value)
+    return datetime.fromtimestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def format_duration(value: Any) -> str:
+    """Format seconds as e.g. ``1h 5min 3s``; ``0s`` for zero."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return "N/A" if value in (None, "") else str(value)
+    remaining = int(round(value))
+    parts = []
+    for unit, size in (("d", 86400), ("h", 3600), ("min", 60), ("s", 1)):
+        amount, remaining = divmod(remaining, size)
+        if amount:
+            parts.append(f"{amount}{unit}")
+    return " ".join(parts) or "0s"
+
+
+def format_speed(value: Any) -> str:
+    """Format a speed in km/h, e.g. ``45 km/h``."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return "N/A" if value in (None, "") else str(value)
+    return f"{value:g} km/h"
+
+
+# Mean Earth radius used by the haversine distances, in meters.
+EARTH_RADIUS_M = 6_371_000.0
+
+
+def distance_m(
+    lat1: Optional[float],
+    lng1: Optional[float],
+    lat2: Optional[float],
+    lng2: Optional[float],
+) -> float:
+    """Return the great-circle distance in metres, NaN when a position is unknown."""
+    if lat1 is None or lng1 is None or lat2 is None or lng2 is None:
+        return math.nan
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
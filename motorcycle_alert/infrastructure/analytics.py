@@ -0,0 +1,288 @@
+"""Vectorised trip detection and daily summaries over the telemetry log.
+
+Every computation is a handful of NumPy array operations over a vehicle's
+whole history: step distances come from one vectorised haversine, and
+per-trip and per-day totals from cumulative sums, ``bincount`` and
+``reduceat`` instead of per-sample Python loops. Needs the ``analytics``
+extra.
+
+Run ``python -m motorcycle_alert.infrastructure.analytics <TELEMETRY_DIR>``
+to print daily summaries as CSV.
+"""
+
+import argparse
+import csv
+import dataclasses
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from motorcycle_alert.domain.values import EARTH_RADIUS_M
+from motorcycle_alert.infrastructure.telemetry import TelemetryReader, require_numpy
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None
+
+_SECONDS_PER_DAY = 86_400
+
+# Columns needed by the analytics.
+ANALYTICS_COLUMNS = ("time", "lat", "lng", "speed", "ignition")
+
+
+@dataclass(frozen=True)
+class Trip:
+    """A stretch of polls with the ignition on.
+
+    A trip starts on the first poll with the ignition on and ends on the
+    next poll with it off, where the vehicle was parked.
+    """
+
+    object_id: str
+    start: float
+    end: float
+    distance_m: float
+    max_speed: float
+    avg_speed: float
+    idle_seconds: float
+    samples: int
+
+    @property
+    def duration(self) -> float:
+        """Return the trip duration in seconds."""
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class DailySummary:
+    """Movement of one vehicle over one calendar day."""
+
+    object_id: str
+    day: str
+    trips: int
+    distance_m: float
+    driving_seconds: float
+    idle_seconds: float
+    max_speed: float
+    avg_speed: float
+
+
+def step_distances(lat: "np.ndarray", lng: "np.ndarray") -> "np.ndarray":
+    """Return the haversine distance in metres from each sample to the next.
+
+    Element ``i`` is the distance covered between samples ``i - 1`` and
+    ``i``; the first element and steps with an unknown position are 0.
+    """
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lng = np.radians(np.asarray(lng, dtype=np.float64))
+    distances = np.zeros(len(lat))
+    if len(lat) < 2:
+        return distances
+    d_lat = lat[1:] - lat[:-1]
+    d_lng = lng[1:] - lng[:-1]
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * (
+        np.sin(d_lng / 2) ** 2
+    )
+    distances[1:] = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return np.nan_to_num(distances, nan=0.0)
+
+
+def _step_seconds(times: "np.ndarray", gap: float) -> "np.ndarray":
+    """Return the seconds since the previous sample, 0 across gaps over ``gap``."""
+    seconds = np.zeros(len(times))
+    seconds[1:] = np.diff(times)
+    seconds[seconds > gap] = 0.0
+    return seconds
+
+
+def detect_trips(
+    columns: Dict[str, "np.ndarray"],
+    object_id: str = "",
+    idle_speed: float = 3.0,
+    max_gap: float = 3600.0,
+) -> List[Trip]:
+    """Split a vehicle's samples into trips.
+
+    Args:
+        columns: Telemetry columns of one vehicle, sorted by time.
+        object_id: Vehicle the samples belong to.
+        idle_speed: Speed in km/h under which the running vehicle is idle.
+        max_gap: Seconds between samples beyond which the interval (e.g.
+            while the poller was down) counts towards no idle time.
+
+    Returns:
+        The trips in chronological order.
+    """
+    require_numpy()
+    times = np.asarray(columns["time"], dtype=np.float64)
+    count = len(times)
+    if not count:
+        return []
+    on = np.asarray(columns["ignition"]).astype(bool)
+    speed = np.asarray(columns["speed"], dtype=np.float64)
+
+    edges = np.diff(np.concatenate(([0], on.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)  # first sample off, or ``count``
+    if not len(starts):
+        return []
+    last = np.minimum(stops, count - 1)
+
+    # Prefix sums give each trip's totals as two lookups: a step i belongs
+    # to the trip when start < i <= last.
+    distance = np.concatenate(
+        ([0.0], np.cumsum(step_distances(columns["lat"], columns["lng"])))
+    )
+    seconds = _step_seconds(times, max_gap)
+    idle_steps = np.zeros(count)
+    idle_steps[1:] = seconds[1:] * (on[:-1] & (np.nan_to_num(speed[:-1]) < idle_speed))
+    idle = np.concatenate(([0.0], np.cumsum(idle_steps)))
+    trip_distance = distance[last + 1] - distance[starts + 1]
+    trip_idle = idle[last + 1] - idle[starts + 1]
+
+    # fmax ignores NaN; reduceat over [start, stop) pairs, padded so that a
+    # trip running to the end of the data has a valid stop index.
+    padded = np.append(speed, np.nan)
+    bounds = np.empty(2 * len(starts), dtype=np.intp)
+    bounds[0::2], bounds[1::2] = starts, stops
+    max_speed = np.fmax.reduceat(padded, bounds)[0::2]
+
+    duration = times[last] - times[starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_speed = np.where(duration > 0, trip_distance / duration * 3.6, np.nan)
+
+    return [
+        Trip(
+            object_id=object_id,
+            start=float(times[s]),
+            end=float(times[e]),
+            distance_m=float(d),
+            max_speed=float(m),
+            avg_speed=float(a),
+            idle_seconds=float(i),
+            samples=int(e - s + 1),
+        )
+        for s, e, d, m, a, i in zip(
+            starts, last, trip_distance, max_speed, avg_speed, trip_idle
+        )
+    ]
+
+
+def daily_summaries(
+    columns: Dict[str, "np.ndarray"],
+    object_id: str = "",
+    utc_offset: float = 0.0,
+    idle_speed: float = 3.0,
+    max_gap: float = 3600.0,
+) -> List[DailySummary]:
+    """Aggregate a vehicle's samples into one summary per calendar day.
+
+    A step between two samples is credited to the day of the later one;
+    driving and idle time count steps that started with the ignition on.
+
+    Args:
+        columns: Telemetry columns of one vehicle, sorted by time.
+        object_id: Vehicle the samples belong to.
+        utc_offset: Seconds added to UTC to get the local day, e.g. -14400.
+        idle_speed: Speed in km/h under which the running vehicle is idle.
+        max_gap: Seconds between samples beyond which the interval counts
+            towards no driving or idle time.
+
+    Returns:
+        Summaries of the days with samples, in chronological order.
+    """
+    require_numpy()
+    times = np.asarray(columns["time"], dtype=np.float64)
+    count = len(times)
+    if not count:
+        return []
+    on = np.asarray(columns["ignition"]).astype(bool)
+    speed = np.asarray(columns["speed"], dtype=np.float64)
+
+    day_numbers = np.floor((times + utc_offset) / _SECONDS_PER_DAY).astype(np.int64)
+    days, day_index = np.unique(day_numbers, return_inverse=True)
+    day_starts = np.flatnonzero(np.diff(np.concatenate(([-1], day_index))))
+
+    seconds = _step_seconds(times, max_gap)
+    running = np.zeros(count, dtype=bool)
+    running[1:] = on[:-1]
+    idle = np.zeros(count, dtype=bool)
+    idle[1:] = on[:-1] & (np.nan_to_num(speed[:-1]) < idle_speed)
+    distance = step_distances(columns["lat"], columns["lng"])
+
+    day_count = len(days)
+    total_distance = np.bincount(day_index, weights=distance, minlength=day_count)
+    driving = np.bincount(day_index, weights=seconds * running, minlength=day_count)
+    idling = np.bincount(day_index, weights=seconds * idle, minlength=day_count)
+    trip_starts = on & ~np.concatenate(([False], on[:-1]))
+    trips = np.bincount(day_index[trip_starts], minlength=day_count)
+    max_speed = np.fmax.reduceat(speed, day_starts)
+    moving = driving - idling
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_speed = np.where(moving > 0, total_distance / moving * 3.6, np.nan)
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return [
+        DailySummary(
+            object_id=object_id,
+            day=(epoch + timedelta(days=int(day))).date().isoformat(),
+            trips=int(trips[k]),
+            distance_m=float(total_distance[k]),
+            driving_seconds=float(driving[k]),
+            idle_seconds=float(idling[k]),
+            max_speed=float(max_speed[k]),
+            avg_speed=float(avg_speed[k]),
+        )
+        for k, day in enumerate(days)
+    ]
+
+
+def fleet_daily_summaries(
+    reader: TelemetryReader,
+    object_ids: Optional[Sequence[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    utc_offset: float = 0.0,
+) -> List[DailySummary]:
+    """Summarise every day of every vehicle of a telemetry log.
+
+    Args:
+        reader: Reader of the telemetry log.
+        object_ids: Vehicles to summarise; all vehicles of the log when omitted.
+        start: Inclusive lower time bound, in epoch seconds.
+        end: Exclusive upper time bound, in epoch seconds.
+        utc_offset: Seconds added to UTC to get the local day.
+    """
+    summaries = []
+    for object_id in object_ids or reader.vehicles():
+        columns = reader.read(object_id, start, end, columns=ANALYTICS_COLUMNS)
+        summaries.extend(daily_summaries(columns, object_id, utc_offset=utc_offset))
+    return summaries
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Print the daily summaries of a telemetry log as CSV."""
+    parser = argparse.ArgumentParser(description="Daily telemetry summaries")
+    parser.add_argument("directory", help="Telemetry log directory (TELEMETRY_DIR)")
+    parser.add_argument("--vehicle", action="append", help="Vehicle to summarise")
+    parser.add_argument(
+        "--utc-offset", type=float, default=0.0, help="Local time offset in hours"
+    )
+    args = parser.parse_args(argv)
+
+    summaries = fleet_daily_summaries(
+        TelemetryReader(args.directory),
+        object_ids=args.vehicle,
+        utc_offset=args.utc_offset * 3600,
+    )
+    fields = [field.name for field in dataclasses.fields(DailySummary)]
+    writer = csv.DictWriter(sys.stdout, fieldnames=fields)
+    writer.writeheader()
+    for summary in summaries:
+        writer.writerow(dataclasses.asdict(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,354 @@
 """HTTP client for motorcycle data API."""
 
+import asyncio
+import dataclasses
+import io
+import json
 import logging
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeVar
 
-import requests
-
-from motorcycle_alert.domain.models import MotorcycleStatus
-from motorcycle_alert.domain.services import MotorcycleDataRepository
-from motorcycle_alert.infrastructure.config import Config, get_api_headers
+from motorcycle_alert.domain.models import COMPARED_FIELDS, MotorcycleStatus
+from motorcycle_alert.domain.services import (
+    FleetDataRepository,
+    MotorcycleDataRepository,
+)
+from motorcycle_alert.domain.values import (
+    parse_duration,
+    parse_number,
+    parse_timestamp,
+)
+from motorcycle_alert.infrastructure.conditional import ConditionalCache
+from motorcycle_alert.infrastructure.config import (
+    API_PARSER_STREAM,
+    Config,
+    get_api_headers,
+)
+from motorcycle_alert.infrastructure.http_client import (
+    FETCH_ERRORS,
+    HttpFetcher,
+    create_http_fetcher,
+)
+from motorcycle_alert.infrastructure.metrics import PARSE_SECONDS
+from motorcycle_alert.infrastructure.sensors import SensorSchema
+from motorcycle_alert.infrastructure.streaming_parser import (
+    parse_items,
+    require_ijson,
+)
 
 logger = logging.getLogger(__name__)
 
+# Sensor fields stored as MotorcycleStatus attributes rather than extras.
+CORE_SENSOR_FIELDS = frozenset({"alimentation", "blocked", "ignition"})
+# Fields a probe refreshes on the last full status when nothing compared changed.
+PROBE_FRESH_FIELDS = ("time", "stop_duration", "speed", "lat", "lng")
+
+T = TypeVar("T")
+
 
-class ApiMotorcycleDataRepository(MotorcycleDataRepository):
-    """Implementation of motorcycle data repository using HTTP API."""
+class ApiMotorcycleDataRepository(MotorcycleDataRepository, FleetDataRepository):
+    """Implementation of motorcycle data repository using HTTP API.
 
-    def __init__(self, config: Config):
-        """Initialize the repository with configuration."""
+    With ``config.probe_fetch`` each poll first sends a ``full=false`` probe.
+    When it shows the compared fields unchanged, the last full status is
+    returned with the probe's time, speed and position; a possible change, a
+    failed probe or a due ``config.full_refresh_interval`` escalates to a
+    ``full=true`` fetch. ``stats`` counts ``probes``, ``escalations`` and
+    ``full_fetches``.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        fetcher: Optional[HttpFetcher] = None,
+        object_id: Optional[str] = None,
+        sensor_schema: Optional[SensorSchema] = None,
+        conditional_cache: Optional[ConditionalCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the repository with configuration.
+
+        Args:
+            config: Application configuration.
+            fetcher: HTTP engine to use; built from ``config.http_client`` when
+                omitted, in which case the repository owns and closes it. Pass
+                one shared fetcher to every vehicle of a fleet.
+            object_id: Vehicle to poll; defaults to ``config.object_id``.
+            sensor_schema: Sensor mapping table; loaded from
+                ``config.sensor_schema_file`` when omitted. Share one across
+                a fleet so normalised names are cached once.
+            conditional_cache: Cache of the last responses, skipping unchanged
+                ones; created when omitted and ``config.conditional_fetch``
+                is set. Share one across a fleet to aggregate its ``stats``.
+            clock: Monotonic time source for full refreshes, replaceable in tests.
+            headers: API session headers; read from the environment when omitted.
+        """
         self._config = config
-        self._headers = get_api_headers()
+        self._object_id = object_id or config.object_id
+        self._headers = headers or get_api_headers()
+        self._utc_offset = (
+            config.api_utc_offset * 3600 if config.api_utc_offset is not None else None
+        )
+        self._owns_fetcher = fetcher is None
+        self._fetcher = fetcher or create_http_fetcher(config)
+        self._sensor_schema = sensor_schema or SensorSchema.load(
+            config.sensor_schema_file
+        )
+        self._streaming = config.api_parser == API_PARSER_STREAM
+        if self._streaming:
+            require_ijson()
+        self._conditional = conditional_cache
+        if self._conditional is None and config.conditional_fetch:
+            self._conditional = ConditionalCache()
+        self._clock = clock
+        # Last full statuses, and when and for which vehicles each request
+        # (keyed by its query) was last fully fetched.
+        self._full: Dict[str, MotorcycleStatus] = {}
+        self._refreshed_at: Dict[str, float] = {}
+        self._fetched_ids: Dict[str, Set[str]] = {}
+        self.stats: Counter = Counter()
+
+    @property
+    def conditional_cache(self) -> Optional[ConditionalCache]:
+        """Return the cache of conditional fetches, None when disabled."""
+        return self._conditional
+
+    def set_headers(self, headers: Dict[str, str]) -> None:
+        """Send ``headers`` from the next request on, e.g. after a session rotation.
+
+        Requests in flight keep the headers they were started with.
+        """
+        self._headers = headers
 
     async def get_current_status(self) -> MotorcycleStatus:
         """Get current motorcycle status from external API."""
-        try:
-            ts_ms = int(datetime.now().timestamp() * 1000)
-            url = f"{self._config.api_base_url}/objects/items?id={self._config.object_id}&full=true&_={ts_ms}"
+        query = f"id={self._object_id}"
 
-            logger.debug(f"Fetching motorcycle data from: {url}")
+        def parse(data: Dict[str, Any]) -> Dict[str, MotorcycleStatus]:
+            return {self._object_id: self._parse_api_response(data)}
 
-            response = requests.get(url, headers=self._headers, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-            return self._parse_api_response(data)
+        try:
+            statuses = await self._probe(query, parse)
+            if statuses is None:
+                url = self._items_url(query, full=True)
+                logger.debug("Fetching motorcycle data from: %s", url)
+                statuses = await self._get(url, parse, "full")
+                self._remember(query, statuses)
+            return statuses[self._object_id]
 
-        except requests.RequestException as e:
+        except FETCH_ERRORS as e:
             logger.error(f"Failed to fetch motorcycle data: {e}")
             raise
         except (KeyError, IndexError) as e:
             logger.error(f"Failed to parse API response: {e}")
             raise
 
+    async def get_fleet_status(
+        self, object_ids: Optional[Sequence[str]] = None
+    ) -> Dict[str, MotorcycleStatus]:
+        """Fetch many vehicles with one ``/objects/items`` request per batch.
+
+        IDs are sent comma-separated, ``config.batch_size`` per request, and the
+        batches are fetched concurrently. Without IDs the whole account listing
+        is requested in a single round trip.
+
+        Args:
+            object_ids: Vehicles to fetch, or None for every vehicle on the account.
+
+        Returns:
+            Parsed statuses keyed by object ID. Vehicles missing from the
+            response or with unparseable data are left out.
+        """
+        if object_ids is None:
+            batches: List[Optional[Sequence[str]]] = [None]
+        else:
+            size = self._config.batch_size or len(object_ids) or 1
+            batches = [
+                object_ids[i : i + size] for i in range(0, len(object_ids), size)
+            ]
+
+        responses = await asyncio.gather(
+            *(self._fetch_items(batch) for batch in batches)
+        )
+
+        statuses: Dict[str, MotorcycleStatus] = {}
+        for batch_statuses in responses:
+            statuses.update(batch_statuses)
+        return statuses
+
+    async def _fetch_items(
+        self, object_ids: Optional[Sequence[str]]
+    ) -> Dict[str, MotorcycleStatus]:
+        """Request ``/objects/items`` for the given IDs, or for all when None."""
+        query = f"id={','.join(object_ids)}" if object_ids is not None else ""
+        try:
+            statuses = await self._probe(query, self._parse_fleet_response)
+            if statuses is None:
+                url = self._items_url(query, full=True)
+                logger.debug("Fetching fleet data from: %s", url)
+                statuses = await self._get(url, self._parse_fleet_response, "full")
+                self._remember(query, statuses)
+            return statuses
+        except FETCH_ERRORS as e:
+            logger.error(f"Failed to fetch fleet data: {e}")
+            raise
+
+    def _items_url(self, query: str, full: bool) -> str:
+        """Build an ``/objects/items`` URL with a cache-busting timestamp."""
+        ts_ms = int(datetime.now().timestamp() * 1000)
+        prefix = f"{query}&" if query else ""
+        return (
+            f"{self._config.api_base_url}/objects/items?"
+            f"{prefix}full={'true' if full else 'false'}&_={ts_ms}"
+        )
+
+    async def _get(
+        self, url: str, parse: Callable[[Dict[str, Any]], T], request: str
+    ) -> T:
+        """Fetch ``url`` and parse its document, through the conditional cache.
+
+        The parse time is recorded under ``request`` (``full`` or ``probe``);
+        it includes decoding the body unless the engine decodes it.
+        """
+
+        def timed(data: Any, decode: Callable[[Any], Dict[str, Any]]) -> T:
+            started = time.perf_counter()
+            try:
+                return parse(decode(data))
+            finally:
+                PARSE_SECONDS.observe(time.perf_counter() - started, request)
+
+        if self._conditional is not None:
+            return await self._conditional.fetch(
+                self._fetcher,
+                url,
+                self._headers,
+                lambda body: timed(body, self._decode),
+            )
+        return timed(await self._fetch_payload(url), lambda data: data)
+
+    async def _probe(
+        self,
+        query: str,
+        parse: Callable[[Dict[str, Any]], Dict[str, MotorcycleStatus]],
+    ) -> Optional[Dict[str, MotorcycleStatus]]:
+        """Probe a request with ``full=false``.
+
+        Returns:
+            The last full statuses refreshed by the probe, or None when a
+            full fetch is needed.
+        """
+        if not self._config.probe_fetch:
+            return None
+        refreshed_at = self._refreshed_at.get(query)
+        if (
+            refreshed_at is None
+            or self._clock() - refreshed_at >= self._config.full_refresh_interval
+        ):
+            return None
+
+        self.stats["probes"] += 1
+        url = self._items_url(query, full=False)
+        logger.debug("Probing: %s", url)
+        try:
+            probed = await self._get(url, parse, "probe")
+        except (ValueError, KeyError, IndexError) as e:
+            logger.warning(f"Probe response unusable, fetching full data: {e}")
+            probed = {}
+        merged = self._merge_probe(query, probed)
+        if merged is None:
+            self.stats["escalations"] += 1
+            logger.debug("Probe shows a possible change, fetching full data")
+        return merged
+
+    def _merge_probe(
+        self, query: str, probed: Dict[str, MotorcycleStatus]
+    ) -> Optional[Dict[str, MotorcycleStatus]]:
+        """Refresh the last full statuses with a probe, None if anything changed."""
+        if not probed or not self._fetched_ids[query] <= probed.keys():
+            return None
+        merged = {}
+        for object_id, probe in probed.items():
+            full = self._full.get(object_id)
+            if full is None or any(
+                getattr(probe, field) != getattr(full, field)
+                for field in COMPARED_FIELDS
+            ):
+                return None
+            fresh = {
+                field: getattr(probe, field)
+                for field in PROBE_FRESH_FIELDS
+                if getattr(probe, field) is not None
+            }
+            merged[object_id] = dataclasses.replace(full, **fresh)
+        return merged
+
+    def _remember(self, query: str, statuses: Dict[str, MotorcycleStatus]) -> None:
+        """Record the result of a full fetch, which probes are compared against."""
+        self.stats["full_fetches"] += 1
+        if not self._config.probe_fetch:
+            return
+        self._full.update(statuses)
+        self._fetched_ids[query] = set(statuses)
+        self._refreshed_at[query] = self._clock()
+
+    async def _fetch_payload(self, url: str) -> Dict[str, Any]:
+        """Fetch ``url`` with the configured parser (full JSON or streaming)."""
+        if self._streaming:
+            return await self._fetcher.get_status_items(url, self._headers)
+        return await self._fetcher.get_json(url, self._headers)
+
+    def _decode(self, body: bytes) -> Dict[str, Any]:
+        """Decode a raw body with the configured parser (full JSON or streaming)."""
+        if self._streaming:
+            return parse_items(io.BytesIO(body))
+        return json.loads(body)
+
+    async def close(self) -> None:
+        """Close the HTTP engine if this repository created it."""
+        if self._owns_fetcher:
+            await self._fetcher.close()
+
     def _parse_api_response(self, data: Dict[str, Any]) -> MotorcycleStatus:
         """Parse API response into MotorcycleStatus domain model."""
         if not data.get("data") or not data["data"]:
             raise ValueError("Invalid API response: no data found")
 
-        item_data = data["data"][0]
+        return self._parse_item(data["data"][0], self._object_id)
 
-        # Extract basic fields
+    def _parse_fleet_response(
+        self, data: Dict[str, Any]
+    ) -> Dict[str, MotorcycleStatus]:
+        """Parse every element of the ``data`` list, keyed by its ``id``."""
+        statuses = {}
+        for item_data in data.get("data") or []:
+            object_id = item_data.get("id")
+            if object_id is None:
+                logger.warning("Skipping API item without an id")
+                continue
+            try:
+                statuses[str(object_id)] = self._parse_item(item_data, str(object_id))
+            except ValueError as e:
+                logger.error(f"Failed to parse data of vehicle {object_id}: {e}")
+        return statuses
+
+    def _parse_item(
+        self, item_data: Dict[str, Any], object_id: str
+    ) -> MotorcycleStatus:
+        """Parse one element of the API ``data`` list into a MotorcycleStatus."""
+        # Extract basic fields, typed once here (the parsers are memoised)
         icon_color = item_data.get("icon_color", "")
-        time_mt = item_data.get("time", "")
-        stop_duration = item_data.get("stop_duration", "")
-        speed = item_data.get("speed", "")
+        time_mt = parse_timestamp(item_data.get("time"), self._utc_offset)
+        stop_duration = parse_duration(item_data.get("stop_duration"))
+        speed = parse_number(item_data.get("speed"))
 
         # Parse sensors
         sensors = self._parse_sensors(item_data.get("sensors", []))
 
-        return MotorcycleStatus(
+        return MotorcycleStatus.create(
             icon_color=icon_color,
             alimentation=sensors.get("alimentation", ""),
             blocked=sensors.get("blocked", False),
@@ -67,33 +357,13 @@ class ApiMotorcycleDataRepository(MotorcycleDataRepository):
             stop_duration=stop_duration,
             speed=speed,
             additional_sensors={
-                k: v
-                for k, v in sensors.items()
-                if k not in ["alimentation", "blocked", "ignition"]
+                k: v for k, v in sensors.items() if k not in CORE_SENSOR_FIELDS
             },
             lat=item_data.get("lat"),
             lng=item_data.get("lng"),
+            object_id=object_id,
         )
 
     def _parse_sensors(self, sensors_data: list) -> Dict[str, Any]:
         """Parse sensors data from API response."""
-        sensors = {}
-
-        for sensor in sensors_data:
-            name = sensor.get("name", "").lower().strip()
-            value = sensor.get("value")
-
-            if not name or value is None:
-                continue
-
-            # Map known sensor names to standard names
-            if name == "alimentacao":
-                sensors["alimentation"] = value
-            elif name == "ignicao":
-                sensors["ignition"] = value
-            elif name == "bloqueio":
-                sensors["blocked"] = bool(value.lower() != "desligado")
-            else:
-                sensors[name] = value
-
-        return sensors
+        return self._sensor_schema.parse(sensors_data)
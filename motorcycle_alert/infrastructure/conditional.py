@@ -0,0 +1,130 @@
+"""Conditional fetching: skip decoding and parsing of unchanged API responses.
+
+A parked vehicle answers every poll with the same payload. When the tracker
+sends ``ETag`` or ``Last-Modified`` headers, the next request carries them
+back as ``If-None-Match`` / ``If-Modified-Since`` and a ``304 Not Modified``
+answer costs no body at all. Otherwise the raw body is hashed and, when the
+hash matches the previous response, the result parsed last time is reused.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from motorcycle_alert.infrastructure.http_client import HttpFetcher
+
+logger = logging.getLogger(__name__)
+
+# Query parameter of the cache-busting timestamp added to every API URL.
+CACHE_BUSTER_PARAM = "_"
+# Request headers that make a GET conditional, in lower case.
+_VALIDATOR_HEADERS = frozenset({"if-none-match", "if-modified-since"})
+
+
+@dataclass
+class _Entry:
+    """What is remembered of the last response to one resource."""
+
+    digest: bytes
+    value: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def resource_key(url: str) -> str:
+    """Return ``url`` without its cache-busting timestamp."""
+    parts = urlsplit(url)
+    query = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name != CACHE_BUSTER_PARAM
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query, safe=",")))
+
+
+class ConditionalCache:
+    """Remembers the last response per resource to skip unchanged ones.
+
+    Share one cache across the repositories of a fleet. ``stats`` counts
+    ``requests``, ``not_modified`` (304 answers), ``unchanged`` (bodies
+    equal to the previous one), ``parsed`` responses and ``refetched``
+    resources, answered 304 while nothing was cached for them; the
+    ``not_modified`` and ``unchanged`` polls skipped decoding and parsing.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[str, _Entry] = {}
+        self.stats: Counter = Counter()
+
+    @property
+    def skipped(self) -> int:
+        """Return the number of polls answered from the cache."""
+        return self.stats["not_modified"] + self.stats["unchanged"]
+
+    async def fetch(
+        self,
+        fetcher: HttpFetcher,
+        url: str,
+        headers: Dict[str, str],
+        parse: Callable[[bytes], Any],
+    ) -> Any:
+        """Fetch ``url`` and parse it, unless it is unchanged since last time.
+
+        Args:
+            fetcher: HTTP engine performing the request.
+            url: Absolute URL to request.
+            headers: HTTP headers sent with the request.
+            parse: Turns a raw body into the value to return; only called
+                for new content. A failing parse is not cached.
+
+        Returns:
+            The parsed value, reused from the previous call when unchanged.
+
+        Raises:
+            Any exception listed in ``FETCH_ERRORS``, or raised by ``parse``.
+            ValueError: If the server answers 304 to an unconditional request.
+        """
+        key = resource_key(url)
+        entry = self._entries.get(key)
+        if entry is not None:
+            headers = dict(headers)
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        self.stats["requests"] += 1
+        response = await fetcher.get_bytes(url, headers)
+
+        if response.not_modified:
+            if entry is not None:
+                self.stats["not_modified"] += 1
+                logger.debug("Not modified: %s", key)
+                return entry.value
+            # Nothing to reuse (e.g. validators set by the caller survived a
+            # restart): treat it as a miss and ask for the whole body.
+            self.stats["refetched"] += 1
+            logger.debug("Not modified but not cached, refetching: %s", key)
+            headers = {
+                name: value
+                for name, value in headers.items()
+                if name.lower() not in _VALIDATOR_HEADERS
+            }
+            response = await fetcher.get_bytes(url, headers)
+            if response.not_modified:
+                raise ValueError(f"Unconditional request answered 304: {key}")
+
+        digest = hashlib.blake2b(response.body, digest_size=16).digest()
+        if entry is not None and digest == entry.digest:
+            self.stats["unchanged"] += 1
+            logger.debug("Unchanged body: %s", key)
+        else:
+            entry = _Entry(digest, parse(response.body))
+            self._entries[key] = entry
+            self.stats["parsed"] += 1
+        entry.etag = response.etag
+        entry.last_modified = response.last_modified
+        return entry.value
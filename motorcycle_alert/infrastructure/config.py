@@ -1,9 +1,41 @@
 """Configuration management for motorcycle alert system."""
 
 import argparse
+import json
 import os
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from motorcycle_alert.domain.debounce import FieldRule
+from motorcycle_alert.domain.geofence import CircleZone, PolygonZone, Zone
+from motorcycle_alert.domain.models import COMPARED_FIELDS
+from motorcycle_alert.domain.rules import AlertRule
+
+HTTP_CLIENT_AIOHTTP = "aiohttp"
+HTTP_CLIENT_THREADED = "threaded"
+HTTP_CLIENT_REQUESTS = "requests"
+HTTP_CLIENT_MODES = (HTTP_CLIENT_AIOHTTP, HTTP_CLIENT_THREADED, HTTP_CLIENT_REQUESTS)
+
+API_PARSER_JSON = "json"
+API_PARSER_STREAM = "stream"
+API_PARSER_MODES = (API_PARSER_JSON, API_PARSER_STREAM)
+
+TELEGRAM_DELIVERY_QUEUE = "queue"
+TELEGRAM_DELIVERY_DIRECT = "direct"
+TELEGRAM_DELIVERY_MODES = (TELEGRAM_DELIVERY_QUEUE, TELEGRAM_DELIVERY_DIRECT)
+
+LOG_FORMAT_TEXT = "text"
+LOG_FORMAT_JSON = "json"
+LOG_FORMATS = (LOG_FORMAT_TEXT, LOG_FORMAT_JSON)
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+@dataclass(frozen=True)
+class VehicleConfig:
+    """A monitored vehicle and the chat its alerts are routed to."""
+
+    object_id: str
+    recipient: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -16,9 +48,73 @@ class Config:
     object_id: str
     check_interval: int
     status_file_path: str
+    http_client: str = HTTP_CLIENT_AIOHTTP
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    http_pool_size: int = 10
+    vehicles: Tuple[VehicleConfig, ...] = ()
+    max_concurrency: int = 10
+    batch_size: int = 0
+    fetch_all_objects: bool = False
+    api_parser: str = API_PARSER_JSON
+    sensor_schema_file: str = ""
+    adaptive_polling: bool = False
+    moving_interval: float = 15.0
+    parked_interval: float = 600.0
+    parked_after: float = 1800.0
+    max_backoff: float = 900.0
+    status_cache: bool = True
+    status_fsync: bool = True
+    status_db_path: str = ""
+    history_batch_size: int = 50
+    telemetry_dir: str = ""
+    telegram_delivery: str = TELEGRAM_DELIVERY_QUEUE
+    telegram_api_url: str = "https://api.telegram.org"
+    telegram_workers: int = 4
+    telegram_queue_size: int = 1000
+    telegram_chat_rate: float = 1.0
+    telegram_global_rate: float = 30.0
+    telegram_max_retries: int = 5
+    outbox_path: str = ""
+    outbox_fsync: bool = True
+    outbox_retry_interval: float = 60.0
+    outbox_dedup_window: float = 300.0
+    debounce_polls: int = 1
+    debounce_seconds: float = 0.0
+    debounce_rules: Tuple[Tuple[str, FieldRule], ...] = ()
+    coalesce_window: float = 0.0
+    alert_rules: Tuple[AlertRule, ...] = ()
+    geofences: Tuple[Zone, ...] = ()
+    api_utc_offset: Optional[float] = None
+    conditional_fetch: bool = True
+    probe_fetch: bool = False
+    full_refresh_interval: float = 600.0
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+    log_level: str = "INFO"
+    log_format: str = LOG_FORMAT_TEXT
+    log_file: str = "motorcycle_alert.log"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_rotate_interval: float = 0.0
+    log_backup_count: int = 5
+    log_debug_sample_rate: int = 1
+    workers: int = 0
+    objects_file: str = ""
+    config_watch_interval: float = 0.0
+
+    @property
+    def fleet(self) -> Tuple[VehicleConfig, ...]:
+        """Return the monitored vehicles, defaulting to ``object_id`` alone."""
+        return self.vehicles or (VehicleConfig(self.object_id),)
 
     def __post_init__(self):
         """Validate configuration."""
+        self._validate_required()
+        self._validate_limits()
+        self._validate_logging()
+
+    def _validate_required(self) -> None:
+        """Check that the credentials and the vehicle are set."""
         if not self.telegram_api_key:
             raise ValueError("TELEGRAM_API_KEY environment variable is required")
         if not self.telegram_user_id:
@@ -28,9 +124,231 @@ class Config:
         if not self.object_id:
             raise ValueError("OBJECT_ID environment variable is required")
 
+    def _validate_limits(self) -> None:
+        """Check that modes are known and limits are in range."""
+        if self.http_client not in HTTP_CLIENT_MODES:
+            raise ValueError(
+                f"HTTP_CLIENT must be one of {', '.join(HTTP_CLIENT_MODES)}"
+            )
+        if self.connect_timeout <= 0 or self.read_timeout <= 0:
+            raise ValueError("HTTP timeouts must be positive")
+        if self.http_pool_size < 1:
+            raise ValueError("HTTP_POOL_SIZE must be at least 1")
+        if self.max_concurrency < 1:
+            raise ValueError("MAX_CONCURRENCY must be at least 1")
+        if self.workers < 0:
+            raise ValueError("WORKERS cannot be negative")
+        if self.batch_size < 0:
+            raise ValueError("BATCH_SIZE cannot be negative")
+        if min(self.moving_interval, self.parked_interval, self.max_backoff) <= 0:
+            raise ValueError("Polling intervals must be positive")
+        if self.history_batch_size < 1:
+            raise ValueError("HISTORY_BATCH_SIZE must be at least 1")
+        if self.telegram_delivery not in TELEGRAM_DELIVERY_MODES:
+            raise ValueError(
+                f"TELEGRAM_DELIVERY must be one of {', '.join(TELEGRAM_DELIVERY_MODES)}"
+            )
+        if self.telegram_workers < 1 or self.telegram_queue_size < 1:
+            raise ValueError(
+                "TELEGRAM_WORKERS and TELEGRAM_QUEUE_SIZE must be positive"
+            )
+        if self.telegram_chat_rate <= 0 or self.telegram_global_rate <= 0:
+            raise ValueError("Telegram rate limits must be positive")
+        if self.outbox_retry_interval <= 0:
+            raise ValueError("OUTBOX_RETRY_INTERVAL must be positive")
+        if min(self.debounce_polls, self.debounce_seconds, self.coalesce_window) < 0:
+            raise ValueError("Debounce settings cannot be negative")
+        if not 0 <= self.metrics_port <= 65535:
+            raise ValueError("METRICS_PORT must be between 0 and 65535")
+        if self.full_refresh_interval < 0:
+            raise ValueError("FULL_REFRESH_INTERVAL cannot be negative")
+        if self.config_watch_interval < 0:
+            raise ValueError("CONFIG_WATCH_INTERVAL cannot be negative")
+        if self.api_parser not in API_PARSER_MODES:
+            raise ValueError(f"API_PARSER must be one of {', '.join(API_PARSER_MODES)}")
+
+    def _validate_logging(self) -> None:
+        """Check the log level, format and rotation settings."""
+        if self.log_level.upper() not in LOG_LEVELS:
+            raise ValueError(f"LOG_LEVEL must be one of {', '.join(LOG_LEVELS)}")
+        if self.log_format not in LOG_FORMATS:
+            raise ValueError(f"LOG_FORMAT must be one of {', '.join(LOG_FORMATS)}")
+        if self.log_max_bytes < 0 or self.log_rotate_interval < 0:
+            raise ValueError("LOG_MAX_BYTES and LOG_ROTATE_INTERVAL cannot be negative")
+        if self.log_backup_count < 1:
+            raise ValueError("LOG_BACKUP_COUNT must be at least 1")
+        if self.log_debug_sample_rate < 1:
+            raise ValueError("LOG_DEBUG_SAMPLE_RATE must be at least 1")
+
+    @property
+    def debounced(self) -> bool:
+        """Return whether status changes are debounced or coalesced."""
+        return bool(
+            self.debounce_rules
+            or self.debounce_polls != 1
+            or self.debounce_seconds
+            or self.coalesce_window
+        )
+
+    @property
+    def sharded(self) -> bool:
+        """Return whether the fleet is split across worker processes."""
+        return self.workers > 1
+
+    @property
+    def batched(self) -> bool:
+        """Return whether the fleet is fetched with batched requests."""
+        return self.batch_size > 0 or self.fetch_all_objects
+
+
+def parse_workers(value: str) -> int:
+    """Parse a worker count, where ``auto`` means one per CPU core."""
+    if value.strip().lower() == "auto":
+        return os.cpu_count() or 1
+    return int(value)
+
+
+def parse_vehicles(entries: List[str]) -> Tuple[VehicleConfig, ...]:
+    """Parse vehicle entries of the form ``object_id[:recipient]``.
+
+    Blank entries and ``#`` comments are ignored; duplicates keep the first entry.
+
+    Args:
+        entries: Raw entries, e.g. items of ``OBJECT_IDS`` or lines of a file.
+
+    Returns:
+        The vehicles in declaration order.
+    """
+    vehicles: Dict[str, VehicleConfig] = {}
+    for entry in entries:
+        entry = entry.split("#", 1)[0].strip()
+        if not entry:
+            continue
+        object_id, _, recipient = entry.partition(":")
+        object_id = object_id.strip()
+        if object_id not in vehicles:
+            vehicles[object_id] = VehicleConfig(object_id, recipient.strip() or None)
+    return tuple(vehicles.values())
+
+
+def parse_debounce_rules(spec: str) -> Tuple[Tuple[str, FieldRule], ...]:
+    """Parse debounce rules of the form ``field[:value]=polls[/seconds]``.
+
+    Entries are comma-separated, e.g. ``icon_color=3,ignition:Desligado=0/300``
+    confirms icon colors after 3 polls and ignition turning off after 5 minutes.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown field.
+    """
+    rules = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key, _, thresholds = entry.partition("=")
+        field = key.partition(":")[0].strip()
+        if field not in COMPARED_FIELDS or not thresholds:
+            raise ValueError(f"Invalid debounce rule: {entry}")
+        polls, _, seconds = thresholds.partition("/")
+        try:
+            rule = FieldRule(int(polls), float(seconds or 0))
+        except ValueError as e:
+            raise ValueError(f"Invalid debounce rule: {entry}") from e
+        rules.append((key.strip(), rule))
+    return tuple(rules)
+
+
+def load_alert_rules(file_path: str) -> Tuple[AlertRule, ...]:
+    """Load alert rules from a JSON file, or none when the path is empty.
+
+    The file holds a list of rules::
+
+        [{"name": "Speeding", "condition": "speed > 80", "cooldown": 600,
+          "recipient": "123456"}]
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid list of rules.
+    """
+    if not file_path:
+        return ()
+    with open(file_path, "r", encoding="utf-8") as file:
+        entries = json.load(file)
+    try:
+        return tuple(
+            AlertRule(
+                name=entry["name"],
+                condition=entry["condition"],
+                cooldown=float(entry.get("cooldown", 0)),
+                recipient=entry.get("recipient"),
+            )
+            for entry in entries
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid alert rules file {file_path}: {e!r}") from e
+
 
-def load_config() -> Config:
-    """Load configuration from environment variables and arguments."""
+def load_geofences(file_path: str) -> Tuple[Zone, ...]:
+    """Load geofence zones from a JSON file, or none when the path is empty.
+
+    The file holds a list of circles and polygons::
+
+        [{"name": "Home", "circle": {"lat": -3.1, "lng": -60.0, "radius": 150}},
+         {"name": "Depot", "polygon": [[-3.0, -60.1], [-3.0, -60.0], [-3.1, -60.0]],
+          "recipient": "123456"}]
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid list of zones.
+    """
+    if not file_path:
+        return ()
+    with open(file_path, "r", encoding="utf-8") as file:
+        entries = json.load(file)
+    zones: List[Zone] = []
+    try:
+        for entry in entries:
+            if "circle" in entry:
+                circle = entry["circle"]
+                zones.append(
+                    CircleZone(
+                        name=entry["name"],
+                        lat=float(circle["lat"]),
+                        lng=float(circle["lng"]),
+                        radius=float(circle["radius"]),
+                        recipient=entry.get("recipient"),
+                    )
+                )
+            else:
+                zones.append(
+                    PolygonZone(
+                        name=entry["name"],
+                        points=tuple(
+                            (float(lat), float(lng)) for lat, lng in entry["polygon"]
+                        ),
+                        recipient=entry.get("recipient"),
+                    )
+                )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid geofence file {file_path}: {e!r}") from e
+    return tuple(zones)
+
+
+def load_vehicles(object_ids: str, objects_file: str) -> Tuple[VehicleConfig, ...]:
+    """Load vehicles from a comma-separated list and/or a file with one per line."""
+    entries = object_ids.split(",") if object_ids else []
+    if objects_file:
+        with open(objects_file, "r", encoding="utf-8") as file:
+            entries.extend(file.read().splitlines())
+    return parse_vehicles(entries)
+
+
+def load_config(argv: Optional[Sequence[str]] = None) -> Config:
+    """Load configuration from environment variables and arguments.
+
+    Args:
+        argv: Command-line arguments; ``sys.argv[1:]`` when omitted.
+    """
     parser = argparse.ArgumentParser(
         description="Motorcycle Alert Configuration",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
@@ -50,15 +368,126 @@ def load_config() -> Config:
         help="Path to status file",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--http-client",
+        type=str,
+        choices=HTTP_CLIENT_MODES,
+        default=os.getenv("HTTP_CLIENT", HTTP_CLIENT_AIOHTTP),
+        help="HTTP engine used to poll the tracker API",
+    )
+
+    parser.add_argument(
+        "--objects-file",
+        type=str,
+        default=os.getenv("OBJECTS_FILE", ""),
+        help="File listing one object_id[:chat_id] per line",
+    )
+
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.getenv("MAX_CONCURRENCY", "10")),
+        help="Maximum number of vehicles polled at the same time",
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=int(os.getenv("BATCH_SIZE", "0")),
+        help="Vehicles fetched per /objects/items request (0 polls each separately)",
+    )
+
+    parser.add_argument(
+        "--api-parser",
+        type=str,
+        choices=API_PARSER_MODES,
+        default=os.getenv("API_PARSER", API_PARSER_JSON),
+        help="Decode whole API responses (json) or stream only needed fields",
+    )
+
+    parser.add_argument(
+        "--adaptive-polling",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("ADAPTIVE_POLLING", "false").lower() == "true",
+        help="Adapt the poll rate to ignition, speed, parking time and errors",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=parse_workers,
+        default=parse_workers(os.getenv("WORKERS", "0")),
+        help="Worker processes sharing the fleet; auto uses one per CPU core",
+    )
+
+    args = parser.parse_args(argv)
+
+    vehicles = load_vehicles(os.getenv("OBJECT_IDS", ""), args.objects_file)
+    object_id = os.getenv("OBJECT_ID", "")
+    if vehicles and not object_id:
+        object_id = vehicles[0].object_id
 
     return Config(
         telegram_api_key=os.getenv("TELEGRAM_API_KEY", ""),
         telegram_user_id=os.getenv("TELEGRAM_USER_ID", ""),
         api_base_url=os.getenv("API_BASE_URL", "https://servidormapa.com"),
-        object_id=os.getenv("OBJECT_ID", ""),
+        object_id=object_id,
         check_interval=args.check_interval,
         status_file_path=args.status_file,
+        http_client=args.http_client,
+        connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+        read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", "30")),
+        http_pool_size=int(os.getenv("HTTP_POOL_SIZE", "10")),
+        vehicles=vehicles,
+        max_concurrency=args.max_concurrency,
+        batch_size=args.batch_size,
+        fetch_all_objects=os.getenv("FETCH_ALL_OBJECTS", "false").lower() == "true",
+        api_parser=args.api_parser,
+        sensor_schema_file=os.getenv("SENSOR_SCHEMA_FILE", ""),
+        adaptive_polling=args.adaptive_polling,
+        moving_interval=float(os.getenv("MOVING_INTERVAL", "15")),
+        parked_interval=float(os.getenv("PARKED_INTERVAL", "600")),
+        parked_after=float(os.getenv("PARKED_AFTER", "1800")),
+        max_backoff=float(os.getenv("MAX_BACKOFF", "900")),
+        status_cache=os.getenv("STATUS_CACHE", "true").lower() == "true",
+        status_fsync=os.getenv("STATUS_FSYNC", "true").lower() == "true",
+        status_db_path=os.getenv("STATUS_DB_PATH", ""),
+        history_batch_size=int(os.getenv("HISTORY_BATCH_SIZE", "50")),
+        telemetry_dir=os.getenv("TELEMETRY_DIR", ""),
+        telegram_delivery=os.getenv("TELEGRAM_DELIVERY", TELEGRAM_DELIVERY_QUEUE),
+        telegram_api_url=os.getenv("TELEGRAM_API_URL", "https://api.telegram.org"),
+        telegram_workers=int(os.getenv("TELEGRAM_WORKERS", "4")),
+        telegram_queue_size=int(os.getenv("TELEGRAM_QUEUE_SIZE", "1000")),
+        telegram_chat_rate=float(os.getenv("TELEGRAM_CHAT_RATE", "1")),
+        telegram_global_rate=float(os.getenv("TELEGRAM_GLOBAL_RATE", "30")),
+        telegram_max_retries=int(os.getenv("TELEGRAM_MAX_RETRIES", "5")),
+        outbox_path=os.getenv("OUTBOX_PATH", ""),
+        outbox_fsync=os.getenv("OUTBOX_FSYNC", "true").lower() == "true",
+        outbox_retry_interval=float(os.getenv("OUTBOX_RETRY_INTERVAL", "60")),
+        outbox_dedup_window=float(os.getenv("OUTBOX_DEDUP_WINDOW", "300")),
+        debounce_polls=int(os.getenv("DEBOUNCE_POLLS", "1")),
+        debounce_seconds=float(os.getenv("DEBOUNCE_SECONDS", "0")),
+        debounce_rules=parse_debounce_rules(os.getenv("DEBOUNCE_RULES", "")),
+        coalesce_window=float(os.getenv("COALESCE_WINDOW", "0")),
+        alert_rules=load_alert_rules(os.getenv("ALERT_RULES_FILE", "")),
+        geofences=load_geofences(os.getenv("GEOFENCE_FILE", "")),
+        api_utc_offset=(
+            float(os.environ["API_UTC_OFFSET"]) if os.getenv("API_UTC_OFFSET") else None
+        ),
+        conditional_fetch=os.getenv("CONDITIONAL_FETCH", "true").lower() == "true",
+        probe_fetch=os.getenv("PROBE_FETCH", "false").lower() == "true",
+        full_refresh_interval=float(os.getenv("FULL_REFRESH_INTERVAL", "600")),
+        metrics_host=os.getenv("METRICS_HOST", "127.0.0.1"),
+        metrics_port=int(os.getenv("METRICS_PORT", "0")),
+        log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        log_format=os.getenv("LOG_FORMAT", LOG_FORMAT_TEXT),
+        log_file=os.getenv("LOG_FILE", "motorcycle_alert.log"),
+        log_max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        log_rotate_interval=float(os.getenv("LOG_ROTATE_INTERVAL", "0")),
+        log_backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+        log_debug_sample_rate=int(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1")),
+        workers=args.workers,
+        objects_file=args.objects_file,
+        config_watch_interval=float(os.getenv("CONFIG_WATCH_INTERVAL", "0")),
     )
 
 
@@ -0,0 +1,337 @@
+"""SQLite-backed history of every observed vehicle status."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.services import StatusStorage
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS status_history (
+        object_id TEXT NOT NULL,
+        time REAL NOT NULL,
+        changed INTEGER NOT NULL,
+        icon_color TEXT NOT NULL,
+        alimentation TEXT,
+        blocked INTEGER NOT NULL,
+        ignition TEXT,
+        reported_time REAL,
+        stop_duration REAL,
+        speed REAL,
+        lat REAL,
+        lng REAL,
+        sensors TEXT
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_status_history_object_time
+    ON status_history (object_id, time)
+    """,
+    # Partial index: change queries never touch the (much larger) unchanged rows.
+    """
+    CREATE INDEX IF NOT EXISTS idx_status_history_changes
+    ON status_history (object_id, time) WHERE changed = 1
+    """,
+)
+
+_COLUMNS = (
+    "object_id, time, changed, icon_color, alimentation, blocked, ignition, "
+    "reported_time, stop_duration, speed, lat, lng, sensors"
+)
+_INSERT = f"INSERT INTO status_history ({_COLUMNS}) VALUES ({', '.join('?' * 13)})"
+_SELECT = f"SELECT {_COLUMNS} FROM status_history"
+
+Row = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class StatusRecord:
+    """A status observed at ``time`` (epoch seconds)."""
+
+    time: float
+    status: MotorcycleStatus
+    changed: bool
+
+
+class SqliteStatusHistory:
+    """Status history of all vehicles in one SQLite database in WAL mode.
+
+    Observations are buffered and handed to a writer thread, which inserts
+    them in a single transaction, once ``batch_size`` rows are queued or
+    the oldest is ``flush_interval`` seconds old. Changes are handed over
+    at once, since they are what :meth:`last_change` must return after a
+    restart. Commits never run on the caller's thread, and
+    :meth:`last_change` is answered from memory for changes recorded by
+    this process, so polls do not wait for the database. Other queries
+    flush the buffer first and use the ``(object_id, time)`` indexes, so
+    their cost does not grow with the size of the history.
+
+    ``stats`` counts ``commits``, inserted ``rows`` and write ``errors``.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 50,
+        flush_interval: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Open (and create if needed) the history database.
+
+        Args:
+            db_path: Path of the SQLite database file.
+            batch_size: Buffered observations that trigger an insert.
+            flush_interval: Maximum age, in seconds, of a buffered observation.
+            clock: Source of observation timestamps, replaceable in tests.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or initialised.
+        """
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._buffer: List[Row] = []
+        self._batches: Deque[List[Row]] = deque()
+        self._writing = False
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._last_changes: Dict[str, MotorcycleStatus] = {}
+        # Serialises use of the connection by the writer and the queries.
+        self._db_lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+        self.stats: Counter = Counter()
+
+    @property
+    def buffered(self) -> int:
+        """Return the number of observations waiting to be written."""
+        with self._condition:
+            return len(self._buffer) + sum(len(batch) for batch in self._batches)
+
+    def record(self, object_id: str, status: MotorcycleStatus, changed: bool) -> None:
+        """Record an observed status of ``object_id``.
+
+        Args:
+            object_id: Vehicle the status belongs to.
+            status: Observed status.
+            changed: Whether the status differs from the previous one.
+        """
+        row = self._to_row(object_id, self._clock(), status, changed)
+        with self._condition:
+            if changed:
+                self._last_changes[object_id] = self._to_record(row).status
+            self._buffer.append(row)
+            oldest = self._buffer[0][1]
+            if (
+                changed
+                or len(self._buffer) >= self._batch_size
+                or row[1] - oldest >= self._flush_interval
+            ):
+                self._submit_locked()
+
+    def flush(self) -> None:
+        """Block until every buffered observation is inserted."""
+        with self._condition:
+            self._submit_locked()
+            while self._batches or self._writing:
+                self._condition.wait()
+
+    def _submit_locked(self) -> None:
+        """Hand the buffer to the writer thread; the condition must be held."""
+        if not self._buffer:
+            return
+        self._batches.append(self._buffer)
+        self._buffer = []
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="history-writer", daemon=True
+            )
+            self._writer.start()
+        self._condition.notify_all()
+
+    def _write_loop(self) -> None:
+        """Insert submitted batches until the history is closed."""
+        while True:
+            with self._condition:
+                while not self._batches and not self._closed:
+                    self._condition.wait()
+                if not self._batches:
+                    return
+                batch = self._batches.popleft()
+                self._writing = True
+            try:
+                with self._db_lock, self._connection:
+                    self._connection.executemany(_INSERT, batch)
+                self.stats["commits"] += 1
+                self.stats["rows"] += len(batch)
+                logger.debug("Inserted %d status history rows", len(batch))
+            except sqlite3.Error as e:
+                self.stats["errors"] += 1
+                logger.error(f"Failed to insert {len(batch)} history rows: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def last_status(self, object_id: str) -> Optional[MotorcycleStatus]:
+        """Return the most recent status of ``object_id``, or None."""
+        rows = self._query(
+            f"{_SELECT} WHERE object_id = ? ORDER BY time DESC LIMIT 1",
+            (object_id,),
+        )
+        return self._to_record(rows[0]).status if rows else None
+
+    def last_change(self, object_id: str) -> Optional[MotorcycleStatus]:
+        """Return the most recent status change of ``object_id``, or None.
+
+        Changes recorded by this process are answered from memory, so only
+        the first call per vehicle reads the database.
+        """
+        with self._condition:
+            status = self._last_changes.get(object_id)
+        if status is not None:
+            return status
+        with self._db_lock:
+            rows = self._connection.execute(
+                f"{_SELECT} WHERE object_id = ? AND changed = 1 "
+                "ORDER BY time DESC LIMIT 1",
+                (object_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        status = self._to_record(rows[0]).status
+        with self._condition:
+            return self._last_changes.setdefault(object_id, status)
+
+    def trip(self, object_id: str, start: float, end: float) -> List[StatusRecord]:
+        """Return the statuses of ``object_id`` observed between two epochs.
+
+        Args:
+            object_id: Vehicle to query.
+            start: Inclusive start, in epoch seconds.
+            end: Inclusive end, in epoch seconds.
+
+        Returns:
+            The records in chronological order.
+        """
+        rows = self._query(
+            f"{_SELECT} WHERE object_id = ? AND time BETWEEN ? AND ? ORDER BY time",
+            (object_id, start, end),
+        )
+        return [self._to_record(row) for row in rows]
+
+    def changes_since(self, object_id: str, since: float) -> List[StatusRecord]:
+        """Return the status changes of ``object_id`` since an epoch."""
+        rows = self._query(
+            f"{_SELECT} WHERE object_id = ? AND changed = 1 AND time >= ? "
+            "ORDER BY time",
+            (object_id, since),
+        )
+        return [self._to_record(row) for row in rows]
+
+    def changes_today(self, object_id: str) -> List[StatusRecord]:
+        """Return the status changes of ``object_id`` since local midnight."""
+        midnight = datetime.fromtimestamp(self._clock()).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return self.changes_since(object_id, midnight.timestamp())
+
+    def close(self) -> None:
+        """Insert buffered observations, stop the writer and close the database."""
+        with self._condition:
+            self._submit_locked()
+            self._closed = True
+            self._condition.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+        with self._db_lock:
+            self._connection.close()
+
+    def _query(self, sql: str, parameters: Sequence[Any]) -> List[Row]:
+        """Flush pending rows, then run a read query."""
+        self.flush()
+        with self._db_lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    @staticmethod
+    def _to_row(
+        object_id: str, observed_at: float, status: MotorcycleStatus, changed: bool
+    ) -> Row:
+        """Flatten a status into an insert row."""
+        sensors = status.additional_sensors
+        return (
+            object_id,
+            observed_at,
+            int(changed),
+            status.icon_color,
+            status.alimentation,
+            int(status.blocked),
+            status.ignition,
+            status.time,
+            status.stop_duration,
+            status.speed,
+            status.lat,
+            status.lng,
+            json.dumps(sensors, default=str) if sensors else None,
+        )
+
+    @staticmethod
+    def _to_record(row: Row) -> StatusRecord:
+        """Rebuild a record from a selected row."""
+        object_id, observed_at, changed, icon_color, alimentation, blocked = row[:6]
+        ignition, reported_time, stop_duration, speed, lat, lng, sensors = row[6:]
+        status = MotorcycleStatus(
+            icon_color=icon_color,
+            alimentation=alimentation,
+            blocked=bool(blocked),
+            ignition=ignition,
+            time=reported_time,
+            stop_duration=stop_duration,
+            speed=speed,
+            additional_sensors=json.loads(sensors) if sensors else None,
+            lat=lat,
+            lng=lng,
+            object_id=object_id,
+        )
+        return StatusRecord(time=observed_at, status=status, changed=bool(changed))
+
+
+class SqliteStatusStorage(StatusStorage):
+    """Status storage of one vehicle, kept in a shared :class:`SqliteStatusHistory`."""
+
+    def __init__(self, history: SqliteStatusHistory, object_id: str):
+        """Initialize the storage for ``object_id``."""
+        self._history = history
+        self._object_id = object_id
+
+    def load_last_status(self) -> Optional[MotorcycleStatus]:
+        """Load the last reported status, ignoring unchanged observations.
+
+        A debouncer records polls it has not confirmed yet; they must not
+        become the status the next change is compared to.
+        """
+        return self._history.last_change(self._object_id)
+
+    def save_status(self, status: MotorcycleStatus) -> None:
+        """Record a status change."""
+        self._history.record(self._object_id, status, changed=True)
+
+    def record_status(self, status: MotorcycleStatus) -> None:
+        """Record an unchanged observation."""
+        self._history.record(self._object_id, status, changed=False)
@@ -0,0 +1,313 @@
+"""HTTP fetch engines used to poll the tracker API."""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+
+import aiohttp
+
+from motorcycle_alert.infrastructure.config import (
+    HTTP_CLIENT_AIOHTTP,
+    HTTP_CLIENT_REQUESTS,
+    HTTP_CLIENT_THREADED,
+    Config,
+)
+from motorcycle_alert.infrastructure.metrics import http_trace_config
+from motorcycle_alert.infrastructure.streaming_parser import (
+    parse_items,
+    parse_items_async,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+# Exceptions raised by any fetcher when the request itself fails. Errors of
+# ``requests`` derive from OSError, so the library is only imported by the
+# engines built on it, keeping it off the startup path of the default one.
+FETCH_ERRORS = (OSError, aiohttp.ClientError, asyncio.TimeoutError)
+
+HTTP_NOT_MODIFIED = 304
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    """Raw response of a GET, with the validators of conditional requests."""
+
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """Return whether the server answered ``304 Not Modified``."""
+        return self.status == HTTP_NOT_MODIFIED
+
+
+class HttpFetcher(ABC):
+    """Abstract engine that performs GET requests and decodes JSON bodies."""
+
+    @abstractmethod
+    async def get_json(self, url: str, headers: Dict[str, str]) -> Any:
+        """Fetch ``url`` and return the decoded JSON body.
+
+        Args:
+            url: Absolute URL to request.
+            headers: HTTP headers sent with the request.
+
+        Returns:
+            The decoded JSON document.
+
+        Raises:
+            Any exception listed in ``FETCH_ERRORS`` on network or HTTP errors.
+        """
+        pass
+
+    @abstractmethod
+    async def get_status_items(self, url: str, headers: Dict[str, str]) -> Any:
+        """Fetch ``url`` and stream-extract only the status fields of each item.
+
+        The body is parsed incrementally as it arrives; see
+        ``motorcycle_alert.infrastructure.streaming_parser``.
+
+        Returns:
+            A ``{"data": [...]}`` document with the extracted fields only.
+        """
+        pass
+
+    @abstractmethod
+    async def get_bytes(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        """Fetch ``url`` and return the undecoded body and its validators.
+
+        A ``304 Not Modified`` answer to a conditional request is returned
+        with an empty body rather than raised.
+
+        Raises:
+            Any exception listed in ``FETCH_ERRORS`` on network or HTTP errors.
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release pooled connections and worker threads."""
+        return None
+
+
+class AiohttpFetcher(HttpFetcher):
+    """Non-blocking fetcher backed by a pooled, keep-alive ``aiohttp`` session."""
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        pool_size: int,
+        trace_configs: Sequence[aiohttp.TraceConfig] = (),
+    ):
+        """Initialize the fetcher; the session is created on first use.
+
+        Args:
+            connect_timeout: Seconds allowed to establish a connection.
+            read_timeout: Seconds allowed between reads of the response.
+            pool_size: Maximum number of simultaneous connections.
+            trace_configs: Request tracing hooks, e.g. phase timings.
+        """
+        self._timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._pool_size = pool_size
+        self._trace_configs = list(trace_configs)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it inside the running loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size, keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+                trace_configs=self._trace_configs or None,
+            )
+        return self._session
+
+    async def get_json(self, url: str, headers: Dict[str, str]) -> Any:
+        """Fetch ``url`` without blocking the event loop."""
+        async with self._get_session().get(url, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def get_status_items(self, url: str, headers: Dict[str, str]) -> Any:
+        """Parse the response body chunk by chunk as it is received."""
+        async with self._get_session().get(url, headers=headers) as response:
+            response.raise_for_status()
+            return await parse_items_async(response.content)
+
+    async def get_bytes(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        """Read the whole body without decoding it."""
+        async with self._get_session().get(url, headers=headers) as response:
+            response.raise_for_status()
+            body = (
+                b"" if response.status == HTTP_NOT_MODIFIED else await response.read()
+            )
+            return HttpResponse(
+                response.status,
+                body,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+
+    async def close(self) -> None:
+        """Close the underlying session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class ThreadedRequestsFetcher(HttpFetcher):
+    """Fetcher that offloads a pooled ``requests.Session`` to a bounded thread pool."""
+
+    def __init__(self, connect_timeout: float, read_timeout: float, pool_size: int):
+        """Initialize the session and the worker pool.
+
+        Args:
+            connect_timeout: Seconds allowed to establish a connection.
+            read_timeout: Seconds allowed between reads of the response.
+            pool_size: Number of worker threads and pooled connections.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._timeout = (connect_timeout, read_timeout)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="http-fetch"
+        )
+
+    def _get_json_sync(self, url: str, headers: Dict[str, str]) -> Any:
+        """Perform the blocking request on a worker thread."""
+        response = self._session.get(url, headers=headers, timeout=self._timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _get_status_items_sync(self, url: str, headers: Dict[str, str]) -> Any:
+        """Stream and parse the response on a worker thread."""
+        with self._session.get(
+            url, headers=headers, timeout=self._timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return parse_items(response.raw)
+
+    def _get_bytes_sync(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        """Read the body on a worker thread."""
+        return _to_response(
+            self._session.get(url, headers=headers, timeout=self._timeout)
+        )
+
+    async def get_json(self, url: str, headers: Dict[str, str]) -> Any:
+        """Fetch ``url`` on the thread pool and await the result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._get_json_sync, url, headers
+        )
+
+    async def get_status_items(self, url: str, headers: Dict[str, str]) -> Any:
+        """Stream-parse ``url`` on the thread pool and await the result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._get_status_items_sync, url, headers
+        )
+
+    async def get_bytes(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        """Read ``url`` on the thread pool and await the result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._get_bytes_sync, url, headers
+        )
+
+    async def close(self) -> None:
+        """Shut down the worker pool and close pooled connections."""
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+
+class RequestsFetcher(HttpFetcher):
+    """Legacy fetcher calling ``requests.get`` inline, blocking the event loop.
+
+    Kept as a selectable baseline for benchmarking against the async engines.
+    """
+
+    def __init__(self, connect_timeout: float, read_timeout: float):
+        """Initialize the fetcher with per-phase timeouts."""
+        import requests
+
+        self._requests = requests
+        self._timeout = (connect_timeout, read_timeout)
+
+    async def get_json(self, url: str, headers: Dict[str, str]) -> Any:
+        """Fetch ``url`` synchronously."""
+        response = self._requests.get(url, headers=headers, timeout=self._timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_status_items(self, url: str, headers: Dict[str, str]) -> Any:
+        """Stream-parse ``url`` synchronously."""
+        with self._requests.get(
+            url, headers=headers, timeout=self._timeout, stream=True
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return parse_items(response.raw)
+
+    async def get_bytes(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        """Read ``url`` synchronously."""
+        return _to_response(
+            self._requests.get(url, headers=headers, timeout=self._timeout)
+        )
+
+
+def _to_response(response: "requests.Response") -> HttpResponse:
+    """Convert a ``requests`` response, raising on HTTP errors."""
+    response.raise_for_status()
+    return HttpResponse(
+        response.status_code,
+        response.content,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+    )
+
+
+def create_http_fetcher(config: Config) -> HttpFetcher:
+    """Build the fetch engine selected by ``config.http_client``.
+
+    Args:
+        config: Application configuration.
+
+    Returns:
+        A fetcher instance; callers own it and must ``await close()`` it.
+
+    Raises:
+        ValueError: If the configured mode is unknown.
+    """
+    if config.http_client == HTTP_CLIENT_AIOHTTP:
+        return AiohttpFetcher(
+            config.connect_timeout,
+            config.read_timeout,
+            config.http_pool_size,
+            trace_configs=[http_trace_config()] if config.metrics_port else (),
+        )
+    if config.http_client == HTTP_CLIENT_THREADED:
+        return ThreadedRequestsFetcher(
+            config.connect_timeout, config.read_timeout, config.http_pool_size
+        )
+    if config.http_client == HTTP_CLIENT_REQUESTS:
+        return RequestsFetcher(config.connect_timeout, config.read_timeout)
+    raise ValueError(f"Unknown HTTP client mode: {config.http_client}")
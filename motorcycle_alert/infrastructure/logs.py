@@ -0,0 +1,211 @@
+"""Non-blocking log pipeline: queued records, JSON output, rotation and sampling.
+
+Code on the event loop only puts records on an in-process queue. A listener
+thread formats them and writes them to the console and a rotating file, so
+a slow disk never stalls polling. Per-poll lines pass their arguments
+%-style (``logger.debug("Probing: %s", url)``), so nothing is formatted for
+disabled levels and enabled ones are formatted on the listener thread.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, TextIO, Tuple
+
+from motorcycle_alert.infrastructure.config import LOG_FORMAT_JSON, Config
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every record has; any other one was passed with ``extra``.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line.
+
+    Fields passed with ``extra``, e.g. ``extra={"object_id": "42"}``, are
+    added to the object as they are, or as strings when not serializable.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render ``time``, ``level``, ``logger``, ``message`` and extras."""
+        document = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                document[name] = value
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            document["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(document, default=str, ensure_ascii=False)
+
+
+class DebugSampler(logging.Filter):
+    """Keeps one in ``rate`` DEBUG records of each call site.
+
+    Records of INFO and above always pass. ``stats`` counts the
+    ``suppressed`` ones.
+    """
+
+    def __init__(self, rate: int):
+        """Initialize the sampler.
+
+        Args:
+            rate: Keep the first DEBUG record of a call site and every
+                ``rate``-th after it; 1 keeps them all.
+        """
+        super().__init__()
+        self.rate = rate
+        self._seen: Counter = Counter()
+        self.stats: Counter = Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether ``record`` is kept."""
+        if record.levelno > logging.DEBUG or self.rate <= 1:
+            return True
+        site: Tuple[str, int] = (record.pathname, record.lineno)
+        seen = self._seen[site]
+        self._seen[site] = seen + 1
+        if seen % self.rate == 0:
+            return True
+        self.stats["suppressed"] += 1
+        return False
+
+
+class RotatingLogFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotates the file when it reaches ``max_bytes`` or every ``interval``.
+
+    Rotated files are numbered like :class:`RotatingFileHandler`'s
+    (``app.log.1`` is the newest), whichever limit triggered the rotation.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_bytes: int = 0,
+        interval: float = 0.0,
+        backup_count: int = 5,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the handler; the file is opened on the first record.
+
+        Args:
+            file_path: Path of the log file.
+            max_bytes: Rotate before the file would exceed this size; 0 disables.
+            interval: Rotate every this many seconds; 0 disables.
+            backup_count: Number of rotated files kept.
+            clock: Time source, replaceable in tests.
+        """
+        super().__init__(
+            file_path,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        self._interval = interval
+        self._clock = clock
+        self._rollover_at = clock() + interval if interval else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Return whether the interval elapsed or the size limit is reached."""
+        if self._clock() >= self._rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        """Rotate the files and schedule the next timed rotation."""
+        super().doRollover()
+        if self._interval:
+            self._rollover_at = self._clock() + self._interval
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues records unformatted, leaving formatting to the listener thread.
+
+    :class:`QueueHandler` merges the arguments into the message before
+    queuing, on the logging thread. The queue is in-process, so records can
+    be passed as they are; arguments should not be mutated after logging.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return ``record`` unchanged."""
+        return record
+
+
+def build_handlers(config: Config, stream: TextIO) -> List[logging.Handler]:
+    """Build the console and, when ``config.log_file`` is set, file handlers."""
+    formatter = (
+        JsonFormatter()
+        if config.log_format == LOG_FORMAT_JSON
+        else logging.Formatter(TEXT_FORMAT)
+    )
+    handlers: List[logging.Handler] = [logging.StreamHandler(stream)]
+    if config.log_file:
+        handlers.append(
+            RotatingLogFileHandler(
+                config.log_file,
+                max_bytes=config.log_max_bytes,
+                interval=config.log_rotate_interval,
+                backup_count=config.log_backup_count,
+            )
+        )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging(
+    config: Config, stream: Optional[TextIO] = None
+) -> logging.handlers.QueueListener:
+    """Route every log record through a queue to a background writer.
+
+    The root logger's handlers are replaced by a single queue handler, which
+    samples DEBUG records per ``config.log_debug_sample_rate``.
+
+    Args:
+        config: Application configuration.
+        stream: Console stream; standard output by default.
+
+    Returns:
+        The started listener; pass it to :func:`stop_logging` on shutdown.
+    """
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(records)
+    queue_handler.addFilter(DebugSampler(config.log_debug_sample_rate))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(config.log_level.upper())
+
+    listener = logging.handlers.QueueListener(
+        records, *build_handlers(config, stream or sys.stdout)
+    )
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener) -> None:
+    """Write the queued records and close the handlers."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
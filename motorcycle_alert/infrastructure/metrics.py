@@ -0,0 +1,448 @@
+"""In-process metrics registry exposed in the Prometheus text format.
+
+Instruments are module-level, like the loggers: recording is a dict lookup
+and an addition (plus a bisect for histograms), cheap enough to leave on.
+``stats`` Counters kept by the services are exposed as they are through
+:meth:`MetricsRegistry.stats`, and queue depths through callback gauges,
+so nothing is computed until ``/metrics`` is scraped.
+
+Serve the registry with :class:`MetricsServer` (``METRICS_PORT``).
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from types import SimpleNamespace
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import aiohttp
+
+from motorcycle_alert.application.use_cases import PollListener
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-millisecond parses to slow requests.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render ``{name="value",...}``."""
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value."""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """A named metric family with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        """Initialize the family."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        """Return the ``HELP`` and ``TYPE`` lines."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> Iterator[str]:
+        """Yield the sample lines."""
+        raise NotImplementedError
+
+
+class CounterMetric(_Metric):
+    """Monotonic counter, e.g. polls per vehicle and outcome."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        """Initialize the counter."""
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Add ``amount`` to the series of ``label_values``."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Return the current value of a series."""
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> Iterator[str]:
+        """Yield one line per series."""
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    """Bucket counts of one histogram series."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class HistogramMetric(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        """Initialize the histogram with sorted upper bounds."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = _HistogramSeries(
+                    len(self.buckets)
+                )
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def count(self, *label_values: str) -> int:
+        """Return the number of observations of a series."""
+        series = self._series.get(label_values)
+        return series.count if series is not None else 0
+
+    def render(self) -> Iterator[str]:
+        """Yield cumulative buckets, sum and count of every series."""
+        with self._lock:
+            snapshot = [
+                (values, list(s.counts), s.total, s.count)
+                for values, s in self._series.items()
+            ]
+        names = self.label_names + ("le",)
+        for label_values, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, label_values + (repr(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(names, label_values + ("+Inf",))
+            yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class _CallbackMetric(_Metric):
+    """Metric whose series are read from a callback when scraped."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Mapping[LabelValues, float]],
+        labels: Sequence[str] = (),
+        kind: str = "gauge",
+    ):
+        """Initialize the metric."""
+        super().__init__(name, documentation, labels)
+        self.kind = kind
+        self._read = read
+
+    def render(self) -> Iterator[str]:
+        """Yield the series returned by the callback."""
+        for label_values, value in self._read().items():
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        """Add a family.
+
+        Raises:
+            ValueError: If a family of that name exists.
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        """Remove a family, if registered."""
+        self._metrics.pop(name, None)
+
+    def counter(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> CounterMetric:
+        """Register and return a counter."""
+        return self._register(CounterMetric(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> HistogramMetric:
+        """Register and return a histogram."""
+        return self._register(HistogramMetric(name, documentation, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], float],
+    ) -> None:
+        """Register a gauge read from ``read`` on each scrape, e.g. a queue depth."""
+        self._register(_CallbackMetric(name, documentation, lambda: {(): read()}))
+
+    def stats(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Counter],
+        label: str = "event",
+    ) -> None:
+        """Expose a ``stats`` Counter as a counter family, one series per key.
+
+        Args:
+            name: Family name, e.g. ``motorcycle_alert_telegram_events_total``.
+            documentation: Help text.
+            read: Returns the Counter, e.g. ``lambda: service.stats``; it may
+                merge the Counters of many objects.
+            label: Label holding the Counter keys.
+        """
+        self._register(
+            _CallbackMetric(
+                name,
+                documentation,
+                lambda: {(key,): value for key, value in sorted(read().items())},
+                labels=(label,),
+                kind="counter",
+            )
+        )
+
+    def render(self) -> str:
+        """Return every family in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = list(metric.render())
+            except Exception as e:
+                logger.error(f"Collecting metric {metric.name} failed: {e}")
+                continue
+            lines.extend(metric.header())
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_PHASE_SECONDS = REGISTRY.histogram(
+    "motorcycle_alert_http_phase_seconds",
+    "Tracker API request phases (dns, connect, ttfb) of the aiohttp engine",
+    labels=("phase",),
+)
+PARSE_SECONDS = REGISTRY.histogram(
+    "motorcycle_alert_parse_seconds",
+    "Time decoding and parsing tracker API responses",
+    labels=("request",),
+)
+POLL_SECONDS = REGISTRY.histogram(
+    "motorcycle_alert_poll_seconds",
+    "Time of a whole vehicle poll, from fetch to alert hand-over",
+)
+POLLS = REGISTRY.counter(
+    "motorcycle_alert_polls_total",
+    "Vehicle polls by outcome (ok or error)",
+    labels=("object_id", "outcome"),
+)
+STATUS_POLLS = REGISTRY.counter(
+    "motorcycle_alert_status_polls_total",
+    "Polled statuses that changed (saved) or not (recorded)",
+    labels=("result",),
+)
+STORAGE_SECONDS = REGISTRY.histogram(
+    "motorcycle_alert_storage_seconds",
+    "Status storage operation time",
+    labels=("operation",),
+)
+TELEGRAM_SEND_SECONDS = REGISTRY.histogram(
+    "motorcycle_alert_telegram_send_seconds",
+    "Telegram Bot API sendMessage latency",
+)
+
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config timing DNS, connect and time to first byte.
+
+    Time to first byte runs from the request being sent to the response
+    headers; reused keep-alive connections record no DNS or connect time.
+    """
+
+    def now() -> float:
+        return time.perf_counter()
+
+    async def request_start(session, context: SimpleNamespace, params) -> None:
+        context.sent = context.dns = context.connect = now()
+
+    async def dns_start(session, context: SimpleNamespace, params) -> None:
+        context.dns = now()
+
+    async def dns_end(session, context: SimpleNamespace, params) -> None:
+        HTTP_PHASE_SECONDS.observe(now() - context.dns, "dns")
+
+    async def connect_start(session, context: SimpleNamespace, params) -> None:
+        context.connect = now()
+
+    async def connect_end(session, context: SimpleNamespace, params) -> None:
+        HTTP_PHASE_SECONDS.observe(now() - context.connect, "connect")
+
+    async def headers_sent(session, context: SimpleNamespace, params) -> None:
+        context.sent = now()
+
+    async def request_end(session, context: SimpleNamespace, params) -> None:
+        HTTP_PHASE_SECONDS.observe(now() - context.sent, "ttfb")
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(request_start)
+    trace.on_dns_resolvehost_start.append(dns_start)
+    trace.on_dns_resolvehost_end.append(dns_end)
+    trace.on_connection_create_start.append(connect_start)
+    trace.on_connection_create_end.append(connect_end)
+    trace.on_request_headers_sent.append(headers_sent)
+    trace.on_request_end.append(request_end)
+    return trace
+
+
+class MetricsPollListener(PollListener):
+    """Records the latency and outcome of every vehicle poll."""
+
+    def poll_finished(
+        self, object_id: Optional[str], seconds: float, error: Optional[BaseException]
+    ) -> None:
+        """Count the poll per vehicle and outcome and observe its latency."""
+        POLLS.inc(object_id or "", "error" if error is not None else "ok")
+        POLL_SECONDS.observe(seconds)
+
+
+class MetricsServer:
+    """Serves a registry on ``GET /metrics`` over a local aiohttp server.
+
+    The aiohttp server modules are imported by :meth:`start`, so they stay
+    off the startup path when metrics are disabled.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port=9464
+    ):
+        """Initialize the server; it listens once :meth:`start` is awaited."""
+        self._registry = registry
+        self._host = host
+        self._port = port
+        self._runner: Optional["web.AppRunner"] = None
+
+    @property
+    def port(self) -> Optional[int]:
+        """Return the bound port, resolving port 0, or None when not started."""
+        if self._runner is None or not self._runner.addresses:
+            return None
+        return self._runner.addresses[0][1]
+
+    async def _handle(self, request: "web.Request") -> "web.Response":
+        """Render the registry on the event loop, where the stats are updated."""
+        from aiohttp import web
+
+        return web.Response(
+            body=self._registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    async def start(self) -> None:
+        """Start listening."""
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self._host, self._port).start()
+        logger.info(f"Serving metrics on http://{self._host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -1,46 +1,394 @@
-"""Telegram notification service implementation."""
+"""Telegram notification service implementations."""
 
+import asyncio
 import logging
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Set
 
-import telebot
+import aiohttp
 
 from motorcycle_alert.domain.models import AlertMessage
 from motorcycle_alert.domain.services import NotificationService
 from motorcycle_alert.infrastructure.config import Config
+from motorcycle_alert.infrastructure.metrics import TELEGRAM_SEND_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Telegram rejects messages longer than this many characters.
+MAX_MESSAGE_LENGTH = 4096
+# Separator between alerts coalesced into one message.
+COALESCE_SEPARATOR = "\n\n"
+_HTML_TAGS = ("<b>", "<i>", "<u>", "<code>", "<pre>")
+
+
+def should_use_html_parsing(message: str) -> bool:
+    """Determine if HTML parsing should be used for the message."""
+    # Simple check to see if the message contains HTML-like formatting
+    return any(tag in message for tag in _HTML_TAGS)
+
 
 class TelegramNotificationService(NotificationService):
     """Telegram-based implementation of notification service."""
 
     def __init__(self, config: Config):
-        """Initialize the notification service with configuration."""
+        """Initialize the notification service with configuration.
+
+        ``telebot`` is imported here rather than at module level: it pulls in
+        ``requests`` and is only needed for direct delivery.
+        """
+        import telebot
+
         self._config = config
         self._bot = telebot.TeleBot(config.telegram_api_key)
 
     def send_alert(self, message: AlertMessage) -> None:
         """Send alert notification via Telegram."""
+        recipient = message.recipient or self._config.telegram_user_id
         try:
             formatted_message = message.format_message()
 
+            started = time.perf_counter()
             self._bot.send_message(
-                self._config.telegram_user_id,
+                recipient,
                 formatted_message,
                 parse_mode=(
-                    "HTML" if self._should_use_html_parsing(formatted_message) else None
+                    "HTML" if should_use_html_parsing(formatted_message) else None
                 ),
             )
+            TELEGRAM_SEND_SECONDS.observe(time.perf_counter() - started)
 
-            logger.info(
-                f"Alert sent successfully to user {self._config.telegram_user_id}"
-            )
+            logger.info("Alert sent successfully to user %s", recipient)
 
         except Exception as e:
             logger.error(f"Failed to send Telegram notification: {e}")
             raise
 
-    def _should_use_html_parsing(self, message: str) -> bool:
-        """Determine if HTML parsing should be used for the message."""
-        # Simple check to see if the message contains HTML-like formatting
-        return any(tag in message for tag in ["<b>", "<i>", "<u>", "<code>", "<pre>"])
+
+@dataclass
+class _Outgoing:
+    """A formatted alert waiting for delivery."""
+
+    message: AlertMessage
+    text: str
+    parse_mode: Optional[str]
+    attempts: int = 0
+
+
+class TelegramRateLimiter:
+    """Spaces sends to respect Telegram's per-chat and global rate limits.
+
+    Each send reserves the earliest slot allowed by both limits, so concurrent
+    workers never exceed them. A 429 answer pauses the bot for the requested
+    ``retry_after``.
+    """
+
+    def __init__(
+        self,
+        chat_rate: float,
+        global_rate: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            chat_rate: Maximum messages per second to a single chat.
+            global_rate: Maximum messages per second across all chats.
+            clock: Monotonic time source, replaceable in tests.
+        """
+        self._chat_gap = 1.0 / chat_rate
+        self._global_gap = 1.0 / global_rate
+        self._clock = clock
+        self._chat_next: Dict[str, float] = {}
+        self._global_next = 0.0
+
+    def reserve(self, chat_id: str) -> float:
+        """Reserve the next send slot for ``chat_id``.
+
+        Returns:
+            Seconds to wait before sending.
+        """
+        now = self._clock()
+        global_slot = max(now, self._global_next)
+        start = max(global_slot, self._chat_next.get(chat_id, 0.0))
+        # A chat waiting on its own limit does not hold back other chats.
+        self._global_next = global_slot + self._global_gap
+        self._chat_next[chat_id] = start + self._chat_gap
+        return start - now
+
+    def pause(self, seconds: float) -> None:
+        """Hold every send for ``seconds``, e.g. after a 429 answer."""
+        self._global_next = max(self._global_next, self._clock() + seconds)
+
+
+class QueuedTelegramNotificationService(NotificationService):
+    """Non-blocking Telegram delivery through a bounded queue and worker pool.
+
+    ``send_alert`` only formats and enqueues the alert, so polling never waits
+    for Telegram. Workers post to the Bot API over one keep-alive ``aiohttp``
+    session, within :class:`TelegramRateLimiter` limits. Alerts queued for the
+    same chat are coalesced into a single message, up to Telegram's length
+    limit. Network errors and 5xx answers are retried with exponential
+    backoff; 429 answers wait for ``retry_after``. Both count toward
+    ``telegram_max_retries``, and other 4xx answers are not retried. When the
+    buffer is full the oldest alert of the chat is dropped.
+
+    ``on_result``, when set, is called with each alert and whether it was
+    delivered, once Telegram accepted it or the service gave up on it.
+
+    ``stats`` counts ``queued``, ``sent`` messages, ``coalesced`` and
+    ``dropped`` alerts, ``retried`` and ``failed`` sends and ``rate_limited``
+    answers.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        rate_limiter: Optional[TelegramRateLimiter] = None,
+        rng: Callable[[], float] = random.random,
+        on_result: Optional[Callable[[AlertMessage, bool], None]] = None,
+    ):
+        """Initialize the service; workers start with :meth:`start`.
+
+        Args:
+            config: Application configuration.
+            rate_limiter: Limiter to use; built from the configuration if omitted.
+            rng: Source of uniform numbers in [0, 1) for backoff jitter.
+            on_result: Delivery report callback, see the class documentation.
+        """
+        self._config = config
+        self._url = (
+            f"{config.telegram_api_url.rstrip('/')}"
+            f"/bot{config.telegram_api_key}/sendMessage"
+        )
+        self._limiter = rate_limiter or TelegramRateLimiter(
+            config.telegram_chat_rate, config.telegram_global_rate
+        )
+        self._rng = rng
+        self.on_result = on_result
+        self._pending: Dict[str, Deque[_Outgoing]] = {}
+        self._size = 0
+        self._ready: "asyncio.Queue[str]" = asyncio.Queue()
+        self._scheduled: Set[str] = set()
+        self._busy = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._workers: List[asyncio.Task] = []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats: Counter = Counter()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of alerts waiting for delivery."""
+        return self._size
+
+    async def start(self) -> None:
+        """Open the HTTP session and start the worker pool."""
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._config.telegram_workers),
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=self._config.connect_timeout,
+                sock_read=self._config.read_timeout,
+            ),
+        )
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self._config.telegram_workers)
+        ]
+
+    def send_alert(self, message: AlertMessage) -> None:
+        """Queue an alert for delivery without waiting for Telegram."""
+        chat_id = message.recipient or self._config.telegram_user_id
+        text = message.format_message()
+        outgoing = _Outgoing(
+            message, text, "HTML" if should_use_html_parsing(text) else None
+        )
+        pending = self._pending.setdefault(chat_id, deque())
+        if self._size >= self._config.telegram_queue_size:
+            if not pending:
+                self.stats["dropped"] += 1
+                logger.warning(f"Notification queue full, dropping alert to {chat_id}")
+                self._report([outgoing], False)
+                return
+            self._report([pending.popleft()], False)
+            self._size -= 1
+            self.stats["dropped"] += 1
+            logger.warning(
+                f"Notification queue full, dropped oldest alert to {chat_id}"
+            )
+        pending.append(outgoing)
+        self._size += 1
+        self.stats["queued"] += 1
+        self._idle.clear()
+        self._schedule(chat_id)
+
+    def _schedule(self, chat_id: str) -> None:
+        """Mark ``chat_id`` ready for a worker, once."""
+        if chat_id not in self._scheduled:
+            self._scheduled.add(chat_id)
+            self._ready.put_nowait(chat_id)
+
+    def _take_batch(self, chat_id: str) -> List[_Outgoing]:
+        """Pop the alerts of a chat that fit into one message."""
+        pending = self._pending[chat_id]
+        batch = [pending.popleft()]
+        length = len(batch[0].text)
+        while pending and pending[0].parse_mode == batch[0].parse_mode:
+            length += len(COALESCE_SEPARATOR) + len(pending[0].text)
+            if length > MAX_MESSAGE_LENGTH:
+                break
+            batch.append(pending.popleft())
+        self._size -= len(batch)
+        return batch
+
+    async def _worker(self) -> None:
+        """Deliver ready chats one batch at a time."""
+        while True:
+            chat_id = await self._ready.get()
+            self._scheduled.discard(chat_id)
+            if not self._pending.get(chat_id):
+                continue
+            self._busy += 1
+            try:
+                batch = self._take_batch(chat_id)
+                retry_in = await self._deliver(chat_id, batch)
+                if retry_in is not None:
+                    self._requeue(chat_id, batch, retry_in)
+                elif self._pending.get(chat_id):
+                    self._schedule(chat_id)
+            finally:
+                self._busy -= 1
+                self._check_idle()
+
+    async def _deliver(self, chat_id: str, batch: List[_Outgoing]) -> Optional[float]:
+        """Send a batch as one message.
+
+        Returns:
+            None when the batch is done (sent or given up), otherwise the
+            seconds to wait before retrying it.
+        """
+        text = COALESCE_SEPARATOR.join(outgoing.text for outgoing in batch)
+        payload = {"chat_id": chat_id, "text": text}
+        if batch[0].parse_mode:
+            payload["parse_mode"] = batch[0].parse_mode
+
+        delay = self._limiter.reserve(chat_id)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        started = time.perf_counter()
+        try:
+            async with self._session.post(self._url, json=payload) as response:
+                TELEGRAM_SEND_SECONDS.observe(time.perf_counter() - started)
+                if response.status == 200:
+                    self._on_sent(chat_id, batch)
+                    return None
+                try:
+                    body = await response.json(content_type=None)
+                except ValueError:
+                    body = None  # e.g. an HTML error page from a proxy
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Telegram delivery to {chat_id} failed: {e}")
+            return self._retry_delay(chat_id, batch)
+
+        if not isinstance(body, dict):
+            body = {}
+        description = body.get("description", "")
+        if response.status == 429:
+            retry_after = float((body.get("parameters") or {}).get("retry_after", 1))
+            self.stats["rate_limited"] += 1
+            logger.warning(f"Telegram rate limit hit, retrying in {retry_after}s")
+            self._limiter.pause(retry_after)
+            return self._retry_delay(chat_id, batch, retry_after)
+        if response.status >= 500:
+            logger.warning(f"Telegram error {response.status}: {description}")
+            return self._retry_delay(chat_id, batch)
+
+        self.stats["failed"] += 1
+        logger.error(
+            f"Telegram rejected alert to {chat_id} ({response.status}): {description}"
+        )
+        self._report(batch, False)
+        return None
+
+    def _on_sent(self, chat_id: str, batch: List[_Outgoing]) -> None:
+        """Record a successful delivery."""
+        self.stats["sent"] += 1
+        self.stats["coalesced"] += len(batch) - 1
+        logger.info("Alert sent successfully to user %s", chat_id)
+        self._report(batch, True)
+
+    def _report(self, batch: List[_Outgoing], delivered: bool) -> None:
+        """Pass the outcome of each alert of a batch to ``on_result``."""
+        if self.on_result is None:
+            return
+        for outgoing in batch:
+            try:
+                self.on_result(outgoing.message, delivered)
+            except Exception as e:
+                logger.error(f"Delivery report callback failed: {e}")
+
+    def _retry_delay(
+        self, chat_id: str, batch: List[_Outgoing], wait: Optional[float] = None
+    ) -> Optional[float]:
+        """Return the delay before retrying, or None once retries are exhausted.
+
+        Args:
+            chat_id: Chat the batch is addressed to.
+            batch: Alerts whose send failed.
+            wait: Delay requested by Telegram; exponential backoff when None.
+        """
+        attempts = batch[0].attempts + 1
+        if attempts > self._config.telegram_max_retries:
+            self.stats["failed"] += 1
+            logger.error(
+                f"Giving up on {len(batch)} alert(s) to {chat_id} after "
+                f"{attempts} attempts"
+            )
+            self._report(batch, False)
+            return None
+        for outgoing in batch:
+            outgoing.attempts = attempts
+        self.stats["retried"] += 1
+        if wait is not None:
+            return wait
+        backoff = min(60.0, 2 ** (attempts - 1))
+        return backoff * (0.5 + self._rng())
+
+    def _requeue(self, chat_id: str, batch: List[_Outgoing], delay: float) -> None:
+        """Put a batch back at the head of its chat and retry after ``delay``."""
+        pending = self._pending.setdefault(chat_id, deque())
+        pending.extendleft(reversed(batch))
+        self._size += len(batch)
+        self._scheduled.add(chat_id)
+        asyncio.get_running_loop().call_later(delay, self._release, chat_id)
+
+    def _release(self, chat_id: str) -> None:
+        """Make a chat waiting on a retry ready again."""
+        self._scheduled.discard(chat_id)
+        self._schedule(chat_id)
+
+    def _check_idle(self) -> None:
+        """Flag the pipeline idle when nothing is queued or in flight."""
+        if not self._size and not self._busy:
+            self._idle.set()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Deliver queued alerts for up to ``timeout`` seconds, then stop.
+
+        Alerts still queued after the timeout are logged and discarded.
+        """
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Discarding {self._size} undelivered alert(s)")
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,489 @@
+"""Durable outbox journaling alerts until their delivery is confirmed."""
+
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from motorcycle_alert.domain.models import AlertMessage, FieldChange, MotorcycleStatus
+from motorcycle_alert.domain.services import NotificationService
+
+logger = logging.getLogger(__name__)
+
+_ADD = "add"
+_ACK = "ack"
+
+
+class OutboxJournal:
+    """Append-only JSON-lines journal written with group commit.
+
+    Appends return immediately; a writer thread writes every record queued
+    since its last pass and makes them durable with a single ``fsync``, so
+    a burst of alerts costs one disk flush instead of one per alert.
+    :meth:`wait_committed` waits for a record without blocking the event
+    loop. A failed write keeps its records queued and is retried after
+    ``retry_delay`` seconds.
+    """
+
+    def __init__(self, file_path: str, fsync: bool = True, retry_delay: float = 1.0):
+        """Initialize the journal.
+
+        Args:
+            file_path: Path of the journal file.
+            fsync: Flush each group of records to the storage device.
+            retry_delay: Seconds before retrying a failed write.
+        """
+        self._file_path = file_path
+        self._fsync = fsync
+        self._retry_delay = retry_delay
+        self._condition = threading.Condition()
+        self._queued: List[dict] = []
+        self._compaction: Optional[List[dict]] = None
+        self._appended = 0
+        self._committed = 0
+        self._waiters: List[Tuple[int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._torn = False
+        self._writing = False
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self.stats: Counter = Counter()
+
+    @property
+    def appended(self) -> int:
+        """Return the sequence number of the last appended record."""
+        return self._appended
+
+    def read(self) -> List[dict]:
+        """Return every record of the journal, skipping a torn last line."""
+        if not os.path.exists(self._file_path):
+            return []
+        records = []
+        with open(self._file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(
+                        f"Skipping corrupt outbox record in {self._file_path}"
+                    )
+        return records
+
+    def rewrite(self, records: List[dict]) -> None:
+        """Atomically replace the journal with ``records``.
+
+        Only call it before the first append, e.g. at startup; a running
+        journal is shrunk with :meth:`compact`.
+        """
+        self.flush()
+        self._replace(records)
+
+    def append(self, record: dict) -> int:
+        """Queue a record for the next group commit.
+
+        Returns:
+            The sequence number of the record, see :meth:`wait_committed`.
+        """
+        with self._condition:
+            self._queued.append(record)
+            self._appended += 1
+            self._start_writer()
+            return self._appended
+
+    def compact(self, records: List[dict]) -> None:
+        """Replace the journal with ``records`` in the next group commit.
+
+        ``records`` must stand for every record appended so far, so the
+        records still queued are dropped in their favour.
+        """
+        with self._condition:
+            self._compaction = list(records)
+            self._queued = []
+            self._start_writer()
+
+    async def wait_committed(self, sequence: int) -> None:
+        """Wait until the record numbered ``sequence`` is durable.
+
+        Raises:
+            OSError: If the write failed; the record stays queued for a retry.
+        """
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            if self._committed >= sequence:
+                return
+            future = loop.create_future()
+            self._waiters.append((sequence, loop, future))
+        await future
+
+    def _start_writer(self) -> None:
+        """Wake the writer thread, starting it first if needed."""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="outbox-writer", daemon=True
+            )
+            self._writer.start()
+        self._condition.notify_all()
+
+    def _write_loop(self) -> None:
+        """Commit queued records in groups until the journal is closed."""
+        while True:
+            with self._condition:
+                while not self._has_work() and not self._closed:
+                    self._condition.wait()
+                if not self._has_work():
+                    return
+                records, self._queued = self._queued, []
+                compaction, self._compaction = self._compaction, None
+                sequence = self._appended
+                self._writing = True
+            error = None
+            try:
+                if compaction is None:
+                    self._append_lines(records)
+                else:
+                    self._replace(compaction + records)
+                    self.stats["compactions"] += 1
+            except OSError as e:
+                error = e
+            with self._condition:
+                self._writing = False
+                if error is None:
+                    self._committed = sequence
+                    self.stats["commits"] += 1
+                    self.stats["records"] += len(records)
+                else:
+                    self._retain(records, compaction, error)
+                self._settle_waiters(error)
+                self._condition.notify_all()
+                if error is not None and not self._closed:
+                    self._condition.wait(self._retry_delay)
+
+    def _has_work(self) -> bool:
+        """Return whether records or a compaction wait to be written."""
+        return bool(self._queued) or self._compaction is not None
+
+    def _append_lines(self, records: List[dict]) -> None:
+        """Append records to the file and make them durable."""
+        with open(self._file_path, "a", encoding="utf-8") as file:
+            if self._torn:
+                # End the line a failed write may have left incomplete.
+                file.write("\n")
+            file.writelines(f"{json.dumps(record)}\n" for record in records)
+            file.flush()
+            if self._fsync:
+                os.fsync(file.fileno())
+        self._torn = False
+
+    def _replace(self, records: List[dict]) -> None:
+        """Atomically replace the file with ``records``."""
+        temp_path = f"{self._file_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.writelines(f"{json.dumps(record)}\n" for record in records)
+            file.flush()
+            if self._fsync:
+                os.fsync(file.fileno())
+        os.replace(temp_path, self._file_path)
+        self._torn = False
+
+    def _retain(
+        self, records: List[dict], compaction: Optional[List[dict]], error: OSError
+    ) -> None:
+        """Keep the records of a failed write for a retry, unless closing."""
+        self.stats["errors"] += 1
+        if compaction is None:
+            self._torn = True
+        if self._closed:
+            logger.error(
+                f"Failed to write outbox journal {self._file_path}, "
+                f"losing {len(records)} record(s): {error}"
+            )
+        elif self._compaction is None:
+            # A newer compaction already stands for these records.
+            self._compaction = compaction
+            self._queued = records + self._queued
+            logger.error(
+                f"Failed to write outbox journal {self._file_path}, "
+                f"retrying in {self._retry_delay}s: {error}"
+            )
+
+    def _settle_waiters(self, error: Optional[OSError]) -> None:
+        """Wake the waiters whose records are committed, or all on an error."""
+        waiting = []
+        for sequence, loop, future in self._waiters:
+            if error is None and sequence > self._committed:
+                waiting.append((sequence, loop, future))
+            else:
+                loop.call_soon_threadsafe(_settle, future, error)
+        self._waiters = waiting
+
+    def flush(self) -> None:
+        """Block until every queued record is committed or failed."""
+        with self._condition:
+            while self._has_work() and not self._closed or self._writing:
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Commit queued records and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+
+
+def _settle(future: asyncio.Future, error: Optional[OSError]) -> None:
+    """Resolve a commit waiter on its event loop."""
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+def _encode(message: AlertMessage) -> dict:
+    """Serialise an alert into an ``add`` record."""
+    return {
+        "op": _ADD,
+        "key": message.dedup_key,
+        "timestamp": message.timestamp,
+        "recipient": message.recipient,
+        "status": dataclasses.asdict(message.status),
+        "changes": [
+            [change.field, change.previous, change.current]
+            for change in message.changes
+        ],
+        "rule": message.rule,
+        "geofence": message.geofence,
+    }
+
+
+def _decode(record: dict) -> AlertMessage:
+    """Rebuild an alert from an ``add`` record."""
+    return AlertMessage(
+        status=MotorcycleStatus(**record["status"]),
+        timestamp=record["timestamp"],
+        recipient=record["recipient"],
+        dedup_key=record["key"],
+        changes=tuple(FieldChange(*change) for change in record.get("changes", ())),
+        rule=record.get("rule"),
+        geofence=record.get("geofence"),
+    )
+
+
+class OutboxNotificationService(NotificationService):
+    """Journals alerts before handing them to a delivery service.
+
+    Every alert is recorded in an :class:`OutboxJournal` and stays pending
+    until its delivery is confirmed, giving at-least-once delivery across
+    crashes and Telegram outages:
+
+    - pending alerts are replayed by :meth:`start`, e.g. after a restart;
+    - alerts not confirmed within ``retry_interval`` are submitted again;
+    - alerts whose ``dedup_key`` is pending, or was delivered within
+      ``dedup_window`` seconds, are ignored;
+    - the journal is compacted at startup and then every ``retry_interval``
+      once it has grown, so it stays small in long-running processes.
+
+    :meth:`commit` waits until the alerts sent so far are journaled durably,
+    so a status change is only saved once its alert would survive a crash.
+
+    When the delivery service exposes an ``on_result`` callback attribute
+    (like ``QueuedTelegramNotificationService``), confirmations come from
+    it; otherwise an alert counts as delivered when ``send_alert`` returns.
+
+    ``stats`` counts ``journaled``, ``delivered``, ``deduplicated``,
+    ``replayed`` and ``resubmitted`` alerts, and journal compactions
+    (``compacted``).
+    """
+
+    def __init__(
+        self,
+        delivery: NotificationService,
+        journal: OutboxJournal,
+        retry_interval: float = 60.0,
+        dedup_window: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the outbox.
+
+        Args:
+            delivery: Service that actually sends the alerts.
+            journal: Journal persisting pending alerts.
+            retry_interval: Seconds before an unconfirmed alert is resubmitted.
+            dedup_window: Seconds a delivered key keeps suppressing duplicates.
+            clock: Monotonic time source, replaceable in tests.
+            wall_clock: Epoch time source stamping confirmations in the journal.
+        """
+        self._delivery = delivery
+        self._journal = journal
+        self._retry_interval = retry_interval
+        self._dedup_window = dedup_window
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._pending: Dict[str, AlertMessage] = {}
+        self._submitted_at: Dict[str, float] = {}
+        self._in_flight: Set[str] = set()
+        self._delivered: "OrderedDict[str, float]" = OrderedDict()
+        self._reports = hasattr(delivery, "on_result")
+        if self._reports:
+            delivery.on_result = self._on_result
+        self._retry_task: Optional[asyncio.Task] = None
+        self._compacted_at = 0
+        self.stats: Counter = Counter()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of alerts awaiting confirmation."""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Replay pending alerts from the journal and start resubmitting.
+
+        The journal is compacted to the pending alerts plus the confirmations
+        still inside the dedup window, which keep suppressing duplicates of
+        alerts delivered just before a restart.
+        """
+        acks: Dict[str, dict] = {}
+        added: Dict[str, dict] = {}
+        for record in self._journal.read():
+            if record.get("op") == _ACK:
+                acks[record["key"]] = record
+            elif record.get("op") == _ADD:
+                added[record["key"]] = record
+        pending = [record for key, record in added.items() if key not in acks]
+        now, wall_now = self._clock(), self._wall_clock()
+        recent = [
+            ack
+            for ack in acks.values()
+            if wall_now - ack.get("at", 0) < self._dedup_window
+        ]
+        self._journal.rewrite(recent + pending)
+        for ack in sorted(recent, key=lambda ack: ack["at"]):
+            self._delivered[ack["key"]] = now - (wall_now - ack["at"])
+        for record in pending:
+            message = _decode(record)
+            self._pending[message.dedup_key] = message
+            self.stats["replayed"] += 1
+            self._submit(message)
+        if pending:
+            logger.info(
+                f"Replaying {len(pending)} undelivered alert(s) from the outbox"
+            )
+        self._retry_task = asyncio.create_task(self._retry_loop())
+
+    def send_alert(self, message: AlertMessage) -> None:
+        """Journal an alert and hand it to the delivery service."""
+        if message.dedup_key is None:
+            message = dataclasses.replace(message, dedup_key=uuid.uuid4().hex)
+        key = message.dedup_key
+        self._expire_delivered()
+        if key in self._pending or key in self._delivered:
+            self.stats["deduplicated"] += 1
+            logger.debug("Ignoring duplicate alert %s", key)
+            return
+        self._pending[key] = message
+        self._journal.append(_encode(message))
+        self.stats["journaled"] += 1
+        self._submit(message)
+
+    async def commit(self) -> None:
+        """Wait until every alert journaled so far is durable.
+
+        Raises:
+            OSError: If the journal could not be written; it keeps retrying.
+        """
+        await self._journal.wait_committed(self._journal.appended)
+
+    def _submit(self, message: AlertMessage) -> None:
+        """Hand an alert to the delivery service."""
+        key = message.dedup_key
+        self._in_flight.add(key)
+        self._submitted_at[key] = self._clock()
+        try:
+            self._delivery.send_alert(message)
+        except Exception as e:
+            logger.error(f"Delivery of alert {key} failed, will retry: {e}")
+            self._on_result(message, False)
+            return
+        if not self._reports:
+            self._on_result(message, True)
+
+    def _on_result(self, message: AlertMessage, delivered: bool) -> None:
+        """Record the outcome reported for an alert."""
+        key = message.dedup_key
+        self._in_flight.discard(key)
+        if not delivered or key not in self._pending:
+            return
+        del self._pending[key]
+        self._submitted_at.pop(key, None)
+        self._delivered[key] = self._clock()
+        self._journal.append({"op": _ACK, "key": key, "at": self._wall_clock()})
+        self.stats["delivered"] += 1
+
+    def _expire_delivered(self) -> None:
+        """Forget delivered keys older than the dedup window."""
+        horizon = self._clock() - self._dedup_window
+        while self._delivered and next(iter(self._delivered.values())) < horizon:
+            self._delivered.popitem(last=False)
+
+    def resubmit_due(self) -> int:
+        """Submit again the pending alerts unconfirmed for ``retry_interval``.
+
+        Returns:
+            The number of resubmitted alerts.
+        """
+        horizon = self._clock() - self._retry_interval
+        due = [
+            message
+            for key, message in self._pending.items()
+            if key not in self._in_flight and self._submitted_at.get(key, 0) <= horizon
+        ]
+        for message in due:
+            self.stats["resubmitted"] += 1
+            self._submit(message)
+        return len(due)
+
+    def compact(self) -> None:
+        """Shrink the journal to the pending alerts and recent confirmations."""
+        self._expire_delivered()
+        now, wall_now = self._clock(), self._wall_clock()
+        acks = [
+            {"op": _ACK, "key": key, "at": wall_now - (now - delivered_at)}
+            for key, delivered_at in self._delivered.items()
+        ]
+        self._compacted_at = self._journal.appended
+        self._journal.compact(
+            acks + [_encode(message) for message in self._pending.values()]
+        )
+        self.stats["compacted"] += 1
+
+    async def _retry_loop(self) -> None:
+        """Periodically resubmit unconfirmed alerts and compact the journal."""
+        while True:
+            await asyncio.sleep(self._retry_interval)
+            count = self.resubmit_due()
+            if count:
+                logger.info(f"Resubmitted {count} undelivered alert(s)")
+            if self._journal.appended != self._compacted_at:
+                self.compact()
+
+    async def stop(self) -> None:
+        """Stop resubmitting; confirmations are still journaled until :meth:`close`."""
+        if self._retry_task is not None:
+            self._retry_task.cancel()
+            await asyncio.gather(self._retry_task, return_exceptions=True)
+            self._retry_task = None
+
+    def close(self) -> None:
+        """Commit the journal and stop its writer thread."""
+        self._journal.close()
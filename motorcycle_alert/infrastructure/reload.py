@@ -0,0 +1,170 @@
+"""Live configuration reload: re-reading ``.env`` and watching files for changes.
+
+The command line is captured once at startup. A reload reads the ``.env``
+file and the environment again and re-applies the same arguments, so flags
+keep precedence over variables as they did at startup. Variables set in the
+process environment at startup likewise keep precedence over ``.env``.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import os
+import sys
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import dotenv
+
+from motorcycle_alert.infrastructure.config import Config, load_config
+
+logger = logging.getLogger(__name__)
+
+# Settings that only choose the monitored vehicles.
+FLEET_SETTINGS = frozenset({"object_id", "vehicles", "objects_file"})
+# Settings the polling policy is built from.
+POLLING_SETTINGS = frozenset(
+    {
+        "check_interval",
+        "adaptive_polling",
+        "moving_interval",
+        "parked_interval",
+        "parked_after",
+        "max_backoff",
+    }
+)
+# Settings a reload applies to the running monitor; the others need a restart.
+RELOADABLE_SETTINGS = FLEET_SETTINGS | POLLING_SETTINGS | {"log_level"}
+
+
+def changed_settings(old: Config, new: Config) -> List[str]:
+    """Return the names of the settings that differ, in declaration order."""
+    return [
+        field.name
+        for field in dataclasses.fields(Config)
+        if getattr(old, field.name) != getattr(new, field.name)
+    ]
+
+
+class ConfigSource:
+    """Loads the configuration from ``.env``, the environment and arguments."""
+
+    def __init__(
+        self,
+        argv: Optional[Sequence[str]] = None,
+        dotenv_path: Optional[str] = None,
+    ):
+        """Capture the arguments and the variables set outside ``.env``.
+
+        Args:
+            argv: Command-line arguments; ``sys.argv[1:]`` when omitted.
+            dotenv_path: The ``.env`` file; searched for like ``load_dotenv``
+                does when omitted. An empty path reads no file.
+        """
+        self._argv = list(sys.argv[1:] if argv is None else argv)
+        self.dotenv_path = dotenv.find_dotenv() if dotenv_path is None else dotenv_path
+        self._external = frozenset(os.environ)
+        self._loaded: Set[str] = set()
+
+    def load(self) -> Config:
+        """Read ``.env`` into the environment and build the configuration.
+
+        Variables that were removed from ``.env`` since the last load are
+        removed from the environment too.
+
+        Raises:
+            ValueError: If the configuration is invalid.
+            OSError: If a file it refers to cannot be read.
+        """
+        values: Dict[str, Optional[str]] = {}
+        if self.dotenv_path:
+            values = dotenv.dotenv_values(self.dotenv_path)
+        for key in self._loaded - values.keys():
+            os.environ.pop(key, None)
+        self._loaded = set()
+        for key, value in values.items():
+            if key in self._external or value is None:
+                continue
+            os.environ[key] = value
+            self._loaded.add(key)
+        return load_config(self._argv)
+
+
+class ConfigWatcher:
+    """Polls files every ``interval`` seconds and calls back when one changes.
+
+    A file counts as changed when its modification time or size differs, or
+    it appeared or disappeared. Polling ``stat`` works on every platform and
+    for files replaced by renames, as editors and secret mounts do.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        callback: Callable[[], Awaitable[Any]],
+        interval: float,
+    ):
+        """Initialize the watcher; it polls once :meth:`start` is awaited.
+
+        Args:
+            paths: Files to watch.
+            callback: Coroutine function called after a change.
+            interval: Seconds between polls.
+        """
+        self._callback = callback
+        self._interval = interval
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.watch(paths)
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        """Return the modification time and size of a file, None if missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch(self, paths: Iterable[str]) -> None:
+        """Watch ``paths`` from now on, as they are now."""
+        self._signatures = {path: self._signature(path) for path in paths}
+
+    def changed(self) -> bool:
+        """Return whether a file changed since the last call, remembering it."""
+        current = {path: self._signature(path) for path in self._signatures}
+        changed = current != self._signatures
+        self._signatures = current
+        return changed
+
+    async def start(self) -> None:
+        """Start polling."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        """Call back after each poll that found a change."""
+        while True:
+            await asyncio.sleep(self._interval)
+            if self.changed():
+                logger.info("Configuration files changed, reloading")
+                try:
+                    await self._callback()
+                except Exception as e:
+                    logger.error(f"Configuration reload failed: {e}")
@@ -0,0 +1,149 @@
+"""Configurable mapping of raw tracker sensors to canonical status fields."""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from motorcycle_alert.domain.values import is_on, parse_number
+
+logger = logging.getLogger(__name__)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Extract the first number of a value as an integer."""
+    number = parse_number(value)
+    return int(number) if number is not None else None
+
+
+def _to_blocked(value: Any) -> bool:
+    """Interpret the ``bloqueio`` sensor, which reads ``Desligado`` when released."""
+    return str(value).lower() != "desligado"
+
+
+# Value converters selectable by name in a sensor schema; ``raw`` (None) keeps
+# the API value untouched without paying for a function call.
+CONVERTERS: Dict[str, Optional[Callable[[Any], Any]]] = {
+    "raw": None,
+    "str": str,
+    "float": parse_number,
+    "int": _to_int,
+    "bool": is_on,
+    "blocked": _to_blocked,
+}
+
+# Sensors understood out of the box: normalised name -> (field, converter).
+DEFAULT_SENSOR_SCHEMA: Dict[str, Tuple[str, str]] = {
+    "alimentacao": ("alimentation", "raw"),
+    "ignicao": ("ignition", "raw"),
+    "bloqueio": ("blocked", "blocked"),
+}
+
+
+# Canonical field a raw sensor maps to and its converter (None keeps the value).
+SensorMapping = Tuple[str, Optional[Callable[[Any], Any]]]
+
+# Cache miss marker, distinct from a cached None (ignored sensor name).
+_UNRESOLVED = object()
+
+
+def normalize_sensor_name(name: str) -> str:
+    """Normalise a raw sensor name for schema lookups."""
+    return name.lower().strip()
+
+
+class SensorSchema:
+    """Precompiled sensor table resolving each raw name with one dict lookup.
+
+    Raw names are normalised once and the resolved mapping is cached, so
+    repeated polls only pay a single lookup per sensor. Sensors missing from
+    the schema keep their normalised name and raw value.
+    """
+
+    # Upper bound on cached raw names, protecting against unbounded growth.
+    MAX_CACHED_NAMES = 4096
+
+    def __init__(self, schema: Mapping[str, Tuple[str, str]]):
+        """Compile a schema.
+
+        Args:
+            schema: Mapping of sensor name to ``(field, converter name)``,
+                where converter names are keys of ``CONVERTERS``.
+
+        Raises:
+            ValueError: If a converter name is unknown.
+        """
+        self._mappings: Dict[str, SensorMapping] = {}
+        for name, (field, converter) in schema.items():
+            if converter not in CONVERTERS:
+                raise ValueError(
+                    f"Unknown converter '{converter}' for sensor '{name}'; "
+                    f"expected one of {', '.join(CONVERTERS)}"
+                )
+            self._mappings[normalize_sensor_name(name)] = (
+                field,
+                CONVERTERS[converter],
+            )
+        self._resolved: Dict[str, Optional[SensorMapping]] = {}
+
+    @classmethod
+    def load(cls, file_path: str = "") -> "SensorSchema":
+        """Build the default schema, extended by an optional JSON file.
+
+        The file maps sensor names to ``{"field": ..., "converter": ...}``::
+
+            {"combustivel": {"field": "fuel", "converter": "float"}}
+
+        Args:
+            file_path: Path of the JSON schema file; empty for defaults only.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a valid schema.
+        """
+        schema = dict(DEFAULT_SENSOR_SCHEMA)
+        if file_path:
+            with open(file_path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+            for name, entry in entries.items():
+                schema[name] = (entry["field"], entry.get("converter", "raw"))
+        return cls(schema)
+
+    def _resolve(self, raw_name: str) -> Optional[SensorMapping]:
+        """Resolve and cache the mapping for a raw sensor name."""
+        name = normalize_sensor_name(raw_name)
+        mapping = self._mappings.get(name)
+        if mapping is None and name:
+            mapping = (name, None)
+        if len(self._resolved) >= self.MAX_CACHED_NAMES:
+            self._resolved.clear()
+        self._resolved[raw_name] = mapping
+        return mapping
+
+    def parse(self, sensors_data: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert raw ``{"name": ..., "value": ...}`` entries into canonical fields.
+
+        Entries without a name or a value are skipped.
+        """
+        resolved = self._resolved
+        sensors = {}
+        for sensor in sensors_data:
+            value = sensor.get("value")
+            if value is None:
+                continue
+            raw_name = sensor.get("name") or ""
+            mapping = resolved.get(raw_name, _UNRESOLVED)
+            if mapping is _UNRESOLVED:
+                mapping = self._resolve(raw_name)
+            if mapping is None:
+                continue
+            field, convert = mapping
+            if convert is None:
+                sensors[field] = value
+                continue
+            try:
+                sensors[field] = convert(value)
+            except (TypeError, ValueError) as e:
+                logger.warning(
+                    f"Cannot convert sensor '{raw_name}' value {value!r}: {e}"
+                )
+        return sensors
@@ -2,25 +2,46 @@
 
 import logging
 import os
+import threading
+import time
+from collections import Counter
 from typing import Optional
 
 from motorcycle_alert.domain.models import MotorcycleStatus
 from motorcycle_alert.domain.services import StatusStorage
+from motorcycle_alert.infrastructure.metrics import STATUS_POLLS, STORAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
 
+def vehicle_status_path(file_path: str, object_id: str) -> str:
+    """Derive a per-vehicle status file, e.g. ``status.txt`` -> ``status.42.txt``."""
+    root, ext = os.path.splitext(file_path)
+    return f"{root}.{object_id}{ext}"
+
+
 class FileStatusStorage(StatusStorage):
-    """File-based implementation of status storage."""
+    """File-based implementation of status storage.
+
+    Statuses are written to a temporary file that atomically replaces the
+    previous one, so a crash or power loss never leaves a truncated file.
+    """
 
-    def __init__(self, file_path: str):
-        """Initialize the storage with file path."""
+    def __init__(self, file_path: str, fsync: bool = True):
+        """Initialize the storage.
+
+        Args:
+            file_path: Path of the status file.
+            fsync: Flush writes to the storage device before replacing the
+                file, trading write latency for durability.
+        """
         self._file_path = file_path
+        self._fsync = fsync
 
     def load_last_status(self) -> Optional[MotorcycleStatus]:
         """Load the last known status from file."""
         if not os.path.exists(self._file_path):
-            logger.debug(f"Status file {self._file_path} does not exist")
+            logger.debug("Status file %s does not exist", self._file_path)
             return None
 
         try:
@@ -29,14 +50,19 @@ class FileStatusStorage(StatusStorage):
                 if not content:
                     return None
 
-                # Parse the saved status format: icon_color,alimentation,blocked,ignition
-                parts = content.split(",")
+                # Parse the saved status format:
+                # icon_color,alimentation,blocked,ignition[,time,object_id]
+                parts = content.split(",", 5)
                 if len(parts) >= 4:
-                    return MotorcycleStatus(
+                    reported_time = parts[4] if len(parts) > 4 else ""
+                    object_id = parts[5] if len(parts) > 5 else ""
+                    return MotorcycleStatus.create(
                         icon_color=parts[0],
                         alimentation=parts[1],
                         blocked=parts[2].lower() == "true",
                         ignition=parts[3],
+                        time=float(reported_time) if reported_time else None,
+                        object_id=object_id or None,
                     )
 
         except (IOError, ValueError) as e:
@@ -45,14 +71,183 @@ class FileStatusStorage(StatusStorage):
         return None
 
     def save_status(self, status: MotorcycleStatus) -> None:
-        """Save the current status to file."""
+        """Atomically replace the status file with the current status."""
+        temp_path = f"{self._file_path}.tmp"
         try:
-            with open(self._file_path, "w", encoding="utf-8") as file:
-                content = f"{status.icon_color},{status.alimentation},{status.blocked},{status.ignition}"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                # The time and object ID are kept so that alert keys derived
+                # from the reloaded status match those computed before a restart.
+                reported_time = "" if status.time is None else repr(float(status.time))
+                content = (
+                    f"{status.icon_color},{status.alimentation},{status.blocked},"
+                    f"{status.ignition},{reported_time},{status.object_id or ''}"
+                )
                 file.write(content)
+                if self._fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            os.replace(temp_path, self._file_path)
+            if self._fsync:
+                self._fsync_directory()
 
-            logger.debug(f"Status saved to {self._file_path}")
+            logger.debug("Status saved to %s", self._file_path)
 
         except IOError as e:
             logger.error(f"Failed to save status to {self._file_path}: {e}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
             raise
+
+    def _fsync_directory(self) -> None:
+        """Persist the rename by syncing the containing directory, where supported."""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self._file_path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class CachedStatusStorage(StatusStorage):
+    """Keeps the last status in memory in front of another storage.
+
+    The wrapped storage is read once, on the first load. Saves update the
+    cache immediately and are written behind on a background thread; when
+    several saves arrive before the writer catches up, only the latest is
+    written. This process must be the only writer of the wrapped storage.
+
+    ``stats`` counts ``disk_reads``, ``hits``, ``writes``, ``coalesced``
+    saves and write ``errors``.
+    """
+
+    def __init__(self, storage: StatusStorage):
+        """Initialize the cache around ``storage``."""
+        self._storage = storage
+        self._condition = threading.Condition()
+        self._loaded = False
+        self._status: Optional[MotorcycleStatus] = None
+        self._pending: Optional[MotorcycleStatus] = None
+        self._writing = False
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self.stats: Counter = Counter()
+
+    def load_last_status(self) -> Optional[MotorcycleStatus]:
+        """Return the cached status, reading the wrapped storage only once."""
+        with self._condition:
+            if self._loaded:
+                self.stats["hits"] += 1
+                return self._status
+        status = self._storage.load_last_status()
+        with self._condition:
+            if not self._loaded:
+                self.stats["disk_reads"] += 1
+                self._status, self._loaded = status, True
+            return self._status
+
+    def save_status(self, status: MotorcycleStatus) -> None:
+        """Cache ``status`` and queue it for writing.
+
+        Raises:
+            RuntimeError: If the storage was closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Status storage is closed")
+            self._status, self._loaded = status, True
+            if self._pending is not None:
+                self.stats["coalesced"] += 1
+            self._pending = status
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="status-writer", daemon=True
+                )
+                self._writer.start()
+            self._condition.notify_all()
+
+    def record_status(self, status: MotorcycleStatus) -> None:
+        """Pass an unchanged observation through to the wrapped storage."""
+        self._storage.record_status(status)
+
+    def _write_loop(self) -> None:
+        """Write queued statuses until the storage is closed."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                status, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._storage.save_status(status)
+                self.stats["writes"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Write-behind of status failed: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Block until every queued status has been written."""
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Write pending statuses and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+
+
+class InstrumentedStatusStorage(StatusStorage):
+    """Times the operations of another storage and counts changed polls.
+
+    Every poll ends with ``save_status`` when the status changed and with
+    ``record_status`` otherwise, so their counts split polls into changed
+    and unchanged ones.
+    """
+
+    def __init__(self, storage: StatusStorage):
+        """Initialize the wrapper around ``storage``."""
+        self._storage = storage
+
+    def load_last_status(self) -> Optional[MotorcycleStatus]:
+        """Load from the wrapped storage, timing it."""
+        started = time.perf_counter()
+        try:
+            return self._storage.load_last_status()
+        finally:
+            STORAGE_SECONDS.observe(time.perf_counter() - started, "load")
+
+    def save_status(self, status: MotorcycleStatus) -> None:
+        """Save to the wrapped storage, timing it."""
+        STATUS_POLLS.inc("changed")
+        started = time.perf_counter()
+        try:
+            self._storage.save_status(status)
+        finally:
+            STORAGE_SECONDS.observe(time.perf_counter() - started, "save")
+
+    def record_status(self, status: MotorcycleStatus) -> None:
+        """Record in the wrapped storage, timing it."""
+        STATUS_POLLS.inc("unchanged")
+        started = time.perf_counter()
+        try:
+            self._storage.record_status(status)
+        finally:
+            STORAGE_SECONDS.observe(time.perf_counter() - started, "record")
+
+    def close(self) -> None:
+        """Close the wrapped storage."""
+        self._storage.close()
@@ -0,0 +1,118 @@
+"""Incremental extraction of status fields from large ``/objects/items`` payloads.
+
+The tracker answers ``full=true`` requests with big documents (history tails,
+device settings, ...) of which only a handful of keys are read. Instead of
+materialising the whole tree with ``json.loads``, the body is tokenized with
+``ijson`` and only the fields needed by ``MotorcycleStatus`` plus the sensor
+list are kept. Everything else is skipped token by token.
+
+``ijson`` is an optional dependency, installed with the ``streaming`` extra.
+"""
+
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    ijson = None
+
+# Top-level keys of a ``data`` item copied into the extracted item.
+ITEM_FIELDS = frozenset(
+    {"id", "icon_color", "time", "stop_duration", "speed", "lat", "lng"}
+)
+# Keys of each sensor entry that are kept.
+SENSOR_FIELDS = frozenset({"name", "value"})
+
+_ITEM = "data.item"
+_SENSOR = "data.item.sensors.item"
+_ITEM_KEYS = {f"{_ITEM}.{field}": field for field in ITEM_FIELDS}
+_SENSOR_KEYS = {f"{_SENSOR}.{field}": field for field in SENSOR_FIELDS}
+# Every prefix the collector reacts to; all other tokens are dropped with a
+# single set lookup, which keeps the per-token cost of skipped data minimal.
+_WANTED_PREFIXES = frozenset({_ITEM, _SENSOR, *_ITEM_KEYS, *_SENSOR_KEYS})
+_CONTAINER_START = ("start_map", "start_array")
+
+
+def require_ijson() -> None:
+    """Ensure the streaming backend is installed.
+
+    Raises:
+        ImportError: If ``ijson`` is missing.
+    """
+    if ijson is None:
+        raise ImportError(
+            "The streaming parser needs ijson: install motorcycle-alert[streaming]"
+        )
+
+
+class _ItemCollector:
+    """Push-style consumer of ijson events building minimal item dicts."""
+
+    def __init__(self):
+        """Initialize an empty collector."""
+        self.items: List[Dict[str, Any]] = []
+        self._item: Optional[Dict[str, Any]] = None
+        self._sensor: Optional[Dict[str, Any]] = None
+
+    def feed(self, prefix: str, event: str, value: Any) -> None:
+        """Consume one ``(prefix, event, value)`` token with a wanted prefix."""
+        if prefix == _ITEM:
+            if event == "start_map":
+                self._item = {"sensors": []}
+            elif event == "end_map":
+                self.items.append(self._item)
+                self._item = None
+        elif prefix == _SENSOR:
+            if event == "start_map":
+                self._sensor = {}
+            elif event == "end_map":
+                self._item["sensors"].append(self._sensor)
+                self._sensor = None
+        elif event in _CONTAINER_START:
+            return
+        elif prefix in _SENSOR_KEYS:
+            if self._sensor is not None:
+                self._sensor[_SENSOR_KEYS[prefix]] = value
+        elif self._item is not None:
+            self._item[_ITEM_KEYS[prefix]] = value
+
+
+def parse_items(source: BinaryIO) -> Dict[str, Any]:
+    """Extract the status fields of every item from a readable byte stream.
+
+    Args:
+        source: File-like object yielding the raw JSON body.
+
+    Returns:
+        A ``{"data": [...]}`` document holding only the extracted fields,
+        shaped like the API response so the regular parser can consume it.
+
+    Raises:
+        ImportError: If ``ijson`` is missing.
+        ijson.JSONError: If the body is not valid JSON.
+    """
+    require_ijson()
+    collector = _ItemCollector()
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if prefix in _WANTED_PREFIXES:
+            collector.feed(prefix, event, value)
+    return {"data": collector.items}
+
+
+async def parse_items_async(source: Any) -> Dict[str, Any]:
+    """Extract the status fields of every item from an async byte stream.
+
+    Args:
+        source: Object with an ``async read(n)`` method, such as
+            ``aiohttp.ClientResponse.content``.
+
+    Returns:
+        The same document as :func:`parse_items`.
+    """
+    require_ijson()
+    collector = _ItemCollector()
+    events: AsyncIterator = ijson.parse_async(source, use_float=True)
+    async for prefix, event, value in events:
+        if prefix in _WANTED_PREFIXES:
+            collector.feed(prefix, event, value)
+    return {"data": collector.items}
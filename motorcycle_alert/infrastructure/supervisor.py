@@ -0,0 +1,472 @@
+"""Multi-process fleet runner: sharded worker processes and one alert channel.
+
+The supervisor places its workers on a :class:`HashRing` and starts one
+process per shard of vehicles. Each worker polls its shard with its own
+event loop and monitoring use case, and hands its alerts back over a queue.
+The supervisor's notification service delivers them, so Telegram rate
+limits and the outbox still apply to the whole fleet. Once an alert is
+committed there, e.g. journaled by the outbox, the supervisor acknowledges
+it over the worker's own queue, and only then does the worker save the
+status change; an alert the supervisor failed to commit is answered as
+such, and the worker does not save the change. Worker log records travel
+over another queue into the supervisor's logging pipeline.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from motorcycle_alert.application.sharding import HashRing
+from motorcycle_alert.domain.models import AlertMessage
+from motorcycle_alert.domain.services import NotificationService
+from motorcycle_alert.infrastructure.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Called in each worker process with the configuration, the worker's index,
+# its object IDs, the alert queue, the log queue and its acknowledgement queue.
+WorkerTarget = Callable[[Config, int, Tuple[str, ...], Any, Any, Any], None]
+
+# Longest wait before restarting a crashed worker, in seconds.
+MAX_RESTART_DELAY = 60.0
+
+
+class ChannelNotificationService(NotificationService):
+    """Hands alerts to the supervisor process over a multiprocessing queue.
+
+    Alerts are numbered, and the supervisor answers each number with
+    whether it committed that alert. :meth:`commit` waits for the answers
+    to every alert sent so far and fails if any of them was not committed,
+    so an alert lost with the queue or the supervisor is detected again.
+    """
+
+    def __init__(self, channel: Any, acks: Any, timeout: float = 30.0):
+        """Initialize the service.
+
+        Args:
+            channel: The supervisor's alert queue.
+            acks: This worker's acknowledgement queue.
+            timeout: Seconds :meth:`commit` waits for the supervisor.
+        """
+        self._channel = channel
+        self._acks = acks
+        self._timeout = timeout
+        self._sent = 0
+        # Every alert up to _settled has been answered (or given up on);
+        # _answered holds the answered alerts above it.
+        self._settled = 0
+        self._answered: Set[int] = set()
+        # Alerts the supervisor failed to commit, until a commit reports them.
+        self._failed: Set[int] = set()
+        self._waiters: List[Tuple[int, asyncio.Future]] = []
+        self._reader: Optional[threading.Thread] = None
+
+    def send_alert(self, message: AlertMessage) -> None:
+        """Queue the alert for delivery by the supervisor."""
+        self._sent += 1
+        self._channel.put((os.getpid(), self._sent, message))
+
+    async def commit(self) -> None:
+        """Wait until the supervisor committed every alert sent so far.
+
+        Raises:
+            RuntimeError: If the supervisor failed to commit one of them.
+            TimeoutError: If the supervisor does not answer within the timeout.
+        """
+        sequence = self._sent
+        loop = asyncio.get_running_loop()
+        if self._reader is None:
+            self._reader = threading.Thread(
+                target=self._read_acks, args=(loop,), name="alert-acks", daemon=True
+            )
+            self._reader.start()
+        future = loop.create_future()
+        self._waiters.append((sequence, future))
+        self._wake()
+        try:
+            await asyncio.wait_for(future, self._timeout)
+        except asyncio.TimeoutError:
+            self._give_up(sequence)
+            raise TimeoutError(
+                f"The supervisor did not acknowledge alert {sequence} "
+                f"within {self._timeout}s"
+            ) from None
+
+    def _read_acks(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Pass acknowledgements from the supervisor to the event loop."""
+        while True:
+            loop.call_soon_threadsafe(self._acknowledge, *self._acks.get())
+
+    def _acknowledge(self, sequence: int, committed: bool) -> None:
+        """Record the supervisor's answer for one alert."""
+        if sequence <= self._settled:
+            return  # given up on already
+        if not committed:
+            self._failed.add(sequence)
+        self._answered.add(sequence)
+        while self._settled + 1 in self._answered:
+            self._settled += 1
+            self._answered.discard(self._settled)
+        self._wake()
+
+    def _give_up(self, sequence: int) -> None:
+        """Stop waiting for the answers to the alerts up to ``sequence``."""
+        if sequence > self._settled:
+            self._settled = sequence
+            self._answered = {s for s in self._answered if s > sequence}
+        self._failed = {s for s in self._failed if s > sequence}
+        self._wake()
+
+    def _wake(self) -> None:
+        """Resolve the waiters whose alerts have all been answered.
+
+        Each failed alert is reported to the first commit waiting for it.
+        """
+        waiting = []
+        for waited, future in self._waiters:
+            if future.done():
+                continue
+            if waited > self._settled:
+                waiting.append((waited, future))
+                continue
+            failed = sorted(s for s in self._failed if s <= waited)
+            if failed:
+                self._failed.difference_update(failed)
+                future.set_exception(
+                    RuntimeError(f"The supervisor failed to commit alerts {failed}")
+                )
+            else:
+                future.set_result(None)
+        self._waiters = waiting
+
+
+@dataclass
+class _Worker:
+    """A shard and the process polling it."""
+
+    name: str
+    index: int
+    object_ids: Tuple[str, ...] = ()
+    process: Optional[BaseProcess] = None
+    acks: Any = None
+    crashes: Deque[float] = field(default_factory=deque)
+    restart_at: float = 0.0
+
+
+class FleetSupervisor:
+    """Runs the fleet across worker processes, restarting crashed ones.
+
+    A crashed worker is restarted after an exponential backoff. A worker
+    that crashed more than ``max_restarts`` times within ``restart_window``
+    seconds is retired. Its vehicles are rebalanced onto the remaining
+    workers, and only workers whose shard changed are restarted.
+
+    ``stats`` counts ``started``, ``crashed`` and ``retired`` workers,
+    ``rebalances`` and forwarded ``alerts``.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        notification_service: NotificationService,
+        target: WorkerTarget,
+        workers: int,
+        max_restarts: int = 5,
+        restart_window: float = 600.0,
+        restart_delay: float = 1.0,
+        poll_interval: float = 1.0,
+        stop_timeout: float = 30.0,
+        context: Optional[BaseContext] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the supervisor; workers start with :meth:`run`.
+
+        Args:
+            config: Application configuration; ``config.fleet`` is sharded.
+            notification_service: Delivers the alerts of every worker.
+            target: Top-level function run in each worker process.
+            workers: Number of worker processes.
+            max_restarts: Crashes tolerated within ``restart_window``.
+            restart_window: Seconds over which crashes are counted.
+            restart_delay: Wait before the first restart; doubles per crash.
+            poll_interval: Seconds between checks of the workers.
+            stop_timeout: Seconds a stopping worker gets before it is killed.
+            context: Multiprocessing context; ``spawn`` by default.
+            clock: Monotonic time source, replaceable in tests.
+
+        Raises:
+            ValueError: If ``workers`` is not positive.
+        """
+        if workers < 1:
+            raise ValueError("The supervisor needs at least 1 worker")
+        self._config = config
+        self._notification_service = notification_service
+        self._target = target
+        self._max_restarts = max_restarts
+        self._restart_window = restart_window
+        self._restart_delay = restart_delay
+        self._poll_interval = poll_interval
+        self._stop_timeout = stop_timeout
+        self._context = context or multiprocessing.get_context("spawn")
+        self._clock = clock
+        self._workers: Dict[str, _Worker] = {
+            f"worker-{index}": _Worker(f"worker-{index}", index)
+            for index in range(workers)
+        }
+        self._ring = HashRing(self._workers)
+        self._alerts: Any = None
+        self._logs: Any = None
+        self._threads: List[threading.Thread] = []
+        # Acknowledgement queue of each live worker process, by pid.
+        self._acks: Dict[int, Any] = {}
+        self._acknowledging: Set[asyncio.Task] = set()
+        # Held while workers are started or stopped, so a reload and the
+        # crash checks never act on the same worker at once.
+        self._lock = asyncio.Lock()
+        self._running = False
+        self.stats: Counter = Counter()
+
+    @property
+    def assignment(self) -> Dict[str, Tuple[str, ...]]:
+        """Return the object IDs of each active worker."""
+        return {name: worker.object_ids for name, worker in self._workers.items()}
+
+    async def run(self) -> None:
+        """Start the workers and supervise them until :meth:`stop`.
+
+        Raises:
+            RuntimeError: If every worker was retired.
+        """
+        loop = asyncio.get_running_loop()
+        self._alerts = self._context.Queue()
+        self._logs = self._context.Queue()
+        self._threads = [
+            threading.Thread(
+                target=self._forward_alerts, args=(loop,), name="alert-channel"
+            ),
+            threading.Thread(target=self._forward_logs, name="worker-logs"),
+        ]
+        for thread in self._threads:
+            thread.start()
+        self._running = True
+        try:
+            async with self._lock:
+                await self._rebalance()
+            while self._running:
+                async with self._lock:
+                    await self._check_workers()
+                await asyncio.sleep(self._poll_interval)
+        finally:
+            await asyncio.gather(*(self._stop(w) for w in self._workers.values()))
+            for task in self._acknowledging:
+                task.cancel()
+            self._alerts.put(None)
+            self._logs.put(None)
+            for thread in self._threads:
+                await loop.run_in_executor(None, thread.join)
+
+    def stop(self) -> None:
+        """Ask :meth:`run` to stop the workers and return."""
+        self._running = False
+
+    async def reload(self, config: Config, restart: bool = False) -> None:
+        """Run the workers with ``config`` from now on.
+
+        The fleet is sharded again and only workers whose shard changed are
+        restarted. With ``restart``, e.g. after new API session headers, the
+        other workers are restarted too, one at a time, so the rest of the
+        fleet keeps polling. A stopping worker finishes its polls in flight.
+        """
+        async with self._lock:
+            self._config = config
+            restarted = await self._rebalance()
+            if not restart:
+                return
+            for worker in list(self._workers.values()):
+                if worker.name in restarted or worker.process is None:
+                    continue
+                await self._stop(worker)
+                if self._running:
+                    self._start(worker)
+
+    def _start(self, worker: _Worker) -> None:
+        """Start the process of a worker's shard."""
+        worker.acks = self._context.Queue()
+        worker.process = self._context.Process(
+            target=self._target,
+            args=(
+                self._config,
+                worker.index,
+                worker.object_ids,
+                self._alerts,
+                self._logs,
+                worker.acks,
+            ),
+            name=worker.name,
+            daemon=True,
+        )
+        worker.process.start()
+        self._acks[worker.process.pid] = worker.acks
+        self.stats["started"] += 1
+        logger.info(
+            f"Started {worker.name} (pid {worker.process.pid}) "
+            f"with {len(worker.object_ids)} vehicle(s)"
+        )
+
+    async def _stop(self, worker: _Worker) -> None:
+        """Stop a worker gracefully, killing it after ``stop_timeout``."""
+        process = worker.process
+        worker.process = None
+        if process is None:
+            return
+        acks = self._acks.pop(process.pid, None)
+        if acks is not None:
+            # Acknowledgements the worker never read must not block our exit.
+            acks.cancel_join_thread()
+        loop = asyncio.get_running_loop()
+        if process.is_alive():
+            process.terminate()
+            await loop.run_in_executor(None, process.join, self._stop_timeout)
+            if process.is_alive():
+                logger.warning(f"{worker.name} did not stop in time, killing it")
+                process.kill()
+        await loop.run_in_executor(None, process.join)
+        process.close()
+
+    async def _check_workers(self) -> None:
+        """Restart crashed workers, retiring those that keep crashing."""
+        now = self._clock()
+        for worker in list(self._workers.values()):
+            if not worker.object_ids:
+                continue
+            process = worker.process
+            if process is not None and process.is_alive():
+                continue
+            if process is not None:
+                exitcode = process.exitcode
+                await self._stop(worker)
+                self._record_crash(worker, now)
+                logger.error(f"{worker.name} exited with code {exitcode}")
+                if len(worker.crashes) > self._max_restarts:
+                    await self._retire(worker)
+                    continue
+            if now >= worker.restart_at and self._running:
+                self._start(worker)
+
+    def _record_crash(self, worker: _Worker, now: float) -> None:
+        """Remember a crash and schedule the restart with backoff."""
+        self.stats["crashed"] += 1
+        worker.crashes.append(now)
+        while worker.crashes and worker.crashes[0] < now - self._restart_window:
+            worker.crashes.popleft()
+        delay = self._restart_delay * 2 ** (len(worker.crashes) - 1)
+        worker.restart_at = now + min(delay, MAX_RESTART_DELAY)
+
+    async def _retire(self, worker: _Worker) -> None:
+        """Drop a crash-looping worker and move its vehicles to the others."""
+        self.stats["retired"] += 1
+        logger.error(
+            f"{worker.name} crashed {len(worker.crashes)} times, "
+            f"moving its {len(worker.object_ids)} vehicle(s) to other workers"
+        )
+        self._ring.remove(worker.name)
+        del self._workers[worker.name]
+        if not self._ring:
+            raise RuntimeError("Every worker was retired after repeated crashes")
+        await self._rebalance()
+
+    async def _rebalance(self) -> Set[str]:
+        """Assign the fleet over the ring, restarting workers whose shard changed.
+
+        Returns:
+            The names of the workers stopped or restarted.
+        """
+        self.stats["rebalances"] += 1
+        shards = self._ring.assign(vehicle.object_id for vehicle in self._config.fleet)
+        changed = set()
+        for name, object_ids in shards.items():
+            worker = self._workers[name]
+            if tuple(object_ids) == worker.object_ids and worker.process is not None:
+                continue
+            changed.add(name)
+            # Stop first, so a vehicle never has two live pollers.
+            await self._stop(worker)
+            worker.object_ids = tuple(object_ids)
+            if worker.object_ids:
+                self._start(worker)
+        return changed
+
+    def _forward_alerts(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Pass alerts from the workers to the event loop until stopped."""
+        while True:
+            item = self._alerts.get()
+            if item is None:
+                return
+            loop.call_soon_threadsafe(self._deliver, *item)
+
+    def _deliver(self, pid: int, sequence: int, message: AlertMessage) -> None:
+        """Hand a worker's alert to the notification service.
+
+        A failed alert is answered as not committed, so the worker fails to
+        save the change and detects it again.
+        """
+        self.stats["alerts"] += 1
+        try:
+            self._notification_service.send_alert(message)
+        except Exception as e:
+            logger.error(f"Failed to deliver alert from a worker: {e}")
+            self._answer(pid, sequence, False)
+            return
+        task = asyncio.ensure_future(self._acknowledge(pid, sequence))
+        self._acknowledging.add(task)
+        task.add_done_callback(self._acknowledging.discard)
+
+    async def _acknowledge(self, pid: int, sequence: int) -> None:
+        """Tell a worker whether its alert is committed."""
+        try:
+            await self._notification_service.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit alert from a worker: {e}")
+            self._answer(pid, sequence, False)
+            return
+        self._answer(pid, sequence, True)
+
+    def _answer(self, pid: int, sequence: int, committed: bool) -> None:
+        """Send a worker the outcome of one of its alerts."""
+        acks = self._acks.get(pid)
+        if acks is not None:
+            acks.put((sequence, committed))
+
+    def _forward_logs(self) -> None:
+        """Emit worker log records through this process's handlers."""
+        while True:
+            record = self._logs.get()
+            if record is None:
+                return
+            try:
+                logging.getLogger(record.name).handle(record)
+            except Exception as e:
+                logger.error(f"Failed to log a worker record: {e}")
+
+
+def worker_config(config: Config, index: int) -> Config:
+    """Return the configuration worker ``index`` runs with.
+
+    Workers deliver through the supervisor, whose outbox journals their
+    alerts before acknowledging them. Each worker serves metrics, when
+    enabled, on the port after the previous one.
+    """
+    return dataclasses.replace(
+        config,
+        workers=0,
+        metrics_port=config.metrics_port + 1 + index if config.metrics_port else 0,
+    )
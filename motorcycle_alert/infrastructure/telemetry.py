@@ -0,0 +1,392 @@
+"""Columnar, append-only binary telemetry log with memory-mapped replay.
+
+Each vehicle owns a directory of numbered segments; a segment stores one
+flat file per column of fixed-width little-endian values::
+
+    telemetry/<escaped object_id>/00000000/time.f8
+                                   lat.f8
+                                   lng.f8
+                                   speed.f4
+                                   ignition.u1
+                                   blocked.u1
+
+Sample ``i`` of a segment sits at offset ``i * itemsize`` of every column
+file, so the writer only appends raw ``array`` buffers and the reader maps
+each column straight into a NumPy array without parsing or copying.
+Columns are cut to their shortest length on open, discarding a partially
+written sample after a crash. Vehicle directories are named after the
+object ID with every byte outside ``[A-Za-z0-9_-]`` percent-escaped, so
+distinct IDs never share a directory.
+
+Writing needs only the standard library; reading needs NumPy, installed
+with the ``analytics`` extra.
+"""
+
+import logging
+import math
+import os
+import re
+import sys
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import unquote
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.services import StatusObserver
+from motorcycle_alert.domain.values import is_on
+
+# NumPy is only needed to read telemetry back, so it is imported by
+# require_numpy() rather than on the startup path of the monitor.
+np: Any = None
+
+logger = logging.getLogger(__name__)
+
+# Column name -> (array typecode, NumPy dtype, file suffix).
+COLUMNS: Dict[str, Tuple[str, str, str]] = {
+    "time": ("d", "<f8", "f8"),
+    "lat": ("d", "<f8", "f8"),
+    "lng": ("d", "<f8", "f8"),
+    "speed": ("f", "<f4", "f4"),
+    "ignition": ("B", "u1", "u1"),
+    "blocked": ("B", "u1", "u1"),
+}
+# Bytes per sample across all columns.
+SAMPLE_WIDTH = sum(array(code).itemsize for code, _, _ in COLUMNS.values())
+
+_SEGMENT_NAME = re.compile(r"^\d{8}$")
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def require_numpy() -> None:
+    """Import the analytics backend on first use.
+
+    Raises:
+        ImportError: If ``numpy`` is missing.
+    """
+    global np
+    if np is not None:
+        return
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover - exercised only without the extra
+        raise ImportError(
+            "Reading telemetry needs numpy: install motorcycle-alert[analytics]"
+        ) from e
+    np = numpy
+
+
+def _escape(object_id: str) -> str:
+    """Percent-escape every byte of ``object_id`` outside ``[A-Za-z0-9_-]``."""
+    return _UNSAFE_CHARS.sub(
+        lambda match: "".join(f"%{byte:02X}" for byte in match[0].encode()),
+        object_id,
+    )
+
+
+def _vehicle_dir(directory: str, object_id: str) -> str:
+    """Return the directory holding a vehicle's segments."""
+    return os.path.join(directory, _escape(object_id))
+
+
+def _column_path(segment_dir: str, column: str) -> str:
+    """Return the file of ``column`` inside a segment."""
+    return os.path.join(segment_dir, f"{column}.{COLUMNS[column][2]}")
+
+
+def _segment_dirs(vehicle_dir: str) -> List[str]:
+    """List the segment directories of a vehicle in write order."""
+    if not os.path.isdir(vehicle_dir):
+        return []
+    names = sorted(n for n in os.listdir(vehicle_dir) if _SEGMENT_NAME.match(n))
+    return [os.path.join(vehicle_dir, name) for name in names]
+
+
+def _segment_length(segment_dir: str) -> int:
+    """Return the number of complete samples in a segment."""
+    lengths = []
+    for column, (code, _, _) in COLUMNS.items():
+        path = _column_path(segment_dir, column)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        lengths.append(size // array(code).itemsize)
+    return min(lengths)
+
+
+class _VehicleWriter:
+    """Open segment files of one vehicle, used only by the flush thread."""
+
+    def __init__(self, vehicle_dir: str, segment_samples: int):
+        """Initialize the writer; the last segment is resumed on first write."""
+        self._vehicle_dir = vehicle_dir
+        self._segment_samples = segment_samples
+        self._segment: Optional[int] = None
+        self._written = 0
+        self._files: Dict[str, IO[bytes]] = {}
+
+    def _resume(self) -> None:
+        """Resume the last segment of the vehicle, or start the first one."""
+        segments = _segment_dirs(self._vehicle_dir)
+        if segments:
+            self._segment = int(os.path.basename(segments[-1]))
+            self._written = self._repair(segments[-1])
+        else:
+            self._segment, self._written = 0, 0
+
+    @staticmethod
+    def _repair(segment_dir: str) -> int:
+        """Truncate every column to the shortest one and return its length."""
+        length = _segment_length(segment_dir)
+        for column, (code, _, _) in COLUMNS.items():
+            path = _column_path(segment_dir, column)
+            if os.path.exists(path):
+                os.truncate(path, length * array(code).itemsize)
+        return length
+
+    def _open(self, segment: int) -> None:
+        """Close the current column files and open those of ``segment``."""
+        self.close()
+        segment_dir = os.path.join(self._vehicle_dir, f"{segment:08d}")
+        os.makedirs(segment_dir, exist_ok=True)
+        self._files = {
+            column: open(_column_path(segment_dir, column), "ab") for column in COLUMNS
+        }
+        self._segment = segment
+
+    def write(self, buffers: Dict[str, array]) -> int:
+        """Append ``buffers`` to the column files, opening segments as they fill up."""
+        if self._segment is None:
+            self._resume()
+        pending = len(buffers["time"])
+        start = 0
+        while start < pending:
+            if self._written >= self._segment_samples:
+                self._open(self._segment + 1)
+                self._written = 0
+            elif not self._files:
+                self._open(self._segment)
+            count = min(pending - start, self._segment_samples - self._written)
+            for column, values in buffers.items():
+                chunk = values[start : start + count]
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                chunk.tofile(self._files[column])
+            self._written += count
+            start += count
+        for file in self._files.values():
+            file.flush()
+        return pending
+
+    def close(self) -> None:
+        """Close the open column files."""
+        for file in self._files.values():
+            file.close()
+        self._files = {}
+
+
+def _new_buffers() -> Dict[str, array]:
+    """Return empty column buffers."""
+    return {column: array(code) for column, (code, _, _) in COLUMNS.items()}
+
+
+class TelemetryLog:
+    """Append-only writer of the per-vehicle columnar telemetry log.
+
+    Samples are buffered in typed arrays and handed to a single flush
+    thread every ``flush_samples`` samples, so appending never waits for
+    the disk. Column files stay open between flushes. :meth:`flush` and
+    :meth:`close` block until every buffered sample is written. This
+    process must be the only writer of ``directory``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_samples: int = 1 << 20,
+        flush_samples: int = 256,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the log.
+
+        Args:
+            directory: Root directory of the log; created if missing.
+            segment_samples: Samples per segment before a new one is started.
+            flush_samples: Buffered samples, across vehicles, that trigger a write.
+            clock: Source of sample timestamps, replaceable in tests.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._segment_samples = segment_samples
+        self._flush_samples = flush_samples
+        self._clock = clock
+        self._buffers: Dict[str, Dict[str, array]] = {}
+        self._writers: Dict[str, _VehicleWriter] = {}
+        self._buffered = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="telemetry"
+        )
+        self._pending: Optional[Future] = None
+
+    def append(self, object_id: str, status: MotorcycleStatus) -> None:
+        """Buffer one sample of ``object_id`` taken now."""
+        buffers = self._buffers.get(object_id)
+        if buffers is None:
+            buffers = self._buffers[object_id] = _new_buffers()
+        speed = status.speed
+        buffers["time"].append(self._clock())
+        buffers["lat"].append(math.nan if status.lat is None else status.lat)
+        buffers["lng"].append(math.nan if status.lng is None else status.lng)
+        buffers["speed"].append(math.nan if speed is None else speed)
+        buffers["ignition"].append(is_on(status.ignition))
+        buffers["blocked"].append(status.blocked)
+        self._buffered += 1
+        if self._buffered >= self._flush_samples:
+            self._submit()
+
+    def _submit(self) -> None:
+        """Hand the buffered samples to the flush thread."""
+        batch, self._buffers, self._buffered = self._buffers, {}, 0
+        if batch:
+            self._pending = self._executor.submit(self._write, batch)
+
+    def _write(self, batch: Dict[str, Dict[str, array]]) -> None:
+        """Append a batch of samples; runs on the flush thread."""
+        written = 0
+        for object_id, buffers in batch.items():
+            writer = self._writers.get(object_id)
+            if writer is None:
+                writer = _VehicleWriter(
+                    _vehicle_dir(self._directory, object_id), self._segment_samples
+                )
+                self._writers[object_id] = writer
+            try:
+                written += writer.write(buffers)
+            except OSError as e:
+                logger.error(f"Failed to append telemetry of vehicle {object_id}: {e}")
+        if written:
+            logger.debug("Appended %d telemetry samples", written)
+
+    def flush(self) -> None:
+        """Write every buffered sample to disk."""
+        self._submit()
+        if self._pending is not None:
+            self._pending.result()
+
+    def close(self) -> None:
+        """Flush buffered samples and close the column files."""
+        self.flush()
+        self._executor.submit(self._close_writers).result()
+        self._executor.shutdown()
+
+    def _close_writers(self) -> None:
+        """Close every open column file; runs on the flush thread."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+class TelemetryRecorder(StatusObserver):
+    """Appends every polled status of one vehicle to a shared :class:`TelemetryLog`."""
+
+    def __init__(self, log: TelemetryLog, object_id: str):
+        """Initialize the recorder for ``object_id``."""
+        self._log = log
+        self._object_id = object_id
+
+    def observe(self, status: MotorcycleStatus) -> None:
+        """Append the status as a telemetry sample."""
+        self._log.append(self._object_id, status)
+
+
+class TelemetryReader:
+    """Zero-copy reader of a telemetry log directory."""
+
+    def __init__(self, directory: str):
+        """Initialize the reader.
+
+        Raises:
+            ImportError: If ``numpy`` is missing.
+        """
+        require_numpy()
+        self._directory = directory
+
+    def vehicles(self) -> List[str]:
+        """Return the IDs of the vehicles present in the log."""
+        if not os.path.isdir(self._directory):
+            return []
+        return sorted(
+            unquote(name)
+            for name in os.listdir(self._directory)
+            if os.path.isdir(os.path.join(self._directory, name))
+        )
+
+    def segments(
+        self, object_id: str, columns: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, "np.ndarray"]]:
+        """Yield each segment of a vehicle as memory-mapped column arrays.
+
+        Args:
+            object_id: Vehicle to read.
+            columns: Columns to map; all of ``COLUMNS`` when omitted.
+        """
+        columns = list(columns or COLUMNS)
+        for segment_dir in _segment_dirs(_vehicle_dir(self._directory, object_id)):
+            length = _segment_length(segment_dir)
+            if not length:
+                continue
+            yield {
+                column: np.memmap(
+                    _column_path(segment_dir, column),
+                    dtype=COLUMNS[column][1],
+                    mode="r",
+                    shape=(length,),
+                )
+                for column in columns
+            }
+
+    def read(
+        self,
+        object_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, "np.ndarray"]:
+        """Return a vehicle's samples with ``start <= time < end``.
+
+        Time bounds are located by binary search. When the range lies in a
+        single segment the arrays are views of the mapped files; ranges
+        spanning several segments are concatenated into new arrays.
+
+        Args:
+            object_id: Vehicle to read.
+            start: Inclusive lower bound, in epoch seconds.
+            end: Exclusive upper bound, in epoch seconds.
+            columns: Columns to return; all of ``COLUMNS`` when omitted.
+        """
+        columns = list(columns or COLUMNS)
+        wanted = columns if "time" in columns else ["time", *columns]
+        parts = []
+        for segment in self.segments(object_id, wanted):
+            times = segment["time"]
+            lo = 0 if start is None else int(np.searchsorted(times, start, "left"))
+            hi = len(times) if end is None else int(np.searchsorted(times, end, "left"))
+            if lo < hi:
+                parts.append({column: segment[column][lo:hi] for column in columns})
+        if not parts:
+            return {column: np.empty(0, dtype=COLUMNS[column][1]) for column in columns}
+        if len(parts) == 1:
+            return parts[0]
+        return {
+            column: np.concatenate([part[column] for part in parts])
+            for column in columns
+        }
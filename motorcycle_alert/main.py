@@ -1,38 +1,129 @@
 """Main application entry point."""
 
 import asyncio
+import dataclasses
 import logging
+import logging.handlers
 import signal
-import sys
-from typing import Optional
-
-import dotenv
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+from motorcycle_alert.application.polling import (
+    AdaptiveIntervals,
+    AdaptivePollingPolicy,
+    FixedPollingPolicy,
+    PollingPolicy,
+)
 from motorcycle_alert.application.use_cases import MotorcycleMonitoringUseCase
+from motorcycle_alert.domain.debounce import FieldRule, StatusDebouncer
+from motorcycle_alert.domain.geofence import ZoneIndex
+from motorcycle_alert.domain.rules import RuleSet
+from motorcycle_alert.domain.services import (
+    MotorcycleAlertService,
+    NotificationService,
+    StatusStorage,
+)
 from motorcycle_alert.infrastructure.api_client import ApiMotorcycleDataRepository
-from motorcycle_alert.infrastructure.config import load_config
-from motorcycle_alert.infrastructure.notifications import TelegramNotificationService
-from motorcycle_alert.infrastructure.storage import FileStatusStorage
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("motorcycle_alert.log"),
-    ],
+from motorcycle_alert.infrastructure.conditional import ConditionalCache
+from motorcycle_alert.infrastructure.config import (
+    TELEGRAM_DELIVERY_QUEUE,
+    Config,
+    VehicleConfig,
+    get_api_headers,
+)
+from motorcycle_alert.infrastructure.history import (
+    SqliteStatusHistory,
+    SqliteStatusStorage,
+)
+from motorcycle_alert.infrastructure.http_client import HttpFetcher, create_http_fetcher
+from motorcycle_alert.infrastructure.logs import configure_logging, stop_logging
+from motorcycle_alert.infrastructure.metrics import (
+    REGISTRY,
+    MetricsPollListener,
+    MetricsRegistry,
+    MetricsServer,
+)
+from motorcycle_alert.infrastructure.notifications import (
+    QueuedTelegramNotificationService,
+    TelegramNotificationService,
+)
+from motorcycle_alert.infrastructure.outbox import (
+    OutboxJournal,
+    OutboxNotificationService,
+)
+from motorcycle_alert.infrastructure.reload import (
+    FLEET_SETTINGS,
+    POLLING_SETTINGS,
+    RELOADABLE_SETTINGS,
+    ConfigSource,
+    ConfigWatcher,
+    changed_settings,
+)
+from motorcycle_alert.infrastructure.sensors import SensorSchema
+from motorcycle_alert.infrastructure.storage import (
+    CachedStatusStorage,
+    FileStatusStorage,
+    InstrumentedStatusStorage,
+    vehicle_status_path,
 )
+from motorcycle_alert.infrastructure.supervisor import (
+    ChannelNotificationService,
+    FleetSupervisor,
+    worker_config,
+)
+from motorcycle_alert.infrastructure.telemetry import TelemetryLog, TelemetryRecorder
 
 logger = logging.getLogger(__name__)
 
 
 class MotorcycleAlertApplication:
-    """Main application class."""
+    """Main application class.
+
+    With ``WORKERS`` above 1 it supervises worker processes that each run
+    this class for a shard of the fleet, see :func:`run_worker`.
+    """
 
-    def __init__(self):
-        """Initialize the application."""
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        notification_service: Optional[NotificationService] = None,
+        object_ids: Optional[Sequence[str]] = None,
+        config_source: Optional[ConfigSource] = None,
+    ):
+        """Initialize the application.
+
+        Args:
+            config: Configuration to run with; loaded from ``config_source``
+                when omitted, and only then reloadable.
+            notification_service: Delivers alerts instead of Telegram, e.g.
+                the supervisor's alert channel in a worker process.
+            object_ids: Vehicles of ``config.fleet`` to monitor; all by default.
+            config_source: Where the configuration is loaded and reloaded
+                from; ``.env``, the environment and ``sys.argv`` by default.
+        """
+        self._config = config
+        self._notification_service = notification_service
+        self._object_ids = object_ids
+        self._config_source = config_source
         self._monitoring_use_case: Optional[MotorcycleMonitoringUseCase] = None
+        self._supervisor: Optional[FleetSupervisor] = None
+        self._fetcher: Optional[HttpFetcher] = None
+        self._conditional: Optional[ConditionalCache] = None
+        self._storages: Dict[str, StatusStorage] = {}
+        self._history: Optional[SqliteStatusHistory] = None
+        self._telemetry: Optional[TelemetryLog] = None
+        self._notifier: Optional[QueuedTelegramNotificationService] = None
+        self._outbox: Optional[OutboxNotificationService] = None
+        self._fleet_repository: Optional[ApiMotorcycleDataRepository] = None
+        self._repositories: Dict[str, ApiMotorcycleDataRepository] = {}
+        self._services: Dict[str, MotorcycleAlertService] = {}
+        self._sensor_schema: Optional[SensorSchema] = None
+        self._headers: Dict[str, str] = {}
+        self._watcher: Optional[ConfigWatcher] = None
+        self._reload_lock = asyncio.Lock()
+        self._reload_tasks: Set[asyncio.Task] = set()
+        self._metrics_server: Optional[MetricsServer] = None
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
         self._setup_signal_handlers()
 
     def _setup_signal_handlers(self):
@@ -45,38 +136,521 @@ class MotorcycleAlertApplication:
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         if self._monitoring_use_case:
             self._monitoring_use_case.stop_monitoring()
+        if self._supervisor:
+            self._supervisor.stop()
 
     async def run(self):
         """Run the application."""
         try:
-            # Load environment variables
-            dotenv.load_dotenv()
-
-            # Load configuration
-            config = load_config()
-            logger.info("Configuration loaded successfully")
+            config = self._config
+            if config is None:
+                # Load environment variables and configuration
+                self._config_source = self._config_source or ConfigSource()
+                config = self._config = self._config_source.load()
+                self._log_listener = configure_logging(config)
+                logger.info("Configuration loaded successfully")
+            else:
+                self._config_source = None
 
-            # Initialize dependencies
-            data_repository = ApiMotorcycleDataRepository(config)
-            status_storage = FileStatusStorage(config.status_file_path)
-            notification_service = TelegramNotificationService(config)
-
-            # Initialize use case
-            self._monitoring_use_case = MotorcycleMonitoringUseCase(
-                data_repository=data_repository,
-                status_storage=status_storage,
-                notification_service=notification_service,
-                check_interval=config.check_interval,
+            self._notification_service = (
+                self._notification_service or await self._start_notifications(config)
             )
-
-            # Start monitoring
-            await self._monitoring_use_case.start_monitoring()
+            notification_service = self._notification_service
+            await self._start_reloading(config)
+            if config.sharded and self._object_ids is None:
+                await self._supervise(config, notification_service)
+            else:
+                await self._monitor(config, notification_service)
 
         except KeyboardInterrupt:
             logger.info("Application interrupted by user")
         except Exception as e:
             logger.error(f"Application error: {e}")
             raise
+        finally:
+            await self._stop_reloading()
+            if self._metrics_server:
+                await self._metrics_server.stop()
+            if self._outbox:
+                await self._outbox.stop()
+            if self._notifier:
+                await self._notifier.close()
+            if self._outbox:
+                self._outbox.close()
+            for storage in self._storages.values():
+                storage.close()
+            if self._history:
+                self._history.close()
+            if self._telemetry:
+                self._telemetry.close()
+            if self._fetcher:
+                await self._fetcher.close()
+            if self._conditional:
+                logger.info(
+                    f"Conditional fetch skipped {self._conditional.skipped} of "
+                    f"{self._conditional.stats['requests']} polls"
+                )
+            if self._log_listener:
+                stop_logging(self._log_listener)
+
+    async def _start_notifications(self, config: Config) -> NotificationService:
+        """Start Telegram delivery, behind the outbox when configured."""
+        notification_service: NotificationService
+        if config.telegram_delivery == TELEGRAM_DELIVERY_QUEUE:
+            self._notifier = QueuedTelegramNotificationService(config)
+            await self._notifier.start()
+            notification_service = self._notifier
+        else:
+            notification_service = TelegramNotificationService(config)
+        if config.outbox_path:
+            self._outbox = OutboxNotificationService(
+                notification_service,
+                OutboxJournal(config.outbox_path, fsync=config.outbox_fsync),
+                retry_interval=config.outbox_retry_interval,
+                dedup_window=config.outbox_dedup_window,
+            )
+            await self._outbox.start()
+            notification_service = self._outbox
+        return notification_service
+
+    async def _start_reloading(self, config: Config) -> None:
+        """Reload the configuration on SIGHUP and, when set, on file changes."""
+        if self._config_source is None:
+            return
+        self._headers = get_api_headers()
+        if hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP, self._reload_soon
+            )
+        if config.config_watch_interval:
+            self._watcher = ConfigWatcher(
+                self._watched_files(config), self.reload, config.config_watch_interval
+            )
+            await self._watcher.start()
+
+    async def _stop_reloading(self) -> None:
+        """Stop watching for reloads and wait for one in progress."""
+        if self._config_source is not None and hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        if self._watcher:
+            await self._watcher.stop()
+        if self._reload_tasks:
+            await asyncio.gather(*self._reload_tasks, return_exceptions=True)
+
+    def _watched_files(self, config: Config) -> List[str]:
+        """Return the files whose changes trigger a reload."""
+        paths = (self._config_source.dotenv_path, config.objects_file)
+        return [path for path in paths if path]
+
+    def _reload_soon(self) -> None:
+        """Start a reload from the SIGHUP handler."""
+        logger.info("Received SIGHUP, reloading configuration...")
+        task = asyncio.create_task(self.reload())
+        self._reload_tasks.add(task)
+        task.add_done_callback(self._reload_tasks.discard)
+
+    async def reload(self) -> bool:
+        """Reload the configuration and apply it without stopping polls.
+
+        API session headers, polling settings, the log level and the vehicle
+        list are swapped into the running monitor; other changed settings
+        are logged as needing a restart. In sharded mode the supervisor
+        reshards the fleet and restarts the workers that need it.
+
+        Returns:
+            Whether a new configuration was applied; an invalid one is
+            rejected and the current one kept.
+        """
+        if self._config_source is None:
+            return False
+        async with self._reload_lock:
+            try:
+                config = self._config_source.load()
+                headers = get_api_headers()
+            except (OSError, ValueError) as e:
+                logger.error(
+                    f"Configuration reload failed, keeping the current one: {e}"
+                )
+                return False
+            changed = changed_settings(self._config, config)
+            if self._supervisor:
+                # Workers pick up anything but their vehicles only on restart.
+                restart = headers != self._headers
+                restart = restart or not FLEET_SETTINGS.issuperset(changed)
+                await self._supervisor.reload(config, restart=restart)
+                self._config = config
+            elif self._monitoring_use_case:
+                await self._apply(config, changed, headers)
+            self._headers = headers
+            logging.getLogger().setLevel(config.log_level.upper())
+            if self._watcher:
+                self._watcher.watch(self._watched_files(config))
+            logger.info(
+                f"Configuration reloaded, changed settings: {', '.join(changed) or 'none'}"
+            )
+            return True
+
+    async def _apply(
+        self, config: Config, changed: List[str], headers: Dict[str, str]
+    ) -> None:
+        """Swap a reloaded configuration into the running monitor."""
+        pending = [name for name in changed if name not in RELOADABLE_SETTINGS]
+        if pending:
+            logger.warning(f"Restart to apply changes to: {', '.join(pending)}")
+        self._config = dataclasses.replace(
+            self._config,
+            **{name: getattr(config, name) for name in RELOADABLE_SETTINGS},
+        )
+        for repository in self._all_repositories():
+            repository.set_headers(headers)
+        self._monitoring_use_case.reconfigure(
+            alert_services=(
+                await self._reload_alert_services(self._config)
+                if FLEET_SETTINGS.intersection(changed)
+                else None
+            ),
+            check_interval=self._config.check_interval,
+            polling_policy=(
+                self._build_polling_policy(self._config)
+                if POLLING_SETTINGS.intersection(changed)
+                else None
+            ),
+        )
+
+    async def _reload_alert_services(
+        self, config: Config
+    ) -> List[MotorcycleAlertService]:
+        """Return the services of the reloaded fleet, building those of new vehicles.
+
+        Vehicles that stay keep their service, and so their repository,
+        storage and alert state; a changed chat only reroutes their alerts.
+        The storages and repositories of removed vehicles are closed.
+        """
+        vehicles = self._select_vehicles(config.fleet)
+        wanted = {vehicle.object_id for vehicle in vehicles}
+        for object_id in [oid for oid in self._services if oid not in wanted]:
+            del self._services[object_id]
+            self._storages.pop(object_id).close()
+            await self._repositories.pop(object_id).close()
+        for vehicle in vehicles:
+            service = self._services.get(vehicle.object_id)
+            if service is not None:
+                service.set_recipient(vehicle.recipient)
+        self._add_vehicles(
+            config, [v for v in vehicles if v.object_id not in self._services]
+        )
+        return [self._services[vehicle.object_id] for vehicle in vehicles]
+
+    def _add_vehicles(self, config: Config, vehicles: Sequence[VehicleConfig]) -> None:
+        """Build the alert services of ``vehicles``, keyed by object ID."""
+        storages: List[StatusStorage] = []
+        repositories: List[ApiMotorcycleDataRepository] = []
+        services = self._build_alert_services(
+            config,
+            self._fetcher,
+            self._notification_service,
+            self._sensor_schema,
+            storages,
+            self._history,
+            self._telemetry,
+            self._conditional,
+            repositories,
+            vehicles,
+        )
+        for vehicle, service, storage, repository in zip(
+            vehicles, services, storages, repositories
+        ):
+            self._services[vehicle.object_id] = service
+            self._storages[vehicle.object_id] = storage
+            self._repositories[vehicle.object_id] = repository
+
+    def _all_repositories(self) -> List[ApiMotorcycleDataRepository]:
+        """Return the repository of every vehicle, and the fleet one if batched."""
+        repositories = list(self._repositories.values())
+        if self._fleet_repository is not None:
+            repositories.append(self._fleet_repository)
+        return repositories
+
+    def _select_vehicles(
+        self, fleet: Sequence[VehicleConfig]
+    ) -> Tuple[VehicleConfig, ...]:
+        """Return the vehicles of ``fleet`` this process monitors."""
+        if self._object_ids is None:
+            return tuple(fleet)
+        shard = set(self._object_ids)
+        return tuple(vehicle for vehicle in fleet if vehicle.object_id in shard)
+
+    async def _supervise(
+        self, config: Config, notification_service: NotificationService
+    ) -> None:
+        """Run the fleet in ``config.workers`` sharded worker processes."""
+        self._supervisor = FleetSupervisor(
+            config, notification_service, run_worker, config.workers
+        )
+        await self._start_metrics(config)
+        await self._supervisor.run()
+
+    async def _monitor(
+        self, config: Config, notification_service: NotificationService
+    ) -> None:
+        """Poll the fleet, or this process's shard of it, until stopped."""
+        # Initialize dependencies shared by every vehicle
+        self._fetcher = create_http_fetcher(config)
+        sensor_schema = self._sensor_schema = SensorSchema.load(
+            config.sensor_schema_file
+        )
+        if config.conditional_fetch:
+            self._conditional = ConditionalCache()
+        if config.status_db_path:
+            self._history = SqliteStatusHistory(
+                config.status_db_path, batch_size=config.history_batch_size
+            )
+        if config.telemetry_dir:
+            self._telemetry = TelemetryLog(config.telemetry_dir)
+
+        fleet_repository = None
+        if config.batched:
+            fleet_repository = self._fleet_repository = ApiMotorcycleDataRepository(
+                config,
+                fetcher=self._fetcher,
+                sensor_schema=sensor_schema,
+                conditional_cache=self._conditional,
+            )
+
+        self._add_vehicles(config, self._select_vehicles(config.fleet))
+
+        # Initialize use case
+        self._monitoring_use_case = MotorcycleMonitoringUseCase(
+            alert_services=list(self._services.values()),
+            check_interval=config.check_interval,
+            max_concurrency=config.max_concurrency,
+            fleet_repository=fleet_repository,
+            fetch_all_objects=config.fetch_all_objects,
+            polling_policy=self._build_polling_policy(config),
+            poll_listener=MetricsPollListener() if config.metrics_port else None,
+        )
+        await self._start_metrics(config)
+
+        # Start monitoring
+        await self._monitoring_use_case.start_monitoring()
+
+    async def _start_metrics(self, config: Config) -> None:
+        """Serve ``/metrics`` when ``config.metrics_port`` is set."""
+        if not config.metrics_port:
+            return
+        self._register_metrics()
+        self._metrics_server = MetricsServer(
+            REGISTRY, config.metrics_host, config.metrics_port
+        )
+        await self._metrics_server.start()
+
+    def _register_metrics(self, registry: MetricsRegistry = REGISTRY) -> None:
+        """Expose the ``stats`` Counters and queue depths of the services.
+
+        Args:
+            registry: Registry to add the families to.
+        """
+        use_case = self._monitoring_use_case
+        if use_case:
+            registry.stats(
+                "motorcycle_alert_scheduler_events_total",
+                "Poll scheduler runs, missed deadlines and failed jobs",
+                lambda: use_case.scheduler.stats if use_case.scheduler else Counter(),
+            )
+            registry.stats(
+                "motorcycle_alert_polling_decisions_total",
+                "Poll delays chosen by the polling policy, by decision",
+                lambda: use_case.polling_policy.decisions,
+                label="decision",
+            )
+            registry.stats(
+                "motorcycle_alert_fetch_events_total",
+                "Full fetches, probes and probe escalations of the tracker API",
+                lambda: sum((r.stats for r in self._all_repositories()), Counter()),
+            )
+        if self._supervisor:
+            supervisor = self._supervisor
+            registry.stats(
+                "motorcycle_alert_supervisor_events_total",
+                "Worker starts, crashes, retirements, rebalances and forwarded alerts",
+                lambda: supervisor.stats,
+            )
+        if self._conditional:
+            registry.stats(
+                "motorcycle_alert_conditional_fetch_total",
+                "Tracker responses parsed, not modified, unchanged or refetched",
+                lambda: self._conditional.stats,
+            )
+        if any(isinstance(s, CachedStatusStorage) for s in self._storages.values()):
+            registry.stats(
+                "motorcycle_alert_status_cache_events_total",
+                "Status cache hits, disk reads and write-behind writes",
+                lambda: sum(
+                    (
+                        s.stats
+                        for s in self._storages.values()
+                        if isinstance(s, CachedStatusStorage)
+                    ),
+                    Counter(),
+                ),
+            )
+        if self._notifier:
+            notifier = self._notifier
+            registry.stats(
+                "motorcycle_alert_telegram_events_total",
+                "Telegram alerts queued, sent, coalesced, retried and dropped",
+                lambda: notifier.stats,
+            )
+            registry.gauge(
+                "motorcycle_alert_telegram_queue_depth",
+                "Alerts waiting for Telegram delivery",
+                lambda: notifier.queued,
+            )
+        if self._outbox:
+            outbox = self._outbox
+            registry.stats(
+                "motorcycle_alert_outbox_events_total",
+                "Outbox alerts journaled, delivered, deduplicated and replayed",
+                lambda: outbox.stats,
+            )
+            registry.gauge(
+                "motorcycle_alert_outbox_pending",
+                "Journaled alerts not yet delivered",
+                lambda: outbox.pending,
+            )
+        if self._history:
+            history = self._history
+            registry.gauge(
+                "motorcycle_alert_history_buffered",
+                "Status observations waiting to be written to the history",
+                lambda: history.buffered,
+            )
+
+    @staticmethod
+    def _build_polling_policy(config: Config) -> PollingPolicy:
+        """Build the fixed or adaptive polling policy from configuration."""
+        if not config.adaptive_polling:
+            return FixedPollingPolicy(config.check_interval)
+        return AdaptivePollingPolicy(
+            AdaptiveIntervals(
+                moving=config.moving_interval,
+                idle=config.check_interval,
+                parked=config.parked_interval,
+                parked_after=config.parked_after,
+                max_backoff=config.max_backoff,
+            )
+        )
+
+    @staticmethod
+    def _build_alert_services(
+        config: Config,
+        fetcher: HttpFetcher,
+        notification_service: NotificationService,
+        sensor_schema: SensorSchema,
+        storages: List[StatusStorage],
+        history: Optional[SqliteStatusHistory] = None,
+        telemetry: Optional[TelemetryLog] = None,
+        conditional_cache: Optional[ConditionalCache] = None,
+        repositories: Optional[List[ApiMotorcycleDataRepository]] = None,
+        vehicles: Optional[Sequence[VehicleConfig]] = None,
+    ) -> List[MotorcycleAlertService]:
+        """Build one alert service per configured vehicle, or per ``vehicles``.
+
+        The status storage of each vehicle is appended to ``storages`` so it
+        can be closed, flushing pending writes, on shutdown. Vehicles are
+        stored in ``history`` when given, otherwise in status files, and
+        every poll is appended to ``telemetry`` when given. Repositories
+        share ``conditional_cache`` when given and are appended to
+        ``repositories``. With metrics enabled, storages are timed. Alert
+        rules are compiled once and evaluated with per-vehicle state; geofence
+        zones are indexed once and tracked per vehicle. In fleet mode every
+        status file is named after its vehicle, whatever the fleet size, so
+        a vehicle keeps its file across shards, reloads and restarts.
+        """
+        fleet = config.fleet
+        rule_set = RuleSet(config.alert_rules)
+        zone_index = ZoneIndex(config.geofences)
+        services = []
+        for vehicle in fleet if vehicles is None else vehicles:
+            status_path = config.status_file_path
+            if config.vehicles:
+                status_path = vehicle_status_path(status_path, vehicle.object_id)
+            status_storage: StatusStorage = (
+                SqliteStatusStorage(history, vehicle.object_id)
+                if history is not None
+                else FileStatusStorage(status_path, fsync=config.status_fsync)
+            )
+            if config.status_cache:
+                status_storage = CachedStatusStorage(status_storage)
+            storages.append(status_storage)
+            if config.metrics_port:
+                status_storage = InstrumentedStatusStorage(status_storage)
+            data_repository = ApiMotorcycleDataRepository(
+                config,
+                fetcher=fetcher,
+                object_id=vehicle.object_id,
+                sensor_schema=sensor_schema,
+                conditional_cache=conditional_cache,
+            )
+            if repositories is not None:
+                repositories.append(data_repository)
+            services.append(
+                MotorcycleAlertService(
+                    data_repository=data_repository,
+                    status_storage=status_storage,
+                    notification_service=notification_service,
+                    object_id=vehicle.object_id,
+                    recipient=vehicle.recipient,
+                    observers=(
+                        [TelemetryRecorder(telemetry, vehicle.object_id)]
+                        if telemetry is not None
+                        else []
+                    ),
+                    debouncer=(
+                        StatusDebouncer(
+                            rules=dict(config.debounce_rules),
+                            default_rule=FieldRule(
+                                config.debounce_polls, config.debounce_seconds
+                            ),
+                            window=config.coalesce_window,
+                        )
+                        if config.debounced
+                        else None
+                    ),
+                    rules=rule_set.evaluator() if rule_set else None,
+                    geofence=zone_index.tracker() if zone_index else None,
+                )
+            )
+        return services
+
+
+def run_worker(
+    config: Config,
+    index: int,
+    object_ids: Tuple[str, ...],
+    alerts: Any,
+    logs: Any,
+    acks: Any,
+) -> None:
+    """Entry point of a worker process: monitor the vehicles of one shard.
+
+    Alerts go to the supervisor over ``alerts``, which acknowledges them over
+    ``acks``, and log records go over ``logs``. The worker stops gracefully
+    on SIGTERM from the supervisor and leaves SIGINT from the terminal to it.
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(logs)]
+    root.setLevel(config.log_level.upper())
+    app = MotorcycleAlertApplication(
+        config=worker_config(config, index),
+        notification_service=ChannelNotificationService(alerts, acks),
+        object_ids=object_ids,
+    )
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGHUP"):
+        # The supervisor handles reloads, restarting workers as needed.
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    asyncio.run(app.run())
 
 
 async def main():
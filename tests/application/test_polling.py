@@ -0,0 +1,82 @@
+"""Tests for polling policies."""
+
+import pytest
+
+from motorcycle_alert.application.polling import (
+    AdaptiveIntervals,
+    AdaptivePollingPolicy,
+    FixedPollingPolicy,
+)
+from motorcycle_alert.domain.models import MotorcycleStatus
+
+INTERVALS = AdaptiveIntervals(
+    moving=10, idle=60, parked=600, parked_after=1800, max_backoff=300, jitter=0.1
+)
+
+
+def make_status(ignition="Desligado", speed=0.0, stop_duration=0.0):
+    """Build a status with the fields the policy looks at."""
+    return MotorcycleStatus(
+        icon_color="green",
+        alimentation="Ligado",
+        blocked=False,
+        ignition=ignition,
+        speed=speed,
+        stop_duration=stop_duration,
+    )
+
+
+def no_jitter():
+    """Return the midpoint of the jitter range."""
+    return 0.5
+
+
+class TestAdaptivePollingPolicy:
+    """Test cases for AdaptivePollingPolicy."""
+
+    @pytest.mark.parametrize(
+        "status, expected, decision",
+        [
+            (make_status(ignition="Ligado"), 10, "moving"),
+            (make_status(speed=32.0), 10, "moving"),
+            (make_status(stop_duration=7500.0), 600, "parked"),
+            (make_status(stop_duration=600.0), 60, "idle"),
+            (None, 60, "idle"),
+        ],
+    )
+    def test_interval_follows_vehicle_state(self, status, expected, decision):
+        """Test the interval chosen for each vehicle state."""
+        policy = AdaptivePollingPolicy(INTERVALS, rng=no_jitter)
+
+        assert policy.next_interval(status, 0) == expected
+        assert policy.decisions == {decision: 1}
+
+    def test_errors_back_off_exponentially_up_to_cap(self):
+        """Test exponential backoff on consecutive errors."""
+        policy = AdaptivePollingPolicy(INTERVALS, rng=no_jitter)
+
+        delays = [
+            policy.next_interval(make_status(), errors) for errors in (1, 2, 3, 9)
+        ]
+
+        assert delays == [60, 120, 240, 300]
+        assert policy.decisions["backoff"] == 4
+
+    def test_jitter_spreads_interval(self):
+        """Test that jitter keeps delays within the configured spread."""
+        low = AdaptivePollingPolicy(INTERVALS, rng=lambda: 0.0)
+        high = AdaptivePollingPolicy(INTERVALS, rng=lambda: 0.999999)
+
+        assert low.next_interval(None, 0) == pytest.approx(54)
+        assert high.next_interval(None, 0) == pytest.approx(66, rel=1e-4)
+
+
+class TestFixedPollingPolicy:
+    """Test cases for FixedPollingPolicy."""
+
+    def test_interval_is_constant(self):
+        """Test that the fixed policy ignores state and errors."""
+        policy = FixedPollingPolicy(60)
+
+        assert policy.next_interval(make_status(ignition="Ligado"), 3) == 60
+        assert policy.decisions == {"fixed": 1}
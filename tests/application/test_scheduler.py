@@ -0,0 +1,167 @@
+"""Tests for the deadline poll scheduler."""
+
+import asyncio
+
+from motorcycle_alert.application.scheduler import PollScheduler
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPollScheduler:
+    """Test cases for PollScheduler."""
+
+    def test_next_deadline_ignores_job_latency(self):
+        """Test that a slow run does not push later deadlines back."""
+        clock = FakeClock()
+        scheduler = PollScheduler(clock=clock)
+
+        async def job():
+            clock.now += 3  # request latency
+            return 10.0
+
+        async def scenario():
+            scheduler.add("bike", job)
+            await scheduler._run_job("bike", 1, 100.0)
+
+        scheduler._running = True
+        asyncio.run(scenario())
+
+        deadlines = sorted(entry[0] for entry in scheduler._heap)
+        assert deadlines[-1] == 110.0
+        assert scheduler.stats["fired"] == 1
+
+    def test_overrun_skips_missed_deadlines(self):
+        """Test that deadlines missed during a long run are skipped, not burst."""
+        clock = FakeClock()
+        scheduler = PollScheduler(clock=clock)
+
+        async def job():
+            clock.now += 35
+            return 10.0
+
+        async def scenario():
+            scheduler.add("bike", job)
+            scheduler._heap.clear()
+            await scheduler._run_job("bike", 1, 100.0)
+
+        scheduler._running = True
+        asyncio.run(scenario())
+
+        assert [entry[0] for entry in scheduler._heap] == [140.0]
+        assert scheduler.stats["missed"] == 3
+
+    def test_failed_job_is_retried_after_delay(self):
+        """Test that a raising job is rescheduled after the retry delay."""
+        clock = FakeClock()
+        scheduler = PollScheduler(retry_delay=5.0, clock=clock)
+
+        async def job():
+            raise RuntimeError("boom")
+
+        async def scenario():
+            scheduler.add("bike", job)
+            scheduler._heap.clear()
+            await scheduler._run_job("bike", 1, 100.0)
+
+        scheduler._running = True
+        asyncio.run(scenario())
+
+        assert [entry[0] for entry in scheduler._heap] == [105.0]
+        assert scheduler.stats["failed"] == 1
+
+    def test_reschedule_only_brings_queued_deadlines_forward(self):
+        """Test that a job is moved earlier, never later, and not while running."""
+        clock = FakeClock()
+        scheduler = PollScheduler(clock=clock)
+
+        async def job():
+            return 10.0
+
+        scheduler.add("bike", job, first_delay=600)
+        scheduler.reschedule("bike", 900)
+        scheduler.reschedule("bike", 30)
+        scheduler.reschedule("missing", 0)
+
+        live = [e[0] for e in scheduler._heap if e[1] == scheduler._generation["bike"]]
+        assert live == [130.0]
+
+        async def fire():
+            clock.now = 130.0
+            scheduler._fire_due()
+            scheduler.reschedule("bike", 0)  # in flight: left alone
+            await asyncio.gather(*scheduler._tasks)
+
+        scheduler._running = True
+        asyncio.run(fire())
+
+        assert scheduler.stats["fired"] == 1
+        assert min(scheduler._heap)[0] == 140.0
+
+    def test_removed_and_added_again_job_ignores_stale_deadlines(self):
+        """Test that a re-added job fires on its new deadline only."""
+        clock = FakeClock()
+        scheduler = PollScheduler(clock=clock)
+        fired = []
+
+        async def job():
+            fired.append(clock.now)
+            return 10.0
+
+        scheduler.add("bike", job, first_delay=5)
+        scheduler.remove("bike")
+        scheduler.add("bike", job, first_delay=50)
+
+        async def fire(now):
+            clock.now = now
+            scheduler._fire_due()
+            await asyncio.gather(*scheduler._tasks)
+
+        async def scenario():
+            await fire(105.0)
+            await fire(150.0)
+
+        scheduler._running = True
+        asyncio.run(scenario())
+
+        assert fired == [150.0]
+
+    def test_run_fires_jobs_until_stopped(self):
+        """Test that jobs fire repeatedly and removed jobs stop firing."""
+        scheduler = PollScheduler()
+        runs = {"fast": 0, "removed": 0}
+
+        async def fast():
+            runs["fast"] += 1
+            if runs["fast"] == 5:
+                scheduler.stop()
+            return 0.01
+
+        async def removed():
+            runs["removed"] += 1
+            scheduler.remove("removed")
+            return 0.01
+
+        scheduler.add("fast", fast)
+        scheduler.add("removed", removed)
+        asyncio.run(asyncio.wait_for(scheduler.run(), timeout=5))
+
+        assert runs == {"fast": 5, "removed": 1}
+        assert len(scheduler) == 1
+
+    def test_spread_offset_is_stable_and_bounded(self):
+        """Test that start offsets are deterministic and within the interval."""
+        offsets = [PollScheduler.spread_offset(f"id-{i}", 60) for i in range(50)]
+
+        assert offsets == [
+            PollScheduler.spread_offset(f"id-{i}", 60) for i in range(50)
+        ]
+        assert all(0 <= offset < 60 for offset in offsets)
+        assert len(set(offsets)) > 40
@@ -0,0 +1,69 @@
+"""Tests for consistent-hash vehicle assignment."""
+
+import pytest
+
+from motorcycle_alert.application.sharding import HashRing
+
+KEYS = [str(object_id) for object_id in range(1000, 3000)]
+
+
+def owners(ring: HashRing):
+    """Return the node owning each key."""
+    return {key: ring.node_for(key) for key in KEYS}
+
+
+class TestHashRing:
+    """Test cases for the hash ring."""
+
+    def test_assignment_is_stable_and_complete(self):
+        """Test that every key has one owner, the same across rings."""
+        ring = HashRing(["w0", "w1", "w2"])
+
+        shards = ring.assign(KEYS)
+
+        assert sorted(key for keys in shards.values() for key in keys) == sorted(KEYS)
+        assert owners(HashRing(["w0", "w1", "w2"])) == owners(ring)
+
+    def test_keys_are_spread_evenly(self):
+        """Test that no node gets far more than its share."""
+        ring = HashRing([f"w{i}" for i in range(4)])
+
+        sizes = [len(keys) for keys in ring.assign(KEYS).values()]
+
+        assert max(sizes) < 1.3 * len(KEYS) / 4
+        assert min(sizes) > 0.7 * len(KEYS) / 4
+
+    def test_removing_a_node_only_moves_its_keys(self):
+        """Test that the other nodes keep all their keys."""
+        ring = HashRing(["w0", "w1", "w2", "w3"])
+        before = owners(ring)
+
+        ring.remove("w2")
+        after = owners(ring)
+
+        moved = {key for key in KEYS if before[key] != after[key]}
+        assert moved == {key for key in KEYS if before[key] == "w2"}
+        assert "w2" not in ring
+        assert len(ring) == 3
+
+    def test_adding_a_node_only_takes_keys(self):
+        """Test that keys only move to the new node, about 1/N of them."""
+        ring = HashRing(["w0", "w1", "w2"])
+        before = owners(ring)
+
+        ring.add("w3")
+        after = owners(ring)
+
+        moved = [key for key in KEYS if before[key] != after[key]]
+        assert all(after[key] == "w3" for key in moved)
+        assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+    def test_empty_ring(self):
+        """Test that an empty ring owns no keys but still lists shards."""
+        ring = HashRing()
+
+        assert ring.assign([]) == {}
+        with pytest.raises(LookupError):
+            ring.node_for("1")
+        with pytest.raises(ValueError):
+            HashRing(replicas=0)
@@ -0,0 +1,501 @@
+"""Tests for the monitoring use case."""
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from motorcycle_alert.application.polling import FixedPollingPolicy, PollingPolicy
+from motorcycle_alert.application.use_cases import (
+    MotorcycleMonitoringUseCase,
+    PollListener,
+)
+from motorcycle_alert.domain.debounce import FieldRule, StatusDebouncer
+from motorcycle_alert.domain.geofence import CircleZone, ZoneIndex
+from motorcycle_alert.domain.models import AlertMessage, MotorcycleStatus
+from motorcycle_alert.domain.rules import AlertRule, RuleSet
+from motorcycle_alert.domain.services import (
+    FleetDataRepository,
+    MotorcycleAlertService,
+    MotorcycleDataRepository,
+    NotificationService,
+    StatusObserver,
+    StatusStorage,
+)
+
+
+class FakeRepository(MotorcycleDataRepository):
+    """Repository returning a fixed status and tracking concurrency."""
+
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, object_id: str, ignition: str = "on", fail: bool = False):
+        self.object_id = object_id
+        self.ignition = ignition
+        self.fail = fail
+
+    async def get_current_status(self) -> MotorcycleStatus:
+        FakeRepository.in_flight += 1
+        FakeRepository.peak = max(FakeRepository.peak, FakeRepository.in_flight)
+        await asyncio.sleep(0.01)
+        FakeRepository.in_flight -= 1
+        if self.fail:
+            raise ConnectionError("tracker unavailable")
+        return MotorcycleStatus(
+            icon_color="green",
+            alimentation="12V",
+            blocked=False,
+            ignition=self.ignition,
+            object_id=self.object_id,
+        )
+
+
+class FakeFleetRepository(FleetDataRepository):
+    """Fleet repository returning one status per requested vehicle."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_fleet_status(self, object_ids=None):
+        self.calls.append(object_ids)
+        return {
+            object_id: MotorcycleStatus(
+                icon_color="green",
+                alimentation="12V",
+                blocked=False,
+                ignition="on",
+                object_id=object_id,
+            )
+            for object_id in object_ids
+        }
+
+
+class RecordingPolicy(PollingPolicy):
+    """Polling policy recording its inputs and stopping after a few polls."""
+
+    def __init__(self, use_case_ref, polls: int):
+        super().__init__()
+        self.calls = []
+        self._use_case_ref = use_case_ref
+        self._polls = polls
+
+    def next_interval(self, status, consecutive_errors):
+        self.calls.append((status, consecutive_errors))
+        if len(self.calls) >= self._polls:
+            self._use_case_ref[0].stop_monitoring()
+        return 3600
+
+
+class MemoryStorage(StatusStorage):
+    """In-memory status storage."""
+
+    def __init__(self):
+        self.status: Optional[MotorcycleStatus] = None
+        self.observations = 0
+
+    def load_last_status(self) -> Optional[MotorcycleStatus]:
+        return self.status
+
+    def save_status(self, status: MotorcycleStatus) -> None:
+        self.status = status
+
+    def record_status(self, status: MotorcycleStatus) -> None:
+        self.observations += 1
+
+
+class ListObserver(StatusObserver):
+    """Observer collecting statuses, optionally failing."""
+
+    def __init__(self, fail: bool = False):
+        self.statuses: List[MotorcycleStatus] = []
+        self.fail = fail
+
+    def observe(self, status: MotorcycleStatus) -> None:
+        if self.fail:
+            raise OSError("disk full")
+        self.statuses.append(status)
+
+
+class RecordingNotifier(NotificationService):
+    """Notification service recording sent alerts."""
+
+    def __init__(self):
+        self.sent: List[AlertMessage] = []
+
+    def send_alert(self, message: AlertMessage) -> None:
+        self.sent.append(message)
+
+
+class FailingNotifier(NotificationService):
+    """Notification service whose channel is down."""
+
+    def send_alert(self, message: AlertMessage) -> None:
+        raise OSError("telegram down")
+
+
+def build_fleet(count: int, notifier: RecordingNotifier, **repository_kwargs):
+    """Build alert services for ``count`` vehicles sharing one notifier."""
+    return [
+        MotorcycleAlertService(
+            FakeRepository(str(i), **repository_kwargs),
+            MemoryStorage(),
+            notifier,
+            object_id=str(i),
+            recipient=f"chat-{i}",
+        )
+        for i in range(count)
+    ]
+
+
+class RecordingListener(PollListener):
+    """Poll listener recording outcomes, optionally failing."""
+
+    def __init__(self, fail: bool = False):
+        self.polls = []
+        self.fail = fail
+
+    def poll_finished(self, object_id, seconds, error):
+        self.polls.append((object_id, seconds, error))
+        if self.fail:
+            raise RuntimeError("listener broken")
+
+
+class TestMotorcycleMonitoringUseCase:
+    """Test cases for fleet monitoring."""
+
+    def test_polls_every_vehicle_within_concurrency_limit(self):
+        """Test that all vehicles are polled but never more than the limit at once."""
+        FakeRepository.peak = 0
+        notifier = RecordingNotifier()
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=build_fleet(20, notifier), max_concurrency=4
+        )
+
+        asyncio.run(use_case.check_all())
+
+        assert len(notifier.sent) == 20
+        assert FakeRepository.peak == 4
+
+    def test_alerts_are_routed_per_vehicle(self):
+        """Test that each alert carries its vehicle and recipient."""
+        notifier = RecordingNotifier()
+        use_case = MotorcycleMonitoringUseCase(alert_services=build_fleet(3, notifier))
+
+        asyncio.run(use_case.check_all())
+
+        routes = {(m.status.object_id, m.recipient) for m in notifier.sent}
+        assert routes == {("0", "chat-0"), ("1", "chat-1"), ("2", "chat-2")}
+
+    def test_unchanged_vehicles_do_not_alert_again(self):
+        """Test that each vehicle keeps its own last-status state."""
+        notifier = RecordingNotifier()
+        storages = [MemoryStorage() for _ in range(3)]
+        services = [
+            MotorcycleAlertService(FakeRepository(str(i)), storage, notifier)
+            for i, storage in enumerate(storages)
+        ]
+        use_case = MotorcycleMonitoringUseCase(alert_services=services)
+
+        asyncio.run(use_case.check_all())
+        asyncio.run(use_case.check_all())
+
+        assert len(notifier.sent) == 3
+        assert [storage.observations for storage in storages] == [1, 1, 1]
+
+    def test_failing_vehicle_does_not_stop_others(self):
+        """Test that an error on one vehicle is isolated from the fleet."""
+        notifier = RecordingNotifier()
+        services = build_fleet(2, notifier) + build_fleet(1, notifier, fail=True)
+        use_case = MotorcycleMonitoringUseCase(alert_services=services)
+
+        asyncio.run(use_case.check_all())
+
+        assert len(notifier.sent) == 2
+
+    def test_observers_see_every_poll_and_cannot_block_alerts(self):
+        """Test that observers get each status and their errors are contained."""
+        notifier = RecordingNotifier()
+        observer = ListObserver()
+        service = MotorcycleAlertService(
+            FakeRepository("1"),
+            MemoryStorage(),
+            notifier,
+            observers=[ListObserver(fail=True), observer],
+        )
+        use_case = MotorcycleMonitoringUseCase(alert_services=[service])
+
+        asyncio.run(use_case.check_all())
+        asyncio.run(use_case.check_all())
+
+        assert len(observer.statuses) == 2
+        assert len(notifier.sent) == 1
+
+    def test_failed_alert_leaves_change_unrecorded(self):
+        """Test that a change is saved only once its alert was handed over."""
+        storage = MemoryStorage()
+        service = MotorcycleAlertService(
+            FakeRepository("1"), storage, FailingNotifier()
+        )
+
+        with pytest.raises(OSError):
+            asyncio.run(service.check_and_alert())
+
+        assert storage.status is None
+
+    def test_debounced_change_is_alerted_once_confirmed(self):
+        """Test that the debouncer holds alerts and storage keeps the reported status."""
+        notifier = RecordingNotifier()
+        storage = MemoryStorage()
+        repository = FakeRepository("1")
+        service = MotorcycleAlertService(
+            repository,
+            storage,
+            notifier,
+            debouncer=StatusDebouncer(default_rule=FieldRule(polls=2)),
+        )
+
+        asyncio.run(service.check_and_alert())
+        repository.ignition = "off"
+        asyncio.run(service.check_and_alert())
+        held = (len(notifier.sent), storage.status.ignition, storage.observations)
+        asyncio.run(service.check_and_alert())
+
+        assert held == (1, "on", 1)
+        assert len(notifier.sent) == 2 and storage.status.ignition == "off"
+        assert notifier.sent[1].changes[0].describe() == "Ignition: on → off"
+
+    def test_rule_alerts_go_to_the_rule_recipient(self):
+        """Test that fired rules send their own alerts besides change alerts."""
+        notifier = RecordingNotifier()
+        repository = FakeRepository("1", ignition="off")
+        rules = RuleSet(
+            [
+                AlertRule("Ignition on", "ignition_on", recipient="ops"),
+                AlertRule("x", "blocked"),
+            ]
+        )
+        service = MotorcycleAlertService(
+            repository,
+            MemoryStorage(),
+            notifier,
+            recipient="owner",
+            rules=rules.evaluator(),
+        )
+
+        asyncio.run(service.check_and_alert())
+        repository.ignition = "on"
+        asyncio.run(service.check_and_alert())
+
+        assert [(m.rule, m.recipient) for m in notifier.sent] == [
+            (None, "owner"),
+            (None, "owner"),
+            ("Ignition on", "ops"),
+        ]
+        assert "Rule triggered: Ignition on" in notifier.sent[2].format_message()
+
+    def test_geofence_events_are_alerted(self):
+        """Test that entering a zone alerts the zone recipient."""
+        notifier = RecordingNotifier()
+        zone = CircleZone("Home", lat=-3.0, lng=-60.0, radius=100, recipient="ops")
+        service = MotorcycleAlertService(
+            FakeRepository("1"),
+            MemoryStorage(),
+            notifier,
+            recipient="owner",
+            geofence=ZoneIndex([zone]).tracker(),
+        )
+        away = MotorcycleStatus("green", "12V", False, "on", lat=-3.1, lng=-60.0)
+        home = MotorcycleStatus("green", "12V", False, "on", lat=-3.0, lng=-60.0)
+
+        asyncio.run(service.check_and_alert(away))
+        asyncio.run(service.check_and_alert(home))
+
+        assert [(m.geofence, m.recipient) for m in notifier.sent] == [
+            (None, "owner"),
+            ("Entered Home", "ops"),
+        ]
+
+    def test_single_vehicle_constructor_still_supported(self):
+        """Test the original single-vehicle constructor."""
+        notifier = RecordingNotifier()
+        use_case = MotorcycleMonitoringUseCase(
+            data_repository=FakeRepository("1"),
+            status_storage=MemoryStorage(),
+            notification_service=notifier,
+        )
+
+        asyncio.run(use_case.check_all())
+
+        assert len(notifier.sent) == 1
+
+    def test_batched_fleet_uses_one_fetch_per_cycle(self):
+        """Test that a fleet repository replaces per-vehicle requests."""
+        notifier = RecordingNotifier()
+        fleet_repository = FakeFleetRepository()
+        services = build_fleet(3, notifier, fail=True)
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=services, fleet_repository=fleet_repository
+        )
+
+        asyncio.run(use_case.check_all())
+
+        assert fleet_repository.calls == [["0", "1", "2"]]
+        assert len(notifier.sent) == 3
+
+    def test_batched_failures_extend_the_error_streak(self):
+        """Test that a vehicle failing in batched mode counts as an error."""
+        use_case_ref = []
+        policy = RecordingPolicy(use_case_ref, polls=2)
+        services = build_fleet(1, RecordingNotifier()) + [
+            MotorcycleAlertService(
+                FakeRepository("9"), MemoryStorage(), FailingNotifier(), object_id="9"
+            )
+        ]
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=services,
+            fleet_repository=FakeFleetRepository(),
+            polling_policy=policy,
+        )
+        use_case_ref.append(use_case)
+
+        asyncio.run(asyncio.wait_for(use_case.start_monitoring(), timeout=5))
+
+        assert sorted(errors for _, errors in policy.calls) == [0, 1]
+
+    def test_policy_receives_status_and_error_streak(self):
+        """Test that each poll reports its outcome to the polling policy."""
+        notifier = RecordingNotifier()
+        use_case_ref = []
+        policy = RecordingPolicy(use_case_ref, polls=2)
+        services = build_fleet(1, notifier) + build_fleet(1, notifier, fail=True)
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=services, polling_policy=policy, check_interval=0.1
+        )
+        use_case_ref.append(use_case)
+
+        asyncio.run(asyncio.wait_for(use_case.start_monitoring(), timeout=5))
+
+        assert sorted(errors for _, errors in policy.calls) == [0, 1]
+        assert {status.ignition for status, _ in policy.calls if status} == {"on"}
+
+    def test_policy_reads_only_its_status_fields(self):
+        """Test that the last status is read back with the policy's fields only."""
+        use_case_ref = []
+        policy = RecordingPolicy(use_case_ref, polls=1)
+        policy.status_fields = ("ignition",)
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=build_fleet(1, RecordingNotifier()),
+            polling_policy=policy,
+            check_interval=0.1,
+        )
+        use_case_ref.append(use_case)
+
+        asyncio.run(asyncio.wait_for(use_case.start_monitoring(), timeout=5))
+
+        status = policy.calls[0][0]
+        assert status.ignition == "on"
+        assert status.icon_color is None and status.additional_sensors is None
+
+    def test_poll_listener_sees_every_outcome(self):
+        """Test that the listener gets each poll's latency and error."""
+        listener = RecordingListener()
+        services = build_fleet(1, RecordingNotifier()) + [
+            MotorcycleAlertService(
+                FakeRepository("9", fail=True),
+                MemoryStorage(),
+                RecordingNotifier(),
+                object_id="9",
+            )
+        ]
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=services, poll_listener=listener
+        )
+
+        asyncio.run(use_case.check_all())
+
+        outcomes = sorted(
+            (oid, type(error).__name__) for oid, _, error in listener.polls
+        )
+        assert outcomes == [("0", "NoneType"), ("9", "ConnectionError")]
+        assert all(seconds > 0 for _, seconds, _ in listener.polls)
+
+    def test_failing_poll_listener_does_not_stop_alerts(self):
+        """Test that listener errors are logged and contained."""
+        notifier = RecordingNotifier()
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=build_fleet(2, notifier),
+            poll_listener=RecordingListener(fail=True),
+        )
+
+        asyncio.run(use_case.check_all())
+
+        assert len(notifier.sent) == 2
+
+    def test_reconfigure_swaps_vehicles_without_stopping(self):
+        """Test that removed vehicles stop being polled and added ones start."""
+        listener = RecordingListener()
+        notifier = RecordingNotifier()
+        services = build_fleet(3, notifier)
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=services[:2], check_interval=0.05, poll_listener=listener
+        )
+
+        def polls(object_id):
+            return sum(1 for oid, _, _ in listener.polls if oid == object_id)
+
+        async def scenario():
+            task = asyncio.create_task(use_case.start_monitoring())
+            await asyncio.sleep(0.2)
+            use_case.reconfigure(alert_services=services[1:])
+            removed_polls, kept_polls = polls("0"), polls("1")
+            await asyncio.sleep(0.2)
+            use_case.stop_monitoring()
+            await task
+            return removed_polls, kept_polls
+
+        removed_polls, kept_polls = asyncio.run(asyncio.wait_for(scenario(), 5))
+
+        assert removed_polls > 0
+        assert polls("0") <= removed_polls + 1  # at most the poll in flight
+        assert polls("1") > kept_polls
+        assert polls("2") > 0
+        assert {m.status.object_id for m in notifier.sent} == {"0", "1", "2"}
+
+    def test_reconfigure_brings_queued_polls_forward(self):
+        """Test that a shorter interval applies before the old deadline."""
+        listener = RecordingListener()
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=build_fleet(2, RecordingNotifier()),
+            polling_policy=FixedPollingPolicy(3600),
+            check_interval=0.01,
+            poll_listener=listener,
+        )
+
+        async def scenario():
+            task = asyncio.create_task(use_case.start_monitoring())
+            await asyncio.sleep(0.1)
+            first_polls = len(listener.polls)
+            use_case.reconfigure(polling_policy=FixedPollingPolicy(0.05))
+            await asyncio.sleep(0.3)
+            use_case.stop_monitoring()
+            await task
+            return first_polls
+
+        first_polls = asyncio.run(asyncio.wait_for(scenario(), 5))
+
+        assert first_polls == 2
+        assert len(listener.polls) >= 6
+
+    def test_reconfigure_changes_the_batched_fleet(self):
+        """Test that the next batched fetch asks for the new vehicle list."""
+        fleet_repository = FakeFleetRepository()
+        services = build_fleet(3, RecordingNotifier())
+        use_case = MotorcycleMonitoringUseCase(
+            alert_services=services[:2], fleet_repository=fleet_repository
+        )
+
+        use_case.reconfigure(alert_services=services[1:])
+        asyncio.run(use_case.check_all())
+
+        assert fleet_repository.calls == [["1", "2"]]
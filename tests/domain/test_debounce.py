@@ -0,0 +1,134 @@
+"""Tests for status change debouncing and coalescing."""
+
+from motorcycle_alert.domain.debounce import FieldRule, StatusDebouncer
+from motorcycle_alert.domain.models import FieldChange, MotorcycleStatus
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_status(icon_color="green", ignition="Ligado", blocked=False):
+    """Build a status with the given compared fields."""
+    return MotorcycleStatus(
+        icon_color=icon_color, alimentation="12V", blocked=blocked, ignition=ignition
+    )
+
+
+def feed(debouncer, reported, statuses, clock=None, step=60.0):
+    """Poll ``statuses`` in turn, reporting digests like the alert service."""
+    digests = []
+    for status in statuses:
+        digest = debouncer.update(reported, status)
+        if digest is not None:
+            reported = digest.status
+            digests.append(digest)
+        if clock is not None:
+            clock.now += step
+    return digests
+
+
+class TestStatusDebouncer:
+    """Test cases for StatusDebouncer."""
+
+    def test_first_status_is_reported_at_once(self):
+        """Test that the very first status needs no confirmation."""
+        digest = StatusDebouncer(default_rule=FieldRule(polls=3)).update(
+            None, make_status()
+        )
+
+        assert digest.status == make_status() and digest.changes == ()
+
+    def test_flapping_field_is_suppressed(self):
+        """Test that a value must persist for K polls before it is reported."""
+        debouncer = StatusDebouncer(rules={"icon_color": FieldRule(polls=3)})
+        flapping = ["yellow", "green", "yellow", "yellow", "green", "yellow"]
+
+        digests = feed(
+            debouncer, make_status(), [make_status(color) for color in flapping]
+        )
+
+        assert digests == []
+        assert debouncer.pending == {"icon_color": "yellow"}
+
+    def test_persistent_change_is_reported_after_k_polls(self):
+        """Test that the K-th poll of the same value confirms it."""
+        debouncer = StatusDebouncer(rules={"icon_color": FieldRule(polls=3)})
+
+        digests = feed(debouncer, make_status(), [make_status("yellow")] * 4)
+
+        assert len(digests) == 1
+        assert digests[0].changes == (FieldChange("icon_color", "green", "yellow"),)
+
+    def test_change_is_confirmed_after_t_seconds(self):
+        """Test that a long enough persistence confirms before K polls."""
+        clock = FakeClock()
+        debouncer = StatusDebouncer(
+            default_rule=FieldRule(polls=10, seconds=120), clock=clock
+        )
+
+        digests = feed(
+            debouncer, make_status(), [make_status("yellow")] * 3, clock=clock
+        )
+
+        assert len(digests) == 1 and clock.now == 180
+
+    def test_value_specific_rule_gives_hysteresis(self):
+        """Test that ``field:value`` rules override the field rule."""
+        debouncer = StatusDebouncer(
+            rules={"ignition": FieldRule(polls=1), "ignition:Desligado": FieldRule(3)}
+        )
+
+        on = feed(debouncer, make_status(ignition="Desligado"), [make_status()])
+        off = feed(debouncer, make_status(), [make_status(ignition="Desligado")] * 3)
+
+        assert len(on) == 1 and len(off) == 1
+        assert debouncer.rule_for("ignition", "Desligado").polls == 3
+
+    def test_unconfirmed_fields_keep_their_reported_value(self):
+        """Test that a digest only carries confirmed field values."""
+        debouncer = StatusDebouncer(rules={"icon_color": FieldRule(polls=5)})
+
+        digest = debouncer.update(make_status(), make_status("yellow", blocked=True))
+
+        assert digest.status.icon_color == "green" and digest.status.blocked
+        assert digest.changes == (FieldChange("blocked", False, True),)
+
+    def test_changes_within_window_are_coalesced(self):
+        """Test that changes of several fields become a single digest."""
+        clock = FakeClock()
+        debouncer = StatusDebouncer(window=120, clock=clock)
+        polls = [
+            make_status("yellow"),
+            make_status("yellow", ignition="Desligado"),
+            make_status("yellow", ignition="Desligado", blocked=True),
+        ]
+
+        digests = feed(debouncer, make_status(), polls, clock=clock)
+
+        assert len(digests) == 1
+        assert [change.field for change in digests[0].changes] == [
+            "icon_color",
+            "blocked",
+            "ignition",
+        ]
+
+    def test_reverted_change_within_window_is_dropped(self):
+        """Test that a field back to its reported value cancels its change."""
+        clock = FakeClock()
+        debouncer = StatusDebouncer(window=120, clock=clock)
+
+        digests = feed(
+            debouncer,
+            make_status(),
+            [make_status("yellow"), make_status(), make_status(), make_status()],
+            clock=clock,
+        )
+
+        assert digests == [] and debouncer.pending == {}
@@ -0,0 +1,216 @@
+"""Tests for the compact fleet status tables."""
+
+import dataclasses
+import struct
+
+import pytest
+
+from motorcycle_alert.domain.fleet import (
+    FleetTable,
+    StatusWindow,
+    SymbolTable,
+)
+from motorcycle_alert.domain.models import MotorcycleStatus
+
+
+def make_status(**overrides):
+    """Build a fully populated status."""
+    fields = dict(
+        icon_color="green",
+        alimentation="12.4V",
+        blocked=False,
+        ignition="Ligado",
+        time=1_700_000_000.0,
+        stop_duration=303.0,
+        speed=42.0,
+        additional_sensors={"gsm": "Excelente", "satellites": 9, "door": True},
+        lat=-3.1,
+        lng=-60.0,
+        object_id="101",
+    )
+    fields.update(overrides)
+    return MotorcycleStatus(**fields)
+
+
+def all_fields(status):
+    """Return every field of a status, beyond the compared ones."""
+    return dataclasses.astuple(status)
+
+
+class TestSymbolTable:
+    """Test cases for string and sensor set interning."""
+
+    def test_interns_strings_once(self):
+        """Test that equal strings share an ID and None is ID 0."""
+        symbols = SymbolTable()
+
+        assert symbols.intern(None) == 0
+        assert symbols.intern("on") == symbols.intern("on") == 1
+        assert symbols.intern("off") == 2
+        assert symbols.lookup(2) == "off"
+        assert len(symbols) == 2
+
+
+class TestFleetTable:
+    """Test cases for the latest status per vehicle."""
+
+    def test_round_trips_every_field(self):
+        """Test that a stored status is materialised unchanged."""
+        table = FleetTable()
+        status = make_status()
+
+        table.update("101", status)
+
+        assert all_fields(table.get("101")) == all_fields(status)
+        assert table.get("missing") is None
+
+    def test_round_trips_unknown_values(self):
+        """Test that None numbers, text and sensors survive storage."""
+        table = FleetTable()
+        status = MotorcycleStatus(
+            icon_color="red", alimentation="", blocked=True, ignition=""
+        )
+
+        table.update("a", status)
+
+        assert all_fields(table.get("a")) == all_fields(status)
+
+    def test_update_overwrites_row_in_place(self):
+        """Test that a vehicle keeps its row across updates."""
+        table = FleetTable()
+        table.update("101", make_status())
+        table.update("102", make_status(object_id="102"))
+
+        table.update("101", make_status(speed=None, ignition="Desligado"))
+
+        assert len(table) == 2
+        assert len(table.columns) == 2
+        assert table.get("101").ignition == "Desligado"
+        assert table.get("101").speed is None
+        assert list(table) == ["101", "102"]
+        assert "102" in table
+
+    def test_discarded_row_is_reused(self):
+        """Test that a removed vehicle's row goes to the next new vehicle."""
+        table = FleetTable()
+        table.update("101", make_status())
+        table.update("102", make_status(object_id="102"))
+
+        table.discard("101")
+        table.discard("missing")
+        table.update("103", make_status(object_id="103", ignition="Desligado"))
+
+        assert list(table) == ["102", "103"]
+        assert "101" not in table and table.get("101") is None
+        assert len(table.columns) == 2
+        assert table.get("103").ignition == "Desligado"
+        assert table.get("102").object_id == "102"
+
+    def test_columns_expose_typed_arrays(self):
+        """Test that numeric columns can be scanned without building statuses."""
+        table = FleetTable()
+        for i, speed in enumerate((10.0, 80.0, 95.0)):
+            table.update(i, make_status(speed=speed))
+
+        speeds = table.columns.column("speed")
+
+        assert speeds.typecode == "d"
+        assert [s > 60 for s in speeds] == [False, True, True]
+        # Five doubles, three symbol IDs and a flag per row, plus pointers to
+        # the alimentation and the three sensor values.
+        pointers = 3 * 4 * struct.calcsize("P")
+        assert table.columns.nbytes() == 3 * (5 * 8 + 3 * 4 + 1) + pointers
+
+    def test_sensor_values_keep_their_types(self):
+        """Test that True and 1, and unhashable values, come back as stored."""
+        table = FleetTable()
+        table.update("a", make_status(additional_sensors={"door": True}))
+        table.update("b", make_status(additional_sensors={"door": 1}))
+        table.update("c", make_status(additional_sensors={"faults": [1, 2]}))
+
+        assert table.get("a").additional_sensors["door"] is True
+        assert table.get("b").additional_sensors["door"] is not True
+        assert table.get("b").additional_sensors == {"door": 1}
+        assert table.get("c").additional_sensors == {"faults": [1, 2]}
+
+    def test_varying_readings_do_not_grow_the_symbol_table(self):
+        """Test that only sensor names are interned, not their readings."""
+        table = FleetTable()
+        table.update("101", make_status())
+        symbols = len(table.columns.symbols)
+        nbytes = table.columns.nbytes()
+
+        for i in range(100):
+            table.update(
+                "101",
+                make_status(
+                    alimentation=f"{12 + i / 100:.2f}V",
+                    additional_sensors={"gsm": "Excelente", "satellites": i},
+                ),
+            )
+
+        assert len(table.columns.symbols) == symbols
+        assert table.columns.nbytes() == nbytes
+        assert table.get("101").additional_sensors == {
+            "gsm": "Excelente",
+            "satellites": 99,
+        }
+
+    def test_missing_sensors_are_not_carried_over(self):
+        """Test that a row only reports the sensors of its latest status."""
+        table = FleetTable()
+        table.update("101", make_status())
+        table.update("101", make_status(additional_sensors={"fuel": 40.0}))
+        table.update("102", make_status(object_id="102", additional_sensors=None))
+
+        assert table.get("101").additional_sensors == {"fuel": 40.0}
+        assert table.get("102").additional_sensors is None
+
+    def test_reads_only_requested_fields(self):
+        """Test that a partial read fills the requested fields only."""
+        table = FleetTable()
+        table.update("101", make_status())
+
+        status = table.get("101", ("ignition", "speed", "stop_duration"))
+
+        assert (status.ignition, status.speed, status.stop_duration) == (
+            "Ligado",
+            42.0,
+            303.0,
+        )
+        assert status.icon_color is None and status.additional_sensors is None
+        assert table.get("101", ()).ignition is None
+
+    def test_materialised_sensors_are_independent(self):
+        """Test that mutating a returned sensor dict does not change the table."""
+        table = FleetTable()
+        table.update("101", make_status())
+
+        table.get("101").additional_sensors["gsm"] = "Ruim"
+
+        assert table.get("101").additional_sensors["gsm"] == "Excelente"
+
+
+class TestStatusWindow:
+    """Test cases for the ring buffer of recent statuses."""
+
+    def test_keeps_last_statuses_oldest_first(self):
+        """Test that the oldest status is evicted once the window is full."""
+        window = StatusWindow(3)
+        for speed in range(5):
+            window.append(make_status(speed=float(speed)))
+
+        assert len(window) == 3
+        assert [s.speed for s in window.statuses()] == [2.0, 3.0, 4.0]
+
+    def test_partial_window(self):
+        """Test a window holding fewer statuses than its capacity."""
+        window = StatusWindow(3)
+        window.append(make_status(speed=1.0))
+
+        assert [s.speed for s in window.statuses()] == [1.0]
+
+    def test_rejects_empty_capacity(self):
+        """Test that a window must hold at least one status."""
+        with pytest.raises(ValueError, match="at least 1"):
+            StatusWindow(0)
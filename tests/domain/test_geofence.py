@@ -0,0 +1,88 @@
+"""Tests for geofence zones and their spatial index."""
+
+import pytest
+
+from motorcycle_alert.domain.geofence import (
+    CircleZone,
+    PolygonZone,
+    ZoneIndex,
+)
+
+SQUARE = PolygonZone(
+    "Depot", ((-3.10, -60.10), (-3.10, -60.00), (-3.00, -60.00), (-3.00, -60.10))
+)
+HOME = CircleZone("Home", lat=-3.05, lng=-60.05, radius=500)
+FAR = CircleZone("Far", lat=10.0, lng=10.0, radius=500)
+
+
+def track(index, positions):
+    """Feed positions to a tracker and describe the events of each update."""
+    tracker = index.tracker()
+    return [[e.describe() for e in tracker.update(*p)] for p in positions]
+
+
+class TestZones:
+    """Test cases for zone shapes."""
+
+    def test_polygon_contains_by_ray_casting(self):
+        """Test points inside, outside and within the box of a concave polygon."""
+        notch = PolygonZone("L", ((0, 0), (0, 2), (1, 2), (1, 1), (2, 1), (2, 0)))
+
+        assert notch.contains(0.5, 1.5)
+        assert not notch.contains(1.5, 1.5)
+        assert not notch.contains(3, 3)
+
+    def test_circle_radius_in_metres(self):
+        """Test that the circle radius is measured on the ground."""
+        assert HOME.contains(-3.05 + 0.004, -60.05)  # ~445 m
+        assert not HOME.contains(-3.05 + 0.005, -60.05)  # ~556 m
+
+    def test_invalid_zones_are_rejected(self):
+        """Test zone validation."""
+        with pytest.raises(ValueError):
+            PolygonZone("line", ((0, 0), (1, 1)))
+        with pytest.raises(ValueError):
+            ZoneIndex([HOME, CircleZone("Home", lat=0, lng=0, radius=1)])
+
+
+class TestZoneIndex:
+    """Test cases for ZoneIndex and GeofenceTracker."""
+
+    def test_lookup_only_tests_zones_of_the_cell(self):
+        """Test that far zones are not candidates for a position."""
+        index = ZoneIndex([SQUARE, HOME, FAR], cell_size=0.05)
+
+        assert FAR not in index.candidates(-3.05, -60.05)
+        assert {z.name for z in index.zones_at(-3.05, -60.05)} == {"Depot", "Home"}
+        assert index.zones_at(10.0, 10.0) == frozenset({FAR})
+        assert index.zones_at(50.0, 50.0) == frozenset()
+
+    def test_enter_and_exit_events(self):
+        """Test that crossing zone borders yields entries then exits."""
+        index = ZoneIndex([SQUARE, HOME])
+        positions = [
+            (-3.20, -60.05),  # outside everything: initial position
+            (-3.08, -60.05),  # inside the depot
+            (-3.05, -60.05),  # inside home too
+            (-3.05, -60.05),  # unchanged
+            (None, None),  # no fix
+            (-3.20, -60.05),  # outside again
+        ]
+
+        assert track(index, positions) == [
+            [],
+            ["Entered Depot"],
+            ["Entered Home"],
+            [],
+            [],
+            ["Left Depot", "Left Home"],
+        ]
+
+    def test_initial_position_sets_zones_silently(self):
+        """Test that starting inside a zone raises no entry event."""
+        index = ZoneIndex([HOME])
+        tracker = index.tracker()
+
+        assert tracker.update(-3.05, -60.05) == []
+        assert tracker.inside == frozenset({HOME})
+        assert [e.describe() for e in tracker.update(-3.2, -60.05)] == ["Left Home"]
@@ -2,7 +2,8 @@
 
 import pytest
 
-from motorcycle_alert.domain.models import AlertMessage, MotorcycleStatus
+from motorcycle_alert.domain.models import AlertMessage, FieldChange, MotorcycleStatus
+from motorcycle_alert.domain.values import parse_timestamp
 
 
 class TestMotorcycleStatus:
@@ -22,14 +23,14 @@ class TestMotorcycleStatus:
     def test_invalid_empty_icon_color(self):
         """Test that empty icon color raises ValueError."""
         with pytest.raises(ValueError, match="Icon color cannot be empty"):
-            MotorcycleStatus(
+            MotorcycleStatus.create(
                 icon_color="", alimentation="12V", blocked=False, ignition="on"
             )
 
     def test_invalid_blocked_type(self):
         """Test that non-boolean blocked value raises ValueError."""
         with pytest.raises(ValueError, match="Blocked status must be a boolean"):
-            MotorcycleStatus(
+            MotorcycleStatus.create(
                 icon_color="green",
                 alimentation="12V",
                 blocked="false",  # Should be boolean
@@ -71,9 +72,9 @@ class TestAlertMessage:
             alimentation="12V",
             blocked=False,
             ignition="on",
-            time="2024-01-01 12:00:00",
-            stop_duration="5 min",
-            speed="0 km/h",
+            time=parse_timestamp("2024-01-01 12:00:00"),
+            stop_duration=300.0,
+            speed=0.0,
         )
 
         alert = AlertMessage(status=status, timestamp="2024-01-01 12:05:00")
@@ -86,6 +87,8 @@ class TestAlertMessage:
         assert "Alimentation: 12V" in message
         assert "Blocked: No" in message
         assert "Ignition: on" in message
+        assert "Stop Duration: 5min" in message
+        assert "Speed: 0 km/h" in message
         assert "Alert Time: 2024-01-01 12:05:00" in message
 
     def test_format_message_with_additional_sensors(self):
@@ -105,3 +108,33 @@ class TestAlertMessage:
         assert "Additional Sensors:" in message
         assert "temperature" in message
         assert "fuel" in message
+
+    def test_format_message_includes_vehicle(self):
+        """Test that the vehicle identifier is shown when known."""
+        status = MotorcycleStatus(
+            icon_color="green",
+            alimentation="12V",
+            blocked=False,
+            ignition="on",
+            object_id="42",
+        )
+
+        message = AlertMessage(status=status, timestamp="now").format_message()
+
+        assert "Vehicle: 42" in message
+
+    def test_format_message_lists_changes(self):
+        """Test that digest changes are described in the message."""
+        status = MotorcycleStatus(
+            icon_color="yellow", alimentation="12V", blocked=True, ignition="on"
+        )
+        changes = (
+            FieldChange("icon_color", "green", "yellow"),
+            FieldChange("blocked", False, True),
+        )
+
+        message = AlertMessage(
+            status=status, timestamp="now", changes=changes
+        ).format_message()
+
+        assert "Changes:\n- Icon Color: green → yellow\n- Blocked: No → Yes" in message
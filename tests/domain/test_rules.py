@@ -0,0 +1,124 @@
+"""Tests for the alert rule engine."""
+
+import pytest
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.rules import AlertRule, RuleSet, compile_condition
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_status(ignition="Desligado", blocked=False, speed=None, lat=-3.1, **kw):
+    """Build a polled status."""
+    kw.setdefault("alimentation", "12.4V")
+    return MotorcycleStatus(
+        icon_color="green",
+        blocked=blocked,
+        ignition=ignition,
+        speed=speed,
+        lat=lat,
+        lng=-60.0,
+        **kw,
+    )
+
+
+def fired_names(rules, statuses, clock=None, step=60.0):
+    """Evaluate ``rules`` over successive polls and list the firings per poll."""
+    evaluator = RuleSet(rules).evaluator(clock=clock or FakeClock())
+    fired = []
+    for status in statuses:
+        fired.append([rule.name for rule in evaluator.evaluate(status)])
+        if clock is not None:
+            clock.now += step
+    return fired
+
+
+class TestCompileCondition:
+    """Test cases for condition compilation."""
+
+    @pytest.mark.parametrize(
+        "condition",
+        [
+            "__import__('os')",
+            "speed.__class__",
+            "open",
+            "prev.prev",
+            "prev",
+            "[x for x in (1,)]",
+            "lambda: 1",
+            "speed >",
+        ],
+    )
+    def test_unsafe_or_invalid_conditions_are_rejected(self, condition):
+        """Test that only whitelisted syntax and variables compile."""
+        with pytest.raises(ValueError):
+            compile_condition(condition)
+
+    def test_previous_values_are_readable(self):
+        """Test that ``prev.<name>`` reads the previous context."""
+        predicate = compile_condition("prev.voltage > 0 == voltage")
+
+        assert predicate({"voltage": 0.0}, {"voltage": 12.0})
+        assert not predicate({"voltage": 12.0}, {"voltage": 12.0})
+
+    def test_duplicate_rule_names_are_rejected(self):
+        """Test that rule names identify rules."""
+        with pytest.raises(ValueError, match="Duplicate"):
+            RuleSet([AlertRule("a", "blocked"), AlertRule("a", "speed > 1")])
+
+
+class TestRuleEvaluator:
+    """Test cases for RuleEvaluator."""
+
+    def test_rule_fires_on_rising_edge_only(self):
+        """Test that a sustained condition alerts once."""
+        rule = AlertRule("Speeding", "speed > 80")
+        speeds = [50.0, 85.0, 90.0, None, 81.0]
+
+        fired = fired_names([rule], [make_status(speed=speed) for speed in speeds])
+
+        assert fired == [[], ["Speeding"], [], [], ["Speeding"]]
+
+    def test_cooldown_suppresses_repeated_firings(self):
+        """Test that a rule does not fire again within its cooldown."""
+        clock = FakeClock()
+        rule = AlertRule("Blocked ignition", "ignition_on and blocked", cooldown=150)
+        polls = [make_status("Ligado", blocked=b) for b in [True, False, True, False]]
+        polls.append(make_status("Ligado", blocked=True))
+
+        fired = fired_names([rule], polls, clock=clock)
+
+        assert fired == [["Blocked ignition"], [], [], [], ["Blocked ignition"]]
+
+    def test_movement_while_parked(self):
+        """Test ``moved_since_parked`` measures from where ignition turned off."""
+        rule = AlertRule("Towed", "not ignition_on and moved_since_parked > 200")
+        polls = [
+            make_status("Ligado", lat=-3.1000),
+            make_status(lat=-3.1000),
+            make_status(lat=-3.1010),  # ~111 m
+            make_status(lat=-3.1025),  # ~278 m
+        ]
+
+        assert fired_names([rule], polls) == [[], [], [], ["Towed"]]
+
+    def test_alimentation_lost(self):
+        """Test a transition rule reading the previous poll."""
+        rule = AlertRule("Power lost", "prev.voltage > 0 and voltage == 0")
+        polls = [make_status(), make_status(alimentation="0V"), make_status()]
+
+        assert fired_names([rule], polls) == [[], ["Power lost"], []]
+
+    def test_failing_condition_counts_as_false(self):
+        """Test that runtime errors in one rule do not affect the others."""
+        rules = [AlertRule("bad", "icon_color > 1"), AlertRule("ok", "blocked")]
+
+        assert fired_names(rules, [make_status(blocked=True)]) == [["ok"]]
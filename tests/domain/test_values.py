@@ -0,0 +1,92 @@
+"""Tests for raw status value interpretation."""
+
+import pytest
+
+from motorcycle_alert.domain.values import (
+    format_duration,
+    format_speed,
+    format_timestamp,
+    is_on,
+    parse_duration,
+    parse_number,
+    parse_timestamp,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1h 5min 3s", 3903),
+        ("5 min", 300),
+        ("2d 3h", 183600),
+        ("3 dias", 259200),
+        ("01:05:03", 3903),
+        ("05:03", 303),
+        (42, 42),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_duration(value, expected):
+    """Test parsing tracker durations into seconds."""
+    assert parse_duration(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(45, 45.0), ("45 km/h", 45.0), ("12,6 V", 12.6), ("n/a", None), (None, None)],
+)
+def test_parse_number(value, expected):
+    """Test extracting numbers from raw values."""
+    assert parse_number(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("Ligado", True), ("on", True), ("Desligado", False), ("0", False), (None, False)],
+)
+def test_is_on(value, expected):
+    """Test interpreting on/off values."""
+    assert is_on(value) is expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("17-10-2026 12:00:00", 1_792_238_400.0),
+        ("2026-10-17 12:00:00", 1_792_238_400.0),
+        ("17/10/2026 12:00", 1_792_238_400.0),
+        (1_792_238_400, 1_792_238_400.0),
+        ("31-02-2026 12:00:00", None),
+        ("yesterday", None),
+        (None, None),
+    ],
+)
+def test_parse_timestamp(value, expected):
+    """Test parsing tracker times in UTC into epoch seconds."""
+    assert parse_timestamp(value, utc_offset=0) == expected
+
+
+def test_parse_timestamp_offset_and_local_time():
+    """Test tracker clocks ahead of UTC and the local time default."""
+    assert parse_timestamp("17-10-2026 12:00:00", utc_offset=-4 * 3600) == (
+        1_792_238_400.0 + 4 * 3600
+    )
+    local = parse_timestamp("2024-01-01 12:00:00")
+    assert format_timestamp(local) == "2024-01-01 12:00:00"
+
+
+@pytest.mark.parametrize(
+    "formatter, value, expected",
+    [
+        (format_duration, 3903.0, "1h 5min 3s"),
+        (format_duration, 0, "0s"),
+        (format_speed, 45.0, "45 km/h"),
+        (format_speed, 12.5, "12.5 km/h"),
+        (format_speed, None, "N/A"),
+        (format_duration, "5 min", "5 min"),
+    ],
+)
+def test_formatters(formatter, value, expected):
+    """Test display text, including legacy raw strings passed through."""
+    assert formatter(value) == expected
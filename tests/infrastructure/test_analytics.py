@@ -0,0 +1,137 @@
+"""Tests for the vectorised telemetry analytics."""
+
+import math
+
+import numpy as np
+import pytest
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.values import distance_m
+from motorcycle_alert.infrastructure.analytics import (
+    daily_summaries,
+    detect_trips,
+    fleet_daily_summaries,
+    main,
+    step_distances,
+)
+from motorcycle_alert.infrastructure.telemetry import TelemetryLog, TelemetryReader
+
+DAY = 1_700_006_400.0  # 2023-11-15 00:00 UTC
+
+
+def make_columns(rows):
+    """Build columns from ``(time, lat, lng, speed, ignition)`` rows."""
+    time, lat, lng, speed, ignition = (np.array(c, dtype=float) for c in zip(*rows))
+    return {
+        "time": time,
+        "lat": lat,
+        "lng": lng,
+        "speed": speed.astype(np.float32),
+        "ignition": ignition.astype(np.uint8),
+    }
+
+
+# Parked, a 3-minute trip with one idle minute, parked, then a trip still running.
+ROWS = [
+    (DAY + 0, -3.100, -60.0, 0, 0),
+    (DAY + 60, -3.100, -60.0, 0, 1),
+    (DAY + 120, -3.101, -60.0, 0, 1),
+    (DAY + 180, -3.110, -60.0, 54, 1),
+    (DAY + 240, -3.120, -60.0, math.nan, 0),
+    (DAY + 300, -3.120, -60.0, 0, 0),
+    (DAY + 86_400 + 60, -3.120, -60.0, 20, 1),
+    (DAY + 86_400 + 120, -3.121, -60.0, 30, 1),
+]
+
+
+class TestAnalytics:
+    """Test cases for trip detection and daily summaries."""
+
+    def test_step_distances_match_scalar_haversine(self):
+        """Test the vectorised haversine against the scalar one."""
+        columns = make_columns(ROWS)
+
+        steps = step_distances(columns["lat"], columns["lng"])
+
+        assert steps[0] == 0.0
+        expected = [distance_m(a[1], a[2], b[1], b[2]) for a, b in zip(ROWS, ROWS[1:])]
+        assert steps[1:] == pytest.approx(expected)
+
+    def test_unknown_positions_add_no_distance(self):
+        """Test that NaN coordinates contribute zero distance."""
+        steps = step_distances(np.array([0.0, np.nan, 0.0]), np.zeros(3))
+
+        assert steps.tolist() == [0.0, 0.0, 0.0]
+
+    def test_trips_span_ignition_on_to_off(self):
+        """Test trip boundaries, distance, speeds and idle time."""
+        trips = detect_trips(make_columns(ROWS), "7")
+
+        assert [(t.start - DAY, t.end - DAY, t.samples) for t in trips] == [
+            (60, 240, 4),
+            (86_460, 86_520, 2),
+        ]
+        first = trips[0]
+        assert first.distance_m == pytest.approx(
+            distance_m(-3.100, -60.0, -3.120, -60.0)
+        )
+        assert first.max_speed == 54.0
+        assert first.avg_speed == pytest.approx(first.distance_m / 180 * 3.6)
+        assert first.idle_seconds == 120.0  # two steps starting at 0 km/h
+        assert trips[1].object_id == "7" and trips[1].max_speed == 30.0
+
+    def test_daily_summaries(self):
+        """Test per-day totals and local day boundaries."""
+        days = daily_summaries(make_columns(ROWS), "7")
+
+        assert [(d.day, d.trips) for d in days] == [
+            ("2023-11-15", 1),
+            ("2023-11-16", 1),
+        ]
+        assert days[0].driving_seconds == 180.0
+        assert days[0].idle_seconds == 120.0
+        assert days[0].distance_m == pytest.approx(
+            distance_m(-3.100, -60.0, -3.120, -60.0)
+        )
+        # Shifted four hours back, the early minutes fall on the previous day.
+        shifted = daily_summaries(make_columns(ROWS), utc_offset=-4 * 3600)
+        assert [d.day for d in shifted] == ["2023-11-14", "2023-11-15"]
+
+    def test_empty_history(self):
+        """Test that vehicles without samples have no trips or summaries."""
+        columns = make_columns([(0, 0, 0, 0, 0)])
+        empty = {name: values[:0] for name, values in columns.items()}
+
+        assert detect_trips(empty) == [] and daily_summaries(empty) == []
+        assert detect_trips(columns) == []
+
+    def test_fleet_summaries_from_telemetry_log(self, tmp_path, capsys):
+        """Test summarising a telemetry log written by the poller."""
+        clock = [0.0]
+        log = TelemetryLog(str(tmp_path), clock=lambda: clock[0])
+        for time, lat, lng, speed, ignition in ROWS:
+            clock[0] = time
+            status = MotorcycleStatus(
+                icon_color="green",
+                alimentation="12V",
+                blocked=False,
+                ignition="Ligado" if ignition else "Desligado",
+                speed=None if math.isnan(speed) else speed,
+                lat=lat,
+                lng=lng,
+            )
+            log.append("1", status)
+            log.append("2", status)
+        log.close()
+
+        summaries = fleet_daily_summaries(TelemetryReader(str(tmp_path)))
+        main([str(tmp_path), "--vehicle", "2"])
+
+        assert [(s.object_id, s.day) for s in summaries] == [
+            ("1", "2023-11-15"),
+            ("1", "2023-11-16"),
+            ("2", "2023-11-15"),
+            ("2", "2023-11-16"),
+        ]
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("object_id,day,trips") and len(lines) == 3
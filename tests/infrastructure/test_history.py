@@ -0,0 +1,203 @@
+"""Tests for the SQLite status history."""
+
+import asyncio
+
+import pytest
+
+from motorcycle_alert.domain.debounce import FieldRule, StatusDebouncer
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.services import (
+    MotorcycleAlertService,
+    MotorcycleDataRepository,
+    NotificationService,
+)
+from motorcycle_alert.infrastructure.history import (
+    SqliteStatusHistory,
+    SqliteStatusStorage,
+)
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_status(ignition="on", speed=0.0):
+    """Build a status with a few optional fields set."""
+    return MotorcycleStatus(
+        icon_color="green",
+        alimentation="12V",
+        blocked=False,
+        ignition=ignition,
+        speed=speed,
+        lat=-3.1,
+        lng=-60.0,
+        additional_sensors={"fuel": 42.0},
+    )
+
+
+class ColorRepository(MotorcycleDataRepository):
+    """Repository reporting the next scripted icon color on each poll."""
+
+    def __init__(self, colors):
+        self._colors = list(colors)
+
+    async def get_current_status(self):
+        return MotorcycleStatus(
+            icon_color=self._colors.pop(0),
+            alimentation="12V",
+            blocked=False,
+            ignition="on",
+        )
+
+
+class RecordingNotifier(NotificationService):
+    """Notification service recording sent alerts."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_alert(self, message):
+        self.sent.append(message)
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Open a history with a controllable clock."""
+    clock = FakeClock()
+    history = SqliteStatusHistory(
+        str(tmp_path / "history.db"), batch_size=10, clock=clock
+    )
+    history.clock = clock
+    yield history
+    history.close()
+
+
+class TestSqliteStatusHistory:
+    """Test cases for SqliteStatusHistory."""
+
+    def test_storage_round_trip_keeps_all_fields(self, history):
+        """Test that the last status comes back with every field."""
+        storage = SqliteStatusStorage(history, "1")
+        assert storage.load_last_status() is None
+
+        storage.save_status(make_status(speed=45.0))
+        loaded = storage.load_last_status()
+
+        assert loaded == make_status()
+        assert (loaded.speed, loaded.lat, loaded.object_id) == (45.0, -3.1, "1")
+        assert loaded.additional_sensors == {"fuel": 42.0}
+
+    def test_observations_are_batched(self, history):
+        """Test that unchanged observations are buffered until the batch fills."""
+        for _ in range(9):
+            history.record("1", make_status(), changed=False)
+        assert history.buffered == 9
+
+        history.record("1", make_status(), changed=False)
+        history.flush()
+        assert history.buffered == 0
+        assert (history.stats["commits"], history.stats["rows"]) == (1, 10)
+
+    def test_last_change_does_not_commit_per_poll(self, history):
+        """Test that the last change is answered without waiting for a commit."""
+        history.record("1", make_status("off"), changed=True)
+        history.flush()
+        commits = history.stats["commits"]
+
+        for _ in range(5):
+            history.record("1", make_status("off"), changed=False)
+            assert history.last_change("1") == make_status("off")
+
+        assert history.stats["commits"] == commits
+        assert history.buffered == 5
+
+    def test_last_change_is_read_back_after_reopen(self, tmp_path):
+        """Test that a new process reads the last change from the database."""
+        path = str(tmp_path / "history.db")
+        history = SqliteStatusHistory(path)
+        history.record("1", make_status("on"), changed=True)
+        history.record("1", make_status("off"), changed=False)
+        history.close()
+
+        reopened = SqliteStatusHistory(path)
+        assert reopened.last_change("1") == make_status("on")
+        assert reopened.last_change("2") is None
+        reopened.close()
+
+    def test_trip_and_changes_queries(self, history):
+        """Test time-range and change queries per vehicle."""
+        for minute, ignition in enumerate(["off", "on", "on", "off"]):
+            history.clock.now = 1_700_000_000.0 + minute * 60
+            changed = minute in (0, 1, 3)
+            history.record("1", make_status(ignition), changed=changed)
+            history.record("2", make_status(ignition), changed=False)
+
+        trip = history.trip("1", 1_700_000_060.0, 1_700_000_180.0)
+        changes = history.changes_since("1", 1_700_000_030.0)
+
+        assert [record.status.ignition for record in trip] == ["on", "on", "off"]
+        assert [record.status.ignition for record in changes] == ["on", "off"]
+        assert all(record.changed for record in changes)
+        assert history.changes_today("2") == []
+
+    def test_queries_use_the_indexes(self, history):
+        """Test that range queries search an index instead of scanning."""
+        plans = [
+            history._connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            .fetchall()[0][-1]
+            .upper()
+            for sql, params in [
+                (
+                    "SELECT * FROM status_history WHERE object_id = ? "
+                    "AND time BETWEEN ? AND ? ORDER BY time",
+                    ("1", 0, 1),
+                ),
+                (
+                    "SELECT * FROM status_history WHERE object_id = ? "
+                    "AND changed = 1 AND time >= ? ORDER BY time",
+                    ("1", 0),
+                ),
+            ]
+        ]
+
+        assert all("USING INDEX" in plan for plan in plans)
+        assert "IDX_STATUS_HISTORY_CHANGES" in plans[1]
+
+    def test_debounced_change_is_alerted_with_history_storage(self, history):
+        """Test that unconfirmed polls do not replace the reported status."""
+        colors = ["green", "red", "red", "red", "red"]
+        notifier = RecordingNotifier()
+        service = MotorcycleAlertService(
+            ColorRepository(colors),
+            SqliteStatusStorage(history, "1"),
+            notifier,
+            debouncer=StatusDebouncer(default_rule=FieldRule(polls=3)),
+        )
+
+        async def scenario():
+            for _ in colors:
+                history.clock.now += 60
+                await service.check_and_alert()
+
+        asyncio.run(scenario())
+
+        assert [m.status.icon_color for m in notifier.sent] == ["green", "red"]
+        assert history.last_change("1").icon_color == "red"
+        assert len(history.trip("1", 0, history.clock.now)) == 5
+
+    def test_history_survives_reopen(self, tmp_path):
+        """Test that buffered rows are flushed on close."""
+        path = str(tmp_path / "history.db")
+        history = SqliteStatusHistory(path)
+        history.record("1", make_status("off"), changed=False)
+        history.close()
+
+        reopened = SqliteStatusHistory(path)
+        assert reopened.last_status("1") == make_status("off")
+        reopened.close()
@@ -0,0 +1,550 @@
+"""Tests for the HTTP fetch engines and the API repository."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from motorcycle_alert.infrastructure.api_client import ApiMotorcycleDataRepository
+from motorcycle_alert.infrastructure.conditional import ConditionalCache, resource_key
+from motorcycle_alert.infrastructure.config import Config, get_api_headers
+from motorcycle_alert.infrastructure.http_client import (
+    FETCH_ERRORS,
+    AiohttpFetcher,
+    RequestsFetcher,
+    ThreadedRequestsFetcher,
+    create_http_fetcher,
+)
+
+API_ENV = {"API_COOKIE": "cookie", "API_CSRF_TOKEN": "token"}
+
+PAYLOAD = {
+    "data": [
+        {
+            "id": 999,
+            "icon_color": "green",
+            "time": "2024-01-01 12:00:00",
+            "stop_duration": "5 min",
+            "speed": 0,
+            "lat": -3.1,
+            "lng": -60.0,
+            "sensors": [
+                {"name": "Alimentacao", "value": "Ligado"},
+                {"name": "Ignicao", "value": "Desligado"},
+                {"name": "Bloqueio", "value": "Desligado"},
+            ],
+        }
+    ]
+}
+
+
+def make_config(
+    base_url: str,
+    http_client: str = "aiohttp",
+    batch_size: int = 0,
+    api_parser: str = "json",
+    conditional_fetch: bool = True,
+    probe_fetch: bool = False,
+) -> Config:
+    """Build a configuration pointing at a local test server."""
+    return Config(
+        telegram_api_key="key",
+        telegram_user_id="12345",
+        api_base_url=base_url,
+        object_id="999",
+        check_interval=60,
+        status_file_path="status.txt",
+        http_client=http_client,
+        read_timeout=5,
+        batch_size=batch_size,
+        api_parser=api_parser,
+        conditional_fetch=conditional_fetch,
+        probe_fetch=probe_fetch,
+        full_refresh_interval=600,
+    )
+
+
+@pytest.fixture
+def tracker_server():
+    """Serve the fake tracker API from a background thread."""
+    state = {
+        "seconds": 0.0,
+        "payload": PAYLOAD,
+        "probe_payload": None,
+        "paths": [],
+        "etag": None,
+        "cookies": [],
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["paths"].append(self.path)
+            state["cookies"].append(self.headers.get("Cookie"))
+            time.sleep(state["seconds"])
+            if state["etag"] and self.headers.get("If-None-Match") == state["etag"]:
+                self.send_response(304)
+                self.end_headers()
+                return
+            payload = state["payload"]
+            if "full=false" in self.path and state["probe_payload"] is not None:
+                payload = state["probe_payload"]
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if state["etag"]:
+                self.send_header("ETag", state["etag"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+    server.server_close()
+
+
+class TestCreateHttpFetcher:
+    """Test selection of the HTTP engine."""
+
+    @pytest.mark.parametrize(
+        "mode, expected",
+        [
+            ("aiohttp", AiohttpFetcher),
+            ("threaded", ThreadedRequestsFetcher),
+            ("requests", RequestsFetcher),
+        ],
+    )
+    def test_mode_selects_engine(self, mode, expected):
+        """Test that each configured mode builds the matching engine."""
+        fetcher = create_http_fetcher(make_config("https://test.com", mode))
+        assert isinstance(fetcher, expected)
+        asyncio.run(fetcher.close())
+
+    def test_requests_errors_are_fetch_errors(self):
+        """Test that errors of the lazily imported requests engines are caught."""
+        import requests
+
+        assert issubclass(requests.ConnectionError, FETCH_ERRORS)
+        assert issubclass(requests.HTTPError, FETCH_ERRORS)
+
+    def test_unknown_mode_rejected_by_config(self):
+        """Test that an unknown HTTP client mode is rejected."""
+        with pytest.raises(ValueError, match="HTTP_CLIENT"):
+            make_config("https://test.com", "curl")
+
+
+class TestApiMotorcycleDataRepository:
+    """Test fetching and parsing through the async engines."""
+
+    @pytest.mark.parametrize("mode", ["aiohttp", "threaded", "requests"])
+    def test_get_current_status(self, tracker_server, mode):
+        """Test that every engine fetches and parses the tracker payload."""
+        base_url, _ = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url, mode))
+
+        async def scenario():
+            status = await repository.get_current_status()
+            await repository.close()
+            return status
+
+        status = asyncio.run(scenario())
+
+        assert status.icon_color == "green"
+        assert status.alimentation == "Ligado"
+        assert status.blocked is False
+        assert status.ignition == "Desligado"
+        assert (status.stop_duration, status.speed) == (300.0, 0.0)
+        assert status.time == datetime(2024, 1, 1, 12).timestamp()
+
+    @pytest.mark.parametrize("mode", ["aiohttp", "threaded", "requests"])
+    def test_get_current_status_streaming(self, tracker_server, mode):
+        """Test that every engine supports the streaming parser."""
+        base_url, _ = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(
+                make_config(base_url, mode, api_parser="stream")
+            )
+
+        async def scenario():
+            status = await repository.get_current_status()
+            await repository.close()
+            return status
+
+        status = asyncio.run(scenario())
+
+        assert status.icon_color == "green"
+        assert status.ignition == "Desligado"
+        assert status.lat == -3.1
+
+    @pytest.mark.parametrize("mode", ["aiohttp", "threaded"])
+    def test_slow_response_does_not_block_event_loop(self, tracker_server, mode):
+        """Test that other coroutines keep running while a poll is in flight."""
+        base_url, state = tracker_server
+        state["seconds"] = 0.3
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url, mode))
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def scenario():
+            ticker_task = asyncio.create_task(ticker())
+            await repository.get_current_status()
+            ticker_task.cancel()
+            await repository.close()
+
+        asyncio.run(scenario())
+
+        assert len(ticks) >= 5
+
+    def test_set_headers_applies_to_next_request(self, tracker_server):
+        """Test that a rotated API session is used without a new repository."""
+        base_url, state = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url))
+        with patch.dict(os.environ, {**API_ENV, "API_COOKIE": "rotated"}):
+            rotated = get_api_headers()
+
+        async def scenario():
+            await repository.get_current_status()
+            repository.set_headers(rotated)
+            await repository.get_current_status()
+            await repository.close()
+
+        asyncio.run(scenario())
+
+        assert state["cookies"] == ["cookie", "rotated"]
+
+
+class TestFleetFetch:
+    """Test batched fleet fetching."""
+
+    def test_get_fleet_status_batches_ids(self, tracker_server):
+        """Test that IDs are fetched in batches and keyed by object ID."""
+        base_url, state = tracker_server
+        item = PAYLOAD["data"][0]
+        state["payload"] = {
+            "data": [dict(item, id=i, icon_color=f"c{i}") for i in range(1, 6)]
+        }
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(
+                make_config(base_url, batch_size=2)
+            )
+
+        async def scenario():
+            statuses = await repository.get_fleet_status(["1", "2", "3", "4", "5"])
+            await repository.close()
+            return statuses
+
+        statuses = asyncio.run(scenario())
+
+        assert len(state["paths"]) == 3
+        assert any("id=1,2" in path for path in state["paths"])
+        assert statuses["3"].icon_color == "c3"
+        assert statuses["3"].object_id == "3"
+
+    def test_get_fleet_status_whole_account(self, tracker_server):
+        """Test fetching the whole account listing in one request."""
+        base_url, state = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url))
+
+        async def scenario():
+            statuses = await repository.get_fleet_status()
+            await repository.close()
+            return statuses
+
+        statuses = asyncio.run(scenario())
+
+        assert list(statuses) == ["999"]
+        assert "id=" not in state["paths"][0]
+
+
+def poll(repository, times=1):
+    """Poll a vehicle ``times`` times and return every status."""
+
+    async def scenario():
+        statuses = [await repository.get_current_status() for _ in range(times)]
+        await repository.close()
+        return statuses
+
+    return asyncio.run(scenario())
+
+
+class TestConditionalFetch:
+    """Test skipping unchanged responses."""
+
+    @pytest.mark.parametrize("mode", ["aiohttp", "threaded", "requests"])
+    def test_not_modified_reuses_parsed_status(self, tracker_server, mode):
+        """Test that a 304 answer to If-None-Match returns the cached status."""
+        base_url, state = tracker_server
+        state["etag"] = '"v1"'
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url, mode))
+
+        first, second, third = poll(repository, 3)
+
+        assert second is first and third is first
+        assert repository.conditional_cache.stats == {
+            "requests": 3,
+            "parsed": 1,
+            "not_modified": 2,
+        }
+
+    def test_not_modified_without_cache_entry_refetches(self, tracker_server):
+        """Test that a 304 with nothing cached is retried without validators."""
+        base_url, state = tracker_server
+        state["etag"] = '"v1"'
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url))
+            repository.set_headers({**get_api_headers(), "If-None-Match": '"v1"'})
+
+        (status,) = poll(repository)
+
+        assert status.icon_color == "green"
+        assert len(state["paths"]) == 2
+        assert repository.conditional_cache.stats == {
+            "requests": 1,
+            "refetched": 1,
+            "parsed": 1,
+        }
+
+    @pytest.mark.parametrize("api_parser", ["json", "stream"])
+    def test_unchanged_body_skips_parsing(self, tracker_server, api_parser):
+        """Test that a body equal to the previous one is not parsed again."""
+        base_url, _ = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(
+                make_config(base_url, api_parser=api_parser)
+            )
+
+        first, second = poll(repository, 2)
+
+        assert second is first
+        assert repository.conditional_cache.skipped == 1
+        assert repository.conditional_cache.stats["unchanged"] == 1
+
+    def test_changed_body_is_parsed(self, tracker_server):
+        """Test that new content, even under a stale ETag, is parsed."""
+        base_url, state = tracker_server
+        state["etag"] = '"v1"'
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url))
+        changed = {"data": [dict(PAYLOAD["data"][0], icon_color="red")]}
+
+        async def scenario():
+            first = await repository.get_current_status()
+            state["etag"], state["payload"] = '"v2"', changed
+            second = await repository.get_current_status()
+            await repository.close()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert (first.icon_color, second.icon_color) == ("green", "red")
+        assert repository.conditional_cache.stats["parsed"] == 2
+
+    def test_shared_cache_keys_resources_apart(self, tracker_server):
+        """Test that a fleet sharing one cache keeps each vehicle separate."""
+        base_url, state = tracker_server
+        cache = ConditionalCache()
+        with patch.dict(os.environ, API_ENV):
+            repositories = [
+                ApiMotorcycleDataRepository(
+                    make_config(base_url), object_id=object_id, conditional_cache=cache
+                )
+                for object_id in ("1", "2")
+            ]
+
+        async def scenario():
+            statuses = []
+            for repository in repositories * 2:
+                statuses.append(await repository.get_current_status())
+            for repository in repositories:
+                await repository.close()
+            return statuses
+
+        asyncio.run(scenario())
+
+        assert cache.stats == {"requests": 4, "parsed": 2, "unchanged": 2}
+
+    def test_disabled(self, tracker_server):
+        """Test that every poll is parsed when conditional fetch is off."""
+        base_url, _ = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(
+                make_config(base_url, conditional_fetch=False)
+            )
+
+        first, second = poll(repository, 2)
+
+        assert repository.conditional_cache is None
+        assert second is not first and second == first
+
+    def test_fleet_fetch_reuses_unchanged_batches(self, tracker_server):
+        """Test that batched fleet requests are skipped when unchanged too."""
+        base_url, _ = tracker_server
+        with patch.dict(os.environ, API_ENV):
+            repository = ApiMotorcycleDataRepository(make_config(base_url))
+
+        async def scenario():
+            first = await repository.get_fleet_status()
+            second = await repository.get_fleet_status()
+            await repository.close()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert second["999"] is first["999"]
+        assert repository.conditional_cache.skipped == 1
+
+    def test_resource_key_ignores_cache_buster(self):
+        """Test that the timestamp parameter does not split the cache."""
+        assert (
+            resource_key("https://t.com/objects/items?id=1,2&full=true&_=123")
+            == resource_key("https://t.com/objects/items?id=1,2&full=true&_=456")
+            == "https://t.com/objects/items?id=1,2&full=true"
+        )
+
+
+PROBE_ITEM = {
+    "id": 999,
+    "icon_color": "green",
+    "time": "2024-01-01 12:05:00",
+    "speed": 12,
+    "lat": -3.2,
+    "lng": -60.1,
+    "sensors": PAYLOAD["data"][0]["sensors"],
+}
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProbeFetch:
+    """Test the full=false probe with escalation to full fetches."""
+
+    def make_repository(self, base_url, clock, **config):
+        """Build a probing repository."""
+        with patch.dict(os.environ, API_ENV):
+            return ApiMotorcycleDataRepository(
+                make_config(base_url, probe_fetch=True, **config), clock=clock
+            )
+
+    def run(self, repository, steps):
+        """Run each step (a callable or None) and poll after it."""
+
+        async def scenario():
+            statuses = []
+            for step in steps:
+                if step:
+                    step()
+                statuses.append(await repository.get_current_status())
+            await repository.close()
+            return statuses
+
+        return asyncio.run(scenario())
+
+    def test_unchanged_probe_refreshes_last_full_status(self, tracker_server):
+        """Test that probes update time, speed and position but keep the rest."""
+        base_url, state = tracker_server
+        state["probe_payload"] = {"data": [PROBE_ITEM]}
+        repository = self.make_repository(base_url, Clock())
+
+        full, probed = self.run(repository, [None, None])
+
+        assert ["full=true" in path for path in state["paths"]] == [True, False]
+        assert probed == full
+        assert probed.stop_duration == full.stop_duration == 300.0
+        assert (probed.speed, probed.lat, probed.lng) == (12.0, -3.2, -60.1)
+        assert probed.time == datetime(2024, 1, 1, 12, 5).timestamp()
+        assert repository.stats == {"full_fetches": 1, "probes": 1}
+
+    def test_possible_change_escalates(self, tracker_server):
+        """Test that a probe differing in a compared field triggers a full fetch."""
+        base_url, state = tracker_server
+        state["probe_payload"] = {"data": [dict(PROBE_ITEM, icon_color="red")]}
+        repository = self.make_repository(base_url, Clock())
+
+        def change():
+            state["payload"] = {"data": [dict(PAYLOAD["data"][0], icon_color="red")]}
+
+        _, status = self.run(repository, [None, change])
+
+        assert status.icon_color == "red"
+        assert ["full=true" in path for path in state["paths"]] == [True, False, True]
+        assert repository.stats["escalations"] == 1
+
+    def test_unusable_probe_escalates(self, tracker_server):
+        """Test that a probe without data falls back to a full fetch."""
+        base_url, state = tracker_server
+        state["probe_payload"] = {"data": []}
+        repository = self.make_repository(base_url, Clock())
+
+        _, status = self.run(repository, [None, None])
+
+        assert status.icon_color == "green"
+        assert repository.stats == {"full_fetches": 2, "probes": 1, "escalations": 1}
+
+    def test_periodic_full_refresh(self, tracker_server):
+        """Test that a full fetch is made once the refresh interval elapsed."""
+        base_url, state = tracker_server
+        state["probe_payload"] = {"data": [PROBE_ITEM]}
+        clock = Clock()
+        repository = self.make_repository(base_url, clock)
+
+        def advance():
+            clock.now += 300
+
+        self.run(repository, [None, advance, advance, advance])
+
+        assert ["full=true" in path for path in state["paths"]] == [
+            True,
+            False,
+            True,
+            False,
+        ]
+
+    def test_fleet_probe_requires_every_vehicle(self, tracker_server):
+        """Test that a batch probe missing a vehicle escalates."""
+        base_url, state = tracker_server
+        item = PAYLOAD["data"][0]
+        state["payload"] = {"data": [dict(item, id=1), dict(item, id=2)]}
+        state["probe_payload"] = {"data": [dict(PROBE_ITEM, id=1)]}
+        repository = self.make_repository(base_url, Clock(), batch_size=2)
+
+        async def scenario():
+            first = await repository.get_fleet_status(["1", "2"])
+            second = await repository.get_fleet_status(["1", "2"])
+            state["probe_payload"]["data"].append(dict(PROBE_ITEM, id=2))
+            third = await repository.get_fleet_status(["1", "2"])
+            await repository.close()
+            return first, second, third
+
+        first, second, third = asyncio.run(scenario())
+
+        assert set(first) == set(second) == set(third) == {"1", "2"}
+        assert third["2"].speed == 12.0
+        assert repository.stats == {"full_fetches": 2, "probes": 2, "escalations": 1}
@@ -0,0 +1,195 @@
+"""Tests for the queued, structured log pipeline."""
+
+import io
+import json
+import logging
+import os
+import queue
+import sys
+
+import pytest
+
+from motorcycle_alert.infrastructure.config import Config
+from motorcycle_alert.infrastructure.logs import (
+    DebugSampler,
+    DeferredQueueHandler,
+    JsonFormatter,
+    RotatingLogFileHandler,
+    configure_logging,
+    stop_logging,
+)
+
+
+def make_record(msg="Probing: %s", args=("url",), level=logging.DEBUG, lineno=10):
+    """Build a record as a logger call would."""
+    return logging.LogRecord(
+        "motorcycle_alert.test", level, "x.py", lineno, msg, args, None
+    )
+
+
+def make_config(**overrides) -> Config:
+    """Build a configuration with the given log settings."""
+    return Config(
+        telegram_api_key="key",
+        telegram_user_id="12345",
+        api_base_url="https://test.com",
+        object_id="999",
+        check_interval=60,
+        status_file_path="status.txt",
+        **overrides,
+    )
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def root_logger():
+    """Restore the root logger's handlers and level after a test."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+class TestJsonFormatter:
+    """Test cases for JSON records."""
+
+    def test_renders_message_and_extras(self):
+        """Test that arguments are merged and extra fields kept."""
+        record = make_record(level=logging.INFO)
+        record.object_id = "42"
+
+        document = json.loads(JsonFormatter().format(record))
+
+        assert document["message"] == "Probing: url"
+        assert document["level"] == "INFO"
+        assert document["logger"] == "motorcycle_alert.test"
+        assert document["object_id"] == "42"
+        assert document["time"].endswith("+00:00")
+        assert "args" not in document
+
+    def test_renders_exceptions(self):
+        """Test that the traceback is added as a field."""
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            record = make_record(level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        document = json.loads(JsonFormatter().format(record))
+
+        assert "ValueError: bad" in document["exception"]
+
+
+class TestDebugSampler:
+    """Test cases for sampling of repetitive DEBUG lines."""
+
+    def test_keeps_one_in_rate_per_call_site(self):
+        """Test that each call site is sampled on its own."""
+        sampler = DebugSampler(3)
+
+        kept = [sampler.filter(make_record(lineno=10)) for _ in range(7)]
+        other = sampler.filter(make_record(lineno=20))
+
+        assert kept == [True, False, False, True, False, False, True]
+        assert other
+        assert sampler.stats["suppressed"] == 4
+
+    def test_info_and_above_always_pass(self):
+        """Test that only DEBUG records are sampled."""
+        sampler = DebugSampler(100)
+
+        assert all(sampler.filter(make_record(level=logging.INFO)) for _ in range(5))
+
+
+class TestRotatingLogFileHandler:
+    """Test cases for size- and time-based rotation."""
+
+    def test_rotates_on_size(self, tmp_path):
+        """Test that the file is rotated before exceeding the size limit."""
+        path = str(tmp_path / "app.log")
+        handler = RotatingLogFileHandler(path, max_bytes=30, backup_count=2)
+
+        for _ in range(3):
+            handler.emit(make_record(msg="x" * 20, args=()))
+        handler.close()
+
+        assert sorted(os.listdir(tmp_path)) == ["app.log", "app.log.1", "app.log.2"]
+
+    def test_rotates_on_interval(self, tmp_path):
+        """Test that the file is rotated once the interval elapsed."""
+        path = str(tmp_path / "app.log")
+        clock = FakeClock()
+        handler = RotatingLogFileHandler(path, interval=60, clock=clock)
+
+        handler.emit(make_record(msg="first", args=()))
+        clock.now += 30
+        handler.emit(make_record(msg="second", args=()))
+        clock.now += 31
+        handler.emit(make_record(msg="third", args=()))
+        handler.close()
+
+        assert open(path + ".1").read().split() == ["first", "second"]
+        assert open(path).read().split() == ["third"]
+
+
+class TestConfigureLogging:
+    """Test cases for the queued pipeline."""
+
+    def test_records_are_written_by_the_listener(self, tmp_path, root_logger):
+        """Test that records reach the console and file once flushed."""
+        path = tmp_path / "app.log"
+        stream = io.StringIO()
+        listener = configure_logging(
+            make_config(log_file=str(path), log_format="json"), stream
+        )
+
+        logging.getLogger("motorcycle_alert.test").info(
+            "Alert sent to %s", "chat-1", extra={"object_id": "1"}
+        )
+        stop_logging(listener)
+
+        document = json.loads(path.read_text())
+        assert document["message"] == "Alert sent to chat-1"
+        assert document["object_id"] == "1"
+        assert json.loads(stream.getvalue()) == document
+
+    def test_formatting_is_deferred_to_the_listener(self):
+        """Test that records are queued with their arguments unmerged."""
+        records = queue.SimpleQueue()
+        handler = DeferredQueueHandler(records)
+
+        handler.handle(make_record())
+
+        record = records.get_nowait()
+        assert (record.msg, record.args) == ("Probing: %s", ("url",))
+
+    def test_disabled_debug_lines_are_not_queued(self, root_logger):
+        """Test the level and the DEBUG sampling of the queue handler."""
+        stream = io.StringIO()
+        listener = configure_logging(
+            make_config(log_file="", log_level="DEBUG", log_debug_sample_rate=2),
+            stream,
+        )
+        logger = logging.getLogger("motorcycle_alert.test")
+
+        for i in range(4):
+            logger.debug("Poll %d", i)
+        stop_logging(listener)
+
+        assert [line.split(" - ")[-1] for line in stream.getvalue().splitlines()] == [
+            "Poll 0",
+            "Poll 2",
+        ]
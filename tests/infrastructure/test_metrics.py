@@ -0,0 +1,214 @@
+"""Tests for the metrics registry, exporter and instrumentation."""
+
+import asyncio
+import signal
+from collections import Counter
+
+import aiohttp
+import pytest
+
+from motorcycle_alert.application.polling import (
+    AdaptiveIntervals,
+    AdaptivePollingPolicy,
+)
+from motorcycle_alert.application.use_cases import MotorcycleMonitoringUseCase
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.infrastructure.http_client import AiohttpFetcher
+from motorcycle_alert.infrastructure.metrics import (
+    CONTENT_TYPE,
+    HTTP_PHASE_SECONDS,
+    POLL_SECONDS,
+    POLLS,
+    STATUS_POLLS,
+    STORAGE_SECONDS,
+    MetricsPollListener,
+    MetricsRegistry,
+    MetricsServer,
+    http_trace_config,
+)
+from motorcycle_alert.infrastructure.storage import (
+    FileStatusStorage,
+    InstrumentedStatusStorage,
+)
+from motorcycle_alert.main import MotorcycleAlertApplication
+
+
+def make_status(ignition: str = "on") -> MotorcycleStatus:
+    """Build a minimal status."""
+    return MotorcycleStatus(
+        icon_color="green", alimentation="12V", blocked=False, ignition=ignition
+    )
+
+
+class TestMetricsRegistry:
+    """Test cases for metric families and their text rendering."""
+
+    def test_counter_renders_labelled_series(self):
+        """Test that a counter renders HELP, TYPE and one line per series."""
+        registry = MetricsRegistry()
+        polls = registry.counter("polls_total", "Polls", labels=("outcome",))
+
+        polls.inc("ok")
+        polls.inc("ok")
+        polls.inc('bad"one', amount=0.5)
+
+        assert registry.render().splitlines() == [
+            "# HELP polls_total Polls",
+            "# TYPE polls_total counter",
+            'polls_total{outcome="ok"} 2',
+            'polls_total{outcome="bad\\"one"} 0.5',
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that buckets count every observation up to their bound."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        lines = registry.render().splitlines()[2:]
+        assert lines == [
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1.0"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+        ]
+        assert latency.count() == 4
+
+    def test_stats_counter_and_gauge_are_read_on_render(self):
+        """Test that callback families reflect the current values."""
+        registry = MetricsRegistry()
+        stats = Counter()
+        queue = []
+        registry.stats("events_total", "Events", lambda: stats)
+        registry.gauge("queue_depth", "Depth", lambda: len(queue))
+
+        stats["sent"] += 3
+        stats["dropped"] += 1
+        queue.append("alert")
+
+        text = registry.render()
+        assert 'events_total{event="dropped"} 1\nevents_total{event="sent"} 3' in text
+        assert "# TYPE queue_depth gauge\nqueue_depth 1" in text
+
+    def test_failing_callback_is_skipped(self):
+        """Test that one broken source does not break the whole scrape."""
+        registry = MetricsRegistry()
+        registry.gauge("broken", "Broken", lambda: 1 / 0)
+        registry.counter("ok_total", "Ok").inc()
+
+        text = registry.render()
+
+        assert "broken" not in text
+        assert "ok_total 1" in text
+
+    def test_duplicate_names_rejected(self):
+        """Test that a family name can be registered once until unregistered."""
+        registry = MetricsRegistry()
+        registry.counter("x_total", "X")
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.counter("x_total", "X")
+        registry.unregister("x_total")
+        registry.counter("x_total", "X")
+
+
+class TestMetricsServer:
+    """Test cases for the /metrics endpoint and HTTP phase tracing."""
+
+    def test_serves_registry_and_times_http_phases(self):
+        """Test a scrape through an aiohttp fetcher carrying the trace config."""
+        registry = MetricsRegistry()
+        registry.counter("scrapes_total", "Scrapes").inc()
+        connects = HTTP_PHASE_SECONDS.count("connect")
+        ttfbs = HTTP_PHASE_SECONDS.count("ttfb")
+
+        async def scrape():
+            server = MetricsServer(registry, "127.0.0.1", 0)
+            await server.start()
+            fetcher = AiohttpFetcher(5, 5, 2, trace_configs=[http_trace_config()])
+            try:
+                url = f"http://127.0.0.1:{server.port}/metrics"
+                first = await fetcher.get_bytes(url, {})
+                await fetcher.get_bytes(url, {})
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url) as response:
+                        content_type = response.headers["Content-Type"]
+            finally:
+                await fetcher.close()
+                await server.stop()
+            return first, content_type
+
+        response, content_type = asyncio.run(scrape())
+
+        assert b"scrapes_total 1" in response.body
+        assert content_type == CONTENT_TYPE
+        # The keep-alive connection is opened once and reused.
+        assert HTTP_PHASE_SECONDS.count("connect") == connects + 1
+        assert HTTP_PHASE_SECONDS.count("ttfb") == ttfbs + 2
+
+
+class TestInstrumentation:
+    """Test cases for the poll listener and the storage wrapper."""
+
+    def test_poll_listener_counts_outcomes(self):
+        """Test that polls are counted per vehicle and outcome and timed."""
+        ok = POLLS.value("m-1", "ok")
+        errors = POLLS.value("m-1", "error")
+        timed = POLL_SECONDS.count()
+        listener = MetricsPollListener()
+
+        listener.poll_finished("m-1", 0.2, None)
+        listener.poll_finished("m-1", 0.3, ConnectionError("down"))
+
+        assert POLLS.value("m-1", "ok") == ok + 1
+        assert POLLS.value("m-1", "error") == errors + 1
+        assert POLL_SECONDS.count() == timed + 2
+
+    def test_storage_wrapper_times_and_counts_polls(self, tmp_path):
+        """Test that saves and records are timed and split into changed polls."""
+        changed = STATUS_POLLS.value("changed")
+        unchanged = STATUS_POLLS.value("unchanged")
+        loads = STORAGE_SECONDS.count("load")
+        storage = InstrumentedStatusStorage(
+            FileStatusStorage(str(tmp_path / "status.txt"))
+        )
+
+        storage.save_status(make_status())
+        storage.record_status(make_status())
+        loaded = storage.load_last_status()
+        storage.close()
+
+        assert loaded == make_status()
+        assert STATUS_POLLS.value("changed") == changed + 1
+        assert STATUS_POLLS.value("unchanged") == unchanged + 1
+        assert STORAGE_SECONDS.count("load") == loads + 1
+
+
+class TestApplicationMetrics:
+    """Test cases for the families registered by the application."""
+
+    def test_polling_decisions_are_exported(self, monkeypatch):
+        """Test that the polling policy's decisions are counted by decision."""
+        monkeypatch.setattr(signal, "signal", lambda *args: None)
+        policy = AdaptivePollingPolicy(AdaptiveIntervals(), rng=lambda: 0.5)
+        app = MotorcycleAlertApplication(config=None)
+        app._monitoring_use_case = MotorcycleMonitoringUseCase(
+            alert_services=[], polling_policy=policy
+        )
+        registry = MetricsRegistry()
+        app._register_metrics(registry)
+
+        policy.next_interval(None, 0)
+        policy.next_interval(make_status("on"), 0)
+        policy.next_interval(None, 2)
+        text = registry.render()
+
+        assert "# TYPE motorcycle_alert_polling_decisions_total counter" in text
+        for decision in ("backoff", "idle", "moving"):
+            assert (
+                f'motorcycle_alert_polling_decisions_total{{decision="{decision}"}} 1'
+                in text
+            )
@@ -0,0 +1,208 @@
+"""Tests for the queued Telegram delivery pipeline."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from motorcycle_alert.domain.models import AlertMessage, MotorcycleStatus
+from motorcycle_alert.infrastructure.config import Config
+from motorcycle_alert.infrastructure.notifications import (
+    QueuedTelegramNotificationService,
+    TelegramRateLimiter,
+)
+
+
+@pytest.fixture
+def telegram_server():
+    """Serve a fake Bot API; ``state["answers"]`` scripts the next responses."""
+    state = {"answers": [], "requests": [], "delay": 0.0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            state["requests"].append(
+                (time.monotonic(), self.path, json.loads(self.rfile.read(length)))
+            )
+            time.sleep(state["delay"])
+            status, body = (
+                state["answers"].pop(0) if state["answers"] else (200, {"ok": True})
+            )
+            data = (body if isinstance(body, str) else json.dumps(body)).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", state
+    server.shutdown()
+
+
+def make_config(base_url: str, **overrides) -> Config:
+    """Build a configuration pointing at the fake Bot API."""
+    settings = dict(
+        telegram_api_key="TOKEN",
+        telegram_user_id="100",
+        api_base_url="http://localhost",
+        object_id="1",
+        check_interval=60,
+        status_file_path="status.txt",
+        telegram_api_url=base_url,
+        telegram_chat_rate=1000,
+        telegram_global_rate=1000,
+    )
+    settings.update(overrides)
+    return Config(**settings)
+
+
+def make_alert(ignition: str, recipient=None) -> AlertMessage:
+    """Build an alert for a status with the given ignition."""
+    status = MotorcycleStatus(
+        icon_color="green", alimentation="12V", blocked=False, ignition=ignition
+    )
+    return AlertMessage(status=status, timestamp="now", recipient=recipient)
+
+
+async def deliver(service, alerts):
+    """Queue alerts before the workers start, then drain the queue."""
+    for alert in alerts:
+        service.send_alert(alert)
+    await service.start()
+    await service.close(timeout=5)
+
+
+class TestQueuedTelegramNotificationService:
+    """Test cases for QueuedTelegramNotificationService."""
+
+    def test_send_alert_does_not_wait_for_telegram(self, telegram_server):
+        """Test that queueing returns immediately while Telegram is slow."""
+        base_url, state = telegram_server
+        state["delay"] = 0.3
+        service = QueuedTelegramNotificationService(make_config(base_url))
+
+        async def scenario():
+            await service.start()
+            started = time.perf_counter()
+            service.send_alert(make_alert("on"))
+            elapsed = time.perf_counter() - started
+            await service.close(timeout=5)
+            return elapsed
+
+        assert asyncio.run(scenario()) < 0.05
+        assert service.stats["sent"] == 1
+        _, path, payload = state["requests"][0]
+        assert path == "/botTOKEN/sendMessage"
+        assert payload["chat_id"] == "100"
+
+    def test_burst_to_one_chat_is_coalesced(self, telegram_server):
+        """Test that alerts queued for a chat are merged into one message."""
+        base_url, state = telegram_server
+        service = QueuedTelegramNotificationService(make_config(base_url))
+
+        alerts = [make_alert(str(i)) for i in range(3)] + [make_alert("x", "200")]
+        asyncio.run(deliver(service, alerts))
+
+        chats = sorted(payload["chat_id"] for _, _, payload in state["requests"])
+        merged = next(p for _, _, p in state["requests"] if p["chat_id"] == "100")
+        assert chats == ["100", "200"]
+        assert [f"Ignition: {i}" in merged["text"] for i in range(3)] == [True] * 3
+        assert service.stats["coalesced"] == 2
+
+    def test_retry_after_is_honoured(self, telegram_server):
+        """Test that a 429 answer delays the retry by ``retry_after``."""
+        base_url, state = telegram_server
+        state["answers"] = [
+            (429, {"ok": False, "parameters": {"retry_after": 0.3}}),
+        ]
+        service = QueuedTelegramNotificationService(make_config(base_url))
+
+        asyncio.run(deliver(service, [make_alert("on")]))
+
+        first, second = state["requests"][0][0], state["requests"][1][0]
+        assert second - first >= 0.3
+        assert service.stats["rate_limited"] == 1
+        assert service.stats["sent"] == 1
+
+    def test_server_errors_are_retried_then_abandoned(self, telegram_server):
+        """Test backoff retries on 5xx answers and the retry limit."""
+        base_url, state = telegram_server
+        state["answers"] = [(502, {"ok": False})] * 3
+        service = QueuedTelegramNotificationService(
+            make_config(base_url, telegram_max_retries=2), rng=lambda: 0.0
+        )
+
+        asyncio.run(deliver(service, [make_alert("on")]))
+
+        assert len(state["requests"]) == 3
+        assert service.stats["retried"] == 2
+        assert service.stats["failed"] == 1
+
+    def test_persistent_rate_limit_counts_toward_retries(self, telegram_server):
+        """Test that a chat answered 429 forever is given up on."""
+        base_url, state = telegram_server
+        state["answers"] = [
+            (429, {"ok": False, "parameters": {"retry_after": 0.01}})
+        ] * 5
+        service = QueuedTelegramNotificationService(
+            make_config(base_url, telegram_max_retries=2)
+        )
+
+        asyncio.run(deliver(service, [make_alert("on")]))
+
+        assert len(state["requests"]) == 3
+        assert service.stats["rate_limited"] == 3
+        assert service.stats["failed"] == 1 and service.stats["sent"] == 0
+
+    def test_client_error_without_json_is_not_retried(self, telegram_server):
+        """Test that a 4xx answer is permanent whatever its body."""
+        base_url, state = telegram_server
+        state["answers"] = [(403, "<html>Forbidden</html>")]
+        service = QueuedTelegramNotificationService(make_config(base_url))
+
+        asyncio.run(deliver(service, [make_alert("on")]))
+
+        assert len(state["requests"]) == 1
+        assert service.stats["failed"] == 1 and service.stats["retried"] == 0
+
+    def test_full_queue_drops_oldest_alert_of_chat(self, telegram_server):
+        """Test that the bounded buffer keeps the newest alerts."""
+        base_url, state = telegram_server
+        service = QueuedTelegramNotificationService(
+            make_config(base_url, telegram_queue_size=2)
+        )
+
+        asyncio.run(deliver(service, [make_alert(str(i)) for i in range(4)]))
+
+        text = state["requests"][0][2]["text"]
+        assert "Ignition: 2" in text and "Ignition: 3" in text
+        assert "Ignition: 0" not in text
+        assert service.stats["dropped"] == 2
+
+
+class TestTelegramRateLimiter:
+    """Test cases for TelegramRateLimiter."""
+
+    def test_reservations_respect_chat_and_global_rates(self):
+        """Test that slots are spaced per chat and across chats."""
+        limiter = TelegramRateLimiter(chat_rate=1, global_rate=10, clock=lambda: 0.0)
+
+        delays = [limiter.reserve(chat) for chat in ["a", "b", "a", "c"]]
+
+        assert delays == pytest.approx([0.0, 0.1, 1.0, 0.3])
+
+    def test_pause_holds_every_chat(self):
+        """Test that a pause delays the next reservation."""
+        limiter = TelegramRateLimiter(chat_rate=1, global_rate=10, clock=lambda: 0.0)
+        limiter.pause(5)
+
+        assert limiter.reserve("a") == pytest.approx(5.0)
@@ -0,0 +1,329 @@
+"""Tests for the durable alert outbox."""
+
+import asyncio
+import dataclasses
+import os
+from unittest.mock import patch
+
+import pytest
+
+from motorcycle_alert.domain.models import AlertMessage, MotorcycleStatus
+from motorcycle_alert.domain.services import (
+    MotorcycleAlertService,
+    MotorcycleDataRepository,
+    NotificationService,
+    StatusStorage,
+)
+from motorcycle_alert.infrastructure.outbox import (
+    OutboxJournal,
+    OutboxNotificationService,
+)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingDelivery(NotificationService):
+    """Synchronous delivery recording alerts, optionally failing."""
+
+    def __init__(self, fail=False):
+        self.sent = []
+        self.fail = fail
+
+    def send_alert(self, message):
+        if self.fail:
+            raise ConnectionError("telegram down")
+        self.sent.append(message)
+
+
+class ReportingDelivery(NotificationService):
+    """Delivery confirming alerts later through ``on_result``."""
+
+    def __init__(self):
+        self.on_result = None
+        self.submitted = []
+
+    def send_alert(self, message):
+        self.submitted.append(message)
+
+
+class ScriptedRepository(MotorcycleDataRepository):
+    """Repository reporting one ignition value per poll, a minute apart."""
+
+    def __init__(self, ignitions):
+        self._ignitions = list(ignitions)
+        self._time = 1_700_000_000.0
+
+    async def get_current_status(self):
+        self._time += 60
+        return MotorcycleStatus(
+            icon_color="green",
+            alimentation="12V",
+            blocked=False,
+            ignition=self._ignitions.pop(0),
+            time=self._time,
+            object_id="1",
+        )
+
+
+class MemoryStorage(StatusStorage):
+    """In-memory status storage."""
+
+    def __init__(self):
+        self.status = None
+
+    def load_last_status(self):
+        return self.status
+
+    def save_status(self, status):
+        self.status = status
+
+
+def make_alert(key="k1", ignition="on"):
+    """Build an alert with a dedup key."""
+    status = MotorcycleStatus(
+        icon_color="green",
+        alimentation="12V",
+        blocked=False,
+        ignition=ignition,
+        additional_sensors={"fuel": 1.5},
+    )
+    return AlertMessage(status=status, timestamp="now", recipient="7", dedup_key=key)
+
+
+def run_outbox(path, delivery, alerts, clock=None, wall_clock=None):
+    """Start an outbox, send alerts, then shut it down."""
+    outbox = OutboxNotificationService(
+        delivery,
+        OutboxJournal(str(path)),
+        clock=clock or FakeClock(),
+        wall_clock=wall_clock or FakeClock(1_700_000_000.0),
+    )
+
+    async def scenario():
+        await outbox.start()
+        for alert in alerts:
+            outbox.send_alert(alert)
+        await outbox.stop()
+        outbox.close()
+
+    asyncio.run(scenario())
+    return outbox
+
+
+class TestOutboxJournal:
+    """Test cases for OutboxJournal."""
+
+    def test_burst_is_group_committed(self, tmp_path):
+        """Test that a burst of records needs far fewer fsyncs than records."""
+        journal = OutboxJournal(str(tmp_path / "outbox.jsonl"))
+        real_fsync = os.fsync
+        calls = []
+
+        def counting_fsync(fd):
+            calls.append(fd)
+            real_fsync(fd)
+
+        with patch("motorcycle_alert.infrastructure.outbox.os.fsync", counting_fsync):
+            for i in range(200):
+                journal.append({"op": "add", "key": str(i)})
+            journal.close()
+
+        assert len(journal.read()) == 200
+        assert len(calls) < 200
+        assert journal.stats["commits"] == len(calls)
+
+    def test_failed_write_is_retried_and_reported_to_waiters(self, tmp_path):
+        """Test that records survive a failed write and waiters see the error."""
+        folder = tmp_path / "missing"
+        journal = OutboxJournal(str(folder / "outbox.jsonl"), retry_delay=0.01)
+
+        async def scenario():
+            sequence = journal.append({"op": "add", "key": "a"})
+            with pytest.raises(OSError):
+                await journal.wait_committed(sequence)
+            folder.mkdir()
+            for _ in range(200):
+                if journal.stats["commits"]:
+                    break
+                await asyncio.sleep(0.01)
+            await journal.wait_committed(sequence)
+
+        asyncio.run(scenario())
+        journal.close()
+
+        assert journal.read() == [{"op": "add", "key": "a"}]
+        assert journal.stats["errors"] >= 1
+
+    def test_compaction_replaces_queued_records(self, tmp_path):
+        """Test that a compaction stands for every record appended before it."""
+        journal = OutboxJournal(str(tmp_path / "outbox.jsonl"))
+        for key in "abc":
+            journal.append({"op": "add", "key": key})
+        journal.compact([{"op": "add", "key": "c"}])
+        journal.append({"op": "ack", "key": "c"})
+        journal.close()
+
+        assert journal.read() == [
+            {"op": "add", "key": "c"},
+            {"op": "ack", "key": "c"},
+        ]
+
+    def test_torn_line_is_skipped(self, tmp_path):
+        """Test that a partially written last record is ignored."""
+        path = tmp_path / "outbox.jsonl"
+        path.write_text('{"op": "ack", "key": "a"}\n{"op": "ad', encoding="utf-8")
+
+        assert OutboxJournal(str(path)).read() == [{"op": "ack", "key": "a"}]
+
+
+class TestOutboxNotificationService:
+    """Test cases for OutboxNotificationService."""
+
+    def test_undelivered_alert_is_replayed_after_restart(self, tmp_path):
+        """Test at-least-once delivery across an outage and a restart."""
+        path = tmp_path / "outbox.jsonl"
+        first = run_outbox(path, RecordingDelivery(fail=True), [make_alert()])
+        assert first.pending == 1
+
+        delivery = RecordingDelivery()
+        second = run_outbox(path, delivery, [])
+
+        assert [m.dedup_key for m in delivery.sent] == ["k1"]
+        assert delivery.sent[0].status.additional_sensors == {"fuel": 1.5}
+        assert second.stats["replayed"] == 1 and second.pending == 0
+
+    def test_event_alerts_are_replayed_with_their_event(self, tmp_path):
+        """Test that replayed alerts keep the rule or geofence that triggered them."""
+        path = tmp_path / "outbox.jsonl"
+        alerts = [
+            dataclasses.replace(make_alert("k1"), rule="Speeding"),
+            dataclasses.replace(make_alert("k2"), geofence="Entered Depot"),
+        ]
+        run_outbox(path, RecordingDelivery(fail=True), alerts)
+
+        delivery = RecordingDelivery()
+        run_outbox(path, delivery, [])
+
+        assert delivery.sent == alerts
+        assert "Rule triggered: Speeding" in delivery.sent[0].format_message()
+        assert "Geofence: Entered Depot" in delivery.sent[1].format_message()
+
+    def test_duplicates_are_ignored_across_restarts(self, tmp_path):
+        """Test that a key delivered within the window is not sent again."""
+        path = tmp_path / "outbox.jsonl"
+        delivery = RecordingDelivery()
+        run_outbox(path, delivery, [make_alert(), make_alert()])
+        later = run_outbox(
+            path, delivery, [make_alert()], wall_clock=FakeClock(1_700_000_060.0)
+        )
+        expired = run_outbox(
+            path, delivery, [make_alert()], wall_clock=FakeClock(1_700_001_000.0)
+        )
+
+        assert len(delivery.sent) == 2
+        assert later.stats["deduplicated"] == 1
+        assert expired.stats["journaled"] == 1
+
+    def test_flapping_status_alerts_every_transition(self, tmp_path):
+        """Test that a change repeating an earlier one is not a duplicate."""
+        ignitions = ["Ligado", "Desligado", "Ligado", "Desligado", "Ligado"]
+        delivery = RecordingDelivery()
+        outbox = OutboxNotificationService(
+            delivery, OutboxJournal(str(tmp_path / "outbox.jsonl"))
+        )
+        service = MotorcycleAlertService(
+            ScriptedRepository(ignitions), MemoryStorage(), outbox
+        )
+
+        async def scenario():
+            await outbox.start()
+            for _ in ignitions:
+                await service.check_and_alert()
+            await outbox.stop()
+            outbox.close()
+
+        asyncio.run(scenario())
+
+        assert [m.status.ignition for m in delivery.sent] == ignitions
+        assert outbox.stats["deduplicated"] == 0
+
+    def test_status_is_saved_only_once_its_alert_is_journaled(self, tmp_path):
+        """Test that a change whose alert cannot be journaled is not recorded."""
+        folder = tmp_path / "missing"
+        storage = MemoryStorage()
+        outbox = OutboxNotificationService(
+            RecordingDelivery(),
+            OutboxJournal(str(folder / "outbox.jsonl"), retry_delay=0.01),
+        )
+        service = MotorcycleAlertService(
+            ScriptedRepository(["Ligado", "Ligado"]), storage, outbox
+        )
+
+        async def scenario():
+            with pytest.raises(OSError):
+                await service.check_and_alert()
+            unsaved = storage.status
+            folder.mkdir()
+            await service.check_and_alert()
+            return unsaved
+
+        assert asyncio.run(scenario()) is None
+        outbox.close()
+
+        assert storage.status.ignition == "Ligado"
+        assert outbox.stats["journaled"] == 1
+
+    def test_journal_is_compacted_while_running(self, tmp_path):
+        """Test that delivered alerts are dropped from the journal periodically."""
+        journal = OutboxJournal(str(tmp_path / "outbox.jsonl"))
+        outbox = OutboxNotificationService(
+            RecordingDelivery(), journal, retry_interval=0.01, dedup_window=0
+        )
+
+        async def scenario():
+            await outbox.start()
+            for i in range(5):
+                outbox.send_alert(make_alert(f"k{i}"))
+            await outbox.commit()
+            for _ in range(200):
+                if outbox.stats["compacted"]:
+                    break
+                await asyncio.sleep(0.01)
+            await outbox.stop()
+
+        asyncio.run(scenario())
+        outbox.close()
+
+        assert outbox.stats["compacted"] >= 1
+        assert journal.read() == []
+
+    def test_unconfirmed_alerts_are_resubmitted(self, tmp_path):
+        """Test that reported failures are retried after the retry interval."""
+        clock = FakeClock()
+        delivery = ReportingDelivery()
+        outbox = OutboxNotificationService(
+            delivery,
+            OutboxJournal(str(tmp_path / "outbox.jsonl")),
+            retry_interval=60,
+            clock=clock,
+        )
+        alert = make_alert()
+
+        outbox.send_alert(alert)
+        delivery.on_result(alert, False)
+        assert outbox.resubmit_due() == 0
+        clock.now += 61
+        assert outbox.resubmit_due() == 1
+        delivery.on_result(alert, True)
+        outbox.close()
+
+        assert len(delivery.submitted) == 2
+        assert outbox.pending == 0
@@ -0,0 +1,130 @@
+"""Tests for live configuration reload."""
+
+import asyncio
+import dataclasses
+import os
+from unittest.mock import patch
+
+import pytest
+
+from motorcycle_alert.infrastructure.config import Config, VehicleConfig
+from motorcycle_alert.infrastructure.reload import (
+    ConfigSource,
+    ConfigWatcher,
+    changed_settings,
+)
+
+BASE_ENV = {
+    "TELEGRAM_API_KEY": "key",
+    "TELEGRAM_USER_ID": "12345",
+    "MAX_CONCURRENCY": "7",
+}
+
+
+def write(path, text):
+    """Write ``text`` to ``path``."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+class TestConfigSource:
+    """Test cases for loading and reloading the configuration."""
+
+    def test_reload_reads_the_changed_dotenv_file(self, tmp_path):
+        """Test that a reload sees new, changed and removed variables."""
+        dotenv_path = str(tmp_path / ".env")
+        write(dotenv_path, "OBJECT_IDS=1,2:42\nCHECK_INTERVAL=30\n")
+        with patch.dict(os.environ, BASE_ENV, clear=True):
+            source = ConfigSource(argv=[], dotenv_path=dotenv_path)
+            first = source.load()
+            write(dotenv_path, "OBJECT_IDS=3\n")
+            second = source.load()
+            assert "CHECK_INTERVAL" not in os.environ
+
+        assert first.fleet == (VehicleConfig("1"), VehicleConfig("2", "42"))
+        assert first.check_interval == 30
+        assert second.fleet == (VehicleConfig("3"),)
+        assert second.check_interval == 60
+
+    def test_flags_and_process_environment_keep_precedence(self, tmp_path):
+        """Test that ``.env`` overrides neither arguments nor the environment."""
+        dotenv_path = str(tmp_path / ".env")
+        write(dotenv_path, "OBJECT_ID=9\nCHECK_INTERVAL=30\nMAX_CONCURRENCY=3\n")
+        with patch.dict(os.environ, BASE_ENV, clear=True):
+            source = ConfigSource(
+                argv=["--check-interval", "15"], dotenv_path=dotenv_path
+            )
+            config = source.load()
+
+        assert (config.object_id, config.check_interval) == ("9", 15)
+        assert config.max_concurrency == 7
+
+    def test_invalid_configuration_is_rejected(self, tmp_path):
+        """Test that a reload of invalid settings raises instead of applying."""
+        dotenv_path = str(tmp_path / ".env")
+        write(dotenv_path, "OBJECT_ID=9\nLOG_LEVEL=LOUD\n")
+        with patch.dict(os.environ, BASE_ENV, clear=True):
+            with pytest.raises(ValueError, match="LOG_LEVEL"):
+                ConfigSource(argv=[], dotenv_path=dotenv_path).load()
+
+    def test_changed_settings_in_declaration_order(self):
+        """Test that only the differing settings are listed."""
+        config = Config(
+            telegram_api_key="key",
+            telegram_user_id="12345",
+            api_base_url="https://test.com",
+            object_id="1",
+            check_interval=60,
+            status_file_path="status.txt",
+        )
+        reloaded = dataclasses.replace(
+            config, vehicles=(VehicleConfig("2"),), check_interval=30
+        )
+
+        assert changed_settings(config, reloaded) == ["check_interval", "vehicles"]
+        assert changed_settings(config, config) == []
+
+
+class TestConfigWatcher:
+    """Test cases for watching configuration files."""
+
+    def test_detects_modified_and_created_files(self, tmp_path):
+        """Test that each change is reported once."""
+        path, missing = str(tmp_path / ".env"), str(tmp_path / "objects.txt")
+        write(path, "OBJECT_ID=1\n")
+
+        async def callback():
+            pass
+
+        watcher = ConfigWatcher([path, missing], callback, interval=1)
+
+        assert not watcher.changed()
+        write(path, "OBJECT_ID=12\n")
+        assert watcher.changed()
+        assert not watcher.changed()
+        write(missing, "1\n")
+        assert watcher.changed()
+
+    def test_calls_back_after_a_change(self, tmp_path):
+        """Test that the polling task reloads once the file changes."""
+        path = str(tmp_path / ".env")
+        write(path, "OBJECT_ID=1\n")
+        calls = []
+
+        async def callback():
+            calls.append(path)
+
+        async def scenario():
+            watcher = ConfigWatcher([path], callback, interval=0.01)
+            await watcher.start()
+            await asyncio.sleep(0.05)
+            write(path, "OBJECT_ID=12\n")
+            for _ in range(100):
+                if calls:
+                    break
+                await asyncio.sleep(0.01)
+            await watcher.stop()
+
+        asyncio.run(scenario())
+
+        assert calls == [path]
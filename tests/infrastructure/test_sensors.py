@@ -0,0 +1,74 @@
+"""Tests for the sensor mapping schema."""
+
+import json
+
+import pytest
+
+from motorcycle_alert.infrastructure.sensors import SensorSchema
+
+
+class TestSensorSchema:
+    """Test cases for SensorSchema."""
+
+    def test_default_schema_maps_known_sensors(self):
+        """Test the built-in alimentation, ignition and blocked mappings."""
+        schema = SensorSchema.load()
+
+        sensors = schema.parse(
+            [
+                {"name": " Alimentacao ", "value": "Ligado"},
+                {"name": "IGNICAO", "value": "Desligado"},
+                {"name": "Bloqueio", "value": "Ligado"},
+                {"name": "Temperatura", "value": "25°C"},
+            ]
+        )
+
+        assert sensors == {
+            "alimentation": "Ligado",
+            "ignition": "Desligado",
+            "blocked": True,
+            "temperatura": "25°C",
+        }
+
+    def test_skips_entries_without_name_or_value(self):
+        """Test that incomplete sensor entries are ignored."""
+        schema = SensorSchema.load()
+
+        sensors = schema.parse([{"name": "", "value": "x"}, {"name": "gps"}])
+
+        assert sensors == {}
+
+    def test_schema_file_adds_sensor_types(self, tmp_path):
+        """Test adding fuel, battery and GSM sensors without code changes."""
+        schema_file = tmp_path / "sensors.json"
+        schema_file.write_text(
+            json.dumps(
+                {
+                    "Combustivel": {"field": "fuel", "converter": "float"},
+                    "bateria": {"field": "battery_voltage", "converter": "float"},
+                    "sinal gsm": {"field": "gsm_signal", "converter": "int"},
+                }
+            )
+        )
+        schema = SensorSchema.load(str(schema_file))
+
+        sensors = schema.parse(
+            [
+                {"name": "combustivel", "value": "80 %"},
+                {"name": "Bateria", "value": "12,6 V"},
+                {"name": "Sinal GSM", "value": "4"},
+                {"name": "Bloqueio", "value": "Desligado"},
+            ]
+        )
+
+        assert sensors == {
+            "fuel": 80.0,
+            "battery_voltage": 12.6,
+            "gsm_signal": 4,
+            "blocked": False,
+        }
+
+    def test_unknown_converter_rejected(self):
+        """Test that a schema naming an unknown converter fails fast."""
+        with pytest.raises(ValueError, match="Unknown converter"):
+            SensorSchema({"fuel": ("fuel", "liters")})
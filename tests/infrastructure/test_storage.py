@@ -0,0 +1,217 @@
+"""Tests for status storages."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.domain.services import (
+    MotorcycleAlertService,
+    MotorcycleDataRepository,
+    NotificationService,
+    StatusStorage,
+)
+from motorcycle_alert.infrastructure.storage import (
+    CachedStatusStorage,
+    FileStatusStorage,
+)
+
+
+def make_status(ignition="on"):
+    """Build a status differing only by ignition."""
+    return MotorcycleStatus(
+        icon_color="green", alimentation="12V", blocked=False, ignition=ignition
+    )
+
+
+class CountingStorage(StatusStorage):
+    """In-memory storage counting calls, optionally blocking writes."""
+
+    def __init__(self, status=None):
+        self.status = status
+        self.loads = 0
+        self.saved = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def load_last_status(self):
+        self.loads += 1
+        return self.status
+
+    def save_status(self, status):
+        self.release.wait(timeout=5)
+        self.saved.append(status)
+        self.status = status
+
+
+class ScriptedRepository(MotorcycleDataRepository):
+    """Repository reporting the next scripted status on each poll."""
+
+    def __init__(self, statuses):
+        self._statuses = list(statuses)
+
+    async def get_current_status(self):
+        return self._statuses.pop(0)
+
+
+class TestFileStatusStorage:
+    """Test cases for FileStatusStorage."""
+
+    @pytest.mark.parametrize("fsync", [True, False])
+    def test_save_replaces_file_atomically(self, tmp_path, fsync):
+        """Test that saves leave no temporary file behind."""
+        path = tmp_path / "status.txt"
+        storage = FileStatusStorage(str(path), fsync=fsync)
+
+        storage.save_status(make_status("on"))
+        storage.save_status(make_status("off"))
+
+        assert path.read_text(encoding="utf-8") == "green,12V,False,off,,"
+        assert os.listdir(tmp_path) == ["status.txt"]
+
+    def test_time_and_object_id_round_trip(self, tmp_path):
+        """Test that the reported time and object ID survive a reload."""
+        path = str(tmp_path / "status.txt")
+        status = MotorcycleStatus(
+            icon_color="green",
+            alimentation="12V",
+            blocked=False,
+            ignition="on",
+            time=1_700_000_000.25,
+            object_id="a,b",
+        )
+        FileStatusStorage(path).save_status(status)
+
+        loaded = FileStatusStorage(path).load_last_status()
+
+        assert (loaded.time, loaded.object_id) == (1_700_000_000.25, "a,b")
+
+    def test_reads_files_without_time(self, tmp_path):
+        """Test that status files written before the time was kept still load."""
+        path = tmp_path / "status.txt"
+        path.write_text("green,12V,False,off", encoding="utf-8")
+
+        loaded = FileStatusStorage(str(path)).load_last_status()
+
+        assert loaded == make_status("off")
+        assert (loaded.time, loaded.object_id) == (None, None)
+
+    def test_transition_key_is_stable_across_restart(self, tmp_path):
+        """Test that a change re-detected after a restart keeps its dedup key."""
+        path = str(tmp_path / "status.txt")
+        first = MotorcycleStatus(
+            icon_color="green",
+            alimentation="12V",
+            blocked=False,
+            ignition="off",
+            time=1_700_000_000.0,
+            object_id="1",
+        )
+        second = MotorcycleStatus(
+            icon_color="green",
+            alimentation="12V",
+            blocked=False,
+            ignition="on",
+            time=1_700_000_060.0,
+            object_id="1",
+        )
+
+        class CrashingNotifier(NotificationService):
+            """Records alerts and dies before the change is saved."""
+
+            def __init__(self, crash):
+                self.keys = []
+                self.crash = crash
+
+            def send_alert(self, message):
+                self.keys.append(message.dedup_key)
+
+            async def commit(self):
+                if self.crash and len(self.keys) > 1:
+                    raise SystemExit
+
+        async def poll(notifier, statuses):
+            storage = CachedStatusStorage(FileStatusStorage(path))
+            service = MotorcycleAlertService(
+                ScriptedRepository(statuses), storage, notifier, recipient="7"
+            )
+            try:
+                for _ in statuses:
+                    await service.check_and_alert()
+                    storage.flush()
+            except SystemExit:
+                pass
+            storage.close()
+
+        before, after = CrashingNotifier(crash=True), CrashingNotifier(crash=False)
+        asyncio.run(poll(before, [first, second]))
+        asyncio.run(poll(after, [second]))
+
+        assert after.keys == before.keys[1:]
+
+
+class TestCachedStatusStorage:
+    """Test cases for CachedStatusStorage."""
+
+    def test_reads_wrapped_storage_once(self):
+        """Test that only the first load reaches the wrapped storage."""
+        inner = CountingStorage(make_status())
+        storage = CachedStatusStorage(inner)
+
+        for _ in range(5):
+            assert storage.load_last_status() == make_status()
+
+        assert inner.loads == 1
+        assert storage.stats["hits"] == 4
+
+    def test_save_is_visible_before_write(self):
+        """Test that the cache serves a save while its write is still pending."""
+        inner = CountingStorage()
+        inner.release.clear()
+        storage = CachedStatusStorage(inner)
+
+        storage.save_status(make_status("off"))
+
+        assert storage.load_last_status() == make_status("off")
+        assert inner.loads == 0
+        inner.release.set()
+        storage.close()
+        assert inner.saved == [make_status("off")]
+
+    def test_pending_saves_are_coalesced(self):
+        """Test that saves queued behind a slow write collapse into the latest."""
+        inner = CountingStorage()
+        inner.release.clear()
+        storage = CachedStatusStorage(inner)
+
+        storage.save_status(make_status("a"))
+        while not storage._writing:
+            pass
+        storage.save_status(make_status("b"))
+        storage.save_status(make_status("c"))
+        inner.release.set()
+        storage.flush()
+
+        assert inner.saved == [make_status("a"), make_status("c")]
+        assert storage.stats["coalesced"] == 1
+        storage.close()
+
+    def test_write_behind_to_file(self, tmp_path):
+        """Test the cache in front of the file storage survives a restart."""
+        path = str(tmp_path / "status.txt")
+        storage = CachedStatusStorage(FileStatusStorage(path))
+        storage.save_status(make_status("off"))
+        storage.close()
+
+        reopened = CachedStatusStorage(FileStatusStorage(path))
+        assert reopened.load_last_status() == make_status("off")
+
+    def test_save_after_close_raises(self):
+        """Test that a closed storage rejects saves."""
+        storage = CachedStatusStorage(CountingStorage())
+        storage.close()
+
+        with pytest.raises(RuntimeError):
+            storage.save_status(make_status())
@@ -0,0 +1,66 @@
+"""Tests for the streaming API payload parser."""
+
+import asyncio
+import io
+import json
+
+from benchmarks.payloads import make_item, make_payload
+from motorcycle_alert.infrastructure.streaming_parser import (
+    parse_items,
+    parse_items_async,
+)
+
+
+class AsyncBytesReader:
+    """Minimal async stream serving a body in small chunks."""
+
+    def __init__(self, body: bytes, chunk_size: int = 64):
+        self._buffer = io.BytesIO(body)
+        self._chunk_size = chunk_size
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._buffer.read(min(n, self._chunk_size) if n >= 0 else -1)
+
+
+class TestParseItems:
+    """Test cases for incremental field extraction."""
+
+    def test_extracts_only_status_fields(self):
+        """Test that only the status fields and sensor names/values are kept."""
+        body = make_payload(vehicles=2, tail_points=3)
+
+        items = parse_items(io.BytesIO(body))["data"]
+
+        assert [item["id"] for item in items] == [1, 2]
+        assert "tail" not in items[0]
+        assert "device_data" not in items[0]
+        assert items[0]["sensors"][0] == {"name": "Alimentacao", "value": "Ligado"}
+
+    def test_matches_full_json_decoding(self):
+        """Test that extracted values equal the fully decoded ones."""
+        expected = make_item(7, tail_points=5)
+        body = json.dumps({"data": [expected]}).encode()
+
+        item = parse_items(io.BytesIO(body))["data"][0]
+
+        for key in ("id", "icon_color", "time", "stop_duration", "speed", "lat", "lng"):
+            assert item[key] == expected[key]
+        assert len(item["sensors"]) == len(expected["sensors"])
+
+    def test_ignores_nested_fields_with_status_names(self):
+        """Test that keys like ``time`` inside history tails are skipped."""
+        body = json.dumps(
+            {"data": [{"icon_color": "red", "tail": [{"time": "old", "lat": 1.0}]}]}
+        ).encode()
+
+        item = parse_items(io.BytesIO(body))["data"][0]
+
+        assert item == {"icon_color": "red", "sensors": []}
+
+    def test_async_stream(self):
+        """Test parsing a body delivered in chunks by an async reader."""
+        body = make_payload(vehicles=3, tail_points=10)
+
+        document = asyncio.run(parse_items_async(AsyncBytesReader(body)))
+
+        assert [item["id"] for item in document["data"]] == [1, 2, 3]
@@ -0,0 +1,304 @@
+"""Tests for the sharded multi-process fleet supervisor."""
+
+import asyncio
+import logging
+import os
+import queue
+import time
+
+from motorcycle_alert.domain.models import AlertMessage, MotorcycleStatus
+from motorcycle_alert.domain.services import NotificationService
+from motorcycle_alert.infrastructure.config import Config, VehicleConfig
+from motorcycle_alert.infrastructure.supervisor import (
+    ChannelNotificationService,
+    FleetSupervisor,
+    worker_config,
+)
+
+
+def make_config(vehicles: int = 12, **overrides) -> Config:
+    """Build a configuration for a fleet of ``vehicles``."""
+    return Config(
+        telegram_api_key="key",
+        telegram_user_id="12345",
+        api_base_url="https://test.com",
+        object_id="1",
+        check_interval=60,
+        status_file_path="status.txt",
+        vehicles=tuple(VehicleConfig(str(i)) for i in range(1, vehicles + 1)),
+        **overrides,
+    )
+
+
+def make_alert() -> AlertMessage:
+    """Build an alert for a vehicle with the ignition on."""
+    return AlertMessage(
+        status=MotorcycleStatus(
+            icon_color="green", alimentation="12V", blocked=False, ignition="on"
+        ),
+        timestamp="now",
+    )
+
+
+def alert_worker(config, index, object_ids, alerts, logs, acks):
+    """Worker sending one alert per vehicle, then idling until terminated.
+
+    Once the supervisor acknowledged its alerts, or failed to, the worker
+    logs the outcome as the ``worker`` logger.
+    """
+    channel = ChannelNotificationService(alerts, acks, timeout=1.0)
+    for object_id in object_ids:
+        channel.send_alert(
+            AlertMessage(
+                status=MotorcycleStatus(
+                    icon_color="green",
+                    alimentation="12V",
+                    blocked=False,
+                    ignition="on",
+                    object_id=object_id,
+                ),
+                timestamp=str(os.getpid()),
+            )
+        )
+    try:
+        asyncio.run(channel.commit())
+        outcome = "acknowledged"
+    except RuntimeError:
+        outcome = "rejected"
+    except TimeoutError:
+        outcome = "unacknowledged"
+    logs.put(
+        logging.makeLogRecord(
+            {"name": "worker", "levelno": logging.INFO, "msg": f"{index} {outcome}"}
+        )
+    )
+    time.sleep(60)
+
+
+def crashing_worker(config, index, object_ids, alerts, logs, acks):
+    """Worker 0 crashes on start; the others behave like ``alert_worker``."""
+    if index == 0:
+        os._exit(3)
+    alert_worker(config, index, object_ids, alerts, logs, acks)
+
+
+class RecordingNotifier(NotificationService):
+    """Notifier recording the vehicles alerted, optionally failing to commit."""
+
+    def __init__(self, fail_commit=False):
+        self.sent = []
+        self.commits = 0
+        self.fail_commit = fail_commit
+
+    def send_alert(self, message):
+        self.sent.append(message)
+
+    async def commit(self):
+        self.commits += 1
+        if self.fail_commit:
+            raise OSError("disk full")
+
+
+class WorkerOutcomes(logging.Handler):
+    """Collects the outcomes logged by ``alert_worker`` processes."""
+
+    def __init__(self):
+        super().__init__()
+        self.outcomes = []
+
+    def emit(self, record):
+        self.outcomes.append(record.getMessage().split()[1])
+
+    def __enter__(self):
+        logging.getLogger("worker").addHandler(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        logging.getLogger("worker").removeHandler(self)
+
+
+async def supervise_until(supervisor, done, timeout=30.0):
+    """Run ``supervisor`` until ``done()`` holds, then stop it."""
+    task = asyncio.create_task(supervisor.run())
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline and not task.done():
+        await asyncio.sleep(0.05)
+    supervisor.stop()
+    await task
+
+
+class TestFleetSupervisor:
+    """Test cases for sharded worker processes."""
+
+    def test_workers_share_the_fleet_and_one_alert_channel(self):
+        """Test that each vehicle is polled by exactly one worker."""
+        notifier = RecordingNotifier()
+        supervisor = FleetSupervisor(
+            make_config(), notifier, alert_worker, workers=3, poll_interval=0.05
+        )
+
+        asyncio.run(supervise_until(supervisor, lambda: len(notifier.sent) >= 12))
+
+        alerted = sorted(m.status.object_id for m in notifier.sent)
+        assert alerted == sorted(str(i) for i in range(1, 13))
+        shards = supervisor.assignment
+        assert sorted(sum(shards.values(), ())) == alerted
+        assert len({m.timestamp for m in notifier.sent}) == sum(
+            1 for ids in shards.values() if ids
+        )
+        assert supervisor.stats["started"] == len({m.timestamp for m in notifier.sent})
+
+    def test_workers_wait_for_the_supervisor_to_commit_their_alerts(self):
+        """Test that alerts are acknowledged only once committed."""
+        for fail_commit, expected in [
+            (False, "acknowledged"),
+            (True, "rejected"),
+        ]:
+            notifier = RecordingNotifier(fail_commit)
+            supervisor = FleetSupervisor(
+                make_config(4), notifier, alert_worker, workers=2, poll_interval=0.05
+            )
+
+            with WorkerOutcomes() as handler:
+                asyncio.run(
+                    supervise_until(supervisor, lambda: len(handler.outcomes) >= 2)
+                )
+
+            assert handler.outcomes == [expected, expected]
+            assert notifier.commits == 4
+
+    def test_crash_looping_worker_is_retired_and_rebalanced(self):
+        """Test restarts with backoff, then moving the shard to other workers."""
+        notifier = RecordingNotifier()
+        supervisor = FleetSupervisor(
+            make_config(),
+            notifier,
+            crashing_worker,
+            workers=3,
+            max_restarts=1,
+            restart_delay=0.01,
+            poll_interval=0.05,
+        )
+
+        asyncio.run(
+            supervise_until(
+                supervisor,
+                lambda: {m.status.object_id for m in notifier.sent}
+                == {str(i) for i in range(1, 13)},
+            )
+        )
+
+        assert supervisor.stats["crashed"] == 2
+        assert supervisor.stats["retired"] == 1
+        assert "worker-0" not in supervisor.assignment
+        assert sorted(sum(supervisor.assignment.values(), ()), key=int) == [
+            str(i) for i in range(1, 13)
+        ]
+
+    def test_reload_restarts_only_the_workers_that_need_it(self):
+        """Test resharding a grown fleet, then restarting every worker."""
+        notifier = RecordingNotifier()
+        supervisor = FleetSupervisor(
+            make_config(), notifier, alert_worker, workers=3, poll_interval=0.05
+        )
+
+        def alerted(count):
+            return lambda: len(notifier.sent) >= count
+
+        async def scenario():
+            task = asyncio.create_task(supervisor.run())
+            await wait_until(alerted(12))
+            before = supervisor.assignment
+            await supervisor.reload(make_config(vehicles=13))
+            resharded = supervisor.stats["started"] - 3
+            moved = next(ids for ids in supervisor.assignment.values() if "13" in ids)
+            await wait_until(alerted(12 + len(moved)))
+            await supervisor.reload(make_config(vehicles=13), restart=True)
+            await wait_until(alerted(12 + len(moved) + 13))
+            supervisor.stop()
+            await task
+            return before, resharded
+
+        before, resharded = asyncio.run(asyncio.wait_for(scenario(), 60))
+
+        changed = [
+            name for name, ids in supervisor.assignment.items() if ids != before[name]
+        ]
+        assert changed and "13" in sum(supervisor.assignment.values(), ())
+        assert resharded == len(changed) == 1
+        assert supervisor.stats["started"] == 3 + 1 + 3
+        assert "13" in {m.status.object_id for m in notifier.sent}
+
+
+async def wait_until(done, timeout=30.0):
+    """Wait until ``done()`` holds."""
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+
+class TestChannelNotificationService:
+    """Test cases for the worker side of the alert channel."""
+
+    def test_each_alert_is_acknowledged_individually(self):
+        """Test that a later acknowledgement does not commit an earlier alert."""
+        acks = queue.Queue()
+        channel = ChannelNotificationService(queue.Queue(), acks, timeout=5.0)
+        message = make_alert()
+
+        async def scenario():
+            channel.send_alert(message)
+            first = asyncio.ensure_future(channel.commit())
+            channel.send_alert(message)
+            second = asyncio.ensure_future(channel.commit())
+            await asyncio.sleep(0)
+            acks.put((2, True))
+            await asyncio.sleep(0.1)
+            pending = not first.done() and not second.done()
+            acks.put((1, False))
+            results = await asyncio.gather(first, second, return_exceptions=True)
+            return pending, results
+
+        pending, (first, second) = asyncio.run(scenario())
+
+        assert pending
+        assert isinstance(first, RuntimeError) and "[1]" in str(first)
+        assert second is None
+
+    def test_unanswered_alerts_are_given_up_on_timeout(self):
+        """Test that a lost answer fails one commit, not every later one."""
+        acks = queue.Queue()
+        channel = ChannelNotificationService(queue.Queue(), acks, timeout=0.1)
+        message = make_alert()
+
+        async def scenario():
+            channel.send_alert(message)
+            try:
+                await channel.commit()
+                timed_out = False
+            except TimeoutError:
+                timed_out = True
+            channel.send_alert(message)
+            acks.put((1, True))
+            acks.put((2, True))
+            await channel.commit()
+            return timed_out
+
+        assert asyncio.run(scenario())
+
+
+class TestWorkerConfig:
+    """Test cases for the configuration of worker processes."""
+
+    def test_workers_deliver_through_the_supervisor(self):
+        """Test that workers run unsharded on their own metrics port."""
+        config = make_config(workers=4, outbox_path="outbox.log", metrics_port=9464)
+
+        worker = worker_config(config, 2)
+
+        assert (worker.workers, worker.outbox_path, worker.metrics_port) == (
+            0,
+            "outbox.log",
+            9467,
+        )
+        assert worker_config(make_config(workers=4), 0).metrics_port == 0
@@ -0,0 +1,144 @@
+"""Tests for the columnar telemetry log."""
+
+import math
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from motorcycle_alert.domain.models import MotorcycleStatus
+from motorcycle_alert.infrastructure.telemetry import (
+    TelemetryLog,
+    TelemetryReader,
+    TelemetryRecorder,
+)
+
+
+def make_status(speed=30.0, ignition="Ligado", lat=-3.1):
+    """Build a status carrying telemetry fields."""
+    return MotorcycleStatus(
+        icon_color="green",
+        alimentation="12V",
+        blocked=False,
+        ignition=ignition,
+        speed=speed,
+        lat=lat,
+        lng=-60.0,
+    )
+
+
+def write_samples(directory, count, object_id="1", **log_kwargs):
+    """Write ``count`` samples one minute apart."""
+    clock = [1_700_000_000.0]
+    log = TelemetryLog(str(directory), clock=lambda: clock[0], **log_kwargs)
+    for i in range(count):
+        clock[0] = 1_700_000_000.0 + i * 60
+        log.append(object_id, make_status(speed=float(i)))
+    log.close()
+
+
+class TestTelemetryLog:
+    """Test cases for TelemetryLog and TelemetryReader."""
+
+    def test_round_trip_values(self, tmp_path):
+        """Test that sample fields come back as typed columns."""
+        log = TelemetryLog(str(tmp_path), clock=lambda: 1_700_000_000.0)
+        recorder = TelemetryRecorder(log, "42")
+        recorder.observe(make_status())
+        recorder.observe(make_status(speed=None, ignition="Desligado", lat=None))
+        log.close()
+
+        columns = TelemetryReader(str(tmp_path)).read("42")
+
+        assert columns["speed"][0] == 30.0 and math.isnan(columns["speed"][1])
+        assert columns["ignition"].tolist() == [1, 0]
+        assert math.isnan(columns["lat"][1])
+        assert columns["time"].dtype == np.float64
+
+    def test_single_segment_read_is_zero_copy(self, tmp_path):
+        """Test that a range within one segment is a view of the mapped file."""
+        write_samples(tmp_path, 100)
+
+        columns = TelemetryReader(str(tmp_path)).read(
+            "1", start=1_700_000_000.0 + 10 * 60, end=1_700_000_000.0 + 20 * 60
+        )
+
+        assert columns["speed"].tolist() == [float(i) for i in range(10, 20)]
+        assert isinstance(columns["speed"].base, np.memmap) or isinstance(
+            columns["speed"], np.memmap
+        )
+
+    def test_segments_roll_over_and_concatenate(self, tmp_path):
+        """Test that full segments start new ones and reads span them."""
+        write_samples(tmp_path, 25, segment_samples=10, flush_samples=7)
+
+        reader = TelemetryReader(str(tmp_path))
+        lengths = [len(segment["time"]) for segment in reader.segments("1")]
+        columns = reader.read("1", columns=["speed"])
+
+        assert lengths == [10, 10, 5]
+        assert columns["speed"].tolist() == [float(i) for i in range(25)]
+        assert list(columns) == ["speed"]
+
+    def test_torn_write_is_repaired_on_resume(self, tmp_path):
+        """Test that a partially written sample is dropped when the log reopens."""
+        write_samples(tmp_path, 3)
+        speed_path = os.path.join(tmp_path, "1", "00000000", "speed.f4")
+        with open(speed_path, "ab") as file:
+            file.write(b"\x00\x00")  # half a float32
+        time_path = os.path.join(tmp_path, "1", "00000000", "time.f8")
+        with open(time_path, "ab") as file:
+            file.write(np.array([1.0]).tobytes())  # column ahead of the others
+
+        log = TelemetryLog(str(tmp_path), clock=lambda: 1_800_000_000.0)
+        log.append("1", make_status(speed=99.0))
+        log.close()
+
+        columns = TelemetryReader(str(tmp_path)).read("1")
+        assert columns["speed"].tolist() == [0.0, 1.0, 2.0, 99.0]
+        assert columns["time"][-1] == 1_800_000_000.0
+
+    @pytest.mark.parametrize("object_id", ["unknown", "..", "../escape"])
+    def test_missing_vehicle_reads_empty(self, tmp_path, object_id):
+        """Test that unknown vehicles yield empty columns inside the log directory."""
+        columns = TelemetryReader(str(tmp_path)).read(object_id)
+
+        assert all(len(values) == 0 for values in columns.values())
+
+    def test_similar_ids_do_not_share_a_directory(self, tmp_path):
+        """Test that IDs differing only in unsafe characters are kept apart."""
+        log = TelemetryLog(str(tmp_path), clock=lambda: 1_700_000_000.0)
+        log.append("a.b", make_status(speed=1.0))
+        log.append("a_b", make_status(speed=2.0))
+        log.append("a/b", make_status(speed=3.0))
+        log.close()
+
+        reader = TelemetryReader(str(tmp_path))
+
+        assert reader.vehicles() == ["a.b", "a/b", "a_b"]
+        assert reader.read("a.b")["speed"].tolist() == [1.0]
+        assert reader.read("a_b")["speed"].tolist() == [2.0]
+        assert reader.read("a/b")["speed"].tolist() == [3.0]
+
+    def test_flushes_reuse_open_files_off_the_calling_thread(self, tmp_path):
+        """Test that column files stay open and are written by the flush thread."""
+        threads = []
+
+        class ThreadRecordingLog(TelemetryLog):
+            def _write(self, batch):
+                threads.append(threading.get_ident())
+                super()._write(batch)
+
+        log = ThreadRecordingLog(str(tmp_path), clock=lambda: 1_700_000_000.0)
+        log.append("1", make_status(speed=1.0))
+        log.flush()
+        files = dict(log._writers["1"]._files)
+        log.append("1", make_status(speed=2.0))
+        log.flush()
+
+        assert log._writers["1"]._files == files
+        assert threading.get_ident() not in threads
+        log.close()
+        assert all(file.closed for file in files.values())
+        assert TelemetryReader(str(tmp_path)).read("1")["speed"].tolist() == [1.0, 2.0]
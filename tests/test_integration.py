@@ -1,14 +1,40 @@
 """Integration tests for the motorcycle alert system."""
 
+import asyncio
+import dataclasses
+import json
+import logging
 import os
+import signal
+import subprocess
+import sys
 import tempfile
-from unittest.mock import Mock, patch
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 
+from motorcycle_alert.domain.debounce import FieldRule
 from motorcycle_alert.domain.models import MotorcycleStatus
-from motorcycle_alert.infrastructure.config import Config, load_config
-from motorcycle_alert.infrastructure.storage import FileStatusStorage
+from motorcycle_alert.domain.services import NotificationService
+from motorcycle_alert.infrastructure.config import (
+    Config,
+    VehicleConfig,
+    load_alert_rules,
+    load_config,
+    load_geofences,
+    parse_debounce_rules,
+    parse_vehicles,
+)
+from motorcycle_alert.infrastructure.reload import ConfigSource
+from motorcycle_alert.infrastructure.storage import (
+    FileStatusStorage,
+    vehicle_status_path,
+)
+from motorcycle_alert.main import MotorcycleAlertApplication
 
 
 class TestConfiguration:
@@ -36,6 +62,74 @@ class TestConfiguration:
             assert config.api_base_url == "https://test.com"
             assert config.object_id == "999"
 
+    def test_load_config_with_vehicle_list(self):
+        """Test loading a fleet from OBJECT_IDS."""
+        with patch.dict(
+            os.environ,
+            {
+                "TELEGRAM_API_KEY": "test_key",
+                "TELEGRAM_USER_ID": "12345",
+                "OBJECT_ID": "",
+                "OBJECT_IDS": "10, 11:777, 12",
+            },
+        ):
+            with patch("sys.argv", ["test"]):
+                config = load_config()
+
+        assert config.object_id == "10"
+        assert [v.object_id for v in config.fleet] == ["10", "11", "12"]
+        assert config.fleet[1].recipient == "777"
+
+    def test_parse_vehicles_skips_comments_and_duplicates(self):
+        """Test parsing vehicle file lines."""
+        vehicles = parse_vehicles(["# fleet", "1:42", "", "2  # spare", "1"])
+
+        assert vehicles == (VehicleConfig("1", "42"), VehicleConfig("2"))
+
+    def test_parse_debounce_rules(self):
+        """Test parsing per-field and per-value debounce rules."""
+        rules = parse_debounce_rules("icon_color=3, ignition:Desligado=0/300")
+
+        assert rules == (
+            ("icon_color", FieldRule(3)),
+            ("ignition:Desligado", FieldRule(0, 300.0)),
+        )
+        with pytest.raises(ValueError, match="speed=2"):
+            parse_debounce_rules("speed=2")
+
+    def test_load_alert_rules(self, tmp_path):
+        """Test loading alert rules from a JSON file."""
+        path = tmp_path / "rules.json"
+        path.write_text(
+            '[{"name": "Speeding", "condition": "speed > 80", "cooldown": 600},'
+            ' {"name": "Power", "condition": "voltage == 0", "recipient": "7"}]'
+        )
+
+        rules = load_alert_rules(str(path))
+
+        assert [(r.name, r.cooldown, r.recipient) for r in rules] == [
+            ("Speeding", 600.0, None),
+            ("Power", 0.0, "7"),
+        ]
+        assert load_alert_rules("") == ()
+
+    def test_load_geofences(self, tmp_path):
+        """Test loading circle and polygon zones from a JSON file."""
+        path = tmp_path / "zones.json"
+        path.write_text(
+            '[{"name": "Home", "circle": {"lat": -3.1, "lng": -60, "radius": 150}},'
+            ' {"name": "Depot", "polygon": [[0, 0], [0, 1], [1, 1]], "recipient": "7"}]'
+        )
+
+        home, depot = load_geofences(str(path))
+
+        assert (home.name, home.radius) == ("Home", 150.0)
+        assert depot.points == ((0.0, 0.0), (0.0, 1.0), (1.0, 1.0))
+        assert depot.recipient == "7"
+        with pytest.raises(ValueError):
+            path.write_text('[{"name": "Bad", "circle": {"lat": 0}}]')
+            load_geofences(str(path))
+
     def test_config_validation_missing_telegram_key(self):
         """Test that missing Telegram API key raises error."""
         with pytest.raises(ValueError, match="TELEGRAM_API_KEY"):
@@ -48,6 +142,28 @@ class TestConfiguration:
                 status_file_path="status.txt",
             )
 
+    @pytest.mark.parametrize(
+        "overrides, message",
+        [
+            ({"log_format": "xml"}, "LOG_FORMAT"),
+            ({"log_level": "LOUD"}, "LOG_LEVEL"),
+            ({"log_backup_count": 0}, "LOG_BACKUP_COUNT"),
+            ({"log_debug_sample_rate": 0}, "LOG_DEBUG_SAMPLE_RATE"),
+        ],
+    )
+    def test_config_validation_logging(self, overrides, message):
+        """Test that invalid log settings are rejected."""
+        with pytest.raises(ValueError, match=message):
+            Config(
+                telegram_api_key="key",
+                telegram_user_id="12345",
+                api_base_url="https://test.com",
+                object_id="999",
+                check_interval=60,
+                status_file_path="status.txt",
+                **overrides,
+            )
+
 
 class TestFileStatusStorage:
     """Test file-based status storage."""
@@ -72,8 +188,190 @@ class TestFileStatusStorage:
         # Clean up
         os.unlink(f.name)
 
+    def test_vehicle_status_path(self):
+        """Test deriving a per-vehicle status file."""
+        assert vehicle_status_path("/tmp/status.txt", "42") == "/tmp/status.42.txt"
+
     def test_load_status_file_not_exists(self):
         """Test loading status when file doesn't exist."""
         storage = FileStatusStorage("/nonexistent/file.txt")
         result = storage.load_last_status()
         assert result is None
+
+
+@pytest.fixture
+def tracker():
+    """Serve tracker items for any vehicle, recording IDs and session cookies."""
+    polls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            ids = parse_qs(urlparse(self.path).query)["id"][0].split(",")
+            polls.extend((object_id, self.headers.get("Cookie")) for object_id in ids)
+            body = json.dumps(
+                {
+                    "data": [
+                        {
+                            "id": int(object_id),
+                            "icon_color": "green",
+                            "sensors": [{"name": "Ignicao", "value": "Ligado"}],
+                        }
+                        for object_id in ids
+                    ]
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", polls
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def process_state():
+    """Restore the root logger and the signal handlers the application replaces."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    signals = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    yield
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    for sig, handler in signals.items():
+        signal.signal(sig, handler)
+
+
+class RecordingNotifier(NotificationService):
+    """Notification service recording the alerted vehicles."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_alert(self, message):
+        self.sent.append(message.status.object_id)
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="needs SIGHUP")
+class TestConfigReload:
+    """Test reloading the configuration of a running application."""
+
+    def test_sighup_swaps_session_and_vehicles_while_polling(
+        self, tmp_path, tracker, process_state
+    ):
+        """Test that a reload reaches running repositories and adds vehicles."""
+        base_url, polls = tracker
+        dotenv_path = tmp_path / ".env"
+        settings = (
+            "TELEGRAM_API_KEY=key\nTELEGRAM_USER_ID=12345\n"
+            f"API_BASE_URL={base_url}\nAPI_CSRF_TOKEN=token\nCHECK_INTERVAL=1\n"
+            f"STATUS_FILE_PATH={tmp_path / 'status.txt'}\nLOG_FILE=\n"
+        )
+        dotenv_path.write_text(settings + "OBJECT_IDS=1\nAPI_COOKIE=old\n")
+        notifier = RecordingNotifier()
+
+        async def wait_for_poll(poll):
+            deadline = time.monotonic() + 10
+            while poll not in polls and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+            assert poll in polls
+
+        async def scenario(app):
+            task = asyncio.create_task(app.run())
+            await wait_for_poll(("1", "old"))
+            dotenv_path.write_text(settings + "OBJECT_IDS=1,2\nAPI_COOKIE=new\n")
+            os.kill(os.getpid(), signal.SIGHUP)
+            await wait_for_poll(("1", "new"))
+            await wait_for_poll(("2", "new"))
+            dotenv_path.write_text(settings + "OBJECT_IDS=1,2\nLOG_LEVEL=LOUD\n")
+            assert not await app.reload()
+            os.kill(os.getpid(), signal.SIGTERM)
+            await task
+
+        with patch.dict(os.environ, {}, clear=True):
+            app = MotorcycleAlertApplication(
+                notification_service=notifier,
+                config_source=ConfigSource(argv=[], dotenv_path=str(dotenv_path)),
+            )
+            asyncio.run(asyncio.wait_for(scenario(app), 30))
+
+        assert sorted(set(notifier.sent)) == ["1", "2"]
+
+
+class TestFleetReload:
+    """Test swapping the vehicles of a running application."""
+
+    def test_vehicles_are_keyed_by_object_id(self, tmp_path, process_state):
+        """Test that a changed chat keeps the service and removals close storage and repository."""
+        config = Config(
+            telegram_api_key="key",
+            telegram_user_id="12345",
+            api_base_url="https://test.com",
+            object_id="1",
+            check_interval=60,
+            status_file_path=str(tmp_path / "status.txt"),
+            vehicles=(VehicleConfig("1"),),
+            status_cache=True,
+        )
+        status = MotorcycleStatus(
+            icon_color="green", alimentation="12V", blocked=False, ignition="on"
+        )
+        env = {"API_COOKIE": "cookie", "API_CSRF_TOKEN": "token"}
+        with patch.dict(os.environ, env):
+            app = MotorcycleAlertApplication(config=config)
+            app._add_vehicles(config, config.fleet)
+            service, storage = app._services["1"], app._storages["1"]
+            repository = app._repositories["1"]
+            repository.close = AsyncMock()
+            storage.save_status(status)
+
+            grown = asyncio.run(
+                app._reload_alert_services(
+                    dataclasses.replace(
+                        config,
+                        vehicles=(VehicleConfig("1", "777"), VehicleConfig("2")),
+                    )
+                )
+            )
+            kept = (grown[0] is service, app._storages["1"] is storage)
+            asyncio.run(
+                app._reload_alert_services(
+                    dataclasses.replace(config, vehicles=(VehicleConfig("2"),))
+                )
+            )
+
+        assert kept == (True, True) and service._recipient == "777"
+        assert list(app._storages) == list(app._repositories) == ["2"]
+        assert repository not in app._all_repositories()
+        repository.close.assert_awaited_once()
+        with pytest.raises(RuntimeError, match="closed"):
+            storage.save_status(status)
+        assert os.path.exists(tmp_path / "status.1.txt")
+
+
+class TestStartup:
+    """Test the cost of starting the application."""
+
+    def test_heavy_dependencies_are_imported_on_demand(self):
+        """Test that importing the application skips unused libraries."""
+        code = (
+            "import sys, motorcycle_alert.main; "
+            "print(sorted({'requests', 'telebot', 'numpy', 'aiohttp.web'} "
+            "& set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"